@@ -0,0 +1,28 @@
+"""Export job type.
+
+Revision ID: 0025_export_job_type
+Revises: 0024_mercy60_job_enhancements
+Create Date: 2026-10-19
+
+Adds:
+  - Extends ``jobtype`` enum with ``export`` value for asynchronous
+    outage / SLA / payment exports
+"""
+from alembic import op
+
+
+revision = "0025_export_job_type"
+down_revision = "0024_mercy60_job_enhancements"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TYPE jobtype ADD VALUE IF NOT EXISTS 'export'"
+    )
+
+
+def downgrade() -> None:
+    # Removing enum values is not reversible in Postgres; leave value in place.
+    pass
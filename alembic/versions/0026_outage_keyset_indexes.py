@@ -0,0 +1,38 @@
+"""Composite indexes for keyset pagination of outage listings.
+
+Revision ID: 0026_outage_keyset_indexes
+Revises: 0025_export_job_type
+Create Date: 2026-10-19
+
+Adds:
+  - ``(sort column, id)`` indexes for every ``OutageSortField``
+  - ``(status|severity, detected_at, id)`` indexes for the default sort
+    combined with the common filters
+"""
+from alembic import op
+
+
+revision = "0026_outage_keyset_indexes"
+down_revision = "0025_export_job_type"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = {
+    "ix_outages_detected_at_id": ["detected_at", "id"],
+    "ix_outages_status_detected_at_id": ["status", "detected_at", "id"],
+    "ix_outages_severity_detected_at_id": ["severity", "detected_at", "id"],
+    "ix_outages_site_name_id": ["site_name", "id"],
+    "ix_outages_severity_id": ["severity", "id"],
+    "ix_outages_status_id": ["status", "id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in _INDEXES.items():
+        op.create_index(name, "outages", columns)
+
+
+def downgrade() -> None:
+    for name in reversed(list(_INDEXES)):
+        op.drop_index(name, table_name="outages")
@@ -0,0 +1,63 @@
+"""Indexed substring search over outage ids and sites.
+
+Revision ID: 0027_outage_search_index
+Revises: 0026_outage_keyset_indexes
+Create Date: 2026-10-19
+
+Adds:
+  - Postgres: ``pg_trgm`` extension, generated ``outages.search_text``
+    column (lower-cased id, site_id, site_name) and a trigram GIN index
+  - SQLite: ``outages_search`` FTS5 table (trigram tokenizer) with
+    insert/update/delete sync triggers, backfilled from ``outages``
+"""
+from alembic import op
+
+
+revision = "0027_outage_search_index"
+down_revision = "0026_outage_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS outages_search "
+    "USING fts5(id, site_id, site_name, tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS outages_search_ai AFTER INSERT ON outages BEGIN
+        INSERT INTO outages_search(id, site_id, site_name) VALUES (new.id, new.site_id, new.site_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS outages_search_ad AFTER DELETE ON outages BEGIN
+        DELETE FROM outages_search WHERE id = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS outages_search_au AFTER UPDATE OF id, site_id, site_name ON outages BEGIN
+        DELETE FROM outages_search WHERE id = old.id;
+        INSERT INTO outages_search(id, site_id, site_name) VALUES (new.id, new.site_id, new.site_name);
+    END""",
+    "INSERT INTO outages_search(id, site_id, site_name) SELECT id, site_id, site_name FROM outages",
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "ALTER TABLE outages ADD COLUMN search_text text GENERATED ALWAYS AS "
+            "(lower(id || ' ' || coalesce(site_id, '') || ' ' || site_name)) STORED"
+        )
+        op.execute(
+            "CREATE INDEX ix_outages_search_text_trgm ON outages USING GIN (search_text gin_trgm_ops)"
+        )
+    elif dialect == "sqlite":
+        for statement in _SQLITE_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_outages_search_text_trgm")
+        op.execute("ALTER TABLE outages DROP COLUMN IF EXISTS search_text")
+    elif dialect == "sqlite":
+        for trigger in ("outages_search_ai", "outages_search_ad", "outages_search_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS outages_search")
@@ -0,0 +1,98 @@
+"""Content-hash column for outage duplicate detection.
+
+Revision ID: 0028_outage_content_hash
+Revises: 0027_outage_search_index
+Create Date: 2026-10-19
+
+Adds:
+  - ``outages.content_hash``: sha256 of the normalized
+    (site_name, detected_at, description, site_id) duplicate key
+  - Backfill of existing rows in id order; when several rows share a key
+    only the first keeps the hash, the rest stay NULL
+  - Partial unique index ``uq_outages_content_hash`` (non-NULL hashes)
+"""
+import hashlib
+import unicodedata
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0028_outage_content_hash"
+down_revision = "0027_outage_search_index"
+branch_labels = None
+depends_on = None
+
+_BATCH = 1000
+
+
+def _norm(value):
+    return unicodedata.normalize("NFC", value or "").strip()
+
+
+def _content_hash(site_name, detected_at, description, site_id):
+    # Same normalization as app.repositories.outage_repository.outage_content_hash
+    # at the time of this revision.
+    if isinstance(detected_at, str):
+        detected_at = datetime.fromisoformat(detected_at)
+    if detected_at is not None and detected_at.tzinfo is None:
+        detected_at = detected_at.replace(tzinfo=timezone.utc)
+    detected = detected_at.astimezone(timezone.utc).isoformat() if detected_at else ""
+    parts = [_norm(site_name), detected, _norm(description), _norm(site_id)]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column("outages", sa.Column("content_hash", sa.String(64), nullable=True))
+
+    bind = op.get_bind()
+    outages = sa.table(
+        "outages",
+        sa.column("id", sa.String),
+        sa.column("site_name", sa.String),
+        sa.column("site_id", sa.String),
+        sa.column("detected_at", sa.DateTime(timezone=True)),
+        sa.column("description", sa.Text),
+        sa.column("content_hash", sa.String),
+    )
+    seen = set()
+    last_id = None
+    while True:
+        query = sa.select(
+            outages.c.id, outages.c.site_name, outages.c.detected_at, outages.c.description, outages.c.site_id
+        ).order_by(outages.c.id).limit(_BATCH)
+        if last_id is not None:
+            query = query.where(outages.c.id > last_id)
+        rows = bind.execute(query).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            digest = _content_hash(row.site_name, row.detected_at, row.description, row.site_id)
+            if digest in seen:
+                continue
+            seen.add(digest)
+            updates.append({"row_id": row.id, "digest": digest})
+        if updates:
+            bind.execute(
+                outages.update()
+                .where(outages.c.id == sa.bindparam("row_id"))
+                .values(content_hash=sa.bindparam("digest")),
+                updates,
+            )
+        last_id = rows[-1].id
+
+    op.create_index(
+        "uq_outages_content_hash",
+        "outages",
+        ["content_hash"],
+        unique=True,
+        postgresql_where=sa.text("content_hash IS NOT NULL"),
+        sqlite_where=sa.text("content_hash IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_outages_content_hash", table_name="outages")
+    op.drop_column("outages", "content_hash")
@@ -0,0 +1,78 @@
+"""Per-table change counter for outage conditional GETs.
+
+Revision ID: 0029_outage_change_counter
+Revises: 0028_outage_content_hash
+Create Date: 2026-10-19
+
+Adds:
+  - ``table_change_counters`` (table_name, version, changed_at)
+  - Triggers on ``outages`` that bump the ``outages`` counter in the same
+    transaction as every insert, update and delete (statement-level on
+    Postgres, row-level on SQLite)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0029_outage_change_counter"
+down_revision = "0028_outage_content_hash"
+branch_labels = None
+depends_on = None
+
+
+_SQLITE_TRIGGERS = {
+    "outages_change_counter_ai": "AFTER INSERT",
+    "outages_change_counter_au": "AFTER UPDATE",
+    "outages_change_counter_ad": "AFTER DELETE",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "table_change_counters",
+        sa.Column("table_name", sa.String(64), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(
+        "INSERT INTO table_change_counters (table_name, version, changed_at) "
+        "VALUES ('outages', 0, CURRENT_TIMESTAMP)"
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            """
+            CREATE OR REPLACE FUNCTION bump_table_change_counter() RETURNS trigger AS $$
+            BEGIN
+                UPDATE table_change_counters
+                   SET version = version + 1, changed_at = now()
+                 WHERE table_name = TG_TABLE_NAME;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        op.execute(
+            "CREATE TRIGGER outages_change_counter "
+            "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON outages "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_change_counter()"
+        )
+    elif dialect == "sqlite":
+        for name, timing in _SQLITE_TRIGGERS.items():
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {name} {timing} ON outages BEGIN "
+                "UPDATE table_change_counters SET version = version + 1, changed_at = CURRENT_TIMESTAMP "
+                "WHERE table_name = 'outages'; END"
+            )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS outages_change_counter ON outages")
+        op.execute("DROP FUNCTION IF EXISTS bump_table_change_counter()")
+    elif dialect == "sqlite":
+        for name in _SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table("table_change_counters")
@@ -0,0 +1,40 @@
+"""Transactional outbox for post-commit side effects.
+
+Revision ID: 0030_outbox
+Revises: 0029_outage_change_counter
+Create Date: 2026-10-19
+
+Adds:
+  - ``outbox`` (id, topic, payload, status, attempts, created_at,
+    published_at, processed_at, last_error)
+  - ``ix_outbox_status_created`` for the relay's oldest-pending-first scan
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0030_outbox"
+down_revision = "0029_outage_change_counter"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("topic", sa.String(100), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_outbox_status_created", "outbox", ["status", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_status_created", table_name="outbox")
+    op.drop_table("outbox")
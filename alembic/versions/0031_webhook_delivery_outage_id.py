@@ -0,0 +1,72 @@
+"""Index webhook deliveries by outage for trace lookups.
+
+Revision ID: 0031_webhook_delivery_outage_id
+Revises: 0030_outbox
+Create Date: 2026-10-19
+
+Adds:
+  - ``webhook_deliveries.outage_id`` copied from the payload's
+    ``data.outage_id`` (backfilled in batches)
+  - ``ix_webhook_deliveries_outage_id``
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0031_webhook_delivery_outage_id"
+down_revision = "0030_outbox"
+branch_labels = None
+depends_on = None
+
+_BATCH = 1000
+
+
+def _payload_outage_id(payload):
+    try:
+        data = json.loads(payload).get("data")
+    except (TypeError, ValueError, AttributeError):
+        return None
+    outage_id = data.get("outage_id") if isinstance(data, dict) else None
+    return outage_id if isinstance(outage_id, str) else None
+
+
+def upgrade() -> None:
+    op.add_column("webhook_deliveries", sa.Column("outage_id", sa.String(), nullable=True))
+
+    bind = op.get_bind()
+    deliveries = sa.table(
+        "webhook_deliveries",
+        sa.column("id"),
+        sa.column("payload", sa.Text()),
+        sa.column("outage_id", sa.String()),
+    )
+    last_id = None
+    while True:
+        query = sa.select(deliveries.c.id, deliveries.c.payload).order_by(deliveries.c.id).limit(_BATCH)
+        if last_id is not None:
+            query = query.where(deliveries.c.id > last_id)
+        rows = bind.execute(query).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            outage_id = _payload_outage_id(row.payload)
+            if outage_id is not None:
+                updates.append({"delivery_id": row.id, "value": outage_id})
+        if updates:
+            bind.execute(
+                deliveries.update()
+                .where(deliveries.c.id == sa.bindparam("delivery_id"))
+                .values(outage_id=sa.bindparam("value")),
+                updates,
+            )
+        last_id = rows[-1].id
+
+    op.create_index("ix_webhook_deliveries_outage_id", "webhook_deliveries", ["outage_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_deliveries_outage_id", table_name="webhook_deliveries")
+    op.drop_column("webhook_deliveries", "outage_id")
@@ -0,0 +1,100 @@
+"""Closure table and subtree outage rollups for the site hierarchy.
+
+Revision ID: 0032_site_hierarchy_closure
+Revises: 0031_webhook_delivery_outage_id
+Create Date: 2026-10-19
+
+Adds:
+  - ``site_hierarchy`` (created here when no earlier schema has it) and
+    ``site_hierarchy.site_code``, the link to ``outages.site_id``
+  - ``site_hierarchy_closure`` (ancestor_id, descendant_id, depth),
+    backfilled from ``parent_id`` with a recursive CTE
+  - ``site_outage_rollups`` per-node subtree totals (zero rows for
+    existing sites)
+  - ``ix_outages_site_id``
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0032_site_hierarchy_closure"
+down_revision = "0031_webhook_delivery_outage_id"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("site_hierarchy"):
+        op.create_table(
+            "site_hierarchy",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("region", sa.String(), nullable=False),
+            sa.Column("parent_id", sa.Integer(), sa.ForeignKey("site_hierarchy.id"), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_site_hierarchy_id", "site_hierarchy", ["id"])
+        op.create_index("ix_site_hierarchy_name", "site_hierarchy", ["name"])
+        op.create_index("ix_site_hierarchy_region", "site_hierarchy", ["region"])
+    with op.batch_alter_table("site_hierarchy") as batch:
+        batch.add_column(sa.Column("site_code", sa.String(255), nullable=True))
+        batch.create_unique_constraint("uq_site_hierarchy_site_code", ["site_code"])
+
+    op.create_table(
+        "site_hierarchy_closure",
+        sa.Column(
+            "ancestor_id", sa.Integer(), sa.ForeignKey("site_hierarchy.id", ondelete="CASCADE"), primary_key=True
+        ),
+        sa.Column(
+            "descendant_id", sa.Integer(), sa.ForeignKey("site_hierarchy.id", ondelete="CASCADE"), primary_key=True
+        ),
+        sa.Column("depth", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_site_hierarchy_closure_descendant", "site_hierarchy_closure", ["descendant_id", "ancestor_id"]
+    )
+    op.create_table(
+        "site_outage_rollups",
+        sa.Column(
+            "site_id", sa.Integer(), sa.ForeignKey("site_hierarchy.id", ondelete="CASCADE"), primary_key=True
+        ),
+        sa.Column("open_outages", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("violations", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("resolved_outages", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("mttr_total_minutes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_outages_site_id", "outages", ["site_id"])
+
+    op.execute(
+        """
+        INSERT INTO site_hierarchy_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM site_hierarchy
+            UNION ALL
+            SELECT tree.ancestor_id, child.id, tree.depth + 1
+            FROM tree JOIN site_hierarchy child ON child.parent_id = tree.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM tree
+        """
+    )
+
+    # ``site_code`` is new, so no outage is linked to a site yet.
+    op.execute(
+        """
+        INSERT INTO site_outage_rollups
+            (site_id, open_outages, violations, resolved_outages, mttr_total_minutes, updated_at)
+        SELECT id, 0, 0, 0, 0, CURRENT_TIMESTAMP FROM site_hierarchy
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outages_site_id", table_name="outages")
+    op.drop_table("site_outage_rollups")
+    op.drop_index("ix_site_hierarchy_closure_descendant", table_name="site_hierarchy_closure")
+    op.drop_table("site_hierarchy_closure")
+    with op.batch_alter_table("site_hierarchy") as batch:
+        batch.drop_constraint("uq_site_hierarchy_site_code", type_="unique")
+        batch.drop_column("site_code")
@@ -0,0 +1,39 @@
+"""Range index for overlapping-outage queries.
+
+Revision ID: 0033_outage_active_range_index
+Revises: 0032_site_hierarchy_closure
+Create Date: 2026-10-19
+
+Adds:
+  - Postgres: ``btree_gist`` extension and ``ix_outages_active_range``, a
+    GiST index on ``(site_id, tsrange(detected_at, resolved_at))`` with
+    open outages running to ``infinity``
+  - SQLite: nothing; overlap queries use an in-memory interval tree
+"""
+from alembic import op
+
+
+revision = "0033_outage_active_range_index"
+down_revision = "0032_site_hierarchy_closure"
+branch_labels = None
+depends_on = None
+
+
+# Kept in step with ACTIVE_RANGE_SQL in app/repositories/outage_intervals.py.
+# The columns are timestamp without time zone (UTC); tsrange keeps the
+# expression IMMUTABLE, which tstzrange's timestamptz cast is not.
+_ACTIVE_RANGE = (
+    "tsrange(detected_at, CASE WHEN resolved_at IS NULL THEN 'infinity'::timestamp "
+    "ELSE GREATEST(resolved_at, detected_at) END, '[)')"
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.execute(f"CREATE INDEX ix_outages_active_range ON outages USING GIST (site_id, ({_ACTIVE_RANGE}))")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_outages_active_range")
@@ -0,0 +1,119 @@
+"""Typed, indexed outage locations for map viewport queries.
+
+Revision ID: 0034_outage_location_index
+Revises: 0033_outage_active_range_index
+Create Date: 2026-10-19
+
+Adds:
+  - ``outages.latitude``, ``outages.longitude`` and ``outages.geohash``
+    copied from the ``location`` JSON (backfilled in batches)
+  - ``ix_outages_geohash`` (prefix range scans, all backends)
+  - Postgres: ``ix_outages_location_gist``, a GiST index on
+    ``point(longitude, latitude)``
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0034_outage_location_index"
+down_revision = "0033_outage_active_range_index"
+branch_labels = None
+depends_on = None
+
+_BATCH = 1000
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def _geohash(latitude, longitude, precision=12):
+    # Same encoding as app.utils.geohash.encode.
+    lat, lon = [-90.0, 90.0], [-180.0, 180.0]
+    chars, value, bits, even = [], 0, 0, True
+    while len(chars) < precision:
+        bounds, coord = (lon, longitude) if even else (lat, latitude)
+        mid = (bounds[0] + bounds[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            bounds[0] = mid
+        else:
+            value <<= 1
+            bounds[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            value, bits = 0, 0
+    return "".join(chars)
+
+
+def _coordinates(location):
+    if isinstance(location, str):
+        try:
+            location = json.loads(location)
+        except ValueError:
+            return None
+    if not isinstance(location, dict):
+        return None
+    try:
+        return float(location["latitude"]), float(location["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def upgrade() -> None:
+    op.add_column("outages", sa.Column("latitude", sa.Float(), nullable=True))
+    op.add_column("outages", sa.Column("longitude", sa.Float(), nullable=True))
+    op.add_column("outages", sa.Column("geohash", sa.String(12), nullable=True))
+
+    bind = op.get_bind()
+    outages = sa.table(
+        "outages",
+        sa.column("id", sa.String()),
+        sa.column("location", sa.JSON()),
+        sa.column("latitude", sa.Float()),
+        sa.column("longitude", sa.Float()),
+        sa.column("geohash", sa.String()),
+    )
+    last_id = None
+    while True:
+        query = (
+            sa.select(outages.c.id, outages.c.location)
+            .where(outages.c.location.isnot(None))
+            .order_by(outages.c.id)
+            .limit(_BATCH)
+        )
+        if last_id is not None:
+            query = query.where(outages.c.id > last_id)
+        rows = bind.execute(query).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            coordinates = _coordinates(row.location)
+            if coordinates is not None:
+                updates.append(
+                    {"outage_id": row.id, "lat": coordinates[0], "lon": coordinates[1], "hash": _geohash(*coordinates)}
+                )
+        if updates:
+            bind.execute(
+                outages.update()
+                .where(outages.c.id == sa.bindparam("outage_id"))
+                .values(latitude=sa.bindparam("lat"), longitude=sa.bindparam("lon"), geohash=sa.bindparam("hash")),
+                updates,
+            )
+        last_id = rows[-1].id
+
+    op.create_index("ix_outages_geohash", "outages", ["geohash"])
+    if bind.dialect.name == "postgresql":
+        op.execute("CREATE INDEX ix_outages_location_gist ON outages USING GIST (point(longitude, latitude))")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_outages_location_gist")
+    op.drop_index("ix_outages_geohash", table_name="outages")
+    with op.batch_alter_table("outages") as batch:
+        batch.drop_column("geohash")
+        batch.drop_column("longitude")
+        batch.drop_column("latitude")
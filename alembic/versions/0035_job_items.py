@@ -0,0 +1,47 @@
+"""Append-only per-item results for bulk jobs.
+
+Revision ID: 0035_job_items
+Revises: 0034_outage_location_index
+Create Date: 2026-10-19
+
+Adds:
+  - ``job_items`` (one row per processed item of a bulk job) with
+    ``ix_job_items_job_id_id`` (keyset listing) and
+    ``ix_job_items_job_id_status_id`` (listing by status, aggregates)
+
+Existing ``jobs.partial_results`` / ``jobs.per_item_errors`` are left in
+place for jobs that finished before this revision.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0035_job_items"
+down_revision = "0034_outage_location_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_items",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), autoincrement=True, nullable=False),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("item_id", sa.String(length=255), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("flagged", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_job_items_job_id_id", "job_items", ["job_id", "id"])
+    op.create_index("ix_job_items_job_id_status_id", "job_items", ["job_id", "status", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_items_job_id_status_id", table_name="job_items")
+    op.drop_index("ix_job_items_job_id_id", table_name="job_items")
+    op.drop_table("job_items")
@@ -0,0 +1,125 @@
+"""Range-partition jobs by finished month for partition-drop retention.
+
+Revision ID: 0036_jobs_retention_partitions
+Revises: 0035_job_items
+Create Date: 2026-10-19
+
+Adds:
+  - ``jobs.retention_month`` (first day of the ``finished_at`` month;
+    9999-12-01 for unfinished jobs), backfilled from ``finished_at``
+  - Postgres: ``jobs`` rebuilt as a table partitioned by range on
+    ``retention_month`` with partitions ``jobs_pYYYYMM`` (every month that
+    has jobs, through three months ahead), ``jobs_open``, ``jobs_retained``
+    and ``jobs_default``
+
+On Postgres the primary key becomes ``(id, retention_month)`` and unique
+indexes gain ``retention_month`` (a partitioned table cannot enforce
+uniqueness without its key), so ``job_items.job_id`` loses its foreign key;
+retention deletes the items of a dropped partition explicitly.  The copy
+runs in one statement; schedule it in a maintenance window on large tables.
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0036_jobs_retention_partitions"
+down_revision = "0035_job_items"
+branch_labels = None
+depends_on = None
+
+_OPEN = "9999-12-01"
+_MONTHS_AHEAD = 3
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _index_defs(bind, table):
+    # Read before the table is renamed, so the definitions name ``jobs``.
+    rows = bind.execute(sa.text(
+        "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :t"
+    ), {"t": table}).all()
+    return [(name, definition) for name, definition in rows if not name.endswith("_pkey")]
+
+
+def _partition_jobs(bind) -> None:
+    indexes = _index_defs(bind, "jobs")
+    op.execute("ALTER TABLE jobs RENAME TO jobs_unpartitioned")
+    op.execute(
+        "CREATE TABLE jobs (LIKE jobs_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (retention_month)"
+    )
+    op.execute(f"CREATE TABLE jobs_open PARTITION OF jobs FOR VALUES FROM ('{_OPEN}') TO (MAXVALUE)")
+    op.execute("CREATE TABLE jobs_retained PARTITION OF jobs FOR VALUES FROM (MINVALUE) TO ('0001-02-01')")
+    op.execute("CREATE TABLE jobs_default PARTITION OF jobs DEFAULT")
+
+    first = bind.execute(sa.text(
+        f"SELECT min(retention_month) FROM jobs_unpartitioned WHERE retention_month <> '{_OPEN}'"
+    )).scalar()
+    today = date.today()
+    month = first or date(today.year, today.month, 1)
+    last = _add_months(date(today.year, today.month, 1), _MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE jobs_p{month.year:04d}{month.month:02d} PARTITION OF jobs "
+            f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')"
+        )
+        month = _add_months(month, 1)
+
+    op.execute("INSERT INTO jobs SELECT * FROM jobs_unpartitioned")
+    # CASCADE drops the job_items foreign key along with the old table.
+    op.execute("DROP TABLE jobs_unpartitioned CASCADE")
+    op.execute("ALTER TABLE jobs ADD PRIMARY KEY (id, retention_month)")
+    for _name, definition in indexes:
+        if definition.startswith("CREATE UNIQUE INDEX"):
+            definition = definition[:-1] + ", retention_month)"
+        op.execute(definition)
+
+
+def _unpartition_jobs(bind) -> None:
+    indexes = _index_defs(bind, "jobs")
+    op.execute("ALTER TABLE jobs RENAME TO jobs_partitioned")
+    op.execute("CREATE TABLE jobs (LIKE jobs_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    op.execute("INSERT INTO jobs SELECT * FROM jobs_partitioned")
+    op.execute("DROP TABLE jobs_partitioned CASCADE")
+    op.execute("ALTER TABLE jobs ADD PRIMARY KEY (id)")
+    for _name, definition in indexes:
+        op.execute(definition.replace(", retention_month)", ")"))
+    op.execute(
+        "DELETE FROM job_items WHERE NOT EXISTS (SELECT 1 FROM jobs WHERE jobs.id = job_items.job_id)"
+    )
+    op.create_foreign_key(
+        "job_items_job_id_fkey", "job_items", "jobs", ["job_id"], ["id"], ondelete="CASCADE"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.add_column(
+        "jobs",
+        sa.Column("retention_month", sa.Date(), nullable=False, server_default=sa.text(f"'{_OPEN}'")),
+    )
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "UPDATE jobs SET retention_month = date_trunc('month', finished_at)::date "
+            "WHERE finished_at IS NOT NULL"
+        )
+        _partition_jobs(bind)
+    else:
+        # SQLite keeps a plain table; the key is maintained for parity.
+        op.execute(
+            "UPDATE jobs SET retention_month = strftime('%Y-%m-01', finished_at) "
+            "WHERE finished_at IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        _unpartition_jobs(bind)
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_column("retention_month")
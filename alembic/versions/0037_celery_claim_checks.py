@@ -0,0 +1,35 @@
+"""Claim-check storage for large Celery messages and results.
+
+Revision ID: 0037_celery_claim_checks
+Revises: 0036_jobs_retention_partitions
+Create Date: 2026-10-19
+
+Adds:
+  - ``celery_claim_checks`` (id, data, size_bytes, created_at, expires_at)
+  - ``ix_celery_claim_checks_expires_at`` for the purge of expired bodies
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0037_celery_claim_checks"
+down_revision = "0036_jobs_retention_partitions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "celery_claim_checks",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_celery_claim_checks_expires_at", "celery_claim_checks", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_celery_claim_checks_expires_at", table_name="celery_claim_checks")
+    op.drop_table("celery_claim_checks")
@@ -0,0 +1,105 @@
+"""Lock-free outage change version on Postgres.
+
+Revision ID: 0038_outage_change_sequence
+Revises: 0037_celery_claim_checks
+Create Date: 2026-10-19
+
+Adds:
+  - Postgres: sequences ``outages_change_seq`` (the version) and
+    ``outages_changed_at_seq`` (epoch microseconds of the last change),
+    seeded from ``table_change_counters``
+  - Postgres: deferred constraint trigger ``outages_change_counter`` that
+    advances them once per committing transaction, plus a TRUNCATE trigger;
+    the row-locking statement trigger of 0029 is dropped
+  - SQLite: nothing; its writers are serialized anyway and keep the 0029
+    triggers
+
+Sequence calls are non-transactional and never wait, so concurrent outage
+writers no longer queue on the ``outages`` counter row until commit.  The
+constraint trigger is row-level and fires at commit: every written row
+queues one after-trigger event, and all but the first return immediately.
+"""
+from alembic import op
+
+
+revision = "0038_outage_change_sequence"
+down_revision = "0037_celery_claim_checks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS outages_change_counter ON outages")
+    op.execute("DROP FUNCTION IF EXISTS bump_table_change_counter()")
+    op.execute("CREATE SEQUENCE outages_change_seq")
+    op.execute("CREATE SEQUENCE outages_changed_at_seq")
+    op.execute(
+        "SELECT setval('outages_change_seq', version + 1, false), "
+        "setval('outages_changed_at_seq', (extract(epoch FROM COALESCE(changed_at, now())) * 1000000)::bigint) "
+        "FROM table_change_counters WHERE table_name = 'outages'"
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_table_change_sequence() RETURNS trigger AS $$
+        DECLARE
+            flag text := 'nociq.' || TG_TABLE_NAME || '_changed';
+        BEGIN
+            -- Once per transaction: the flag is transaction-local.
+            IF current_setting(flag, true) IS DISTINCT FROM 'on' THEN
+                PERFORM set_config(flag, 'on', true);
+                PERFORM nextval(TG_TABLE_NAME || '_change_seq');
+                PERFORM setval(
+                    TG_TABLE_NAME || '_changed_at_seq',
+                    (extract(epoch FROM clock_timestamp()) * 1000000)::bigint
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE CONSTRAINT TRIGGER outages_change_counter "
+        "AFTER INSERT OR UPDATE OR DELETE ON outages "
+        "DEFERRABLE INITIALLY DEFERRED "
+        "FOR EACH ROW EXECUTE FUNCTION bump_table_change_sequence()"
+    )
+    op.execute(
+        "CREATE TRIGGER outages_change_counter_truncate "
+        "AFTER TRUNCATE ON outages "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_change_sequence()"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS outages_change_counter_truncate ON outages")
+    op.execute("DROP TRIGGER IF EXISTS outages_change_counter ON outages")
+    op.execute("DROP FUNCTION IF EXISTS bump_table_change_sequence()")
+    op.execute(
+        "UPDATE table_change_counters SET version = (SELECT last_value FROM outages_change_seq), "
+        "changed_at = to_timestamp((SELECT last_value FROM outages_changed_at_seq) / 1000000.0) "
+        "WHERE table_name = 'outages'"
+    )
+    op.execute("DROP SEQUENCE IF EXISTS outages_changed_at_seq")
+    op.execute("DROP SEQUENCE IF EXISTS outages_change_seq")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_table_change_counter() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_change_counters
+               SET version = version + 1, changed_at = now()
+             WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER outages_change_counter "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON outages "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_change_counter()"
+    )
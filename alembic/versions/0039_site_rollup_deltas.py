@@ -0,0 +1,39 @@
+"""Queued site rollup deltas.
+
+Revision ID: 0039_site_rollup_deltas
+Revises: 0038_outage_change_sequence
+Create Date: 2026-10-19
+
+Adds:
+  - ``site_rollup_deltas`` (id, site_code, open_outages, violations,
+    resolved_outages, mttr_total_minutes, created_at): outage writes append
+    here instead of updating every ancestor rollup in their transaction
+  - ``ix_site_rollup_deltas_site_code``
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0039_site_rollup_deltas"
+down_revision = "0038_outage_change_sequence"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "site_rollup_deltas",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True),
+        sa.Column("site_code", sa.String(255), nullable=False),
+        sa.Column("open_outages", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("violations", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("resolved_outages", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("mttr_total_minutes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_site_rollup_deltas_site_code", "site_rollup_deltas", ["site_code"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_site_rollup_deltas_site_code", table_name="site_rollup_deltas")
+    op.drop_table("site_rollup_deltas")
@@ -0,0 +1,82 @@
+"""Rowid-keyed outage search rows and an id prefix index.
+
+Revision ID: 0040_outage_search_rowid
+Revises: 0039_site_rollup_deltas
+Create Date: 2026-10-19
+
+Adds:
+  - Postgres: ``ix_outages_id_pattern`` (``id text_pattern_ops``) so id
+    prefix lookups are index range scans under any collation
+  - SQLite: ``outages_search`` rebuilt with each row's rowid equal to the
+    outage's rowid; the sync triggers update and delete by rowid instead
+    of scanning the FTS table for ``id``
+"""
+from alembic import op
+
+
+revision = "0040_outage_search_rowid"
+down_revision = "0039_site_rollup_deltas"
+branch_labels = None
+depends_on = None
+
+
+_SQLITE_TRIGGERS = ("outages_search_ai", "outages_search_ad", "outages_search_au")
+
+# Kept in step with SQLITE_SEARCH_DDL in app/repositories/outage_search.py.
+_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS outages_search "
+    "USING fts5(id, site_id, site_name, tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS outages_search_ai AFTER INSERT ON outages BEGIN
+        INSERT INTO outages_search(rowid, id, site_id, site_name)
+        VALUES (new.rowid, new.id, new.site_id, new.site_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS outages_search_ad AFTER DELETE ON outages BEGIN
+        DELETE FROM outages_search WHERE rowid = old.rowid AND id = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS outages_search_au AFTER UPDATE OF id, site_id, site_name ON outages BEGIN
+        DELETE FROM outages_search WHERE rowid = old.rowid AND id = old.id;
+        INSERT INTO outages_search(rowid, id, site_id, site_name)
+        VALUES (new.rowid, new.id, new.site_id, new.site_name);
+    END""",
+    "INSERT INTO outages_search(rowid, id, site_id, site_name) SELECT rowid, id, site_id, site_name FROM outages",
+)
+
+_SQLITE_DDL_0027 = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS outages_search "
+    "USING fts5(id, site_id, site_name, tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS outages_search_ai AFTER INSERT ON outages BEGIN
+        INSERT INTO outages_search(id, site_id, site_name) VALUES (new.id, new.site_id, new.site_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS outages_search_ad AFTER DELETE ON outages BEGIN
+        DELETE FROM outages_search WHERE id = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS outages_search_au AFTER UPDATE OF id, site_id, site_name ON outages BEGIN
+        DELETE FROM outages_search WHERE id = old.id;
+        INSERT INTO outages_search(id, site_id, site_name) VALUES (new.id, new.site_id, new.site_name);
+    END""",
+    "INSERT INTO outages_search(id, site_id, site_name) SELECT id, site_id, site_name FROM outages",
+)
+
+
+def _rebuild_sqlite(ddl) -> None:
+    for trigger in _SQLITE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS outages_search")
+    for statement in ddl:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE INDEX ix_outages_id_pattern ON outages (id text_pattern_ops)")
+    elif dialect == "sqlite":
+        _rebuild_sqlite(_SQLITE_DDL)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_outages_id_pattern")
+    elif dialect == "sqlite":
+        _rebuild_sqlite(_SQLITE_DDL_0027)
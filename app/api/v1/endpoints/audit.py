@@ -5,8 +5,9 @@ from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.services.audit_log import audit_log, BridgeOutcomeClass
-from app.services.trace import build_trace_chain
-from app.schemas.trace import TraceChain
+from app.services.trace import build_trace_chain, load_trace_chains
+from app.schemas.trace import TraceBatchRequest, TraceBatchResponse, TraceChain
+from app.core.config import settings
 from app.core.security import require_admin
 
 router = APIRouter(prefix="/audit", tags=["audit"])
@@ -114,3 +115,45 @@ def get_trace(
     )
 
     return chain
+
+
+@router.post("/trace/batch", response_model=TraceBatchResponse)
+def get_trace_batch(
+    payload: TraceBatchRequest,
+    current_user=Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Return trace chains for many outages at once.
+
+    Built with one query per entity type regardless of how many outages are
+    requested, so incident views covering hundreds of outages do not issue a
+    trace request per row. Chains of fully settled outages are cached.
+
+    At most `TRACE_BATCH_MAX_OUTAGES` distinct ids per call (400 otherwise).
+    Access is audit-logged once per call, like `GET /audit/trace`.
+    """
+    outage_ids = list(dict.fromkeys(payload.outage_ids))
+    if len(outage_ids) > settings.TRACE_BATCH_MAX_OUTAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.TRACE_BATCH_MAX_OUTAGES} outage ids may be traced per request",
+        )
+
+    chains = load_trace_chains(db, outage_ids)
+    response = TraceBatchResponse(
+        traces=[chains[oid] for oid in outage_ids if oid in chains],
+        missing=[oid for oid in outage_ids if oid not in chains],
+    )
+
+    actor_email = getattr(current_user, "email", "unknown")
+    audit_log.log(
+        "trace.batch_accessed",
+        details={
+            "outage_ids": outage_ids,
+            "found": len(response.traces),
+            "missing": response.missing,
+            "actor": actor_email,
+        },
+    )
+
+    return response
@@ -1,10 +1,11 @@
 import json
+import os
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from celery.result import AsyncResult
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -19,15 +20,17 @@ from app.models.job import (
     JobType,
     RetryClass,
 )
+from app.repositories import job_items
+from app.services import export_artifacts, job_leases, job_progress
 from app.services.audit_log import audit_log
 from app.services.job_cleanup import (
     JobCleanupService,
     get_retry_policy,
-    heartbeat_job,
     reclaim_stale_leases,
 )
 from app.services.metrics import increment_counter, timer
 from app.tasks.celery_app import celery_app
+from app.tasks.export_tasks import enqueue_export, redispatch_export
 from app.tasks.sla_tasks import enqueue_sla_computation, enqueue_bulk_sla_computation
 from app.tasks.webhook_tasks import dispatch_webhook_delivery
 from app.utils.correlation import get_correlation_id
@@ -54,6 +57,12 @@ class BulkSLAJobRequest(BaseModel):
     period: str
 
 
+class ExportJobRequest(BaseModel):
+    dataset: str  # "outages" | "sla" | "payments"
+    format: str = "json"  # "json" | "csv"
+    filters: Dict[str, Any] = {}
+
+
 class JobResponse(BaseModel):
     id: UUID
     celery_task_id: str
@@ -143,6 +152,7 @@ class JobCleanupResponse(BaseModel):
     deleted_by_status: dict
     cutoffs: dict
     dry_run: bool
+    partitions_dropped: List[str] = []
 
 
 # BE-W5-047: Lease reclamation
@@ -157,6 +167,7 @@ class LeaseReclamationResponse(BaseModel):
     reclaimed: int
     dry_run: bool
     checked_at: str
+    batches: int = 0
 
 
 # BE-W5-052: Audit-critical cleanup
@@ -290,32 +301,6 @@ def _get_job_or_404(db: Session, job_id: UUID) -> Job:
     return job
 
 
-def _sync_job_status_from_celery(db: Session, job: Job) -> Job:
-    """Pull latest status from Celery backend for in-progress jobs."""
-    if job.status in (JobStatus.SUCCESS, JobStatus.FAILURE, JobStatus.REVOKED,
-                       JobStatus.DEAD_LETTER, JobStatus.QUARANTINED):
-        return job
-
-    task_result: AsyncResult = AsyncResult(job.celery_task_id, app=celery_app)
-    celery_state = task_result.state
-
-    state_map = {
-        "PENDING": JobStatus.PENDING,
-        "STARTED": JobStatus.STARTED,
-        "SUCCESS": JobStatus.SUCCESS,
-        "FAILURE": JobStatus.FAILURE,
-        "REVOKED": JobStatus.REVOKED,
-    }
-
-    new_status = state_map.get(celery_state, job.status)
-    if new_status != job.status:
-        job.status = new_status
-        db.commit()
-        db.refresh(job)
-
-    return job
-
-
 # --------------------------------------------------------------------------- #
 # Endpoints                                                                    #
 # --------------------------------------------------------------------------- #
@@ -417,6 +402,64 @@ def submit_bulk_sla_computation(
         return _serialize_job(job)
 
 
+@router.post(
+    "/exports",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def submit_export(
+    payload: ExportJobRequest,
+    request: Request,
+    current_user=Depends(require_engineer),
+    db: Session = Depends(get_db),
+):
+    """Enqueue an async export of outages, SLA results or payments.
+
+    Identical in-flight requests are deduplicated and return the existing job.
+    Poll ``/jobs/{job_id}/progress`` and fetch the artifact from
+    ``/jobs/{job_id}/download`` once the job succeeds.
+    """
+    correlation_id = get_correlation_id()
+    dataset = payload.dataset.lower()
+    export_format = payload.format.lower()
+
+    try:
+        export_artifacts.validate_export_request(dataset, export_format)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    logger.info(
+        "Submitting export job",
+        dataset=dataset,
+        format=export_format,
+        correlation_id=correlation_id,
+    )
+
+    with timer("job_submission_duration", {"job_type": "export"}):
+        increment_counter("jobs_submitted", tags={"job_type": "export"})
+        job = enqueue_export(
+            db,
+            dataset=dataset,
+            format=export_format,
+            filters=payload.filters,
+            correlation_id=correlation_id,
+        )
+
+        if job.retry_class is None:
+            policy = get_retry_policy(JobType.EXPORT.value)
+            job.retry_class = str(policy.get("retry_class", "exponential_backoff"))
+            db.commit()
+            db.refresh(job)
+
+        logger.info(
+            "Export job submitted",
+            job_id=str(job.id),
+            celery_task_id=job.celery_task_id,
+            correlation_id=correlation_id,
+        )
+        return _serialize_job(job)
+
+
 @router.get("", response_model=List[JobResponse])
 def list_jobs(
     job_type: Optional[JobType] = Query(None),
@@ -440,9 +483,12 @@ def get_job(
     current_user=Depends(require_engineer),
     db: Session = Depends(get_db),
 ):
-    """Get a single job's status. Syncs status from Celery for in-progress jobs."""
+    """Get a single job's status.
+
+    Reads the jobs row only; task states reach it through the background
+    synchronizer (``app.services.job_state_sync``).
+    """
     job = _get_job_or_404(db, job_id)
-    job = _sync_job_status_from_celery(db, job)
     return _serialize_job(job)
 
 
@@ -455,7 +501,6 @@ def get_job_envelope(
 ):
     """Get a single job wrapped in the standardised result envelope (BE-W5-050)."""
     job = _get_job_or_404(db, job_id)
-    job = _sync_job_status_from_celery(db, job)
     return _serialize_envelope(job)
 
 
@@ -476,19 +521,150 @@ def get_job_progress(
     current_user=Depends(require_engineer),
     db: Session = Depends(get_db),
 ):
-    """Lightweight polling endpoint returning only progress fields."""
+    """Lightweight polling endpoint returning only progress fields.
+
+    While the job runs, progress comes from the live Redis snapshot (every
+    update, not just the coalesced row writes); otherwise, or when the row
+    is ahead of it, from the jobs row.
+    """
     job = _get_job_or_404(db, job_id)
-    job = _sync_job_status_from_celery(db, job)
+    progress = job.progress
+    progress_details = job.progress_details
+    if job.status in (JobStatus.PENDING, JobStatus.STARTED):
+        snapshot = job_progress.read_snapshot(job.celery_task_id)
+        if snapshot and (snapshot.get("progress") or 0.0) >= (progress or 0.0):
+            progress = snapshot["progress"]
+            progress_details = snapshot.get("progress_details") or progress_details
     return JobProgressResponse(
         id=job.id,
         status=job.status,
-        progress=job.progress,
-        progress_details=job.progress_details,
+        progress=progress,
+        progress_details=progress_details,
         partial_results=job.partial_results,
         per_item_errors=job.per_item_errors,
     )
 
 
+class JobItemResponse(BaseModel):
+    id: int
+    item_id: str
+    status: str
+    flagged: bool = False
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class JobItemPageResponse(BaseModel):
+    items: List[JobItemResponse]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+@router.get("/{job_id}/items", response_model=JobItemPageResponse)
+def list_job_items(
+    job_id: UUID,
+    item_status: Optional[str] = Query(None, alias="status", description="`success` or `error`"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user=Depends(require_engineer),
+    db: Session = Depends(get_db),
+):
+    """Page through a bulk job's per-item results and errors (keyset on item row id)."""
+    job = _get_job_or_404(db, job_id)
+    if cursor is not None and not cursor.isdigit():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    try:
+        rows, next_after = job_items.list_items(
+            db, job.id, status=item_status, after=int(cursor) if cursor else None, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return JobItemPageResponse(
+        items=[JobItemResponse.model_validate(row) for row in rows],
+        next_cursor=str(next_after) if next_after is not None else None,
+        has_more=next_after is not None,
+    )
+
+
+@router.get("/{job_id}/download")
+def download_export_artifact(
+    job_id: UUID,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    current_user=Depends(require_engineer),
+    db: Session = Depends(get_db),
+):
+    """Download a finished export artifact.
+
+    The body is the stored gzip stream (``Content-Encoding: gzip``).  A single
+    ``Range: bytes=start-end`` request is honoured with 206 so interrupted
+    downloads can resume.
+    """
+    job = _get_job_or_404(db, job_id)
+    if job.job_type != JobType.EXPORT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only export jobs have downloadable artifacts.",
+        )
+    if job.status != JobStatus.SUCCESS:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export is not ready (status '{job.status.value}').",
+        )
+
+    result = json.loads(job.result) if job.result else {}
+    try:
+        path = export_artifacts.artifact_path(result.get("artifact", ""))
+    except ValueError:
+        path = ""
+    if not path or not os.path.isfile(path):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Export artifact is no longer available.",
+        )
+
+    size = os.path.getsize(path)
+    media_type = "text/csv" if result.get("format") == "csv" else "application/json"
+    filename = f"{result.get('dataset', 'export')}-{job.id}.{result.get('format', 'json')}"
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Encoding": "gzip",
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+    if result.get("sha256"):
+        headers["ETag"] = f'"{result["sha256"]}"'
+
+    try:
+        byte_range = export_artifacts.parse_byte_range(range_header, size)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail=str(exc),
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    increment_counter("export_downloads", tags={"partial": str(byte_range is not None).lower()})
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(
+            export_artifacts.iter_file_range(path, 0, size - 1),
+            media_type=media_type,
+            headers=headers,
+        )
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        export_artifacts.iter_file_range(path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
 def cancel_job(
     job_id: UUID,
@@ -654,6 +830,7 @@ def retry_job(
                 device_id=payload.get("device_id", ""),
                 period=payload.get("period", ""),
                 correlation_id=correlation_id,
+                dedupe=False,
             )
         elif job.job_type == JobType.BULK_SLA_COMPUTATION:
             new_task = enqueue_bulk_sla_computation(
@@ -661,6 +838,20 @@ def retry_job(
                 device_ids=payload.get("device_ids", []),
                 period=payload.get("period", ""),
                 correlation_id=correlation_id,
+                dedupe=False,
+            )
+        elif job.job_type == JobType.EXPORT:
+            job = redispatch_export(db, job, correlation_id=correlation_id)
+
+            return JobRetryResponse(
+                id=job.id,
+                celery_task_id=job.celery_task_id,
+                job_type=job.job_type,
+                status=job.status,
+                retry_count=job.retry_count,
+                max_retries=job.max_retries,
+                retry_class=job.retry_class,
+                message=f"Job retry #{job.retry_count} initiated successfully",
             )
         elif job.job_type == JobType.WEBHOOK_DISPATCH:
             from app.tasks.webhook_tasks import dispatch_webhook_delivery
@@ -789,7 +980,8 @@ def record_job_heartbeat(
 ):
     """Record a lease heartbeat for a running job (BE-W5-047).
 
-    Internal endpoint used by workers to extend their lease on a job.
+    Internal endpoint used by workers to extend their lease on a job.  The
+    heartbeat is buffered in Redis and reaches the job row on the next flush.
     """
     job = _get_job_or_404(db, job_id)
     if job.status not in (JobStatus.STARTED, JobStatus.PENDING):
@@ -798,18 +990,18 @@ def record_job_heartbeat(
             detail=f"Cannot heartbeat a job with status '{job.status.value}'.",
         )
 
-    updated = heartbeat_job(
+    heartbeat_at = job_leases.record_heartbeat(
         db,
         job.celery_task_id,
         worker_id,
         timeout_seconds=cfg.JOB_LEASE_TIMEOUT_SECONDS,
     )
-    if not updated:
+    if not heartbeat_at:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update heartbeat.",
         )
-    return {"job_id": str(job_id), "heartbeat_at": updated.heartbeat_at.isoformat()}
+    return {"job_id": str(job_id), "heartbeat_at": heartbeat_at.isoformat()}
 
 
 @router.post("/reclaim-stale-leases", response_model=LeaseReclamationResponse)
@@ -1054,6 +1246,7 @@ def release_job_from_quarantine(
                 device_id=payload.get("device_id", ""),
                 period=payload.get("period", ""),
                 correlation_id=correlation_id,
+                dedupe=False,
             )
         elif job.job_type == JobType.BULK_SLA_COMPUTATION:
             new_task = enqueue_bulk_sla_computation(
@@ -1061,6 +1254,18 @@ def release_job_from_quarantine(
                 device_ids=payload.get("device_ids", []),
                 period=payload.get("period", ""),
                 correlation_id=correlation_id,
+                dedupe=False,
+            )
+        elif job.job_type == JobType.EXPORT:
+            job = redispatch_export(db, job, correlation_id=correlation_id)
+            return JobReleaseResponse(
+                job_id=job.id,
+                celery_task_id=job.celery_task_id,
+                job_type=job.job_type,
+                status=job.status,
+                retry_count=job.retry_count,
+                max_retries=job.max_retries,
+                message="Released from quarantine and re-dispatched.",
             )
         elif job.job_type == JobType.WEBHOOK_DISPATCH:
             from app.tasks.webhook_tasks import dispatch_webhook_delivery
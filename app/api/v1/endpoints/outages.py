@@ -1,22 +1,26 @@
 from typing import List
-import csv
-import io
-import json
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
+from app.db.unit_of_work import UnitOfWork
 from app.models import BulkOutageCreate, Outage, OutageCreate, OutageUpdate
 from app.models.enums import OutageStatus, Severity
-from app.models.outage import PaginatedOutages, ResolveOutageRequest
+from app.models.outage import (
+    OutageConcurrencyPeak,
+    OutageMapResponse,
+    OutageSearchHit,
+    PaginatedOutages,
+    ResolveOutageRequest,
+)
 from app.models.outage_dto import (
     OutageSortDirection,
     OutageSortField,
     ImportConsistency,
-    ImportFieldError,
     ImportRowResult,
     ImportResponse,
 )
@@ -28,8 +32,12 @@ from app.repositories.sla_repository import SLARepository
 from app.core.outage_state_machine import OutageStateMachine
 from app.services.audit_log import audit_log
 from app.services.contracts import SLAContractAdapter, translate_contract_result
-from app.services.webhook_service import trigger_sla_violation_webhooks
+from app.services import outage_cache, outbox
+from app.services.outage_import import OutageImportEngine
+from app.services.trace import invalidate_trace
+from app.utils import geohash
 from app.utils.exporter import export_outages
+from app.utils.import_stream import ImportFormatError, open_import_parser
 from app.api.v1.endpoints.sla import _invalidate_analytics_cache
 from app.core.security import require_engineer, require_admin
 from app.core.config import settings
@@ -71,6 +79,11 @@ def export_outages_endpoint(
     return exported
 
 
+def _invalidate_outage(outage_id: str) -> None:
+    outage_cache.invalidate(outage_id)
+    invalidate_trace(outage_id)
+
+
 @router.get("/violations")
 def list_violations(current_user=Depends(require_engineer), db: Session = Depends(get_db)):
     repo = OutageRepository(db)
@@ -79,6 +92,8 @@ def list_violations(current_user=Depends(require_engineer), db: Session = Depend
 
 @router.get("/", response_model=PaginatedOutages)
 def list_outages(
+    request: Request,
+    response: Response,
     severity: Severity | None = None,
     status: OutageStatus | None = None,
     search: str | None = None,
@@ -95,6 +110,14 @@ def list_outages(
         default=OutageSortDirection.desc,
         description="Sort direction (enum). Supported: asc, desc. Invalid values rejected with 422. Default: desc.",
     ),
+    cursor: str | None = Query(
+        default=None,
+        description="Opaque keyset cursor (`next_cursor` from the previous page). Takes precedence over `page`.",
+    ),
+    exact_total: bool = Query(
+        default=False,
+        description="Count `total` exactly. Otherwise it may be a planner estimate or a briefly cached count.",
+    ),
     current_user=Depends(require_engineer),
     db: Session = Depends(get_db),
 ):
@@ -115,9 +138,20 @@ def list_outages(
       - id: Unique outage identifier
     - Default sorting: detected_at descending, then id ascending (stable, deterministic)
     - Invalid sort values: rejected with 422 validation error
+
+    **Keyset pagination**
+    - Every page returns `next_cursor`/`has_more`; pass `cursor` to fetch the
+      next page without an OFFSET scan. A cursor is bound to its sort field
+      and direction; a mismatched or malformed cursor is rejected with 400.
+    - `total` is exact only with `exact_total=true`; otherwise
+      `total_is_estimate` tells whether it is approximate.
+
+    **Conditional GET**
+    - Responses carry an `ETag` derived from the outages table version and
+      the query; a matching `If-None-Match` returns 304 without running it.
     """
     repo = OutageRepository(db)
-    return repo.list(
+    query_params = dict(
         severity=severity,
         status=status,
         search=search,
@@ -127,7 +161,98 @@ def list_outages(
         page_size=page_size,
         sort_by=sort_by,
         sort_direction=sort_direction,
+        cursor=cursor,
+        exact_total=exact_total,
     )
+    validators = outage_cache.list_validators(repo, query_params)
+    headers = outage_cache.validator_headers(**validators)
+    if outage_cache.is_not_modified(request.headers, **validators):
+        return Response(status_code=304, headers=headers)
+    try:
+        result = repo.list(**query_params)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    response.headers.update(headers)
+    return result
+
+
+@router.get("/search", response_model=List[OutageSearchHit])
+def search_outages(
+    q: str = Query(..., min_length=1, max_length=255, description="Outage id, site id or site name fragment"),
+    limit: int = Query(default=20, ge=1, le=100),
+    current_user=Depends(require_engineer),
+    db: Session = Depends(get_db),
+):
+    """Ranked search over outage id, site_id and site_name.
+
+    An exact id match is returned first, then ids starting with `q`, then
+    substring matches ranked by the trigram (Postgres) or FTS5 (SQLite)
+    index. Each hit reports which of these it is in `match`.
+    """
+    term = q.strip()
+    if not term:
+        raise HTTPException(status_code=400, detail="Search term must not be blank")
+    return OutageRepository(db).search(term, limit=limit)
+
+
+@router.get("/map", response_model=OutageMapResponse)
+def outage_map(
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(default=10, ge=0, le=22, description="Map zoom level; sets the cluster cell size"),
+    cluster: bool | None = Query(
+        default=None, description="Force clusters (true) or points (false); by default decided by count"
+    ),
+    status: OutageStatus | None = None,
+    current_user=Depends(require_engineer),
+    db: Session = Depends(get_db),
+):
+    """Outages inside a map viewport, as points or as per-cell clusters.
+
+    The viewport filter uses the location index (Postgres GiST, geohash
+    prefixes elsewhere). Unless `cluster` is given, outages are listed when
+    at most `OUTAGE_MAP_MAX_POINTS` fall in the viewport and clustered by
+    geohash cell for the zoom level otherwise. A `west` greater than `east`
+    crosses the antimeridian.
+    """
+    if south > north:
+        raise HTTPException(status_code=400, detail="south must not be greater than north")
+    bbox = (south, west, north, east)
+    repo = OutageRepository(db)
+    total = repo.count_in_viewport(bbox, status=status)
+    if cluster is None:
+        cluster = total > settings.OUTAGE_MAP_MAX_POINTS
+    if not cluster:
+        outages = repo.in_viewport(bbox, status=status, limit=settings.OUTAGE_MAP_MAX_POINTS)
+        return OutageMapResponse(mode="points", total=total, outages=outages)
+    precision = geohash.precision_for_zoom(zoom)
+    clusters = repo.cluster_viewport(bbox, precision, status=status)
+    return OutageMapResponse(mode="clusters", total=total, precision=precision, clusters=clusters)
+
+
+@router.get("/concurrency", response_model=List[OutageConcurrencyPeak])
+def outage_concurrency_profile(
+    start: datetime = Query(..., description="Window start (inclusive)"),
+    end: datetime = Query(..., description="Window end (exclusive)"),
+    site_id: str | None = Query(default=None, description="Restrict to one site"),
+    current_user=Depends(require_engineer),
+    db: Session = Depends(get_db),
+):
+    """Peak number of concurrently active outages per site per UTC day.
+
+    Outages are active from `detected_at` until `resolved_at` (open outages
+    until the window end). Computed with a sweep line over the outages
+    overlapping the window; site-days without an active outage are omitted.
+    The window may span at most `OUTAGE_CONCURRENCY_MAX_DAYS` days (400
+    otherwise).
+    """
+    try:
+        peaks = OutageRepository(db).concurrency_profile(start, end, site_id=site_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return [OutageConcurrencyPeak(**vars(peak)) for peak in peaks]
 
 
 @router.get("/deleted", response_model=PaginatedOutages)
@@ -148,12 +273,16 @@ def list_deleted_outages(
 
 
 @router.get("/{outage_id}", response_model=Outage)
-def get_outage(outage_id: str, current_user=Depends(require_engineer), db: Session = Depends(get_db)):
-    repo = OutageRepository(db)
-    outage = repo.get(outage_id)
-    if not outage:
+def get_outage(outage_id: str, request: Request, current_user=Depends(require_engineer), db: Session = Depends(get_db)):
+    # Read-through cache with ETag/Last-Modified validators; an unchanged
+    # poll is answered with 304 from the table version alone.
+    entry = outage_cache.get_outage_detail(OutageRepository(db), outage_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Outage not found")
-    return outage
+    headers = outage_cache.validator_headers(entry.etag, entry.last_modified)
+    if outage_cache.is_not_modified(request.headers, entry.etag, entry.last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
 
 
 @router.post("/", response_model=Outage)
@@ -173,18 +302,24 @@ def create_outage(payload: OutageCreate, current_user=Depends(require_engineer),
 
 
 @router.post("/bulk", response_model=dict)
-def bulk_create_outages(payload: BulkOutageCreate, current_user=Depends(require_engineer), db: Session = Depends(get_db)):
+def bulk_create_outages(
+    payload: BulkOutageCreate,
+    return_minimal: bool = Query(
+        default=False,
+        description="Return only outage ids in `items` instead of full outage objects.",
+    ),
+    current_user=Depends(require_engineer),
+    db: Session = Depends(get_db),
+):
+    # One duplicate-resolution query and one transaction for the whole batch;
+    # an id conflict rejects the batch before anything is written.
     repo = OutageRepository(db)
-    items: list[Outage] = []
-    persisted_count = 0
     try:
-        for outage_payload in payload.outages:
-            created, persisted = repo.create_or_get_existing(outage_payload)
-            items.append(created)
-            if persisted:
-                persisted_count += 1
+        results = repo.bulk_create_or_get_existing(payload.outages, return_minimal=return_minimal)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    items = [outage for outage, _ in results]
+    persisted_count = sum(1 for _, persisted in results if persisted)
     return {"count": len(items), "persisted": persisted_count, "items": items}
 
 
@@ -209,132 +344,52 @@ async def import_outages(
     CHUNK_SIZE = 64 * 1024  # 64 KB
 
     filename = file.filename or ""
+    parser = open_import_parser(filename)
+    if parser is None:
+        raise HTTPException(status_code=400, detail="Unsupported file format. Use .json or .csv")
 
     # --- #213: chunked read with size cap ---
-    chunks: list[bytes] = []
+    # Rows are parsed and validated as bytes arrive; parsing, validation and
+    # duplicate resolution run in the threadpool so the event loop is never
+    # blocked on a large upload.  Nothing is persisted until the whole file
+    # has been accepted, so the row cap can still reject it cleanly.
+    batch = OutageImportEngine(db).begin(consistency, dry_run=dry_run)
     total_read = 0
+    total_rows = 0
+
+    def _consume(data: bytes) -> int:
+        rows = parser.feed(data) if data else parser.close()
+        if total_rows + len(rows) > settings.MAX_BULK_OUTAGES_COUNT:
+            return -1
+        batch.feed(rows)
+        return len(rows)
+
     while True:
         chunk = await file.read(CHUNK_SIZE)
-        if not chunk:
-            break
         total_read += len(chunk)
         if total_read > MAX_BYTES:
             raise HTTPException(status_code=413, detail="File exceeds 10 MB limit")
-        chunks.append(chunk)
-    content = b"".join(chunks)
-
-    # --- parse into a row iterator (avoids holding two full copies in memory) ---
-    if filename.endswith(".json"):
         try:
-            rows = json.loads(content)
-            if not isinstance(rows, list):
-                raise HTTPException(status_code=400, detail="JSON file must contain a list of outage objects")
-        except json.JSONDecodeError as exc:
-            raise HTTPException(status_code=400, detail=f"Invalid JSON: {exc}") from exc
-    elif filename.endswith(".csv"):
-        try:
-            rows = list(csv.DictReader(io.StringIO(content.decode("utf-8"))))
-        except Exception as exc:
-            raise HTTPException(status_code=400, detail=f"Invalid CSV: {exc}") from exc
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported file format. Use .json or .csv")
-
-    if len(rows) > settings.MAX_BULK_OUTAGES_COUNT:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Too many rows in file. Maximum allowed is {settings.MAX_BULK_OUTAGES_COUNT}."
-        )
-
-    repo = OutageRepository(db)
-    row_outcomes: list[ImportRowResult] = []
-    persisted_count = 0
-
-    if dry_run:
-        # --- BE-012: Dry-run validation mode ---
-        # Validates rows exactly as live import: OutageCreate field validation + duplicate detection
-        # Returns field and row-level errors with same semantics, but does NOT persist
-        for i, row in enumerate(rows):
-            try:
-                payload = OutageCreate(**row)  # Full field validation via Pydantic
-                duplicate = repo.check_duplicate(payload)  # Duplicate detection same as live import
-                if duplicate:
-                    row_outcomes.append(ImportRowResult(
-                        row=i, 
-                        id=payload.id, 
-                        status="ok",
-                        duplicate=True,
-                        existing_id=duplicate.id,
-                    ))
-                else:
-                    row_outcomes.append(ImportRowResult(
-                        row=i, 
-                        id=payload.id, 
-                        status="ok",
-                        duplicate=False,
-                    ))
-            except Exception as exc:
-                row_outcomes.append(_row_error(i, row, exc))
-    elif consistency == ImportConsistency.atomic:
-        parsed: list[OutageCreate] = []
-        for i, row in enumerate(rows):
-            try:
-                parsed.append(OutageCreate(**row))
-                row_outcomes.append(ImportRowResult(row=i, id=row.get("id"), status="ok"))
-            except Exception as exc:
-                row_outcomes.append(_row_error(i, row, exc))
+            parsed = await run_in_threadpool(_consume, chunk)
+        except ImportFormatError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        if parsed < 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many rows in file. Maximum allowed is {settings.MAX_BULK_OUTAGES_COUNT}."
+            )
+        total_rows += parsed
+        if not chunk:
+            break
 
-        if any(r.status == "error" for r in row_outcomes):
-            return _import_response("import", consistency, len(rows), 0, row_outcomes)
+    # Set-based engine: one duplicate-resolution query and one bulk INSERT
+    # per chunk instead of per-row probes and commits.
+    try:
+        row_outcomes, persisted_count = await run_in_threadpool(batch.finish)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Transaction failed: {exc}") from exc
 
-        try:
-            for i, payload in enumerate(parsed):
-                created, persisted = repo.create_or_get_existing(payload)
-                row_outcomes[i].outage_id = created.id
-                row_outcomes[i].persisted = persisted
-                if persisted:
-                    persisted_count += 1
-                else:
-                    row_outcomes[i].duplicate = True
-                    row_outcomes[i].existing_id = created.id
-            db.commit()
-        except Exception as exc:
-            db.rollback()
-            raise HTTPException(status_code=500, detail=f"Transaction failed: {exc}") from exc
-    else:
-        for i, row in enumerate(rows):
-            try:
-                payload = OutageCreate(**row)
-                created, persisted = repo.create_or_get_existing(payload)
-                row_outcomes.append(ImportRowResult(
-                    row=i,
-                    id=payload.id,
-                    status="ok",
-                    outage_id=created.id,
-                    persisted=persisted,
-                    duplicate=not persisted,
-                    existing_id=created.id if not persisted else None,
-                ))
-                if persisted:
-                    persisted_count += 1
-            except Exception as exc:
-                db.rollback()
-                row_outcomes.append(_row_error(i, row, exc))
-
-    return _import_response("dry_run" if dry_run else "import", consistency, len(rows), persisted_count, row_outcomes)
-def _row_error(index: int, raw_row: dict, exc: Exception) -> ImportRowResult:
-    """Return a stable machine-readable ImportRowResult for a failed row."""
-    errors: list[ImportFieldError] = []
-    if hasattr(exc, "errors"):
-        for e in exc.errors():  # type: ignore[union-attr]
-            errors.append(ImportFieldError(
-                field=".".join(str(loc) for loc in e["loc"]) if e.get("loc") else None,
-                type=e.get("type"),
-                message=e.get("msg", str(e)),
-            ))
-    else:
-        errors.append(ImportFieldError(field=None, type=type(exc).__name__, message=str(exc)))
-
-    return ImportRowResult(row=index, id=raw_row.get("id"), status="error", errors=errors)
+    return _import_response("dry_run" if dry_run else "import", consistency, total_rows, persisted_count, row_outcomes)
 
 
 def _import_response(mode: str, consistency: ImportConsistency, total: int, persisted: int, outcomes: list[ImportRowResult]) -> ImportResponse:
@@ -370,6 +425,7 @@ def update_outage(outage_id: str, payload: OutageUpdate, current_user=Depends(re
         updated = repo.update(outage_id, payload)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    _invalidate_outage(outage_id)
     OutageEventRepository(db).record(outage_id, "updated", payload.model_dump(exclude_unset=True, exclude_none=True))
     return updated
 
@@ -393,6 +449,7 @@ def patch_outage(outage_id: str, payload: OutageUpdate, current_user=Depends(req
         updated = repo.update(outage_id, payload)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    _invalidate_outage(outage_id)
     OutageEventRepository(db).record(outage_id, "patched", payload.model_dump(exclude_unset=True, exclude_none=True))
     return updated
 
@@ -408,6 +465,7 @@ def delete_outage(outage_id: str, current_user=Depends(require_admin), db: Sessi
     if result is None:
         raise HTTPException(status_code=404, detail="Outage not found")
     repo.delete(outage_id)
+    _invalidate_outage(outage_id)
     return {"message": "Outage deleted successfully", "deleted_at": result.deleted_at}
 
 
@@ -420,9 +478,26 @@ def restore_outage(outage_id: str):
     result = outage_store.restore(outage_id)
     if result is None:
         raise HTTPException(status_code=404, detail="Outage not found")
+    _invalidate_outage(outage_id)
     return {"message": "Outage restored successfully", "outage": result}
 
 
+def _enqueue_sla_webhooks(db: Session, outage_id: str, stored_sla, payment) -> None:
+    webhook_event = WebhookEvent.SLA_VIOLATION if stored_sla.status == "violated" else WebhookEvent.SLA_RESOLVED
+    outbox.enqueue(
+        db,
+        outbox.TOPIC_SLA_WEBHOOKS,
+        {
+            "event": webhook_event.value,
+            "sla_data": {
+                "outage_id": outage_id,
+                "sla": stored_sla.model_dump(mode="json"),
+                "payment": payment.model_dump(mode="json"),
+            },
+        },
+    )
+
+
 @router.post("/{outage_id}/resolve")
 def resolve_outage(outage_id: str, payload: ResolveOutageRequest, current_user=Depends(require_engineer), db: Session = Depends(get_db)):
     """Resolve an outage, compute SLA, and create payment (BE-013).
@@ -437,6 +512,10 @@ def resolve_outage(outage_id: str, payload: ResolveOutageRequest, current_user=D
     - Returns 409 Conflict if another resolution is already in progress
     
     Also calculates SLA metrics and triggers webhook notifications.
+
+    The outage update, events, SLA result and payment are written in one
+    unit of work (one commit) together with outbox messages for the audit
+    entry and webhook fan-out, which a worker applies after the commit.
     """
     repo = OutageRepository(db)
     outage = repo.get(outage_id)
@@ -450,17 +529,19 @@ def resolve_outage(outage_id: str, payload: ResolveOutageRequest, current_user=D
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     
-    # Acquire advisory lock to prevent concurrent resolutions
+    # Acquire advisory lock to prevent concurrent resolutions; the single
+    # commit also keeps the transaction-scoped lock held until the end.
     try:
-        with advisory_lock_nowait(db, f"resolve:{outage_id}"):
+        with advisory_lock_nowait(db, f"resolve:{outage_id}"), UnitOfWork(db) as uow:
             try:
                 outage = repo.resolve(outage_id, payload.mttr_minutes)
             except ValueError as exc:
                 raise HTTPException(status_code=400, detail=str(exc)) from exc
             if not outage:
                 raise HTTPException(status_code=404, detail="Outage not found")
+            uow.after_commit(lambda: _invalidate_outage(outage_id))
 
-            audit_log.log("outage_resolved", {"id": outage.id, "mttr": payload.mttr_minutes})
+            outbox.enqueue_audit(db, "outage_resolved", {"id": outage.id, "mttr": payload.mttr_minutes})
             OutageEventRepository(db).record(outage_id, "resolved", {"mttr_minutes": payload.mttr_minutes})
 
             raw_contract_result = SLAContractAdapter.calculate_sla(
@@ -474,16 +555,11 @@ def resolve_outage(outage_id: str, payload: ResolveOutageRequest, current_user=D
 
             sla_repo = SLARepository(db)
             stored_sla = sla_repo.create_if_changed(sla)
-            _invalidate_analytics_cache()
+            uow.after_commit(_invalidate_analytics_cache)
             OutageEventRepository(db).record(outage_id, "sla_computed", {"status": stored_sla.status})
             payment_repo = PaymentRepository(db)
             payment = payment_repo.create_for_sla_result(outage.id, stored_sla)
-            webhook_event = WebhookEvent.SLA_VIOLATION if stored_sla.status == "violated" else WebhookEvent.SLA_RESOLVED
-            trigger_sla_violation_webhooks(
-                db,
-                sla_data={"outage_id": outage.id, "sla": stored_sla.model_dump(), "payment": payment.model_dump()},
-                event=webhook_event,
-            )
+            _enqueue_sla_webhooks(db, outage.id, stored_sla, payment)
 
             return {"outage": outage, "sla": stored_sla, "payment": payment}
     except ConcurrencyLockError as exc:
@@ -514,7 +590,7 @@ def recompute_sla(outage_id: str, current_user=Depends(require_engineer), db: Se
 
     # Acquire advisory lock to prevent concurrent recomputations
     try:
-        with advisory_lock_nowait(db, f"recompute:{outage_id}"):
+        with advisory_lock_nowait(db, f"recompute:{outage_id}"), UnitOfWork(db) as uow:
             orm = repo.get_orm_locked(outage_id)
             raw_contract_result = SLAContractAdapter.calculate_sla(
                 outage_id=outage.id,
@@ -527,23 +603,47 @@ def recompute_sla(outage_id: str, current_user=Depends(require_engineer), db: Se
 
             sla_repo = SLARepository(db)
             stored_sla = sla_repo.create_if_changed(sla)
-            _invalidate_analytics_cache()
+            uow.after_commit(_invalidate_analytics_cache)
+            uow.after_commit(lambda: invalidate_trace(outage_id))
             payment_repo = PaymentRepository(db)
             payment = payment_repo.create_for_sla_result(outage.id, stored_sla)
-            webhook_event = WebhookEvent.SLA_VIOLATION if stored_sla.status == "violated" else WebhookEvent.SLA_RESOLVED
-            trigger_sla_violation_webhooks(
-                db,
-                sla_data={"outage_id": outage.id, "sla": stored_sla.model_dump(), "payment": payment.model_dump()},
-                event=webhook_event,
-            )
+            _enqueue_sla_webhooks(db, outage.id, stored_sla, payment)
 
-            audit_log.log("sla_recomputed", {"id": outage.id})
+            outbox.enqueue_audit(db, "sla_recomputed", {"id": outage.id})
             OutageEventRepository(db).record(outage_id, "sla_recomputed", {"status": stored_sla.status})
             return {"sla": stored_sla, "payment": payment}
     except ConcurrencyLockError as exc:
         raise HTTPException(status_code=409, detail=str(exc)) from exc
 
 
+@router.get("/{outage_id}/overlapping", response_model=List[Outage])
+def list_overlapping_outages(
+    outage_id: str,
+    same_site: bool = Query(default=False, description="Only outages at the same site_id"),
+    limit: int = Query(default=100, ge=1, le=500),
+    current_user=Depends(require_engineer),
+    db: Session = Depends(get_db),
+):
+    """Other outages that were active at any time while this one was open.
+
+    An open outage overlaps everything active from its `detected_at` on.
+    Results are ordered by `detected_at`.
+    """
+    repo = OutageRepository(db)
+    orm = repo.get_orm(outage_id)
+    if not orm:
+        raise HTTPException(status_code=404, detail="Outage not found")
+    if same_site and not orm.site_id:
+        return []
+    return repo.overlapping(
+        orm.detected_at,
+        orm.resolved_at,
+        site_id=orm.site_id if same_site else None,
+        exclude_id=outage_id,
+        limit=limit,
+    )
+
+
 @router.get("/{outage_id}/timeline")
 def get_outage_timeline(
     outage_id: str,
@@ -0,0 +1,112 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.security import require_admin, require_engineer
+from app.db.session import get_db
+from app.models.enums import OutageStatus
+from app.models.outage import Outage
+from app.repositories.outage_repository import OutageRepository
+from app.schemas.site_hierarchy import (
+    SiteHierarchyCreate,
+    SiteHierarchyMove,
+    SiteHierarchyResponse,
+    SiteOutageRollupResponse,
+    SiteSubtreeNode,
+    SiteSubtreeResponse,
+)
+from app.services.site_hierarchy import SiteHierarchyService
+
+router = APIRouter()
+service = SiteHierarchyService()
+
+
+def _get_site_or_404(db: Session, site_id: int):
+    site = service.get_site_by_id(db, site_id=site_id)
+    if not site:
+        raise HTTPException(status_code=404, detail="Site not found")
+    return site
+
+
+@router.post("/", response_model=SiteHierarchyResponse)
+def create_site_hierarchy(
+    *,
+    db: Session = Depends(get_db),
+    site_in: SiteHierarchyCreate,
+    current_user=Depends(require_admin),
+):
+    """
+    Create a new site hierarchy entry.
+    """
+    if site_in.parent_id:
+        parent = service.get_site_by_id(db, site_id=site_in.parent_id)
+        if not parent:
+            raise HTTPException(status_code=404, detail="Parent site not found")
+
+    return service.create_site(db, site_in=site_in)
+
+
+@router.put("/{site_id}/parent", response_model=SiteHierarchyResponse)
+def move_site_hierarchy(
+    site_id: int,
+    move: SiteHierarchyMove,
+    current_user=Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Move a site (with its whole subtree) under another parent, or to the root
+    when `parent_id` is null. Subtree rollups follow the move.
+    """
+    _get_site_or_404(db, site_id)
+    try:
+        return service.move_site(db, site_id, move.parent_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{site_id}/subtree", response_model=SiteSubtreeResponse)
+def get_site_subtree(
+    site_id: int,
+    max_depth: Optional[int] = Query(None, ge=0, description="Limit to descendants at most this many levels down."),
+    current_user=Depends(require_engineer),
+    db: Session = Depends(get_db),
+):
+    """
+    Return the site and all its descendants, shallowest first.
+    """
+    _get_site_or_404(db, site_id)
+    nodes = [
+        SiteSubtreeNode(**SiteHierarchyResponse.model_validate(site).model_dump(), depth=depth)
+        for site, depth in service.get_subtree(db, site_id, max_depth=max_depth)
+    ]
+    return SiteSubtreeResponse(site_id=site_id, nodes=nodes)
+
+
+@router.get("/{site_id}/rollup", response_model=SiteOutageRollupResponse)
+def get_site_rollup(site_id: int, current_user=Depends(require_engineer), db: Session = Depends(get_db)):
+    """
+    Precomputed outage totals for the site's whole subtree: open outages, SLA
+    violations and average MTTR of resolved outages.
+    """
+    _get_site_or_404(db, site_id)
+    rollup = service.get_rollup(db, site_id)
+    if rollup is None:
+        return SiteOutageRollupResponse(site_id=site_id, open_outages=0, violations=0, resolved_outages=0)
+    return rollup
+
+
+@router.get("/{site_id}/outages", response_model=List[Outage])
+def list_site_subtree_outages(
+    site_id: int,
+    status: Optional[OutageStatus] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    current_user=Depends(require_engineer),
+    db: Session = Depends(get_db),
+):
+    """
+    Outages reported for the site or any of its descendants, newest first.
+    """
+    _get_site_or_404(db, site_id)
+    return OutageRepository(db).list_in_site_subtree(site_id, status=status, limit=limit, offset=offset)
@@ -8,6 +8,7 @@ from app.api.v1.endpoints import (
     outages,
     sla,
     sla_dispute,
+    site_hierarchy,
     payments,
     transactions,
     webhooks,
@@ -24,6 +25,7 @@ api_router.include_router(metrics.router)
 api_router.include_router(outages.router, prefix="/outages", tags=["outages"])
 api_router.include_router(sla.router, prefix="/sla", tags=["sla"])
 api_router.include_router(sla_dispute.router, prefix="/sla", tags=["sla-disputes"])
+api_router.include_router(site_hierarchy.router, prefix="/site-hierarchy", tags=["site-hierarchy"])
 api_router.include_router(payments.router, prefix="/payments", tags=["payments"])
 api_router.include_router(transactions.router, prefix="/transactions", tags=["transactions"])
 api_router.include_router(webhooks.router)
@@ -13,6 +13,7 @@ class CacheKeyNamespace(str, Enum):
     SESSION = "session"
     OUTAGE = "outage"
     METRICS = "metrics"
+    TRACE = "trace"
 
 
 _NAMESPACE_TTL_LIMITS: dict[CacheKeyNamespace, int] = {
@@ -21,6 +22,7 @@ _NAMESPACE_TTL_LIMITS: dict[CacheKeyNamespace, int] = {
     CacheKeyNamespace.SESSION: 3600,
     CacheKeyNamespace.OUTAGE: 120,
     CacheKeyNamespace.METRICS: 30,
+    CacheKeyNamespace.TRACE: 600,
 }
 
 
@@ -55,6 +55,24 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
     CELERY_TASK_ALWAYS_EAGER: bool = True
+    CELERY_REQUIRED_QUEUES: str = ""  # comma-separated queues a worker must see bound at startup
+    CELERY_STRICT_QUEUE_BINDINGS: bool = True
+    CELERY_QUEUE_PROBE_TIMEOUT_SECONDS: float = 5.0
+    APP_ENV: str = "dev"  # selects the worker concurrency profile (dev/staging/prod)
+    CELERY_WORKER_CONCURRENCY: Optional[int] = None  # overrides the profile; split across lanes
+    CELERY_MAX_TASKS_PER_CHILD: Optional[int] = None
+    CELERY_CLAIM_CHECK_ENABLED: bool = True  # store large task bodies/results in the DB, pass a reference
+    CELERY_CLAIM_CHECK_THRESHOLD_BYTES: int = 262144
+    CELERY_CLAIM_CHECK_TTL_SECONDS: int = 172800  # outlives result_expires (24h)
+
+    # ── Outbox ────────────────────────────────────────────────────────────
+    OUTBOX_RELAY_INTERVAL_SECONDS: float = 1.0     # beat interval of the outbox relay
+    OUTBOX_RELAY_BATCH_SIZE: int = 100             # messages published per relay run
+    OUTBOX_REPUBLISH_AFTER_SECONDS: int = 300      # republish published-but-unprocessed messages after this
+    OUTBOX_MAX_ATTEMPTS: int = 5                   # publishes before a message is marked failed
+
+    # ── Bulk SLA ──────────────────────────────────────────────────────────
+    SLA_BULK_CHUNK_SIZE: int = 500                 # devices per compute_sla_chunk task in a bulk chord
 
     # ── Observability ─────────────────────────────────────────────────────
     OTEL_SERVICE_NAME: str = "nociq-api"
@@ -99,6 +117,23 @@ class Settings(BaseSettings):
     MAX_BULK_BODY_SIZE: int = 10 * 1024 * 1024             # 10 MB
     MAX_WEBHOOK_BODY_SIZE: int = 1 * 1024 * 1024           # 1 MB
 
+    # ── Outage import ─────────────────────────────────────────────────────
+    OUTAGE_IMPORT_CHUNK_ROWS: int = 500        # rows per duplicate-resolution / insert round trip
+    OUTAGE_IMPORT_COPY_MIN_ROWS: int = 200     # Postgres: use COPY for chunks at least this large
+
+    # ── Outage listing ────────────────────────────────────────────────────
+    OUTAGE_LIST_COUNT_CACHE_SECONDS: int = 30          # cached filtered counts when exact_total is off
+    OUTAGE_LIST_EXACT_COUNT_MAX_ESTIMATE: int = 10000  # Postgres: count exactly below this planner estimate
+    OUTAGE_DETAIL_CACHE_TTL_SECONDS: int = 60          # read-through GET /outages/{id} cache (namespace max 120)
+    TRACE_SETTLED_CACHE_SECONDS: int = 600             # cached trace chains of fully settled outages (namespace max 600)
+    TRACE_BATCH_MAX_OUTAGES: int = 500                 # outage ids accepted by POST /audit/trace/batch
+    OUTAGE_CONCURRENCY_MAX_DAYS: int = 92              # widest window for GET /outages/concurrency
+    OUTAGE_MAP_MAX_POINTS: int = 500                   # GET /outages/map lists outages up to this many, else clusters
+
+    # ── Site rollups ──────────────────────────────────────────────────────
+    SITE_ROLLUP_FOLD_INTERVAL_SECONDS: float = 5.0  # beat interval folding queued outage deltas into the rollups
+    SITE_ROLLUP_FOLD_BATCH_SIZE: int = 5000         # queued deltas folded per run
+
     # ── Cache & idempotency ───────────────────────────────────────────────
     WALLET_CACHE_TTL_SECONDS: int = 60
     WALLET_CACHE_LOCK_TIMEOUT: int = 5
@@ -191,13 +226,33 @@ class Settings(BaseSettings):
     JOB_LEASE_TIMEOUT_SECONDS: int = 120
     JOB_LEASE_RECLAMATION_ENABLED: bool = True
     JOB_LEASE_RECLAMATION_BATCH_SIZE: int = 50
+    JOB_LEASE_REDIS_ENABLED: bool = True  # buffer heartbeats in expiring Redis keys instead of row writes
+    JOB_LEASE_FLUSH_INTERVAL_SECONDS: float = 5.0  # how often buffered heartbeats are copied to the jobs rows
+    JOB_LEASE_FLUSH_BATCH_SIZE: int = 500
+
+    # ── Job state sync (Celery task events → jobs rows) ───────────────────
+    JOB_STATE_SYNC_FLUSH_INTERVAL_MS: int = 500  # max delay before a task-state event reaches the row
+    JOB_STATE_SYNC_BATCH_SIZE: int = 500
+
+    # ── Job progress ──────────────────────────────────────────────────────
+    JOB_PROGRESS_FLUSH_INTERVAL_MS: int = 2000  # min gap between jobs-row progress writes; stage changes flush at once
+    JOB_PROGRESS_REDIS_ENABLED: bool = True  # publish every update to Redis pub/sub + a snapshot key
+    JOB_PROGRESS_SNAPSHOT_TTL_SECONDS: int = 3600  # lifetime of the Redis progress snapshot
+
+    # ── Job dedupe ────────────────────────────────────────────────────────
+    JOB_DEDUPE_REDIS_ENABLED: bool = True  # share dedupe claims across replicas via Redis SET NX PX
+    JOB_DEDUPE_DEFAULT_TTL_SECONDS: int = 3600
+    JOB_DEDUPE_TTLS: str = "sla_computation:900,bulk_sla_computation:3600,webhook_dispatch:300,export:3600"
+    # Format per entry: "job_type:ttl_seconds"
+    JOB_DEDUPE_LOCAL_MAX_KEYS: int = 10000  # bound of the in-process LRU used while Redis is down
 
     # ── BE-W5-048: Retry taxonomy governance ──────────────────────────────
     JOB_RETRY_CLASS_DEFAULTS: str = (
         "sla_computation:exponential_backoff:3:30,"
         "bulk_sla_computation:exponential_backoff:2:60,"
         "webhook_dispatch:at_least_once:5:30,"
-        "webhook_dr_replay:at_most_once:1:60"
+        "webhook_dr_replay:at_most_once:1:60,"
+        "export:exponential_backoff:2:60"
     )
     # Format per entry: "job_type:retry_class:max_retries:base_delay_seconds"
     JOB_RETRY_DEAD_LETTER_ENABLED: bool = True
@@ -217,6 +272,12 @@ class Settings(BaseSettings):
     JOB_RETENTION_DRY_RUN_DEFAULT: bool = False
     JOB_RETENTION_CLEANUP_BATCH_SIZE: int = 1000
     JOB_RETENTION_CLEANUP_METRICS_ENABLED: bool = True
+    JOB_RETENTION_PARTITION_DROP_ENABLED: bool = True  # Postgres: drop expired jobs month partitions whole
+    JOB_PARTITION_MONTHS_AHEAD: int = 3  # month partitions created ahead of time by each cleanup
+
+    # ── Export jobs ───────────────────────────────────────────────────────
+    EXPORT_ARTIFACT_DIR: str = ".runtime/exports"
+    EXPORT_CHUNK_ROWS: int = 5000
 
     # ── DB pool ───────────────────────────────────────────────────────────
     DB_POOL_SATURATION_THRESHOLD: float = 0.9
@@ -0,0 +1,104 @@
+"""Request-scoped unit of work.
+
+Repositories normally commit each write on their own.  Inside a
+``UnitOfWork`` they only stage it on the session (flushing when a
+database-generated key is needed) and the unit of work issues a single
+commit for everything: domain rows, outage events, audit entries and
+webhook deliveries.  Side effects that must only happen once the data is
+durable (cache invalidation, webhook dispatch) are registered with
+``after_commit`` and run after that commit.
+
+    with UnitOfWork(db) as uow:
+        outage = repo.resolve(outage_id, mttr)
+        OutageEventRepository(db).record(outage_id, "resolved", detail)
+        uow.after_commit(lambda: outage_cache.invalidate(outage_id))
+
+An exception inside the block rolls everything back and drops the
+after-commit callbacks.  Units of work do not nest; an inner
+``UnitOfWork`` on the same session joins the outer one.
+"""
+
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.utils.logging import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+_SESSION_KEY = "unit_of_work"
+
+
+class UnitOfWork:
+    def __init__(self, db: Session):
+        self.db = db
+        self._callbacks: List[Callable[[], Any]] = []
+        self._owner = False
+
+    def __enter__(self) -> "UnitOfWork":
+        outer = current_unit_of_work(self.db)
+        if outer is not None:
+            return outer
+        self.db.info[_SESSION_KEY] = self
+        self._owner = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self._owner:
+            return
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.db.rollback()
+                self._callbacks.clear()
+        finally:
+            self.db.info.pop(_SESSION_KEY, None)
+            self._owner = False
+
+    def add(self, instance: Any) -> None:
+        """Stage *instance*; it is written by the unit of work's commit."""
+        self.db.add(instance)
+
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        self._callbacks.append(callback)
+
+    def commit(self) -> None:
+        self.db.commit()
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                # The data is committed; a failed side effect must not turn
+                # the request into an error.
+                logger.exception("unit_of_work_after_commit_failed")
+
+
+def current_unit_of_work(db: Session) -> Optional[UnitOfWork]:
+    info = getattr(db, "info", None)
+    return info.get(_SESSION_KEY) if info is not None else None
+
+
+def commit_or_defer(db: Session, *refresh: Any, flush: bool = False) -> None:
+    """Commit *db* and refresh *refresh*, unless a unit of work owns it.
+
+    Under a unit of work nothing is committed; pass ``flush=True`` when the
+    caller needs database-generated values (autoincrement keys) right away.
+    """
+    if current_unit_of_work(db) is not None:
+        if flush:
+            db.flush()
+        return
+    db.commit()
+    for instance in refresh:
+        db.refresh(instance)
+
+
+def after_commit(db: Session, callback: Callable[[], Any]) -> None:
+    """Run *callback* after the unit of work commits, or now if there is none."""
+    uow = current_unit_of_work(db)
+    if uow is None:
+        callback()
+    else:
+        uow.after_commit(callback)
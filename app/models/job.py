@@ -1,9 +1,9 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Dict, Optional
 
 from pydantic import BaseModel as PydanticBaseModel
-from sqlalchemy import Boolean, Column, DateTime, Enum, Enum as SAEnum, Float, Integer, JSON, String, Text
+from sqlalchemy import BigInteger, Boolean, Column, Date, DateTime, Enum, Enum as SAEnum, Float, Index, Integer, JSON, String, Text, event
 from sqlalchemy.dialects.postgresql import UUID
 import enum
 
@@ -25,6 +25,14 @@ class JobType(str, enum.Enum):
     WEBHOOK_DISPATCH = "webhook_dispatch"
     BULK_SLA_COMPUTATION = "bulk_sla_computation"
     WEBHOOK_DR_REPLAY = "webhook_dr_replay"  # BE-W5-045: disaster-recovery replay
+    EXPORT = "export"  # Outage / SLA / payment exports written to a local artifact
+
+
+# Job types whose Celery task returns as soon as it has dispatched a chord;
+# the chord's reducer (or errback) writes the final status.  The task's own
+# Celery state is SUCCESS at that point, so status sync must never copy a
+# terminal Celery state onto these rows.
+CHORD_COMPLETED_JOB_TYPES = frozenset({JobType.BULK_SLA_COMPUTATION})
 
 
 class RetryClass(str, enum.Enum):
@@ -67,6 +75,25 @@ class JobResultEnvelope(PydanticBaseModel):
     started_at: Optional[str] = None
     finished_at: Optional[str] = None
     created_at: Optional[str] = None
+    # BE-W5-047 / BE-W5-052: lease and retention metadata
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[str] = None
+    under_investigation: bool = False
+    under_dispute: bool = False
+    audit_critical: bool = False
+
+
+# Sentinel partition keys: unfinished jobs, and rows kept past their month
+# partition (protected or longer-retained rows moved aside before a drop).
+OPEN_RETENTION_MONTH = date(9999, 12, 1)
+RETAINED_RETENTION_MONTH = date(1, 1, 1)
+
+
+def retention_month_for(finished_at: Optional[datetime]) -> date:
+    """Partition key of a job: the first day of its ``finished_at`` month."""
+    if finished_at is None:
+        return OPEN_RETENTION_MONTH
+    return date(finished_at.year, finished_at.month, 1)
 
 
 class Job(Base):
@@ -112,3 +139,48 @@ class Job(Base):
     under_dispute = Column(Boolean, default=False, nullable=False, index=True)
     # BE-W5-052: audit-critical flag (retention tier)
     audit_critical = Column(Boolean, default=False, nullable=False)
+    # Retention partition key (see retention_month_for).  On Postgres the
+    # table is range-partitioned on it, with a primary key of
+    # (id, retention_month).
+    retention_month = Column(Date, default=OPEN_RETENTION_MONTH, nullable=False)
+
+
+@event.listens_for(Job, "before_insert")
+@event.listens_for(Job, "before_update")
+def _set_retention_month(mapper, connection, target: Job) -> None:
+    # ORM writes only; set-based UPDATEs that set ``finished_at`` must set
+    # ``retention_month`` themselves (see ``job_state_sync``).
+    # Rows moved to the retained partition stay there.
+    if target.retention_month != RETAINED_RETENTION_MONTH:
+        target.retention_month = retention_month_for(target.finished_at)
+
+
+class JobItemStatus(str, enum.Enum):
+    SUCCESS = "success"
+    ERROR = "error"
+
+
+class JobItem(Base):
+    """One processed item of a bulk job (e.g. one device of a bulk SLA run).
+
+    Append-only: rows are inserted in batches as chunks finish and never
+    rewritten, so recording n items costs O(n) instead of re-serialising a
+    growing JSON blob on the job row.  Summaries are SQL aggregates over
+    ``job_id``; listings page by ``id``.
+    """
+    __tablename__ = "job_items"
+    __table_args__ = (
+        Index("ix_job_items_job_id_id", "job_id", "id"),
+        Index("ix_job_items_job_id_status_id", "job_id", "status", "id"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    # No foreign key: a partitioned ``jobs`` has no unique ``id`` to
+    # reference (migration 0036); retention deletes the items explicitly.
+    job_id = Column(UUID(as_uuid=True), nullable=False)
+    item_id = Column(String(255), nullable=False)
+    status = Column(String(16), nullable=False)  # JobItemStatus value
+    flagged = Column(Boolean, default=False, nullable=False)  # needs attention, e.g. SLA violated
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
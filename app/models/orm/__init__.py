@@ -6,6 +6,9 @@ from app.models.orm.user import UserORM
 from app.models.orm.session import SessionORM
 from app.models.orm.audit_log import AuditLogORM
 from app.models.orm.token_family import TokenFamilyORM
+from app.models.orm.change_counter import TableChangeCounterORM
+from app.models.orm.outbox import OutboxMessageORM
+from app.models.orm.claim_check import ClaimCheckORM
 from app.models.sla_dispute import SLADispute
 
 __all__ = [
@@ -17,5 +20,8 @@ __all__ = [
     "SessionORM",
     "AuditLogORM",
     "TokenFamilyORM",
+    "TableChangeCounterORM",
+    "OutboxMessageORM",
+    "ClaimCheckORM",
     "SLADispute",
 ]
@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, DateTime, String
+
+from app.db.base import Base
+
+
+class TableChangeCounterORM(Base):
+    """Per-table write counter maintained by database triggers (migration 0029).
+
+    Bumped in the same transaction as the write, so a reader that sees the
+    new version also sees the committed rows.  Used to derive ETags on
+    SQLite; Postgres uses sequences instead (migration 0038).
+    """
+
+    __tablename__ = "table_change_counters"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    changed_at = Column(DateTime(timezone=True), nullable=True)
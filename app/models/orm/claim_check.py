@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from app.db.base import Base
+
+
+class ClaimCheckORM(Base):
+    """Compressed body of a Celery message or result too large for the broker.
+
+    Only a reference to the row travels through Redis; the row is read back
+    when the message or result is decoded and purged after ``expires_at``
+    (see ``app.services.claim_check``).
+    """
+
+    __tablename__ = "celery_claim_checks"
+
+    id = Column(String(36), primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+    size_bytes = Column(Integer, nullable=False)  # uncompressed body size
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import ARRAY, Column, DateTime, Float, Integer, JSON, String, Text
+from sqlalchemy import ARRAY, Column, DateTime, Float, Index, Integer, JSON, String, Text, text
 from sqlalchemy.dialects.postgresql import ARRAY, JSON
 
 from app.db.base import Base
@@ -17,13 +17,21 @@ class OutageORM(Base):
     detected_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now(timezone.utc))
     resolved_at = Column(DateTime(timezone=True), nullable=True)
     description = Column(Text, nullable=False)
-    affected_services = Column(ARRAY(String), nullable=False, default=list)
+    # ARRAY is Postgres-only; the local SQLite database stores the list as JSON.
+    affected_services = Column(ARRAY(String).with_variant(JSON(), "sqlite"), nullable=False, default=list)
     affected_subscribers = Column(Integer, nullable=True)
     assigned_to = Column(String(255), nullable=True)
     created_by = Column(String(255), nullable=True)
     location = Column(JSON, nullable=True)          # {"latitude": float, "longitude": float}
+    # Typed copy of ``location`` for map viewport queries, see outage_geo.
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)
     sla_status = Column(JSON, nullable=True)        # SLAStatus dict
     mttr_minutes = Column(Integer, nullable=True)
+    # sha256 of the normalized duplicate key, see outage_content_hash().
+    # NULL for rows whose content is already owned by another outage.
+    content_hash = Column(String(64), nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now(timezone.utc))
     updated_at = Column(
         DateTime,
@@ -31,3 +39,23 @@ class OutageORM(Base):
         default=datetime.now(timezone.utc),
         onupdate=datetime.now(timezone.utc),
     )
+
+    # Keyset pagination: one index per supported sort key (plus the common
+    # status/severity filters), each ending in the ``id`` tiebreaker.
+    __table_args__ = (
+        Index("ix_outages_detected_at_id", "detected_at", "id"),
+        Index("ix_outages_status_detected_at_id", "status", "detected_at", "id"),
+        Index("ix_outages_severity_detected_at_id", "severity", "detected_at", "id"),
+        Index("ix_outages_site_name_id", "site_name", "id"),
+        Index("ix_outages_site_id", "site_id"),
+        Index("ix_outages_geohash", "geohash"),
+        Index("ix_outages_severity_id", "severity", "id"),
+        Index("ix_outages_status_id", "status", "id"),
+        Index(
+            "uq_outages_content_hash",
+            "content_hash",
+            unique=True,
+            postgresql_where=text("content_hash IS NOT NULL"),
+            sqlite_where=text("content_hash IS NOT NULL"),
+        ),
+    )
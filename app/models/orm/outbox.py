@@ -0,0 +1,33 @@
+from sqlalchemy import Column, DateTime, Index, Integer, JSON, String, Text
+
+from app.db.base import Base
+
+OUTBOX_PENDING = "pending"
+OUTBOX_PUBLISHED = "published"
+OUTBOX_PROCESSED = "processed"
+
+
+class OutboxMessageORM(Base):
+    """Side effect recorded in the same transaction as the change that caused it.
+
+    ``pending`` rows are published to Celery by the relay
+    (``app.services.outbox.relay_pending``), which marks them ``published``;
+    the consumer marks them ``processed`` in the transaction that applies
+    the side effect, so redelivered messages are skipped.
+    """
+
+    __tablename__ = "outbox"
+
+    id = Column(String(36), primary_key=True)
+    topic = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default=OUTBOX_PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    published_at = Column(DateTime(timezone=True), nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_status_created", "status", "created_at"),
+    )
@@ -24,7 +24,11 @@ class SLAResultORM(Base):
     reason_code = Column(String(50), nullable=True)       # e.g., "mttr_exceeded", "met_exceptional"
     decision_trace = Column(Text, nullable=True)          # Machine-readable decision trace
 
-    disputes = relationship("SLADispute", back_populates="sla_result")
+    disputes = relationship(
+        "SLADispute",
+        back_populates="sla_result",
+        foreign_keys="SLADispute.sla_result_id",
+    )
 
     __table_args__ = (
         Index("ix_sla_results_outage_latest", "outage_id", "is_latest"),
@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
@@ -90,6 +90,42 @@ class PaginatedOutages(BaseModel):
     total: int
     page: int
     page_size: int
+    # Keyset pagination: pass ``next_cursor`` back as ``cursor`` for the next page.
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    # True when ``total`` is a planner estimate or a briefly cached count.
+    total_is_estimate: bool = False
+
+
+class OutageSearchHit(BaseModel):
+    outage: Outage
+    # exact_id | id_prefix | text
+    match: str
+
+
+class OutageMapCluster(BaseModel):
+    geohash: str
+    count: int
+    # Mean position of the cell's outages.
+    latitude: float
+    longitude: float
+
+
+class OutageMapResponse(BaseModel):
+    # "points" (outages listed) or "clusters" (counts per geohash cell)
+    mode: str
+    total: int
+    precision: Optional[int] = None
+    outages: List[Outage] = Field(default_factory=list)
+    clusters: List[OutageMapCluster] = Field(default_factory=list)
+
+
+class OutageConcurrencyPeak(BaseModel):
+    site_id: Optional[str] = None
+    day: date
+    peak_concurrent: int
+    # When the day's peak began (UTC).
+    peak_at: datetime
 
 
 class ResolveOutageRequest(BaseModel):
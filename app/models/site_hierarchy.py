@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base_class import Base
@@ -10,6 +10,70 @@ class SiteHierarchy(Base):
     name = Column(String, index=True, nullable=False)
     region = Column(String, index=True, nullable=False)
     parent_id = Column(Integer, ForeignKey("site_hierarchy.id"), nullable=True)
+    # Matches ``outages.site_id``; outages reported for this code roll up
+    # into this node and every ancestor.
+    site_code = Column(String(255), nullable=True, unique=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     parent = relationship("SiteHierarchy", remote_side=[id], backref="children")
+
+
+class SiteHierarchyClosure(Base):
+    """One row per (ancestor, descendant) pair, including each node with itself.
+
+    Maintained by ``SiteHierarchyService`` on insert and move, so a subtree
+    is a single indexed lookup on ``ancestor_id``.
+    """
+
+    __tablename__ = "site_hierarchy_closure"
+
+    ancestor_id = Column(Integer, ForeignKey("site_hierarchy.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("site_hierarchy.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_site_hierarchy_closure_descendant", "descendant_id", "ancestor_id"),
+    )
+
+
+class SiteOutageRollup(Base):
+    """Outage totals for a node's whole subtree (the node and all descendants).
+
+    Outage writes queue ``SiteRollupDelta`` rows that ``fold_deltas`` adds
+    here periodically; ``SiteHierarchyService.get_rollup`` includes the
+    deltas still queued and ``rebuild_rollups`` recomputes everything.
+    """
+
+    __tablename__ = "site_outage_rollups"
+
+    site_id = Column(Integer, ForeignKey("site_hierarchy.id", ondelete="CASCADE"), primary_key=True)
+    open_outages = Column(Integer, nullable=False, default=0)
+    violations = Column(Integer, nullable=False, default=0)
+    resolved_outages = Column(Integer, nullable=False, default=0)
+    mttr_total_minutes = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @property
+    def mttr_avg_minutes(self):
+        if not self.resolved_outages:
+            return None
+        return round(self.mttr_total_minutes / self.resolved_outages, 2)
+
+
+class SiteRollupDelta(Base):
+    """A queued change to the rollups of a site code's node and its ancestors.
+
+    Outage writes only insert these rows, so they never lock the shared
+    ancestor rollups; ``app.repositories.site_rollups.fold_deltas`` applies
+    and deletes them in batches.
+    """
+
+    __tablename__ = "site_rollup_deltas"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    site_code = Column(String(255), nullable=False, index=True)
+    open_outages = Column(Integer, nullable=False, default=0)
+    violations = Column(Integer, nullable=False, default=0)
+    resolved_outages = Column(Integer, nullable=False, default=0)
+    mttr_total_minutes = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
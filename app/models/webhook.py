@@ -64,6 +64,7 @@ class WebhookDelivery(Base):
     signature_version = Column(Integer, default=1, nullable=False)  # BE-087: Explicit signature algorithm version
     idempotency_key = Column(String(255), nullable=False, unique=True, index=True)  # Deterministic key for deduplication
     event_timestamp = Column(DateTime, nullable=False)  # Immutable: when the event occurred (UTC)
+    outage_id = Column(String, nullable=True, index=True)  # Copied from payload data.outage_id for trace lookups
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
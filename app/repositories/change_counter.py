@@ -0,0 +1,105 @@
+"""Per-table change versions used to validate cached reads and ETags.
+
+Database triggers advance the version on every write to ``outages``, so it
+is shared by all workers and covers writes made outside the repository
+(imports, COPY, raw SQL):
+
+- Postgres (migration 0038): a deferred trigger calls ``nextval`` on
+  ``outages_change_seq`` once per committing transaction and stores the
+  time in ``outages_changed_at_seq``.  Sequences are non-transactional and
+  never block, so concurrent writers do not serialize on a counter row; in
+  exchange a reader can see the new version a moment before the commit is
+  visible, bounded by the detail cache TTL.
+- SQLite (migration 0029): row triggers bump ``table_change_counters`` in
+  the writing transaction; SQLite serializes writers anyway.
+
+Reading the version is a single-row lookup either way.
+
+Schemas built without the migration (e.g. ``create_all`` in tests) have no
+triggers; there the version falls back to an in-process counter bumped by
+repository writes.  That version includes a per-process token, so another
+worker never produces a matching validator from stale state.
+"""
+
+import itertools
+import uuid
+import weakref
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.orm.change_counter import TableChangeCounterORM
+
+_TRIGGER_PROBES = {
+    "postgresql": "SELECT 1 FROM pg_class WHERE relkind = 'S' AND relname = :name",
+    "sqlite": "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name",
+}
+_TRIGGER_NAMES = {
+    "postgresql": "{table}_change_seq",
+    "sqlite": "{table}_change_counter_ai",
+}
+
+_process_token = uuid.uuid4().hex[:8]
+_local_counter = itertools.count(1)
+_local_versions: dict = {}
+
+_installed_cache: "weakref.WeakKeyDictionary[Engine, dict]" = weakref.WeakKeyDictionary()
+
+
+def record_local_write(table: str) -> None:
+    """Bump the in-process fallback version for *table*."""
+    _local_versions[table] = next(_local_counter)
+
+
+def forget_engine(engine: Engine) -> None:
+    """Drop the cached trigger probe for *engine* (after installing triggers)."""
+    _installed_cache.pop(engine, None)
+
+
+def _counter_installed(db: Session, table: str) -> bool:
+    engine = db.get_bind()
+    per_table = _installed_cache.setdefault(engine, {})
+    if table not in per_table:
+        probe = _TRIGGER_PROBES.get(engine.dialect.name)
+        installed = False
+        if probe:
+            name = _TRIGGER_NAMES[engine.dialect.name].format(table=table)
+            try:
+                installed = db.execute(text(probe), {"name": name}).first() is not None
+            except SQLAlchemyError:
+                installed = False
+        per_table[table] = installed
+    return per_table[table]
+
+
+def table_version(db: Session, table: str) -> Tuple[str, Optional[datetime]]:
+    """Return ``(version, changed_at)`` for *table*.
+
+    ``changed_at`` is only known when the database counter is installed.
+    """
+    if _counter_installed(db, table):
+        if db.get_bind().dialect.name == "postgresql":
+            return _sequence_version(db, table)
+        row = db.execute(
+            select(TableChangeCounterORM.version, TableChangeCounterORM.changed_at).where(
+                TableChangeCounterORM.table_name == table
+            )
+        ).first()
+        if row is not None:
+            changed_at = row.changed_at
+            if changed_at is not None and changed_at.tzinfo is None:
+                changed_at = changed_at.replace(tzinfo=timezone.utc)
+            return f"db{row.version}", changed_at
+    return f"local{_local_versions.get(table, 0)}-{_process_token}", None
+
+
+def _sequence_version(db: Session, table: str) -> Tuple[str, Optional[datetime]]:
+    # *table* is a fixed table name, never user input.
+    version, changed_us = db.execute(
+        text(f"SELECT v.last_value, t.last_value FROM {table}_change_seq v, {table}_changed_at_seq t")
+    ).one()
+    return f"db{version}", datetime.fromtimestamp(changed_us / 1_000_000, tz=timezone.utc)
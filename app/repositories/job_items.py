@@ -0,0 +1,89 @@
+"""Append-only per-item results of bulk jobs (``job_items``).
+
+Bulk tasks record each processed item as a row instead of rewriting the
+job's ``partial_results`` / ``per_item_errors`` JSON: ``insert_items``
+writes a whole chunk with one executemany INSERT in the caller's
+transaction.  ``summarize`` computes the job totals with one aggregate
+query and ``list_items`` pages by primary key (keyset), so neither slows
+down as a job grows to hundreds of thousands of items.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.job import JobItem, JobItemStatus
+
+
+@dataclass(frozen=True)
+class JobItemSummary:
+    total: int
+    succeeded: int
+    failed: int
+    flagged: int
+
+
+def success_item(item_id: str, result: Any, flagged: bool = False) -> Dict[str, Any]:
+    return {"item_id": item_id, "status": JobItemStatus.SUCCESS.value, "flagged": flagged, "result": result, "error": None}
+
+
+def error_item(item_id: str, error: str) -> Dict[str, Any]:
+    return {"item_id": item_id, "status": JobItemStatus.ERROR.value, "flagged": False, "result": None, "error": error}
+
+
+def insert_items(db: Session, job_id: UUID, items: Iterable[Dict[str, Any]]) -> int:
+    """Insert ``success_item`` / ``error_item`` rows for *job_id*; does not commit."""
+    now = datetime.utcnow()
+    rows = [{**item, "job_id": job_id, "created_at": now} for item in items]
+    if rows:
+        db.execute(insert(JobItem.__table__), rows)
+    return len(rows)
+
+
+def summarize(db: Session, job_id: UUID) -> JobItemSummary:
+    """Item totals of a job in one aggregate query."""
+    succeeded = func.sum(case((JobItem.status == JobItemStatus.SUCCESS.value, 1), else_=0))
+    failed = func.sum(case((JobItem.status == JobItemStatus.ERROR.value, 1), else_=0))
+    flagged = func.sum(case((JobItem.flagged.is_(True), 1), else_=0))
+    row = db.execute(
+        select(func.count(JobItem.id), succeeded, failed, flagged).where(JobItem.job_id == job_id)
+    ).one()
+    return JobItemSummary(*(int(value or 0) for value in row))
+
+
+def flagged_item_ids(db: Session, job_id: UUID) -> List[str]:
+    """Ids of the job's flagged items, in insertion order."""
+    query = (
+        select(JobItem.item_id)
+        .where(JobItem.job_id == job_id, JobItem.flagged.is_(True))
+        .order_by(JobItem.id)
+    )
+    return list(db.scalars(query))
+
+
+def list_items(
+    db: Session,
+    job_id: UUID,
+    status: Optional[str] = None,
+    after: Optional[int] = None,
+    limit: int = 100,
+) -> Tuple[List[JobItem], Optional[int]]:
+    """One page of a job's items and the cursor (last row id) of the next page.
+
+    Raises ValueError for an unknown *status*.
+    """
+    query = db.query(JobItem).filter(JobItem.job_id == job_id)
+    if status is not None:
+        if status not in {s.value for s in JobItemStatus}:
+            raise ValueError(f"Unknown job item status: '{status}'")
+        query = query.filter(JobItem.status == status)
+    if after is not None:
+        query = query.filter(JobItem.id > after)
+    rows = query.order_by(JobItem.id).limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].id
+    return rows, None
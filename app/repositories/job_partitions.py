@@ -0,0 +1,109 @@
+"""Monthly range partitions of the ``jobs`` table (Postgres only).
+
+On Postgres ``jobs`` is range-partitioned on ``retention_month`` (the first
+day of the job's ``finished_at`` month, see ``app.models.job``):
+
+  - ``jobs_pYYYYMM``   one partition per finished month
+  - ``jobs_open``      unfinished jobs (``OPEN_RETENTION_MONTH``)
+  - ``jobs_retained``  rows kept past their month partition
+                       (``RETAINED_RETENTION_MONTH``)
+  - ``jobs_default``   catch-all for months without a partition yet
+
+Retention drops a whole expired month partition instead of deleting its
+rows: rows that must survive the drop are first moved to ``jobs_retained``.
+Other backends keep a plain table; ``is_partitioned`` is False there and
+retention falls back to batched deletes.
+"""
+
+import re
+from datetime import date
+from typing import List
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.orm import Session
+
+from app.models.job import Job, JobItem, RETAINED_RETENTION_MONTH
+
+_PARTITION_NAME = re.compile(r"^jobs_p(\d{4})(\d{2})$")
+
+
+def partition_name(month: date) -> str:
+    return f"jobs_p{month.year:04d}{month.month:02d}"
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('jobs'))"
+    )).scalar())
+
+
+def list_month_partitions(db: Session) -> List[date]:
+    """Months that currently have a ``jobs_pYYYYMM`` partition, oldest first."""
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass('jobs')"
+    )).scalars()
+    months = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def ensure_month_partitions(db: Session, start: date, months_ahead: int) -> List[date]:
+    """Create the month partitions from *start* through *months_ahead* months later.
+
+    Returns the months created.  A month whose rows already landed in
+    ``jobs_default`` cannot get its own partition; it is skipped and those
+    rows are cleaned up by the batched fallback.
+    """
+    existing = set(list_month_partitions(db))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(start, offset)
+        if month in existing:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(text(
+                    f"CREATE TABLE {partition_name(month)} PARTITION OF jobs "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                ))
+        except Exception:
+            continue
+        created.append(month)
+    db.commit()
+    return created
+
+
+def retain_rows(db: Session, month: date, keep) -> int:
+    """Move the rows of *month* matching *keep* to the retained partition."""
+    result = db.execute(
+        update(Job.__table__)
+        .where(Job.retention_month == month, keep)
+        .values(retention_month=RETAINED_RETENTION_MONTH)
+    )
+    return result.rowcount or 0
+
+
+def drop_month_partition(db: Session, month: date) -> None:
+    """Detach and drop the partition of *month*, with the items of its jobs.
+
+    ``job_items`` cannot reference the partitioned table, so the items are
+    deleted here rather than by cascade.  Commits.
+    """
+    name = partition_name(month)
+    db.execute(
+        delete(JobItem).where(JobItem.job_id.in_(select(Job.id).where(Job.retention_month == month)))
+    )
+    db.execute(text(f"ALTER TABLE jobs DETACH PARTITION {name}"))
+    db.execute(text(f"DROP TABLE {name}"))
+    db.commit()
@@ -5,6 +5,7 @@ from uuid import uuid4
 
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import commit_or_defer
 from app.models.orm.outage_event import OutageEventORM, CURRENT_SCHEMA_VERSION
 from app.models.outage_event import validate_event_detail
 
@@ -24,8 +25,7 @@ class OutageEventRepository:
             occurred_at=datetime.utcnow(),
         )
         self.db.add(orm)
-        self.db.commit()
-        self.db.refresh(orm)
+        commit_or_defer(self.db, orm)
         return orm
 
     def list_for_outage(
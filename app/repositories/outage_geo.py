@@ -0,0 +1,74 @@
+"""Map viewport queries over outage locations.
+
+``outages.location`` (JSON) is mirrored into typed ``latitude`` /
+``longitude`` columns plus a 12-character ``geohash`` on every repository
+write (``location_columns``).  A viewport filter is index-backed per
+backend:
+
+  postgres  ``ix_outages_location_gist`` is a GiST index on
+            ``point(longitude, latitude)`` (migration 0034); the filter is
+            ``point(...) <@ box(...)`` on the same expression.
+  other     the box is covered by a few geohash prefixes
+            (``app.utils.geohash.cover``), each an ``ix_outages_geohash``
+            range scan, and then trimmed by the exact lat/lon bounds.
+
+Clustering groups the matching rows by a geohash prefix whose length
+follows the map zoom, so the response size depends on the viewport, not on
+the number of outages.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.orm.outage import OutageORM
+from app.utils import geohash
+
+BBox = Tuple[float, float, float, float]  # (south, west, north, east)
+
+
+def location_columns(location: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Typed column values for a ``{"latitude", "longitude"}`` location."""
+    if not location or location.get("latitude") is None or location.get("longitude") is None:
+        return {"latitude": None, "longitude": None, "geohash": None}
+    latitude = float(location["latitude"])
+    longitude = float(location["longitude"])
+    return {"latitude": latitude, "longitude": longitude, "geohash": geohash.encode(latitude, longitude)}
+
+
+def _split_antimeridian(bbox: BBox) -> List[BBox]:
+    south, west, north, east = bbox
+    if west <= east:
+        return [bbox]
+    return [(south, west, north, 180.0), (south, -180.0, north, east)]
+
+
+def viewport_filter(db: Session, bbox: BBox) -> ColumnElement:
+    """WHERE clause matching outages located inside *bbox*.
+
+    A box whose west edge is east of its east edge crosses the antimeridian
+    and is split in two.
+    """
+    boxes = _split_antimeridian(bbox)
+    postgres = db.get_bind().dialect.name == "postgresql"
+    clauses = []
+    for i, (south, west, north, east) in enumerate(boxes):
+        exact = and_(
+            OutageORM.latitude.between(south, north),
+            OutageORM.longitude.between(west, east),
+        )
+        if postgres:
+            indexed = text(
+                f"point(longitude, latitude) <@ box(point(:w{i}, :s{i}), point(:e{i}, :n{i}))"
+            ).bindparams(**{f"s{i}": south, f"w{i}": west, f"n{i}": north, f"e{i}": east})
+        else:
+            indexed = or_(
+                *(
+                    and_(OutageORM.geohash >= prefix, OutageORM.geohash < prefix + geohash.PREFIX_END)
+                    for prefix in geohash.cover(south, west, north, east)
+                )
+            )
+        clauses.append(and_(indexed, exact))
+    return or_(*clauses)
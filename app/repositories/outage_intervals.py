@@ -0,0 +1,224 @@
+"""Interval queries over outages: overlap lookups and concurrency profiles.
+
+An outage is active over the half-open interval ``[detected_at,
+resolved_at)``; an outage without ``resolved_at`` is still open and its
+interval has no end.  Overlap lookups are index-backed per backend:
+
+  postgres  ``ix_outages_active_range`` is a GiST index on ``site_id`` and
+            the ``tsrange`` of that interval (migration 0033); the
+            overlap predicate ``&&`` uses the same expression, so it is an
+            index scan with or without a site filter.
+  other     an ``IntervalTree`` is built per site (and one over all sites)
+            from ``(id, site_id, detected_at, resolved_at)`` and cached
+            until the outages table version changes.
+
+``concurrency_profile`` turns the intervals overlapping a window into
+per-site, per-day peak concurrency with a sweep line over sorted start/end
+events, O(n log n) in the number of outages.
+"""
+
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.orm.outage import OutageORM
+from app.repositories.change_counter import table_version
+
+# Kept in step with alembic/versions/0033_outage_active_range_index.py.
+# ``outages`` stores naive UTC timestamps, so the range is a tsrange.
+ACTIVE_RANGE_SQL = (
+    "tsrange(detected_at, CASE WHEN resolved_at IS NULL THEN 'infinity'::timestamp "
+    "ELSE GREATEST(resolved_at, detected_at) END, '[)')"
+)
+
+_OPEN_END = datetime.max.replace(tzinfo=timezone.utc)
+_NO_END = datetime.min.replace(tzinfo=timezone.utc)
+_ALL_SITES = "*"
+
+_tree_cache: "weakref.WeakKeyDictionary[Engine, Dict[str, Tuple[str, IntervalTree]]]" = weakref.WeakKeyDictionary()
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True)
+class OutageInterval:
+    outage_id: str
+    site_id: Optional[str]
+    start: datetime
+    end: Optional[datetime]  # None while the outage is open
+
+    @property
+    def end_key(self) -> datetime:
+        return _OPEN_END if self.end is None else self.end
+
+
+@dataclass(frozen=True)
+class ConcurrencyPeak:
+    site_id: Optional[str]
+    day: date
+    peak_concurrent: int
+    peak_at: datetime
+
+
+def _interval(outage_id: str, site_id: Optional[str], detected_at, resolved_at) -> OutageInterval:
+    start = _as_utc(detected_at)
+    end = _as_utc(resolved_at)
+    return OutageInterval(outage_id, site_id, start, None if end is None else max(start, end))
+
+
+# --------------------------------------------------------------------------- #
+# Interval tree
+# --------------------------------------------------------------------------- #
+
+
+class IntervalTree:
+    """Static interval tree over half-open intervals.
+
+    Intervals are sorted by start and laid out as an implicit balanced
+    binary tree (each range's midpoint is its root) augmented with the
+    largest end in every subtree, so an overlap query visits
+    O(log n + k) nodes for k results.
+    """
+
+    def __init__(self, intervals: Iterable[OutageInterval]):
+        self._items = sorted(intervals, key=lambda iv: (iv.start, iv.outage_id))
+        self._max_end: List[datetime] = [_NO_END] * len(self._items)
+        self._build(0, len(self._items))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _build(self, lo: int, hi: int) -> datetime:
+        if lo >= hi:
+            return _NO_END
+        mid = (lo + hi) // 2
+        self._max_end[mid] = max(self._items[mid].end_key, self._build(lo, mid), self._build(mid + 1, hi))
+        return self._max_end[mid]
+
+    def overlapping(self, start: datetime, end: Optional[datetime] = None) -> List[OutageInterval]:
+        """Intervals overlapping ``[start, end)`` (``end`` None: no upper bound), by start."""
+        stop = end or _OPEN_END
+        found: List[OutageInterval] = []
+        stack = [(0, len(self._items))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_end[mid] <= start:
+                continue  # nothing in this subtree is still active at ``start``
+            stack.append((lo, mid))
+            item = self._items[mid]
+            if item.start < stop:
+                if item.end_key > start:
+                    found.append(item)
+                stack.append((mid + 1, hi))
+        found.sort(key=lambda iv: (iv.start, iv.outage_id))
+        return found
+
+
+def _tree_for(db: Session, site_id: Optional[str]) -> IntervalTree:
+    engine = db.get_bind()
+    per_site = _tree_cache.setdefault(engine, {})
+    key = site_id if site_id is not None else _ALL_SITES
+    version, _ = table_version(db, OutageORM.__tablename__)
+    cached = per_site.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    query = select(OutageORM.id, OutageORM.site_id, OutageORM.detected_at, OutageORM.resolved_at)
+    if site_id is not None:
+        query = query.where(OutageORM.site_id == site_id)
+    tree = IntervalTree(_interval(*row) for row in db.execute(query))
+    per_site[key] = (version, tree)
+    return tree
+
+
+# --------------------------------------------------------------------------- #
+# Queries
+# --------------------------------------------------------------------------- #
+
+
+def overlapping_intervals(
+    db: Session, start: datetime, end: Optional[datetime] = None, site_id: Optional[str] = None
+) -> List[OutageInterval]:
+    """Outage intervals overlapping ``[start, end)``, ordered by start."""
+    start = _as_utc(start)
+    end = _as_utc(end)
+    if end is not None and end < start:
+        end = start
+    if db.get_bind().dialect.name != "postgresql":
+        return _tree_for(db, site_id).overlapping(start, end)
+
+    query = select(OutageORM.id, OutageORM.site_id, OutageORM.detected_at, OutageORM.resolved_at).where(
+        text(f"{ACTIVE_RANGE_SQL} && tsrange(:window_start, :window_end, '[)')").bindparams(
+            window_start=start.replace(tzinfo=None),
+            window_end=end.replace(tzinfo=None) if end is not None else None,
+        )
+    )
+    if site_id is not None:
+        query = query.where(OutageORM.site_id == site_id)
+    query = query.order_by(OutageORM.detected_at.asc(), OutageORM.id.asc())
+    return [_interval(*row) for row in db.execute(query)]
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _record_segment(peaks: Dict[date, Tuple[int, datetime]], start: datetime, end: datetime, count: int) -> None:
+    at = start
+    while at < end:
+        day = at.date()
+        best = peaks.get(day)
+        if best is None or count > best[0]:
+            peaks[day] = (count, at)
+        at = _day_start(day + timedelta(days=1))
+
+
+def concurrency_profile(
+    intervals: Iterable[OutageInterval], start: datetime, end: datetime
+) -> List[ConcurrencyPeak]:
+    """Peak concurrent outages per site per UTC day within ``[start, end)``.
+
+    Each interval is clipped to the window and contributes a +1 event at its
+    start and a -1 event at its end; sorting the events (ends before starts
+    at the same instant, as intervals are half-open) and walking them once
+    gives the active count between consecutive events.  Site-days with no
+    active outage are omitted; ``peak_at`` is when the day's peak began.
+    """
+    start = _as_utc(start)
+    end = _as_utc(end)
+    events: Dict[Optional[str], List[Tuple[datetime, int]]] = defaultdict(list)
+    for interval in intervals:
+        clipped_start = max(interval.start, start)
+        clipped_end = min(interval.end_key, end)
+        if clipped_start < clipped_end:
+            events[interval.site_id].append((clipped_start, 1))
+            events[interval.site_id].append((clipped_end, -1))
+
+    profile: List[ConcurrencyPeak] = []
+    for site_id in sorted(events, key=lambda s: (s is None, s or "")):
+        site_events = sorted(events[site_id])
+        peaks: Dict[date, Tuple[int, datetime]] = {}
+        active = 0
+        previous: Optional[datetime] = None
+        for at, delta in site_events:
+            if active and previous is not None and at > previous:
+                _record_segment(peaks, previous, at, active)
+            active += delta
+            previous = at
+        profile.extend(
+            ConcurrencyPeak(site_id, day, count, peak_at) for day, (count, peak_at) in sorted(peaks.items())
+        )
+    return profile
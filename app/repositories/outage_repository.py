@@ -1,13 +1,66 @@
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
-
-from sqlalchemy import and_, asc, desc, or_
+import base64
+import hashlib
+import io
+import json
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import and_, asc, desc, func, insert, or_, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.cache_governance import CacheGovernance, CacheKeyBuilder, CacheKeyNamespace
+from app.core.config import settings
+from app.db.unit_of_work import after_commit, commit_or_defer
+
 from app.models.enums import OutageStatus, Severity
 from app.models.orm.outage import OutageORM
-from app.models.outage import Outage, Location, SLAStatus
+from app.models.outage import Outage, Location, OutageSearchHit, SLAStatus
 from app.models.outage_dto import OutageCreate, OutageSortDirection, OutageSortField, OutageUpdate
+from app.models.site_hierarchy import SiteHierarchy, SiteHierarchyClosure
+from app.repositories.change_counter import record_local_write, table_version
+from app.repositories.outage_geo import BBox, location_columns, viewport_filter
+from app.repositories.outage_intervals import ConcurrencyPeak, concurrency_profile, overlapping_intervals
+from app.repositories.outage_search import ranked_search, search_predicate
+from app.repositories.site_rollups import apply_outage_changes, orm_contribution, outage_contribution
+from app.utils.cache import TTLCache
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite drops tzinfo on DateTime(timezone=True) columns; values are stored as UTC.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _normalize_text(value: Optional[str]) -> str:
+    return unicodedata.normalize("NFC", value or "").strip()
+
+
+def outage_content_hash(
+    site_name: str, detected_at: datetime, description: str, site_id: Optional[str] = None
+) -> str:
+    """Normalized hash of the duplicate-detection key.
+
+    Covers (site_name, detected_at, description, site_id): text is NFC
+    normalized and stripped, ``detected_at`` is compared in UTC and a
+    missing ``site_id`` hashes as empty.  Kept in step with the backfill in
+    alembic/versions/0028_outage_content_hash.py.
+    """
+    detected = _as_utc(detected_at)
+    parts = [
+        _normalize_text(site_name),
+        detected.astimezone(timezone.utc).isoformat() if detected else "",
+        _normalize_text(description),
+        _normalize_text(site_id),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _payload_hash(payload: OutageCreate) -> str:
+    return outage_content_hash(payload.site_name, payload.detected_at, payload.description, payload.site_id)
 
 
 def _orm_to_pydantic(orm: OutageORM) -> Outage:
@@ -25,8 +78,8 @@ def _orm_to_pydantic(orm: OutageORM) -> Outage:
         site_id=orm.site_id,
         severity=orm.severity,
         status=orm.status,
-        detected_at=orm.detected_at,
-        resolved_at=orm.resolved_at,
+        detected_at=_as_utc(orm.detected_at),
+        resolved_at=_as_utc(orm.resolved_at),
         description=orm.description,
         affected_services=orm.affected_services or [],
         affected_subscribers=orm.affected_subscribers,
@@ -37,6 +90,23 @@ def _orm_to_pydantic(orm: OutageORM) -> Outage:
     )
 
 
+def _copy_field(value: Any) -> str:
+    """Encode one value for Postgres ``COPY ... (FORMAT csv)``; unquoted empty is NULL."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        text = value.isoformat()
+    elif isinstance(value, list):
+        text = "{" + ",".join(
+            '"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"' for item in value
+        ) + "}"
+    elif isinstance(value, dict):
+        text = json.dumps(value)
+    else:
+        text = str(value)
+    return '"' + text.replace('"', '""') + '"'
+
+
 ALLOWED_STATUS_TRANSITIONS = {
     OutageStatus.open.value: {OutageStatus.open.value, OutageStatus.resolved.value},
     OutageStatus.resolved.value: {OutageStatus.resolved.value},
@@ -45,22 +115,97 @@ ALLOWED_STATUS_TRANSITIONS = {
 OUTAGE_SORT_FIELDS = {"detected_at", "site_name", "severity", "status", "id"}
 
 
+# Filtered-count cache for listings that do not ask for an exact total.
+_count_cache = TTLCache(
+    ttl_seconds=CacheGovernance.enforce_ttl(CacheKeyNamespace.OUTAGE, settings.OUTAGE_LIST_COUNT_CACHE_SECONDS)
+)
+
+
+def _record_write() -> None:
+    _count_cache.invalidate_prefix(CacheKeyBuilder.build(CacheKeyNamespace.OUTAGE, "count"))
+    record_local_write(OutageORM.__tablename__)
+
+
+def _encode_cursor(
+    sort_by: OutageSortField, direction: OutageSortDirection, value: Any, outage_id: str
+) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps({"s": sort_by.value, "d": direction.value, "v": value, "id": outage_id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_by: OutageSortField, direction: OutageSortDirection) -> Tuple[Any, str]:
+    """Return ``(last_sort_value, last_id)`` from a listing cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value, outage_id = data["v"], str(data["id"])
+        if data["s"] != sort_by.value or data["d"] != direction.value:
+            raise ValueError("cursor was issued for a different sort order")
+        if sort_by == OutageSortField.detected_at:
+            value = datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise ValueError(f"Invalid cursor: {exc}") from exc
+    except (KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    return value, outage_id
+
+
+ContentKey = Tuple[str, datetime, str]
+
+
+def _content_key(payload: OutageCreate) -> ContentKey:
+    return (payload.site_name, payload.detected_at, payload.description)
+
+
+@dataclass
+class PendingOutageIndex:
+    """Payloads accepted for insert earlier in the same batch.
+
+    Applies the ``check_duplicate`` rules to rows that are not stored yet,
+    so a batch containing the same outage twice inserts it once.  Rows are
+    matched on the normalized content hash that ``uq_outages_content_hash``
+    enforces; a row without a site also matches on the raw key, as
+    ``check_duplicate`` does.
+    """
+    by_id: Dict[str, OutageCreate] = field(default_factory=dict)
+    by_hash: Dict[str, OutageCreate] = field(default_factory=dict)
+    by_content: Dict[ContentKey, List[OutageCreate]] = field(default_factory=dict)
+
+    def add(self, payload: OutageCreate) -> None:
+        self.by_id[payload.id] = payload
+        self.by_hash.setdefault(_payload_hash(payload), payload)
+        self.by_content.setdefault(_content_key(payload), []).append(payload)
+
+    def match(self, payload: OutageCreate) -> Tuple[Optional[str], Optional[str]]:
+        """Return ``(existing_id, conflict)`` against rows already accepted."""
+        earlier = self.by_id.get(payload.id)
+        if earlier is not None:
+            if earlier == payload:
+                return earlier.id, None
+            return None, f"Outage with id '{payload.id}' already exists with different content"
+        candidate = self.by_hash.get(_payload_hash(payload))
+        if candidate is not None:
+            return candidate.id, None
+        candidates = self.by_content.get(_content_key(payload)) if not payload.site_id else None
+        if candidates:
+            return candidates[0].id, None
+        return None, None
+
+
 class OutageRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def list(
+    def _filtered_query(
         self,
         severity: Optional[Severity] = None,
         status: Optional[OutageStatus] = None,
         search: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        page: int = 1,
-        page_size: int = 20,
-        sort_by: OutageSortField = OutageSortField.detected_at,
-        sort_direction: OutageSortDirection = OutageSortDirection.desc,
-    ) -> dict:
+    ):
         query = self.db.query(OutageORM)
 
         if severity:
@@ -69,34 +214,140 @@ class OutageRepository:
             query = query.filter(OutageORM.status == status.value)
 
         if search:
-            search_filter = or_(
-                OutageORM.id.ilike(f"%{search}%"),
-                OutageORM.site_id.ilike(f"%{search}%"),
-                OutageORM.site_name.ilike(f"%{search}%"),
-            )
-            query = query.filter(search_filter)
+            # Trigram (Postgres) / FTS5 (SQLite) index when installed.
+            query = query.filter(search_predicate(self.db, search))
 
         if start_date:
             query = query.filter(OutageORM.detected_at >= start_date)
         if end_date:
             query = query.filter(OutageORM.detected_at <= end_date)
+        return query
+
+    def list(
+        self,
+        severity: Optional[Severity] = None,
+        status: Optional[OutageStatus] = None,
+        search: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        page: int = 1,
+        page_size: int = 20,
+        sort_by: OutageSortField = OutageSortField.detected_at,
+        sort_direction: OutageSortDirection = OutageSortDirection.desc,
+        cursor: Optional[str] = None,
+        exact_total: bool = False,
+    ) -> dict:
+        """Return one page of outages.
+
+        With ``cursor`` (the ``next_cursor`` of the previous page) the page
+        is located with a keyset predicate on ``(sort column, id)`` instead
+        of ``OFFSET``.  ``total`` is only counted exactly when
+        ``exact_total`` is set; otherwise it comes from ``estimate_count``.
+        Raises ``ValueError`` for a malformed or mismatched cursor.
+        """
+        filters = dict(severity=severity, status=status, search=search, start_date=start_date, end_date=end_date)
+        query = self._filtered_query(**filters)
 
         sort_column = getattr(OutageORM, sort_by.value)
-        direction_fn = asc if sort_direction == OutageSortDirection.asc else desc
-        query = query.order_by(direction_fn(sort_column), OutageORM.id.asc())
+        descending = sort_direction == OutageSortDirection.desc
+        direction_fn = desc if descending else asc
 
-        total = query.count()
-        items = query.offset((page - 1) * page_size).limit(page_size).all()
+        if cursor:
+            last_value, last_id = _decode_cursor(cursor, sort_by, sort_direction)
+            if sort_by == OutageSortField.id:
+                query = query.filter(OutageORM.id > last_id)
+            else:
+                past_value = sort_column < last_value if descending else sort_column > last_value
+                query = query.filter(or_(past_value, and_(sort_column == last_value, OutageORM.id > last_id)))
+        elif page > 1:
+            query = query.offset((page - 1) * page_size)
+
+        if sort_by == OutageSortField.id:
+            query = query.order_by(asc(OutageORM.id))
+        else:
+            query = query.order_by(direction_fn(sort_column), OutageORM.id.asc())
+        rows = query.limit(page_size + 1).all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        next_cursor = None
+        if has_more and rows:
+            last = rows[-1]
+            next_cursor = _encode_cursor(sort_by, sort_direction, getattr(last, sort_by.value), last.id)
+
+        if exact_total:
+            total, estimated = self._filtered_query(**filters).count(), False
+        else:
+            total, estimated = self.estimate_count(**filters)
 
         return {
-            "items": [_orm_to_pydantic(o) for o in items],
+            "items": [_orm_to_pydantic(o) for o in rows],
             "total": total,
             "page": page,
             "page_size": page_size,
             "sort_by": sort_by.value,
             "sort_direction": sort_direction.value,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+            "total_is_estimate": estimated,
         }
 
+    def estimate_count(self, **filters: Any) -> Tuple[int, bool]:
+        """Return ``(count, is_estimate)`` for a filtered listing.
+
+        On Postgres the planner's row estimate is used and only small
+        results (below ``OUTAGE_LIST_EXACT_COUNT_MAX_ESTIMATE``) are counted
+        exactly.  Other backends have no usable estimate, so the exact count
+        is cached for ``OUTAGE_LIST_COUNT_CACHE_SECONDS``.
+        """
+        query = self._filtered_query(**filters)
+        if self.db.get_bind().dialect.name == "postgresql":
+            estimate = self._planner_estimate(query)
+            if estimate is not None and estimate >= settings.OUTAGE_LIST_EXACT_COUNT_MAX_ESTIMATE:
+                return estimate, True
+            return query.count(), False
+
+        key = CacheKeyBuilder.build(
+            CacheKeyNamespace.OUTAGE,
+            "count",
+            json.dumps(filters, sort_keys=True, default=str),
+        )
+        cached = _count_cache.get(key)
+        if cached is not None:
+            return cached, True
+        total = query.count()
+        _count_cache.set(key, total)
+        return total, False
+
+    def _planner_estimate(self, query) -> Optional[int]:
+        # Sent as driver SQL: text() would escape the %(name)s placeholders.
+        compiled = query.statement.compile(
+            dialect=self.db.get_bind().dialect, compile_kwargs={"render_postcompile": True}
+        )
+        try:
+            # A failed EXPLAIN only rolls back the savepoint, so the exact
+            # count fallback still runs in a usable transaction.
+            with self.db.begin_nested():
+                plan = self.db.connection().exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+                ).scalar()
+        except Exception:
+            return None
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def search(self, term: str, limit: int = 20) -> List[OutageSearchHit]:
+        """Ranked id/site search; exact and prefix id matches come first."""
+        return [
+            OutageSearchHit(outage=_orm_to_pydantic(orm), match=match)
+            for orm, match in ranked_search(self.db, term, limit)
+        ]
+
+    def table_version(self) -> Tuple[str, Optional[datetime]]:
+        """Current ``(version, changed_at)`` of the outages table."""
+        return table_version(self.db, OutageORM.__tablename__)
+
     def list_all(self) -> List[Outage]:
         rows = self.db.query(OutageORM).all()
         return [_orm_to_pydantic(r) for r in rows]
@@ -109,24 +360,114 @@ class OutageRepository:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
     ) -> List[Outage]:
-        query = self.db.query(OutageORM)
-        if severity:
-            query = query.filter(OutageORM.severity == severity.value)
+        query = self._filtered_query(severity, status, search, start_date, end_date)
+        return [_orm_to_pydantic(r) for r in query.all()]
+
+    def list_in_site_subtree(
+        self,
+        site_id: int,
+        status: Optional[OutageStatus] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Outage]:
+        """Outages of hierarchy node *site_id* and all its descendants, newest first.
+
+        Joins through ``site_hierarchy_closure``, so the whole subtree is
+        resolved by one indexed lookup on the ancestor id.
+        """
+        query = (
+            self.db.query(OutageORM)
+            .join(SiteHierarchy, SiteHierarchy.site_code == OutageORM.site_id)
+            .join(SiteHierarchyClosure, SiteHierarchyClosure.descendant_id == SiteHierarchy.id)
+            .filter(SiteHierarchyClosure.ancestor_id == site_id)
+        )
         if status:
             query = query.filter(OutageORM.status == status.value)
-        if search:
-            query = query.filter(
-                or_(
-                    OutageORM.id.ilike(f"%{search}%"),
-                    OutageORM.site_id.ilike(f"%{search}%"),
-                    OutageORM.site_name.ilike(f"%{search}%"),
-                )
+        rows = query.order_by(OutageORM.detected_at.desc(), OutageORM.id.desc()).offset(offset).limit(limit).all()
+        return [_orm_to_pydantic(r) for r in rows]
+
+    def overlapping(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        site_id: Optional[str] = None,
+        exclude_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Outage]:
+        """Outages active at any point in ``[start, end)``, earliest first.
+
+        ``end=None`` leaves the window open-ended.  Uses the range index
+        (Postgres) or the cached per-site interval tree, see
+        ``app.repositories.outage_intervals``.
+        """
+        intervals = [
+            iv for iv in overlapping_intervals(self.db, start, end, site_id) if iv.outage_id != exclude_id
+        ][:limit]
+        if not intervals:
+            return []
+        rows = {
+            orm.id: orm
+            for orm in self.db.query(OutageORM).filter(OutageORM.id.in_([iv.outage_id for iv in intervals]))
+        }
+        return [_orm_to_pydantic(rows[iv.outage_id]) for iv in intervals if iv.outage_id in rows]
+
+    def concurrency_profile(
+        self, start: datetime, end: datetime, site_id: Optional[str] = None
+    ) -> List[ConcurrencyPeak]:
+        """Peak concurrent outages per site per UTC day in ``[start, end)``."""
+        start, end = _as_utc(start), _as_utc(end)
+        if end <= start:
+            raise ValueError("end must be after start")
+        if end - start > timedelta(days=settings.OUTAGE_CONCURRENCY_MAX_DAYS):
+            raise ValueError(f"Window may span at most {settings.OUTAGE_CONCURRENCY_MAX_DAYS} days")
+        return concurrency_profile(overlapping_intervals(self.db, start, end, site_id), start, end)
+
+    def _viewport_query(self, bbox: BBox, status: Optional[OutageStatus] = None):
+        query = self.db.query(OutageORM).filter(viewport_filter(self.db, bbox))
+        if status:
+            query = query.filter(OutageORM.status == status.value)
+        return query
+
+    def in_viewport(
+        self, bbox: BBox, status: Optional[OutageStatus] = None, limit: int = 500
+    ) -> List[Outage]:
+        """Outages located inside ``(south, west, north, east)``, newest first."""
+        rows = (
+            self._viewport_query(bbox, status)
+            .order_by(OutageORM.detected_at.desc(), OutageORM.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [_orm_to_pydantic(r) for r in rows]
+
+    def count_in_viewport(self, bbox: BBox, status: Optional[OutageStatus] = None) -> int:
+        return self._viewport_query(bbox, status).with_entities(func.count(OutageORM.id)).scalar() or 0
+
+    def cluster_viewport(
+        self, bbox: BBox, precision: int, status: Optional[OutageStatus] = None
+    ) -> List[Dict[str, Any]]:
+        """Outage counts per geohash cell of *precision* inside the viewport.
+
+        Each cluster carries the mean position of its outages, so markers sit
+        where the outages are rather than at cell centres.
+        """
+        cell = func.substr(OutageORM.geohash, 1, precision)
+        rows = (
+            self._viewport_query(bbox, status)
+            .with_entities(
+                cell.label("cell"),
+                func.count(OutageORM.id),
+                func.avg(OutageORM.latitude),
+                func.avg(OutageORM.longitude),
             )
-        if start_date:
-            query = query.filter(OutageORM.detected_at >= start_date)
-        if end_date:
-            query = query.filter(OutageORM.detected_at <= end_date)
-        return [_orm_to_pydantic(r) for r in query.all()]
+            .group_by(cell)
+            .order_by(cell)
+            .all()
+        )
+        return [
+            {"geohash": c, "count": int(n), "latitude": float(lat), "longitude": float(lon)}
+            for c, n, lat, lon in rows
+        ]
 
     def get(self, outage_id: str) -> Optional[Outage]:
         row = self.db.query(OutageORM).filter(OutageORM.id == outage_id).first()
@@ -134,6 +475,12 @@ class OutageRepository:
             return None
         return _orm_to_pydantic(row)
 
+    def get_with_updated_at(self, outage_id: str) -> Optional[Tuple[Outage, Optional[datetime]]]:
+        orm = self.get_orm(outage_id)
+        if not orm:
+            return None
+        return _orm_to_pydantic(orm), _as_utc(orm.updated_at)
+
     def get_orm(self, outage_id: str) -> Optional[OutageORM]:
         return self.db.query(OutageORM).filter(OutageORM.id == outage_id).first()
 
@@ -153,16 +500,26 @@ class OutageRepository:
             raise ValueError(f"Invalid status transition: {current_status} -> {next_status}")
 
     def _find_duplicate_orm(self, payload: OutageCreate) -> Optional[OutageORM]:
-        query = self.db.query(OutageORM).filter(
-            and_(
-                OutageORM.site_name == payload.site_name,
-                OutageORM.detected_at == payload.detected_at,
-                OutageORM.description == payload.description,
+        # Indexed equality on the content hash covers the exact key.
+        duplicate = (
+            self.db.query(OutageORM)
+            .filter(OutageORM.content_hash == _payload_hash(payload))
+            .first()
+        )
+        if duplicate is not None or payload.site_id:
+            return duplicate
+        # Without a site_id, the same content at any site is a duplicate.
+        return (
+            self.db.query(OutageORM)
+            .filter(
+                and_(
+                    OutageORM.site_name == payload.site_name,
+                    OutageORM.detected_at == payload.detected_at,
+                    OutageORM.description == payload.description,
+                )
             )
+            .first()
         )
-        if payload.site_id:
-            query = query.filter(OutageORM.site_id == payload.site_id)
-        return query.first()
 
     @staticmethod
     def _is_same_outage(orm: OutageORM, payload: OutageCreate) -> bool:
@@ -172,7 +529,7 @@ class OutageRepository:
             and orm.site_id == payload.site_id
             and orm.severity == payload.severity.value
             and orm.status == payload.status.value
-            and orm.detected_at == payload.detected_at
+            and _as_utc(orm.detected_at) == payload.detected_at
             and orm.description == payload.description
             and (orm.affected_services or []) == payload.affected_services
             and orm.affected_subscribers == payload.affected_subscribers
@@ -217,9 +574,21 @@ class OutageRepository:
             assigned_to=payload.assigned_to,
             created_by=payload.created_by,
             location=location_data,
+            content_hash=_payload_hash(payload),
+            **location_columns(location_data),
         )
         self.db.add(orm)
-        self.db.commit()
+        try:
+            apply_outage_changes(self.db, [(None, orm_contribution(orm))])
+            self.db.commit()
+        except IntegrityError:
+            # A concurrent writer inserted the same content first.
+            self.db.rollback()
+            existing = self.check_duplicate(payload)
+            if existing:
+                return existing, False
+            raise
+        _record_write()
         self.db.refresh(orm)
         return _orm_to_pydantic(orm), True
 
@@ -227,14 +596,183 @@ class OutageRepository:
         outage, _ = self.create_or_get_existing(payload)
         return outage
 
-    def bulk_create(self, outages: List[OutageCreate]) -> List[Outage]:
-        return [self.create(payload) for payload in outages]
+    # ------------------------------------------------------------------ #
+    # Set-based bulk primitives                                           #
+    # ------------------------------------------------------------------ #
+
+    def resolve_duplicates(
+        self, payloads: Sequence[OutageCreate]
+    ) -> List[Tuple[Optional[OutageORM], Optional[str]]]:
+        """Resolve id and content duplicates for a chunk in one round trip.
+
+        Applies the same rules as ``check_duplicate`` to every payload and
+        returns ``(existing, conflict)`` per payload, in input order:
+        ``existing`` is the matching stored outage, ``conflict`` an error
+        message when the id is taken by an outage with different content.
+        Content matches are an indexed ``content_hash`` lookup; only payloads
+        without a ``site_id`` also probe the raw content key.
+        """
+        if not payloads:
+            return []
+        hashes = [_payload_hash(p) for p in payloads]
+        predicates = [
+            OutageORM.id.in_(list({p.id for p in payloads})),
+            OutageORM.content_hash.in_(list(set(hashes))),
+        ]
+        siteless_keys = list({_content_key(p) for p in payloads if not p.site_id})
+        if siteless_keys:
+            predicates.append(
+                tuple_(OutageORM.site_name, OutageORM.detected_at, OutageORM.description).in_(siteless_keys)
+            )
+        candidates = (
+            self.db.query(OutageORM)
+            .filter(or_(*predicates))
+            .order_by(OutageORM.id.asc())
+            .all()
+        )
+
+        by_id = {orm.id: orm for orm in candidates}
+        by_hash: Dict[str, OutageORM] = {}
+        by_content: Dict[tuple, OutageORM] = {}
+        for orm in candidates:
+            if orm.content_hash:
+                by_hash.setdefault(orm.content_hash, orm)
+            by_content.setdefault((orm.site_name, _as_utc(orm.detected_at), orm.description), orm)
+
+        resolved: List[Tuple[Optional[OutageORM], Optional[str]]] = []
+        for payload, content_hash in zip(payloads, hashes):
+            existing = by_id.get(payload.id)
+            if existing is not None:
+                if self._is_same_outage(existing, payload):
+                    resolved.append((existing, None))
+                else:
+                    resolved.append((None, f"Outage with id '{payload.id}' already exists with different content"))
+                continue
+            match = by_hash.get(content_hash)
+            if match is None and not payload.site_id:
+                match = by_content.get(_content_key(payload))
+            resolved.append((match, None))
+        return resolved
+
+    @staticmethod
+    def _insert_values(payload: OutageCreate, now: datetime) -> Dict[str, Any]:
+        location = payload.location.model_dump() if payload.location else None
+        return {
+            "id": payload.id,
+            "site_name": payload.site_name,
+            "site_id": payload.site_id,
+            "severity": payload.severity.value,
+            "status": payload.status.value,
+            "detected_at": payload.detected_at,
+            "resolved_at": payload.resolved_at,
+            "description": payload.description,
+            "affected_services": list(payload.affected_services),
+            "affected_subscribers": payload.affected_subscribers,
+            "assigned_to": payload.assigned_to,
+            "created_by": payload.created_by,
+            "location": location,
+            "content_hash": _payload_hash(payload),
+            "created_at": now,
+            "updated_at": now,
+            **location_columns(location),
+        }
+
+    def insert_many(self, payloads: Sequence[OutageCreate]) -> None:
+        """Insert new outages in one statement without committing.
+
+        Uses ``executemany`` (batched multi-row INSERT) and, on Postgres,
+        switches to ``COPY`` once a chunk reaches
+        ``OUTAGE_IMPORT_COPY_MIN_ROWS``.  The site rollups are updated in
+        the same transaction.  Callers own the transaction.
+        """
+        if not payloads:
+            return
+        now = datetime.now(timezone.utc)
+        rows = [self._insert_values(p, now) for p in payloads]
+        bind = self.db.get_bind()
+        if bind.dialect.name == "postgresql" and len(rows) >= settings.OUTAGE_IMPORT_COPY_MIN_ROWS:
+            self._copy_rows(rows)
+        else:
+            self.db.execute(insert(OutageORM), rows)
+        apply_outage_changes(
+            self.db,
+            [(None, outage_contribution(p.site_id, p.severity.value, p.status.value, None)) for p in payloads],
+        )
+        _record_write()
+
+    def _copy_rows(self, rows: List[Dict[str, Any]]) -> None:
+        columns = list(rows[0].keys())
+        lines = [",".join(_copy_field(row[col]) for col in columns) for row in rows]
+        buffer = io.StringIO("\n".join(lines) + "\n")
+        # The DBAPI connection is the one bound to the session transaction,
+        # so COPY commits or rolls back together with the rest of the import.
+        dbapi_conn = self.db.connection().connection
+        with dbapi_conn.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {OutageORM.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+
+    def bulk_create_or_get_existing(
+        self, payloads: Sequence[OutageCreate], return_minimal: bool = False
+    ) -> List[Tuple[Union[Outage, str], bool]]:
+        """Set-based ``create_or_get_existing`` for a whole batch.
+
+        Duplicates are resolved with one query, every new row is inserted in
+        a single transaction and one commit, and ``(outage, persisted)`` is
+        returned per payload in input order.  Any id conflict raises
+        ``ValueError`` before anything is written.  With ``return_minimal``
+        the outage ids are returned instead of ``Outage`` models, skipping
+        the reload and pydantic conversion.
+        """
+        pending = PendingOutageIndex()
+        plan: List[Tuple[str, bool]] = []
+        new_rows: List[OutageCreate] = []
+        existing_orms: Dict[str, OutageORM] = {}
+        for payload, (existing, conflict) in zip(payloads, self.resolve_duplicates(payloads)):
+            if conflict:
+                raise ValueError(conflict)
+            if existing is not None:
+                existing_orms[existing.id] = existing
+                plan.append((existing.id, False))
+                continue
+            earlier_id, conflict = pending.match(payload)
+            if conflict:
+                raise ValueError(conflict)
+            if earlier_id:
+                plan.append((earlier_id, False))
+                continue
+            pending.add(payload)
+            new_rows.append(payload)
+            plan.append((payload.id, True))
+
+        try:
+            self.insert_many(new_rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        if return_minimal:
+            return plan
+
+        outages: Dict[str, Outage] = {oid: _orm_to_pydantic(orm) for oid, orm in existing_orms.items()}
+        if new_rows:
+            created = self.db.query(OutageORM).filter(OutageORM.id.in_([p.id for p in new_rows])).all()
+            outages.update({orm.id: _orm_to_pydantic(orm) for orm in created})
+        return [(outages[oid], persisted) for oid, persisted in plan]
+
+    def bulk_create(
+        self, outages: Sequence[OutageCreate], return_minimal: bool = False
+    ) -> Union[List[Outage], List[str]]:
+        return [outage for outage, _ in self.bulk_create_or_get_existing(outages, return_minimal=return_minimal)]
 
     def update(self, outage_id: str, payload: OutageUpdate) -> Optional[Outage]:
         orm = self.get_orm(outage_id)
         if not orm:
             return None
 
+        before = orm_contribution(orm)
         update_data = payload.model_dump(exclude_unset=True)
         if "status" in update_data and update_data["status"] is not None:
             next_status = update_data["status"]
@@ -249,16 +787,39 @@ class OutageRepository:
             else:
                 setattr(orm, key, value)
 
+        if {"site_name", "description"} & update_data.keys():
+            self._rehash(orm)
+        if "location" in update_data:
+            for key, value in location_columns(orm.location).items():
+                setattr(orm, key, value)
         orm.updated_at = datetime.now(timezone.utc)
+        apply_outage_changes(self.db, [(before, orm_contribution(orm))])
         self.db.commit()
+        _record_write()
         self.db.refresh(orm)
         return _orm_to_pydantic(orm)
 
+    def _rehash(self, orm: OutageORM) -> None:
+        """Recompute ``content_hash`` after the content key changed.
+
+        If another outage already owns the new hash the row keeps a NULL
+        hash, which the partial unique index permits.
+        """
+        new_hash = outage_content_hash(orm.site_name, orm.detected_at, orm.description, orm.site_id)
+        taken = (
+            self.db.query(OutageORM.id)
+            .filter(OutageORM.content_hash == new_hash, OutageORM.id != orm.id)
+            .first()
+        )
+        orm.content_hash = None if taken else new_hash
+
     def delete(self, outage_id: str) -> None:
         orm = self.get_orm(outage_id)
         if orm:
+            apply_outage_changes(self.db, [(orm_contribution(orm), None)])
             self.db.delete(orm)
             self.db.commit()
+            _record_write()
 
     def resolve(self, outage_id: str, mttr_minutes: int) -> Optional[Outage]:
         orm = self.get_orm_locked(outage_id)
@@ -270,12 +831,14 @@ class OutageRepository:
             return _orm_to_pydantic(orm)
 
         self.validate_status_transition(orm.status, OutageStatus.resolved.value)
+        before = orm_contribution(orm)
         orm.status = OutageStatus.resolved.value
         orm.mttr_minutes = mttr_minutes
         orm.resolved_at = datetime.now(timezone.utc)
         orm.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(orm)
+        apply_outage_changes(self.db, [(before, orm_contribution(orm))])
+        commit_or_defer(self.db, orm)
+        after_commit(self.db, _record_write)
         return _orm_to_pydantic(orm)
 
     def list_violations(self) -> List[dict]:
@@ -301,11 +864,6 @@ class OutageRepository:
 
         return violations
 
-
-class OutageRepository:
-    def __init__(self, db_session: Any = None):
-        self.db = db_session
-
     def get_raw_outage_events(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
         """
         Retrieves root infrastructure downtime events within a window.
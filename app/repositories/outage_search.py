@@ -0,0 +1,183 @@
+"""Indexed substring search over outage ids and sites.
+
+The ``search`` filter matches ``id``, ``site_id`` and ``site_name``
+case-insensitively by substring.  Three leading-wildcard ``ILIKE`` probes
+force a sequential scan, so each backend gets a dedicated index instead:
+
+  postgres  ``outages.search_text`` is a generated, lower-cased
+            ``id site_id site_name`` column with a ``pg_trgm`` GIN index
+            (migration 0027); ``ILIKE`` on it is index-assisted and results
+            are ranked by ``similarity()``.
+  sqlite    ``outages_search`` is an FTS5 table with the ``trigram``
+            tokenizer, kept in sync by triggers on insert, update and
+            delete; results are ranked by ``bm25``.
+
+Each FTS row carries the outage's rowid as its own (migration 0040), so the
+triggers update and delete by rowid instead of scanning the FTS table for
+``id`` (a plain FTS5 column is not indexed).  The table stores its own
+copy of the text rather than being an external-content one because
+``outages`` has no INTEGER PRIMARY KEY, so its rowids are not stable
+across ``VACUUM``; the triggers also match ``id``, so after a ``VACUUM``
+they never remove another outage's row, and ``install_sqlite_search``
+re-keys the table.
+
+Id prefix hits use ``LIKE 'term%'``: on Postgres through the
+``text_pattern_ops`` index (migration 0040), which is correct under any
+collation; on SQLite within a primary-key range, since its ``BINARY``
+collation orders by bytes.
+
+When neither index exists (e.g. a schema built with ``create_all``) or the
+term is shorter than a trigram, the original ``ILIKE`` predicates are used.
+"""
+
+import weakref
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, inspect, literal_column, or_, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.orm.outage import OutageORM
+
+SEARCH_TABLE = "outages_search"
+TRIGRAM_MIN_LENGTH = 3
+
+BACKEND_TRIGRAM = "pg_trgm"
+BACKEND_FTS5 = "fts5"
+
+# Kept in step with alembic/versions/0040_outage_search_rowid.py.
+SQLITE_SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+    "USING fts5(id, site_id, site_name, tokenize='trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON outages BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, id, site_id, site_name)
+        VALUES (new.rowid, new.id, new.site_id, new.site_name);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON outages BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.rowid AND id = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF id, site_id, site_name ON outages BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.rowid AND id = old.id;
+        INSERT INTO {SEARCH_TABLE}(rowid, id, site_id, site_name)
+        VALUES (new.rowid, new.id, new.site_id, new.site_name);
+    END""",
+)
+
+_search_table = table(SEARCH_TABLE, column("id"))
+_search_text = literal_column("outages.search_text")
+
+_backend_cache: "weakref.WeakKeyDictionary[Engine, Optional[str]]" = weakref.WeakKeyDictionary()
+
+
+def install_sqlite_search(engine: Engine) -> None:
+    """Create the FTS5 table and triggers on a SQLite database and (re)fill it."""
+    with engine.begin() as conn:
+        for statement in SQLITE_SEARCH_DDL:
+            conn.exec_driver_sql(statement)
+        conn.exec_driver_sql(f"DELETE FROM {SEARCH_TABLE}")
+        conn.exec_driver_sql(
+            f"INSERT INTO {SEARCH_TABLE}(rowid, id, site_id, site_name) "
+            "SELECT rowid, id, site_id, site_name FROM outages"
+        )
+    _backend_cache.pop(engine, None)
+
+
+def search_backend(db: Session) -> Optional[str]:
+    """Return the search index available on this database, if any."""
+    engine = db.get_bind()
+    if engine in _backend_cache:
+        return _backend_cache[engine]
+
+    backend: Optional[str] = None
+    if engine.dialect.name == "postgresql":
+        columns = {c["name"] for c in inspect(engine).get_columns("outages")}
+        if "search_text" in columns:
+            backend = BACKEND_TRIGRAM
+    elif engine.dialect.name == "sqlite":
+        found = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SEARCH_TABLE},
+        ).first()
+        if found:
+            backend = BACKEND_FTS5
+    _backend_cache[engine] = backend
+    return backend
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _indexed(db: Session, term: str) -> Optional[str]:
+    if len(term) < TRIGRAM_MIN_LENGTH:
+        return None
+    return search_backend(db)
+
+
+def search_predicate(db: Session, term: str):
+    """WHERE clause matching *term* against id, site_id and site_name."""
+    backend = _indexed(db, term)
+    if backend == BACKEND_TRIGRAM:
+        return _search_text.ilike(f"%{term}%")
+    if backend == BACKEND_FTS5:
+        matches = select(_search_table.c.id).where(
+            text(f"{SEARCH_TABLE} MATCH :search_phrase").bindparams(search_phrase=_fts_phrase(term))
+        )
+        return OutageORM.id.in_(matches)
+    return or_(
+        OutageORM.id.ilike(f"%{term}%"),
+        OutageORM.site_id.ilike(f"%{term}%"),
+        OutageORM.site_name.ilike(f"%{term}%"),
+    )
+
+
+def ranked_search(db: Session, term: str, limit: int) -> List[Tuple[OutageORM, str]]:
+    """Return up to *limit* ``(outage, match)`` pairs, best first.
+
+    ``match`` is ``exact_id`` for the outage whose id equals *term*,
+    ``id_prefix`` for ids starting with it (an index range scan) and
+    ``text`` for ranked substring hits on id/site.
+    """
+    hits: List[Tuple[OutageORM, str]] = []
+    seen: set = set()
+
+    exact = db.get(OutageORM, term)
+    if exact is not None:
+        hits.append((exact, "exact_id"))
+        seen.add(exact.id)
+
+    if len(hits) < limit:
+        query = db.query(OutageORM).filter(OutageORM.id.startswith(term, autoescape=True), OutageORM.id != term)
+        if db.get_bind().dialect.name == "sqlite":
+            # LIKE is case-insensitive and unindexed here; the byte-ordered
+            # primary-key range does the work.
+            query = query.filter(OutageORM.id > term, OutageORM.id < term + "\U0010ffff")
+        for orm in query.order_by(OutageORM.id.asc()).limit(limit - len(hits)).all():
+            hits.append((orm, "id_prefix"))
+            seen.add(orm.id)
+
+    remaining = limit - len(hits)
+    if remaining <= 0:
+        return hits
+
+    query = db.query(OutageORM)
+    backend = _indexed(db, term)
+    if backend == BACKEND_FTS5:
+        ranks = (
+            select(_search_table.c.id, literal_column(f"bm25({SEARCH_TABLE})").label("score"))
+            .where(text(f"{SEARCH_TABLE} MATCH :rank_phrase").bindparams(rank_phrase=_fts_phrase(term)))
+            .subquery()
+        )
+        query = query.join(ranks, ranks.c.id == OutageORM.id).order_by(ranks.c.score.asc())
+    else:
+        query = query.filter(search_predicate(db, term))
+        if backend == BACKEND_TRIGRAM:
+            query = query.order_by(
+                text("similarity(outages.search_text, :rank_term) DESC").bindparams(rank_term=term.lower())
+            )
+    if seen:
+        query = query.filter(OutageORM.id.notin_(seen))
+    query = query.order_by(OutageORM.id.asc())
+
+    hits.extend((orm, "text") for orm in query.limit(remaining).all())
+    return hits
@@ -6,6 +6,7 @@ from uuid import uuid4
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import commit_or_defer
 from app.models.orm.audit_log import AuditLogORM
 from app.models.orm.payment import PaymentTransactionORM
 from app.models.payment import (
@@ -61,10 +62,10 @@ class PaymentRepository:
             created_at=data.created_at,
             confirmed_at=data.confirmed_at,
             idempotency_key=data.idempotency_key,
+            retry_count=data.retry_count,
         )
         self.db.add(orm)
-        self.db.commit()
-        self.db.refresh(orm)
+        commit_or_defer(self.db, orm)
         return _orm_to_pydantic(orm)
 
     def create_with_submit(self, data: PaymentTransaction) -> PaymentTransaction:
@@ -0,0 +1,262 @@
+"""Per-node outage rollups over the site hierarchy closure table.
+
+``site_outage_rollups`` holds, for every ``site_hierarchy`` node, totals
+over the outages of its whole subtree: open outages, SLA violations and the
+MTTR sum/count of resolved outages.  Outages belong to the node whose
+``site_code`` equals ``outages.site_id``.
+
+Every outage write in ``OutageRepository`` passes the row's contribution
+before and after the change to ``apply_outage_changes``, which queues the
+difference per site code in ``site_rollup_deltas`` in the caller's
+transaction.  Updating the node and all its ancestors there instead would
+make every outage write lock the root rollup row until commit, serializing
+all writers (and, in partial imports, holding it for a whole chunk).
+``fold_deltas`` (beat task ``fold_site_rollup_deltas``) adds the queued
+deltas to the stored rollups in batches; ``pending_totals`` sums the ones
+not folded yet, so reads stay current.  ``rollup_totals`` recomputes the
+same numbers from ``outages`` and backs ``rebuild_rollups``.
+
+A violation is a resolved outage whose MTTR exceeds the severity threshold
+in ``SLA_CONFIG``, the same rule ``OutageRepository.list_violations``
+applies.  Changing a threshold at runtime does not touch stored rollups;
+rebuild them afterwards.
+
+Schemas built without migrations 0032 and 0039 (e.g. ``create_all`` in
+tests) may lack the rollup tables; the hook is then a no-op.
+"""
+
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, bindparam, case, delete, func, inspect, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.enums import OutageStatus
+from app.models.orm.outage import OutageORM
+from app.models.site_hierarchy import SiteHierarchy, SiteHierarchyClosure, SiteOutageRollup, SiteRollupDelta
+from app.services.sla.config import SLA_CONFIG
+
+ROLLUP_FIELDS = ("open_outages", "violations", "resolved_outages", "mttr_total_minutes")
+
+_installed_cache: "weakref.WeakKeyDictionary[Engine, bool]" = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class OutageContribution:
+    """What one outage adds to the rollups of its site and ancestors."""
+
+    site_code: str
+    open_outages: int = 0
+    violations: int = 0
+    resolved_outages: int = 0
+    mttr_total_minutes: int = 0
+
+    def values(self) -> Tuple[int, int, int, int]:
+        return (self.open_outages, self.violations, self.resolved_outages, self.mttr_total_minutes)
+
+
+def _threshold(severity: Optional[str]) -> Optional[int]:
+    config = SLA_CONFIG.get((severity or "").lower())
+    return config["threshold_minutes"] if config else None
+
+
+def outage_contribution(
+    site_code: Optional[str], severity: Optional[str], status: Optional[str], mttr_minutes: Optional[int]
+) -> Optional[OutageContribution]:
+    """Contribution of one outage, or None when it is not tied to a site."""
+    if not site_code:
+        return None
+    if status != OutageStatus.resolved.value:
+        return OutageContribution(site_code, open_outages=1)
+    if mttr_minutes is None:
+        return OutageContribution(site_code)
+    threshold = _threshold(severity)
+    return OutageContribution(
+        site_code,
+        violations=int(threshold is not None and mttr_minutes > threshold),
+        resolved_outages=1,
+        mttr_total_minutes=mttr_minutes,
+    )
+
+
+def orm_contribution(orm: OutageORM) -> Optional[OutageContribution]:
+    return outage_contribution(orm.site_id, orm.severity, orm.status, orm.mttr_minutes)
+
+
+def rollups_installed(db: Session) -> bool:
+    engine = db.get_bind()
+    if engine not in _installed_cache:
+        # Inspect through the session's own connection: a pooled checkout
+        # would reset (roll back) a shared SQLite connection on return.
+        inspector = inspect(db.connection())
+        _installed_cache[engine] = all(
+            inspector.has_table(model.__tablename__) for model in (SiteOutageRollup, SiteRollupDelta)
+        )
+    return _installed_cache[engine]
+
+
+# --------------------------------------------------------------------------- #
+# Incremental maintenance
+# --------------------------------------------------------------------------- #
+
+
+def _sum_by_code(
+    changes: Iterable[Tuple[Optional[OutageContribution], Optional[OutageContribution]]],
+) -> Dict[str, List[int]]:
+    deltas: Dict[str, List[int]] = {}
+    for before, after in changes:
+        for contribution, sign in ((before, -1), (after, 1)):
+            if contribution is None:
+                continue
+            totals = deltas.setdefault(contribution.site_code, [0, 0, 0, 0])
+            for i, value in enumerate(contribution.values()):
+                totals[i] += sign * value
+    return {code: totals for code, totals in deltas.items() if any(totals)}
+
+
+def apply_outage_changes(
+    db: Session,
+    changes: Iterable[Tuple[Optional[OutageContribution], Optional[OutageContribution]]],
+) -> None:
+    """Queue ``(before, after)`` outage contributions for the stored rollups.
+
+    ``before`` is None for an inserted outage and ``after`` None for a
+    deleted one.  Inserts one delta row per affected site code and locks
+    nothing shared.  Does not commit.
+    """
+    deltas = _sum_by_code(changes)
+    if not deltas or not rollups_installed(db):
+        return
+    db.execute(
+        insert(SiteRollupDelta.__table__),
+        [
+            {"site_code": code, "created_at": datetime.utcnow(), **dict(zip(ROLLUP_FIELDS, totals))}
+            for code, totals in deltas.items()
+        ],
+    )
+
+
+def fold_deltas(db: Session, batch_size: Optional[int] = None) -> int:
+    """Add up to *batch_size* queued deltas to the stored rollups and delete them.
+
+    Returns the number of delta rows folded.  On Postgres the batch is taken
+    ``FOR UPDATE SKIP LOCKED``, so overlapping runs fold disjoint rows.  The
+    ancestors are resolved at fold time, which is what a move expects: the
+    moved node's stored totals go with it and its queued deltas follow.
+    Does not commit.
+    """
+    if not rollups_installed(db):
+        return 0
+    deltas = SiteRollupDelta.__table__
+    query = select(deltas.c.id, deltas.c.site_code, *(deltas.c[name] for name in ROLLUP_FIELDS)).order_by(deltas.c.id)
+    if batch_size:
+        query = query.limit(batch_size)
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+    rows = db.execute(query).all()
+    if not rows:
+        return 0
+
+    totals: Dict[str, List[int]] = {}
+    for row in rows:
+        summed = totals.setdefault(row.site_code, [0, 0, 0, 0])
+        for i, name in enumerate(ROLLUP_FIELDS):
+            summed[i] += row._mapping[name]
+    params = [
+        {"code": code, **{f"d_{name}": value for name, value in zip(ROLLUP_FIELDS, summed)}}
+        for code, summed in totals.items()
+        if any(summed)
+    ]
+    if params:
+        rollups = SiteOutageRollup.__table__
+        closure = SiteHierarchyClosure.__table__
+        sites = SiteHierarchy.__table__
+        ancestors = (
+            select(closure.c.ancestor_id)
+            .join(sites, sites.c.id == closure.c.descendant_id)
+            .where(sites.c.site_code == bindparam("code"))
+        )
+        db.execute(
+            update(rollups)
+            .where(rollups.c.site_id.in_(ancestors))
+            .values(
+                updated_at=datetime.utcnow(),
+                **{name: rollups.c[name] + bindparam(f"d_{name}") for name in ROLLUP_FIELDS},
+            ),
+            params,
+        )
+    db.execute(delete(deltas).where(deltas.c.id.in_([row.id for row in rows])))
+    return len(rows)
+
+
+def pending_totals(db: Session, site_ids: Sequence[int]) -> Dict[int, Tuple[int, int, int, int]]:
+    """Sum of the deltas still queued for the subtrees of *site_ids*."""
+    if not site_ids or not rollups_installed(db):
+        return {}
+    deltas = SiteRollupDelta.__table__
+    query = (
+        select(SiteHierarchyClosure.ancestor_id, *(func.sum(deltas.c[name]) for name in ROLLUP_FIELDS))
+        .join(SiteHierarchy, SiteHierarchy.id == SiteHierarchyClosure.descendant_id)
+        .join(deltas, deltas.c.site_code == SiteHierarchy.site_code)
+        .where(SiteHierarchyClosure.ancestor_id.in_(list(site_ids)))
+        .group_by(SiteHierarchyClosure.ancestor_id)
+    )
+    return {row[0]: tuple(int(v or 0) for v in row[1:]) for row in db.execute(query)}
+
+
+def discard_deltas(db: Session, site_code: Optional[str] = None) -> None:
+    """Drop queued deltas (of *site_code* only, when given) that a recomputation covers."""
+    stmt = delete(SiteRollupDelta.__table__)
+    if site_code is not None:
+        stmt = stmt.where(SiteRollupDelta.__table__.c.site_code == site_code)
+    if rollups_installed(db):
+        db.execute(stmt)
+
+
+def shift_rollups(db: Session, site_ids: Sequence[int], delta: Sequence[int]) -> None:
+    """Add *delta* (in ``ROLLUP_FIELDS`` order) to the rollups of *site_ids*."""
+    if not site_ids or not any(delta):
+        return
+    rollups = SiteOutageRollup.__table__
+    db.execute(
+        update(rollups)
+        .where(rollups.c.site_id.in_(list(site_ids)))
+        .values(
+            updated_at=datetime.utcnow(),
+            **{name: rollups.c[name] + value for name, value in zip(ROLLUP_FIELDS, delta)},
+        )
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Full recomputation
+# --------------------------------------------------------------------------- #
+
+
+def rollup_totals(db: Session, site_ids: Optional[Sequence[int]] = None) -> Dict[int, Tuple[int, int, int, int]]:
+    """Subtree totals computed from ``outages`` in one grouped query.
+
+    Nodes without outages in their subtree are absent from the result.
+    """
+    resolved = OutageORM.status == OutageStatus.resolved.value
+    measured = and_(resolved, OutageORM.mttr_minutes.isnot(None))
+    thresholds = {severity: config["threshold_minutes"] for severity, config in SLA_CONFIG.items()}
+    threshold = case(thresholds, value=func.lower(OutageORM.severity))
+    query = (
+        select(
+            SiteHierarchyClosure.ancestor_id,
+            func.sum(case((resolved, 0), else_=1)),
+            func.sum(case((and_(measured, OutageORM.mttr_minutes > threshold), 1), else_=0)),
+            func.sum(case((measured, 1), else_=0)),
+            func.sum(case((measured, OutageORM.mttr_minutes), else_=0)),
+        )
+        .join(SiteHierarchy, SiteHierarchy.id == SiteHierarchyClosure.descendant_id)
+        .join(OutageORM, OutageORM.site_id == SiteHierarchy.site_code)
+        .group_by(SiteHierarchyClosure.ancestor_id)
+    )
+    if site_ids is not None:
+        query = query.where(SiteHierarchyClosure.ancestor_id.in_(list(site_ids)))
+    return {row[0]: tuple(int(v or 0) for v in row[1:]) for row in db.execute(query)}
@@ -5,6 +5,7 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from sqlalchemy import case, func, select, update
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import commit_or_defer
 from app.models.orm.outage import OutageORM
 from app.models.orm.sla import SLAResultORM
 from app.models.orm.sla_snapshot import SLAAnalyticsSnapshotORM
@@ -74,8 +75,8 @@ class SLARepository:
             decision_trace=payload.get("decision_trace"),
         )
         self.db.add(orm)
-        self.db.commit()
-        self.db.refresh(orm)
+        # The payment row references the autoincrement id, so flush under a unit of work.
+        commit_or_defer(self.db, orm, flush=True)
         return _orm_to_pydantic(orm)
 
     def create_if_changed(self, sla_data: SLAResult | Mapping[str, object]) -> SLAResult:
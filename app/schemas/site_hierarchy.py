@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 
@@ -6,13 +6,33 @@ class SiteHierarchyBase(BaseModel):
     name: str
     region: str
     parent_id: Optional[int] = None
+    site_code: Optional[str] = None
 
 class SiteHierarchyCreate(SiteHierarchyBase):
     pass
 
+class SiteHierarchyMove(BaseModel):
+    parent_id: Optional[int] = None
+
 class SiteHierarchyResponse(SiteHierarchyBase):
     id: int
     created_at: datetime
-    
-    class Config:
-        orm_mode = True
+
+    model_config = ConfigDict(from_attributes=True)
+
+class SiteSubtreeNode(SiteHierarchyResponse):
+    depth: int
+
+class SiteSubtreeResponse(BaseModel):
+    site_id: int
+    nodes: List[SiteSubtreeNode]
+
+class SiteOutageRollupResponse(BaseModel):
+    site_id: int
+    open_outages: int
+    violations: int
+    resolved_outages: int
+    mttr_avg_minutes: Optional[float] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TraceNode(BaseModel):
@@ -23,3 +23,16 @@ class TraceChain(BaseModel):
     transaction_hash: Optional[str] = None
     nodes: List[TraceNode] = []
     total_nodes: int = 0
+
+
+class TraceBatchRequest(BaseModel):
+    """Outage ids to trace in one call (duplicates are ignored)."""
+
+    outage_ids: List[str] = Field(..., min_length=1)
+
+
+class TraceBatchResponse(BaseModel):
+    """Trace chains in request order, plus ids with no outage record."""
+
+    traces: List[TraceChain] = []
+    missing: List[str] = []
@@ -1,9 +1,11 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.models.orm.audit_log import AuditLogORM
 from app.db.session import SessionLocal
+from app.db.unit_of_work import commit_or_defer
 from app.utils.correlation import get_correlation_id
 import hashlib
 import json
@@ -257,6 +259,8 @@ class AuditLogService:
             actor_id: User ID for consistent actor tracking (preferred over email)
             details: Event details dict (will be sanitized before persistence)
             correlation_id: Request correlation ID (auto-detected from context if omitted)
+
+        Inside a ``UnitOfWork`` on *db* the entry is committed with the unit of work.
         """
         if correlation_id is None:
             correlation_id = get_correlation_id()
@@ -270,7 +274,40 @@ class AuditLogService:
             created_at=datetime.now(timezone.utc),
         )
         db.add(audit_entry)
-        db.commit()
+        commit_or_defer(db)
+
+    def log_events(
+        self,
+        db: Session,
+        event_type: str,
+        details: list[dict[str, Any]],
+        actor_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+    ) -> int:
+        """Record one *event_type* entry per item of *details* with a single multi-row INSERT.
+
+        Same sanitisation and commit semantics as ``log_event``.  Returns the
+        number of entries written.
+        """
+        if not details:
+            return 0
+        if correlation_id is None:
+            correlation_id = get_correlation_id()
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "event_type": event_type,
+                "email": None,
+                "actor_id": actor_id,
+                "correlation_id": correlation_id,
+                "details": self._sanitize(item),
+                "created_at": now,
+            }
+            for item in details
+        ]
+        db.execute(insert(AuditLogORM.__table__), rows)
+        commit_or_defer(db)
+        return len(rows)
 
     def log_bridge_event(
         self,
@@ -0,0 +1,117 @@
+"""Claim-check serializer for large Celery messages and results.
+
+``compute_bulk_sla`` takes the whole ``device_ids`` list as an argument and
+its chord returns every per-device result, so a large bulk job used to put
+multi-megabyte messages on the Redis broker and keep equally large results
+in the result backend for ``result_expires``.
+
+The ``claimcheck-json`` serializer (installed as both the task and the
+result serializer) encodes like Celery's ``json`` serializer.  A body over
+``CELERY_CLAIM_CHECK_THRESHOLD_BYTES`` is compressed into a
+``celery_claim_checks`` row instead, and only ``claim-check:<id>`` goes
+through Redis; decoding reads the row back.  Task signatures are unchanged.
+
+Rows outlive the result backend (``CELERY_CLAIM_CHECK_TTL_SECONDS``) so a
+redelivered message can still be decoded, and ``purge_expired`` removes
+them afterwards.  When the row cannot be written the body is sent inline,
+as before.
+"""
+
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+from kombu.serialization import register as register_serializer
+from kombu.utils.encoding import bytes_to_str
+from kombu.utils.json import dumps as json_dumps, loads as json_loads
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.orm.claim_check import ClaimCheckORM
+from app.services.metrics import increment_counter
+from app.utils.logging import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+SERIALIZER = "claimcheck-json"
+CONTENT_TYPE = "application/x-nociq-claim-check+json"
+REFERENCE_PREFIX = "claim-check:"  # never the start of a JSON document
+
+_session_factory: Optional[Callable[[], Session]] = None
+
+
+def _session() -> Session:
+    if _session_factory is not None:
+        return _session_factory()
+    from app.db.session import SessionLocal
+
+    return SessionLocal()
+
+
+def store(body: bytes) -> str:
+    """Write *body* compressed to a new claim-check row; returns its id."""
+    now = datetime.now(timezone.utc)
+    row = ClaimCheckORM(
+        id=str(uuid4()),
+        data=zlib.compress(body),
+        size_bytes=len(body),
+        created_at=now,
+        expires_at=now + timedelta(seconds=settings.CELERY_CLAIM_CHECK_TTL_SECONDS),
+    )
+    db = _session()
+    try:
+        db.add(row)
+        db.commit()
+        return row.id
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def fetch(claim_id: str) -> bytes:
+    db = _session()
+    try:
+        row = db.get(ClaimCheckORM, claim_id)
+    finally:
+        db.close()
+    if row is None:
+        raise ValueError(f"Claim check {claim_id} not found (expired or purged)")
+    return zlib.decompress(row.data)
+
+
+def dumps(obj: Any) -> str:
+    body = json_dumps(obj)
+    encoded = body.encode("utf-8")
+    if not settings.CELERY_CLAIM_CHECK_ENABLED or len(encoded) <= settings.CELERY_CLAIM_CHECK_THRESHOLD_BYTES:
+        return body
+    try:
+        claim_id = store(encoded)
+    except Exception as exc:
+        logger.warning("claim_check_store_failed", size_bytes=len(encoded), error=str(exc))
+        increment_counter("claim_check_fallbacks")
+        return body
+    increment_counter("claim_checks_stored")
+    return REFERENCE_PREFIX + claim_id
+
+
+def loads(data: Any) -> Any:
+    text = bytes_to_str(data)
+    if text.startswith(REFERENCE_PREFIX):
+        text = fetch(text[len(REFERENCE_PREFIX):]).decode("utf-8")
+    return json_loads(text)
+
+
+def register() -> None:
+    register_serializer(SERIALIZER, dumps, loads, content_type=CONTENT_TYPE, content_encoding="utf-8")
+
+
+def purge_expired(db: Session, now: Optional[datetime] = None) -> int:
+    """Delete claim-check rows past their ``expires_at``; returns the count."""
+    now = now or datetime.now(timezone.utc)
+    result = db.execute(delete(ClaimCheckORM).where(ClaimCheckORM.expires_at < now))
+    db.commit()
+    return result.rowcount or 0
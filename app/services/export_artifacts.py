@@ -0,0 +1,372 @@
+"""Chunked, compressed export artifacts for asynchronous export jobs.
+
+Rows are read from the database in keyset-ordered chunks of
+``settings.EXPORT_CHUNK_ROWS`` so an export never materialises the full
+dataset in memory.  Each chunk is appended to the artifact as its own gzip
+member; concatenated members form a valid gzip stream, so the finished file
+can be served as-is with ``Content-Encoding: gzip`` and resumed with HTTP
+byte ranges.
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic_core import to_jsonable_python
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.models.orm.outage import OutageORM
+from app.models.orm.payment import PaymentTransactionORM
+from app.models.orm.sla import SLAResultORM
+from app.repositories import outage_repository, sla_repository
+from app.utils.logging import get_structured_logger
+
+logger = get_structured_logger("export_artifacts")
+
+EXPORT_DATASETS: Tuple[str, ...] = ("outages", "sla", "payments")
+EXPORT_FORMATS: Tuple[str, ...] = ("json", "csv")
+
+OUTAGE_CSV_FIELDS: List[str] = [
+    "id",
+    "site_name",
+    "site_id",
+    "severity",
+    "status",
+    "detected_at",
+    "resolved_at",
+    "description",
+    "affected_services",
+    "affected_subscribers",
+    "assigned_to",
+    "created_by",
+    "location",
+    "sla_status",
+]
+
+SLA_CSV_FIELDS: List[str] = [
+    "id",
+    "outage_id",
+    "status",
+    "mttr_minutes",
+    "threshold_minutes",
+    "amount",
+    "payment_type",
+    "rating",
+    "policy_version",
+    "threshold_source",
+    "reason_code",
+    "decision_trace",
+]
+
+PAYMENT_CSV_FIELDS: List[str] = [
+    "id",
+    "transaction_hash",
+    "type",
+    "amount",
+    "asset_code",
+    "from_address",
+    "to_address",
+    "status",
+    "outage_id",
+    "sla_result_id",
+    "created_at",
+    "confirmed_at",
+    "retry_count",
+    "failure_taxonomy",
+]
+
+
+@dataclass
+class ExportSummary:
+    filename: str
+    path: str
+    row_count: int
+    chunk_count: int
+    size_bytes: int
+    sha256: str
+
+
+# --------------------------------------------------------------------------- #
+# Dataset queries                                                              #
+# --------------------------------------------------------------------------- #
+
+def _parse_dt(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def _outage_query(db: Session, filters: Dict[str, Any]) -> Query:
+    query = db.query(OutageORM)
+    if filters.get("severity"):
+        query = query.filter(OutageORM.severity == filters["severity"])
+    if filters.get("status"):
+        query = query.filter(OutageORM.status == filters["status"])
+    if filters.get("site_id"):
+        query = query.filter(OutageORM.site_id == filters["site_id"])
+    start_date = _parse_dt(filters.get("start_date"))
+    end_date = _parse_dt(filters.get("end_date"))
+    if start_date:
+        query = query.filter(OutageORM.detected_at >= start_date)
+    if end_date:
+        query = query.filter(OutageORM.detected_at <= end_date)
+    return query
+
+
+def _sla_query(db: Session, filters: Dict[str, Any]) -> Query:
+    query = db.query(SLAResultORM)
+    if filters.get("outage_id"):
+        query = query.filter(SLAResultORM.outage_id == filters["outage_id"])
+    if filters.get("status"):
+        query = query.filter(SLAResultORM.status == filters["status"])
+    if filters.get("latest_only"):
+        query = query.filter(SLAResultORM.is_latest.is_(True))
+    return query
+
+
+def _payment_query(db: Session, filters: Dict[str, Any]) -> Query:
+    query = db.query(PaymentTransactionORM)
+    if filters.get("status"):
+        query = query.filter(PaymentTransactionORM.status == filters["status"])
+    if filters.get("outage_id"):
+        query = query.filter(PaymentTransactionORM.outage_id == filters["outage_id"])
+    if filters.get("type"):
+        query = query.filter(PaymentTransactionORM.type == filters["type"])
+    date_from = _parse_dt(filters.get("date_from"))
+    date_to = _parse_dt(filters.get("date_to"))
+    if date_from:
+        query = query.filter(PaymentTransactionORM.created_at >= date_from)
+    if date_to:
+        query = query.filter(PaymentTransactionORM.created_at <= date_to)
+    return query
+
+
+def _model_row(to_model: Callable[[Any], Any]) -> Callable[[Any], Dict[str, Any]]:
+    return lambda orm: to_model(orm).model_dump(mode="json")
+
+
+def _payment_row(orm: PaymentTransactionORM) -> Dict[str, Any]:
+    # Serialized directly: ``outage_id`` is NULL once the outage is deleted
+    # (ON DELETE SET NULL), which the PaymentTransaction model rejects.
+    row = {column.name: getattr(orm, column.name) for column in PaymentTransactionORM.__table__.columns}
+    row["residual"] = 0.0
+    return to_jsonable_python(row)
+
+
+# dataset -> (query builder, primary key column, ORM -> JSON-ready dict, CSV fields)
+_DATASETS: Dict[str, Tuple[Callable[[Session, Dict[str, Any]], Query], Any, Callable[[Any], Dict[str, Any]], List[str]]] = {
+    "outages": (_outage_query, OutageORM.id, _model_row(outage_repository._orm_to_pydantic), OUTAGE_CSV_FIELDS),
+    "sla": (_sla_query, SLAResultORM.id, _model_row(sla_repository._orm_to_pydantic), SLA_CSV_FIELDS),
+    "payments": (_payment_query, PaymentTransactionORM.id, _payment_row, PAYMENT_CSV_FIELDS),
+}
+
+
+def validate_export_request(dataset: str, format: str) -> None:
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f"Unsupported export dataset '{dataset}'. Use one of: {', '.join(EXPORT_DATASETS)}.")
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}.")
+
+
+def count_rows(db: Session, dataset: str, filters: Optional[Dict[str, Any]] = None) -> int:
+    build_query, _, _, _ = _DATASETS[dataset]
+    return build_query(db, filters or {}).count()
+
+
+def iter_row_chunks(
+    db: Session,
+    dataset: str,
+    filters: Optional[Dict[str, Any]] = None,
+    chunk_rows: Optional[int] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield JSON-ready row dicts in primary-key order, one chunk at a time.
+
+    Uses keyset pagination (``pk > last_pk``) rather than OFFSET so the cost
+    of each chunk stays flat as the export progresses.
+    """
+    build_query, pk_column, to_row, _ = _DATASETS[dataset]
+    chunk_rows = chunk_rows or settings.EXPORT_CHUNK_ROWS
+    last_pk = None
+    while True:
+        query = build_query(db, filters or {})
+        if last_pk is not None:
+            query = query.filter(pk_column > last_pk)
+        rows = query.order_by(pk_column.asc()).limit(chunk_rows).all()
+        if not rows:
+            return
+        last_pk = rows[-1].id
+        yield [to_row(row) for row in rows]
+        # Detach the chunk so the identity map does not grow with the export.
+        db.expunge_all()
+        if len(rows) < chunk_rows:
+            return
+
+
+# --------------------------------------------------------------------------- #
+# Encoding                                                                     #
+# --------------------------------------------------------------------------- #
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _encode_csv(rows: List[Dict[str, Any]], fieldnames: List[str], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    for row in rows:
+        writer.writerow({key: _csv_cell(row.get(key)) for key in fieldnames})
+    return buffer.getvalue()
+
+
+def _encode_json(rows: List[Dict[str, Any]], first: bool) -> str:
+    body = ",".join(json.dumps(row, separators=(",", ":")) for row in rows)
+    return body if first else "," + body
+
+
+def artifact_dir() -> str:
+    path = settings.EXPORT_ARTIFACT_DIR
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def artifact_filename(job_id: str, format: str) -> str:
+    return f"{job_id}.{format}.gz"
+
+
+def artifact_path(filename: str) -> str:
+    # Only bare filenames produced by artifact_filename() are accepted so a
+    # stored result can never point outside the artifact directory.
+    if os.path.basename(filename) != filename:
+        raise ValueError("Invalid artifact filename")
+    return os.path.join(artifact_dir(), filename)
+
+
+def write_export_artifact(
+    db: Session,
+    job_id: str,
+    dataset: str,
+    format: str,
+    filters: Optional[Dict[str, Any]] = None,
+    chunk_rows: Optional[int] = None,
+    on_chunk: Optional[Callable[[int, int, int], None]] = None,
+) -> ExportSummary:
+    """Stream *dataset* into a gzip artifact and return its summary.
+
+    ``on_chunk(rows_written, chunks_written, bytes_written)`` is invoked after
+    each chunk is flushed so callers can report progress.
+    """
+    validate_export_request(dataset, format)
+    _, _, _, fieldnames = _DATASETS[dataset]
+    filename = artifact_filename(job_id, format)
+    final_path = artifact_path(filename)
+    tmp_path = final_path + ".part"
+
+    digest = hashlib.sha256()
+    rows_written = 0
+    chunks_written = 0
+    bytes_written = 0
+
+    def _append(handle, text: str) -> None:
+        nonlocal bytes_written
+        member = gzip.compress(text.encode("utf-8"))
+        handle.write(member)
+        digest.update(member)
+        bytes_written += len(member)
+
+    try:
+        with open(tmp_path, "wb") as handle:
+            if format == "json":
+                _append(handle, "[")
+            for chunk in iter_row_chunks(db, dataset, filters, chunk_rows):
+                if format == "json":
+                    _append(handle, _encode_json(chunk, first=rows_written == 0))
+                else:
+                    _append(handle, _encode_csv(chunk, fieldnames, header=rows_written == 0))
+                rows_written += len(chunk)
+                chunks_written += 1
+                if on_chunk:
+                    on_chunk(rows_written, chunks_written, bytes_written)
+            if format == "json":
+                _append(handle, "]")
+            elif rows_written == 0:
+                _append(handle, _encode_csv([], fieldnames, header=True))
+        os.replace(tmp_path, final_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    logger.info(
+        "Export artifact written",
+        job_id=job_id,
+        dataset=dataset,
+        format=format,
+        row_count=rows_written,
+        size_bytes=bytes_written,
+    )
+    return ExportSummary(
+        filename=filename,
+        path=final_path,
+        row_count=rows_written,
+        chunk_count=chunks_written,
+        size_bytes=bytes_written,
+        sha256=digest.hexdigest(),
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Byte-range downloads                                                         #
+# --------------------------------------------------------------------------- #
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``Range: bytes=...`` header into an inclusive (start, end).
+
+    Returns ``None`` when no range was requested.  Raises ``ValueError`` for
+    malformed, multi-part or unsatisfiable ranges (mapped to 416 by the API).
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec or "," in spec:
+        raise ValueError("Only single byte ranges are supported")
+    start_s, sep, end_s = spec.strip().partition("-")
+    if not sep:
+        raise ValueError("Malformed byte range")
+    if not (start_s.isdigit() or start_s == "") or not (end_s.isdigit() or end_s == ""):
+        raise ValueError("Malformed byte range")
+    if start_s == "":
+        # Suffix range: last N bytes.
+        if not end_s or int(end_s) == 0:
+            raise ValueError("Unsatisfiable byte range")
+        start, end = max(size - int(end_s), 0), size - 1
+    else:
+        start = int(start_s)
+        end = int(end_s) if end_s else size - 1
+    end = min(end, size - 1)
+    if start >= size or end < start:
+        raise ValueError("Unsatisfiable byte range")
+    return start, end
+
+
+def iter_file_range(path: str, start: int, end: int, block_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield bytes ``start..end`` (inclusive) of *path* in blocks."""
+    remaining = end - start + 1
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        while remaining > 0:
+            block = handle.read(min(block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
@@ -8,14 +8,18 @@ BE-W5-047: Stale lease reclamation for stuck-task recovery.
 BE-W5-052: Retention tiering with configurable windows per job class/status,
 investigation/dispute protection, audit-critical preservation, and metrics.
 """
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from sqlalchemy import delete, update
+from sqlalchemy import String, and_, cast, delete, func, literal, not_, or_, select, update
 from sqlalchemy.orm import Session
 
-from app.models.job import Job, JobStatus
+from app.db.unit_of_work import UnitOfWork
+from app.models.job import Job, JobItem, JobStatus, retention_month_for
+from app.repositories import job_partitions
+from app.services import job_leases
 from app.services.audit_log import audit_log
-from app.services.metrics import increment_counter, gauge
+from app.services.metrics import increment_counter
 from app.utils.logging import get_structured_logger
 
 logger = get_structured_logger("job_cleanup")
@@ -46,6 +50,11 @@ RETRY_CLASS_DEFAULTS: Dict[str, Dict[str, object]] = {
         "max_retries": 1,
         "base_delay_seconds": 60,
     },
+    "export": {
+        "retry_class": "exponential_backoff",
+        "max_retries": 2,
+        "base_delay_seconds": 60,
+    },
 }
 
 
@@ -67,9 +76,11 @@ def get_retry_policy(job_type: str) -> Dict[str, object]:
 
 
 def heartbeat_job(db: Session, celery_task_id: str, worker_id: str, timeout_seconds: int = 120) -> Optional[Job]:
-    """Record a heartbeat for *celery_task_id*.
+    """Record a heartbeat for *celery_task_id* directly on the job row.
 
-    Returns the updated Job or None if no matching record exists.
+    Returns the updated Job or None if no matching record exists.  Workers
+    and the heartbeat endpoint go through ``job_leases.record_heartbeat``,
+    which buffers heartbeats in Redis.
     """
     job = db.query(Job).filter(Job.celery_task_id == celery_task_id).first()
     if not job:
@@ -84,6 +95,84 @@ def heartbeat_job(db: Session, celery_task_id: str, worker_id: str, timeout_seco
     return job
 
 
+def _stale_lease_filter(now: datetime):
+    return and_(
+        Job.lease_expires_at.isnot(None),
+        Job.lease_expires_at < now,
+        Job.worker_id.isnot(None),
+        Job.status == JobStatus.STARTED,
+    )
+
+
+def _reclaim_values(now: datetime, worker_id, lease_expires_at) -> Dict[str, object]:
+    return {
+        "worker_id": None,
+        "heartbeat_at": None,
+        "lease_expires_at": None,
+        "status": JobStatus.PENDING,
+        "started_at": None,
+        "error": (
+            literal("Lease expired (worker=")
+            + worker_id
+            + literal(", expired=")
+            + cast(lease_expires_at, String)
+            + literal(f"); reclaimed at {now.isoformat()}")
+        ),
+    }
+
+
+def _reclaim_batch(db: Session, now: datetime, batch_size: int) -> List[dict]:
+    """Reset one batch of stale leases to PENDING with a set-based UPDATE.
+
+    On PostgreSQL this is a single statement: the candidates are locked
+    ``FOR UPDATE SKIP LOCKED`` in a CTE, so concurrent reclaimers on other
+    nodes take disjoint batches, and the UPDATE joins that CTE so each row's
+    previous worker and lease come back through ``RETURNING``.  Other
+    dialects cannot return the joined columns; there the candidates are read
+    first and the UPDATE re-checks the stale predicate, so a row another
+    reclaimer already took is simply not returned.
+    """
+    candidates = (
+        select(Job.id, Job.worker_id, Job.lease_expires_at)
+        .where(_stale_lease_filter(now))
+        .order_by(Job.lease_expires_at)
+        .limit(batch_size)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        stale = candidates.with_for_update(skip_locked=True).cte("stale_leases")
+        stmt = (
+            update(Job)
+            .where(Job.id == stale.c.id)
+            .values(_reclaim_values(now, stale.c.worker_id, stale.c.lease_expires_at))
+            .returning(Job.id, Job.celery_task_id, Job.job_type, stale.c.worker_id, stale.c.lease_expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        rows = db.execute(stmt).all()
+    else:
+        previous = {row.id: (row.worker_id, row.lease_expires_at) for row in db.execute(candidates)}
+        if not previous:
+            return []
+        stmt = (
+            update(Job)
+            .where(Job.id.in_(previous), _stale_lease_filter(now))
+            .values(_reclaim_values(now, Job.worker_id, Job.lease_expires_at))
+            .returning(Job.id, Job.celery_task_id, Job.job_type)
+            .execution_options(synchronize_session=False)
+        )
+        rows = [(*row, *previous[row[0]]) for row in db.execute(stmt)]
+    return [
+        {
+            "job_id": str(job_id),
+            "celery_task_id": celery_task_id,
+            "job_type": getattr(job_type, "value", job_type),
+            "previous_worker": worker_id,
+            "lease_expired": lease_expires_at.isoformat() if lease_expires_at else None,
+            "reclaimed_at": now.isoformat(),
+        }
+        for job_id, celery_task_id, job_type, worker_id, lease_expires_at in rows
+    ]
+
+
 def reclaim_stale_leases(
     db: Session,
     timeout_seconds: int = 120,
@@ -95,66 +184,53 @@ def reclaim_stale_leases(
     BE-W5-047: Stale leases are reset to PENDING so another worker can pick
     them up.  Single-owner guarantee: only jobs with ``lease_expires_at`` in
     the past AND a non-null ``worker_id`` are candidates.
+
+    Reclaims in batches of *batch_size* until none remain: each batch is one
+    set-based UPDATE (see ``_reclaim_batch``) plus one multi-row audit
+    insert, committed together, so the sweep is safe to run on every node.
+    The audit insert runs in a savepoint: if it fails the batch is still
+    committed, so the loop always makes progress.
+    A dry run only counts the stale leases.
+
+    Heartbeats still buffered in Redis are flushed first, so a lease is only
+    reclaimed when its newest heartbeat has expired too.
     """
+    job_leases.flush_heartbeats(db)
     now = datetime.utcnow()
-    stale = (
-        db.query(Job)
-        .filter(
-            Job.lease_expires_at.isnot(None),
-            Job.lease_expires_at < now,
-            Job.worker_id.isnot(None),
-            Job.status.in_([JobStatus.STARTED]),
-        )
-        .limit(batch_size)
-        .all()
-    )
-
-    reclaimed: List[str] = []
-    for job in stale:
-        prev_worker = job.worker_id
-        prev_lease = job.lease_expires_at
-        if not dry_run:
-            job.worker_id = None
-            job.heartbeat_at = None
-            job.lease_expires_at = None
-            job.status = JobStatus.PENDING
-            job.started_at = None
-            job.error = (
-                f"Lease expired (worker={prev_worker}, "
-                f"expired={prev_lease.isoformat() if prev_lease else 'N/A'}); "
-                f"reclaimed at {now.isoformat()}"
-            )
-            # BE-W5-047: reclamation audit event
-            try:
-                audit_log.log_event(
-                    db,
-                    event_type="job_lease_reclaimed",
-                    details={
-                        "job_id": str(job.id),
-                        "celery_task_id": job.celery_task_id,
-                        "job_type": job.job_type.value,
-                        "previous_worker": prev_worker,
-                        "lease_expired": prev_lease.isoformat() if prev_lease else None,
-                        "reclaimed_at": now.isoformat(),
-                    },
-                )
-            except Exception:
-                logger.exception("Failed to write lease-reclamation audit event for job=%s", job.id)
-            increment_counter("job_leases_reclaimed", tags={"job_type": job.job_type.value})
-        reclaimed.append(str(job.id))
-
-    if not dry_run and reclaimed:
-        db.commit()
-
-    logger.info(
-        "Lease reclamation scanned %d stale leases; reclaimed=%d dry_run=%s",
-        len(stale), len(reclaimed), dry_run,
-    )
+    if dry_run:
+        found = db.execute(select(func.count(Job.id)).where(_stale_lease_filter(now))).scalar() or 0
+        logger.info("job_lease_reclamation_dry_run", stale_leases_found=found)
+        return {"stale_leases_found": found, "reclaimed": found, "dry_run": True, "checked_at": now.isoformat()}
+
+    reclaimed = 0
+    batches = 0
+    while True:
+        with UnitOfWork(db):
+            rows = _reclaim_batch(db, now, batch_size)
+            if rows:
+                try:
+                    # BE-W5-047: reclamation audit events.  A failed insert
+                    # only rolls back its savepoint, never the reclaim UPDATE.
+                    with db.begin_nested():
+                        audit_log.log_events(db, "job_lease_reclaimed", rows)
+                except Exception:
+                    logger.exception("job_lease_reclamation_audit_failed", jobs=len(rows))
+        if not rows:
+            break
+        batches += 1
+        reclaimed += len(rows)
+        for job_type, count in Counter(row["job_type"] for row in rows).items():
+            increment_counter("job_leases_reclaimed", value=count, tags={"job_type": job_type})
+        if len(rows) < batch_size:
+            break
+
+    logger.info("job_lease_reclamation_completed", reclaimed=reclaimed, batches=batches)
     return {
-        "stale_leases_found": len(stale),
-        "reclaimed": len(reclaimed),
-        "dry_run": dry_run,
+        "stale_leases_found": reclaimed,
+        "reclaimed": reclaimed,
+        "dry_run": False,
         "checked_at": now.isoformat(),
+        "batches": batches,
     }
 
 
@@ -192,28 +268,38 @@ class JobCleanupService:
         Jobs flagged ``under_investigation`` or ``under_dispute`` are always
         skipped regardless of age.  Audit-critical jobs use a separate
         extended window.
+
+        On a partitioned Postgres ``jobs`` table, expired month partitions
+        are dropped whole first (see :meth:`_drop_expired_partitions`); the
+        batched deletes then only see what is left, e.g. the retained
+        partition.  Other backends use the batched deletes alone.
         """
+        from app.core.config import settings as cfg
+
         windows = retention_days or self._default_retention()
         now = datetime.utcnow()
-        total_deleted = 0
-        stats: dict = {"dry_run": dry_run, "deleted_by_status": {}}
-
+        cutoffs: Dict[JobStatus, datetime] = {}
         for status_value, days in windows.items():
             try:
-                status = JobStatus(status_value)
+                cutoffs[JobStatus(status_value)] = now - timedelta(days=days)
             except ValueError:
                 logger.warning("Unknown JobStatus in retention config: %s", status_value)
-                continue
 
-            cutoff = now - timedelta(days=days)
-            count = self._count_eligible(status, cutoff)
-            stats["deleted_by_status"][status_value] = count
+        stats: dict = {"dry_run": dry_run, "deleted_by_status": {}, "partitions_dropped": []}
+        deleted_by_status: Counter = Counter()
+        if cfg.JOB_RETENTION_PARTITION_DROP_ENABLED and job_partitions.is_partitioned(self.db):
+            stats["partitions_dropped"] = self._drop_expired_partitions(
+                cutoffs, dry_run, deleted_by_status
+            )
 
+        for status, cutoff in cutoffs.items():
+            count = self._count_eligible(status, cutoff)
             if not dry_run and count > 0:
-                deleted = self._delete_eligible(status, cutoff, batch_size)
-                total_deleted += deleted
-                stats["deleted_by_status"][status_value] = deleted
+                count = self._delete_eligible(status, cutoff, batch_size)
+            deleted_by_status[status.value] += count
+            stats["deleted_by_status"][status.value] = deleted_by_status[status.value]
 
+        total_deleted = 0 if dry_run else sum(deleted_by_status.values())
         stats["total_deleted"] = total_deleted
         stats["cutoffs"] = {
             s: (now - timedelta(days=d)).isoformat() for s, d in windows.items()
@@ -320,6 +406,62 @@ class JobCleanupService:
         )
         return q
 
+    def _drop_expired_partitions(
+        self,
+        cutoffs: Dict[JobStatus, datetime],
+        dry_run: bool,
+        deleted_by_status: Counter,
+    ) -> List[str]:
+        """Drop the month partitions whose rows have all expired.
+
+        A month is expired once it ends before the most recent cutoff.  Rows
+        in it that must survive (protected, a status with a longer window
+        that has not passed yet, or a status without a window) are moved to
+        the retained partition first.  Dropped rows are added to
+        *deleted_by_status*; a dry run only names the partitions.  Also
+        creates the month partitions of the next
+        ``JOB_PARTITION_MONTHS_AHEAD`` months.
+        """
+        from app.core.config import settings as cfg
+
+        if not cutoffs:
+            return []
+        horizon = max(cutoffs.values())
+        expired = [
+            month
+            for month in job_partitions.list_month_partitions(self.db)
+            if job_partitions.add_months(month, 1) <= horizon.date()
+        ]
+        names = [job_partitions.partition_name(month) for month in expired]
+        if dry_run:
+            return names
+
+        eligible = or_(*(
+            and_(Job.status == status, Job.finished_at < cutoff) for status, cutoff in cutoffs.items()
+        ))
+        keep = or_(
+            Job.under_investigation.is_(True),
+            Job.under_dispute.is_(True),
+            Job.audit_critical.is_(True),
+            not_(eligible),
+        )
+        for month, name in zip(expired, names):
+            retained = job_partitions.retain_rows(self.db, month, keep)
+            counts = self.db.execute(
+                select(Job.status, func.count(Job.id))
+                .where(Job.retention_month == month)
+                .group_by(Job.status)
+            ).all()
+            job_partitions.drop_month_partition(self.db, month)
+            for status, count in counts:
+                deleted_by_status[status.value] += count
+            logger.info("job_partition_dropped", partition=name, rows=sum(c for _, c in counts), retained=retained)
+            increment_counter("job_partitions_dropped")
+
+        start = retention_month_for(datetime.utcnow())
+        job_partitions.ensure_month_partitions(self.db, start, cfg.JOB_PARTITION_MONTHS_AHEAD)
+        return names
+
     def _count_eligible(self, status: JobStatus, cutoff: datetime) -> int:
         return self._build_base_query(status, cutoff).count()
 
@@ -337,6 +479,7 @@ class JobCleanupService:
             ]
             if not ids:
                 break
+            self.db.execute(delete(JobItem).where(JobItem.job_id.in_(ids)))
             self.db.execute(delete(Job).where(Job.id.in_(ids)))
             self.db.commit()
             total += len(ids)
@@ -385,6 +528,7 @@ class JobCleanupService:
                 ]
                 if not ids:
                     break
+                self.db.execute(delete(JobItem).where(JobItem.job_id.in_(ids)))
                 self.db.execute(delete(Job).where(Job.id.in_(ids)))
                 self.db.commit()
                 deleted += len(ids)
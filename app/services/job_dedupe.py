@@ -1,8 +1,36 @@
-"""Job deduplication keys for SLA and webhook tasks (#307)."""
+"""Job deduplication keys for SLA, export and webhook tasks (#307).
+
+A dedupe key names the business identity of a job (device + period,
+export filters, ...).  Keys live in Redis so every API replica sees the
+same claims: ``claim_dedupe_key`` is a single ``SET NX PX`` that both
+checks and registers, and every key expires after its job type's TTL
+(``JOB_DEDUPE_TTLS``), so nothing accumulates.
+
+While Redis is disabled or unreachable, keys fall back to a process-local
+LRU bounded by ``JOB_DEDUPE_LOCAL_MAX_KEYS`` with the same TTLs; dedupe
+is then per process only.  Hits, misses and fallbacks are counted in
+``dedupe_stats`` and the metrics registry.
+"""
 
 import hashlib
 import json
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.models.job import Job, JobStatus
+from app.services.metrics import increment_counter
+from app.utils.logging import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+_KEY_PREFIX = "jobs:dedupe:"
+_NO_JOB = "-"  # registered without a job id
+_REDIS_RETRY_SECONDS = 30.0
+_ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.STARTED)
 
 
 def compute_dedupe_key(job_type: str, payload: dict) -> str:
@@ -11,20 +39,232 @@ def compute_dedupe_key(job_type: str, payload: dict) -> str:
         device_id = payload.get("device_id", "")
         period = payload.get("period", "")
         base = f"sla:{device_id}:{period}"
+    elif job_type == "bulk_sla_computation":
+        device_ids = ",".join(sorted(set(payload.get("device_ids") or [])))
+        period = payload.get("period", "")
+        base = f"bulk_sla:{period}:{device_ids}"
     elif job_type == "webhook_dispatch":
         delivery_id = payload.get("delivery_id", "")
         base = f"webhook:{delivery_id}"
+    elif job_type == "export":
+        dataset = payload.get("dataset", "")
+        fmt = payload.get("format", "")
+        filters = json.dumps(payload.get("filters") or {}, sort_keys=True, default=str)
+        base = f"export:{dataset}:{fmt}:{filters}"
     else:
         base = json.dumps(payload, sort_keys=True)
     return hashlib.sha256(base.encode()).hexdigest()[:16]
 
 
-DEDUPE_REGISTRY: dict = {}  # In production: use Redis with TTL
+def _parse_ttls(raw: str) -> Dict[str, int]:
+    ttls: Dict[str, int] = {}
+    for entry in raw.split(","):
+        job_type, _, seconds = entry.strip().partition(":")
+        if job_type and seconds.strip().isdigit():
+            ttls[job_type] = int(seconds)
+    return ttls
+
+
+def dedupe_ttl_seconds(job_type: Optional[str]) -> int:
+    """TTL of a dedupe key for *job_type* (``JOB_DEDUPE_TTLS``, else the default)."""
+    return _parse_ttls(settings.JOB_DEDUPE_TTLS).get(job_type or "", settings.JOB_DEDUPE_DEFAULT_TTL_SECONDS)
+
+
+# --------------------------------------------------------------------------- #
+# Stores
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class DedupeStats:
+    hits: int = 0
+    misses: int = 0
+    fallbacks: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+_stats = DedupeStats()
+
+
+def dedupe_stats() -> DedupeStats:
+    return _stats
+
+
+class LocalDedupeStore:
+    """Process-local LRU of dedupe keys with per-key expiry."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _live(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _put(self, key: str, value: str, ttl_ms: int) -> None:
+        self._entries[key] = (value, time.monotonic() + ttl_ms / 1000.0)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+
+    def set_nx(self, key: str, value: str, ttl_ms: int) -> Optional[str]:
+        with self._lock:
+            current = self._live(key)
+            if current is not None:
+                return current
+            self._put(key, value, ttl_ms)
+            return None
+
+    def set(self, key: str, value: str, ttl_ms: int) -> None:
+        with self._lock:
+            self._put(key, value, ttl_ms)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._live(key)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RedisDedupeStore:
+    """Dedupe keys shared by every replica through Redis."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def set_nx(self, key: str, value: str, ttl_ms: int) -> Optional[str]:
+        if self.client.set(_KEY_PREFIX + key, value, nx=True, px=ttl_ms):
+            return None
+        current = self.client.get(_KEY_PREFIX + key)
+        # The holder may have expired between SET and GET; try once more.
+        if current is None and self.client.set(_KEY_PREFIX + key, value, nx=True, px=ttl_ms):
+            return None
+        return current
+
+    def set(self, key: str, value: str, ttl_ms: int) -> None:
+        self.client.set(_KEY_PREFIX + key, value, px=ttl_ms)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(_KEY_PREFIX + key)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(_KEY_PREFIX + key)
+
+
+_local_store = LocalDedupeStore(settings.JOB_DEDUPE_LOCAL_MAX_KEYS)
+_redis_store: Optional[RedisDedupeStore] = None
+_redis_retry_at = 0.0
+
+
+def _get_redis_store() -> Optional[RedisDedupeStore]:
+    global _redis_store, _redis_retry_at
+    if not settings.JOB_DEDUPE_REDIS_ENABLED:
+        return None
+    if _redis_store is None and time.monotonic() >= _redis_retry_at:
+        try:
+            import redis
+
+            client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True, socket_timeout=2)
+            client.ping()
+            _redis_store = RedisDedupeStore(client)
+        except Exception:
+            _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            logger.warning("job_dedupe_redis_unavailable")
+    return _redis_store
+
+
+def _run(operation: str, *args):
+    """Run a store operation on Redis, or on the local LRU when Redis fails."""
+    global _redis_store, _redis_retry_at
+    store = _get_redis_store()
+    if store is not None:
+        try:
+            return getattr(store, operation)(*args)
+        except Exception as exc:
+            _redis_store = None
+            _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            logger.warning("job_dedupe_redis_failed", operation=operation, error=str(exc))
+    _stats.fallbacks += 1
+    increment_counter("job_dedupe_fallbacks")
+    return getattr(_local_store, operation)(*args)
+
+
+def _record_lookup(hit: bool) -> None:
+    if hit:
+        _stats.hits += 1
+    else:
+        _stats.misses += 1
+    increment_counter("job_dedupe_lookups", tags={"result": "hit" if hit else "miss"})
+
+
+# --------------------------------------------------------------------------- #
+# Public API
+# --------------------------------------------------------------------------- #
+
+
+def claim_dedupe_key(dedupe_key: str, job_id: str, job_type: Optional[str] = None) -> Optional[str]:
+    """Atomically register *job_id* under *dedupe_key* unless it is taken.
+
+    Returns None when the claim succeeded, otherwise the id registered by
+    the current holder.
+    """
+    holder = _run("set_nx", dedupe_key, job_id, dedupe_ttl_seconds(job_type) * 1000)
+    _record_lookup(holder is not None)
+    return holder
+
+
+def register_dedupe_key(dedupe_key: str, job_id: Optional[str] = None, job_type: Optional[str] = None) -> None:
+    """Register (or take over) *dedupe_key* unconditionally."""
+    _run("set", dedupe_key, job_id or _NO_JOB, dedupe_ttl_seconds(job_type) * 1000)
+
+
+def get_dedupe_job_id(dedupe_key: str) -> Optional[str]:
+    """Return the job id registered under *dedupe_key*, if one was recorded."""
+    value = _run("get", dedupe_key)
+    return value if value and value != _NO_JOB else None
 
 
 def is_duplicate(dedupe_key: str) -> bool:
-    return dedupe_key in DEDUPE_REGISTRY
+    return _run("get", dedupe_key) is not None
+
+
+def release_dedupe_key(dedupe_key: str) -> None:
+    _run("delete", dedupe_key)
+
 
+def claim_for_job(db, job: Job, dedupe_key: str) -> Job:
+    """Claim *dedupe_key* for the freshly committed *job*.
 
-def register_dedupe_key(dedupe_key: str) -> None:
-    DEDUPE_REGISTRY[dedupe_key] = True
+    Returns *job* when it won the claim.  When another still-active job
+    holds the key, *job* is deleted and the holder is returned instead.  A
+    holder that finished (or no longer exists) is taken over.  Every
+    claimant commits its row before claiming, so a live holder's row is
+    always visible here.
+    """
+    job_type = job.job_type.value
+    holder_id = claim_dedupe_key(dedupe_key, job.celery_task_id, job_type=job_type)
+    if holder_id is None or holder_id == job.celery_task_id:
+        return job
+    holder = db.query(Job).filter(Job.celery_task_id == holder_id).first()
+    if holder is not None and holder.status in _ACTIVE_STATUSES:
+        db.delete(job)
+        db.commit()
+        return holder
+    register_dedupe_key(dedupe_key, job_id=job.celery_task_id, job_type=job_type)
+    return job
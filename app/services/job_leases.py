@@ -0,0 +1,199 @@
+"""Job lease heartbeats buffered in Redis (BE-W5-047).
+
+A heartbeat used to be an UPDATE + commit on the ``jobs`` row, so thousands
+of running tasks kept the table under a constant write load.  Heartbeats
+now go to Redis instead: each lease is a key (``jobs:lease:<task id>``) that
+expires together with the lease, and the task id is added to a dirty set.
+``flush_heartbeats`` runs every ``JOB_LEASE_FLUSH_INTERVAL_SECONDS`` and
+copies the dirty leases to ``jobs.heartbeat_at`` / ``lease_expires_at``
+with one executemany UPDATE per batch.
+
+Lease reclamation flushes pending heartbeats before it looks for expired
+leases, so a job is never reclaimed while Redis still holds a newer lease.
+When Redis is disabled or unreachable, heartbeats are written straight to
+the row as before.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, func, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job import Job, JobStatus
+from app.services.metrics import increment_counter
+from app.utils.logging import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+_KEY_PREFIX = "jobs:lease"
+_DIRTY_KEY = f"{_KEY_PREFIX}:dirty"
+_REDIS_RETRY_SECONDS = 30.0
+_LIVE_STATUSES = (JobStatus.PENDING, JobStatus.STARTED)
+
+_redis_client = None
+_redis_retry_at = 0.0
+
+
+def lease_key(celery_task_id: str) -> str:
+    return f"{_KEY_PREFIX}:{celery_task_id}"
+
+
+def get_redis_client():
+    """Shared Redis client, or None while Redis is disabled or unreachable."""
+    global _redis_client, _redis_retry_at
+    if not settings.JOB_LEASE_REDIS_ENABLED:
+        return None
+    if _redis_client is None and time.monotonic() >= _redis_retry_at:
+        try:
+            import redis
+
+            client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True, socket_timeout=2)
+            client.ping()
+            _redis_client = client
+        except Exception:
+            _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            logger.warning("job_lease_redis_unavailable")
+    return _redis_client
+
+
+def _drop_client() -> None:
+    global _redis_client, _redis_retry_at
+    _redis_client = None
+    _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+
+
+def _write_row(
+    db: Session,
+    celery_task_id: str,
+    worker_id: Optional[str],
+    now: datetime,
+    expires: datetime,
+) -> bool:
+    values = {Job.heartbeat_at: now, Job.lease_expires_at: expires}
+    if worker_id is not None:
+        values[Job.worker_id] = worker_id
+    updated = (
+        db.query(Job)
+        .filter(Job.celery_task_id == celery_task_id, Job.status.in_(_LIVE_STATUSES))
+        .update(values, synchronize_session=False)
+    )
+    db.commit()
+    return bool(updated)
+
+
+def record_heartbeat(
+    db: Session,
+    celery_task_id: str,
+    worker_id: Optional[str] = None,
+    timeout_seconds: Optional[int] = None,
+    client=None,
+) -> Optional[datetime]:
+    """Extend the lease of a running job; returns the heartbeat time.
+
+    The heartbeat lands in Redis and reaches the row on the next flush.
+    Without Redis the row is updated directly, and None is returned when
+    no live (pending/started) job matched.
+    """
+    timeout = settings.JOB_LEASE_TIMEOUT_SECONDS if timeout_seconds is None else timeout_seconds
+    now = datetime.utcnow()
+    expires = now + timedelta(seconds=timeout)
+    client = client or get_redis_client()
+    if client is not None:
+        lease = {
+            "worker_id": worker_id,
+            "heartbeat_at": now.isoformat(),
+            "lease_expires_at": expires.isoformat(),
+        }
+        try:
+            pipe = client.pipeline()
+            pipe.set(lease_key(celery_task_id), json.dumps(lease), px=timeout * 1000)
+            pipe.sadd(_DIRTY_KEY, celery_task_id)
+            pipe.execute()
+            increment_counter("job_heartbeats", tags={"store": "redis"})
+            return now
+        except Exception as exc:
+            _drop_client()
+            logger.warning("job_lease_heartbeat_redis_failed", celery_task_id=celery_task_id, error=str(exc))
+    increment_counter("job_heartbeats", tags={"store": "db"})
+    return now if _write_row(db, celery_task_id, worker_id, now, expires) else None
+
+
+def get_lease(celery_task_id: str, client=None) -> Optional[Dict[str, Optional[str]]]:
+    """The live Redis lease of a task (``worker_id`` / ``heartbeat_at`` /
+    ``lease_expires_at``), or None when it expired or Redis is unavailable."""
+    client = client or get_redis_client()
+    if client is None:
+        return None
+    try:
+        raw = client.get(lease_key(celery_task_id))
+    except Exception as exc:
+        logger.warning("job_lease_read_failed", celery_task_id=celery_task_id, error=str(exc))
+        return None
+    return json.loads(raw) if raw else None
+
+
+def flush_heartbeats(db: Session, client=None, batch_size: Optional[int] = None) -> int:
+    """Copy buffered heartbeats to the ``jobs`` rows; returns the rows written.
+
+    Drains the dirty set *batch_size* ids at a time.  A lease whose key has
+    already expired is skipped (the row's own lease expires with it), and
+    jobs that are no longer pending/started are left untouched.
+    """
+    client = client or get_redis_client()
+    if client is None:
+        return 0
+    size = batch_size or settings.JOB_LEASE_FLUSH_BATCH_SIZE
+    stmt = (
+        update(Job.__table__)
+        .where(
+            Job.celery_task_id == bindparam("b_celery_task_id"),
+            # Spelled out: expanding IN parameters cannot be used with executemany.
+            or_(*(Job.status == status for status in _LIVE_STATUSES)),
+        )
+        .values(
+            worker_id=func.coalesce(bindparam("b_worker_id"), Job.worker_id),
+            heartbeat_at=bindparam("b_heartbeat_at"),
+            lease_expires_at=bindparam("b_lease_expires_at"),
+        )
+    )
+    written = 0
+    while True:
+        try:
+            task_ids = client.spop(_DIRTY_KEY, size)
+            leases = client.mget([lease_key(task_id) for task_id in task_ids]) if task_ids else []
+        except Exception as exc:
+            _drop_client()
+            logger.warning("job_lease_flush_redis_failed", error=str(exc))
+            break
+        if not task_ids:
+            break
+        rows: List[Dict[str, object]] = []
+        for task_id, raw in zip(task_ids, leases):
+            if not raw:
+                continue
+            lease = json.loads(raw)
+            rows.append({
+                "b_celery_task_id": task_id,
+                "b_worker_id": lease.get("worker_id"),
+                "b_heartbeat_at": datetime.fromisoformat(lease["heartbeat_at"]),
+                "b_lease_expires_at": datetime.fromisoformat(lease["lease_expires_at"]),
+            })
+        if rows:
+            try:
+                db.execute(stmt, rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                # Put the batch back so the next flush retries it.
+                client.sadd(_DIRTY_KEY, *task_ids)
+                raise
+            written += len(rows)
+        if len(task_ids) < size:
+            break
+    if written:
+        increment_counter("job_heartbeat_rows_flushed", value=written)
+    return written
@@ -0,0 +1,218 @@
+"""Coalesced job progress reporting with a live Redis channel.
+
+Long-running tasks report progress far more often than anyone needs it in
+the ``jobs`` table.  ``ProgressReporter`` keeps the latest update in memory
+and writes the row at most every ``JOB_PROGRESS_FLUSH_INTERVAL_MS`` or when
+``progress_details["stage"]`` changes, so a job touches its row a handful of
+times per stage instead of once per item.
+
+Every update (written or not) is also published to Redis: a snapshot key
+that ``GET /jobs/{id}/progress`` reads first, and a pub/sub channel for live
+subscribers.  Both are keyed by the Celery task id.  Redis is optional;
+without it readers fall back to the (coalesced) row.
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services.metrics import increment_counter
+from app.utils.logging import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+_KEY_PREFIX = "jobs:progress"
+_REDIS_RETRY_SECONDS = 30.0
+
+_redis_client = None
+_redis_retry_at = 0.0
+
+
+def channel_for(celery_task_id: str) -> str:
+    """Pub/sub channel carrying every progress update of a task."""
+    return f"{_KEY_PREFIX}:{celery_task_id}"
+
+
+def snapshot_key(celery_task_id: str) -> str:
+    return f"{_KEY_PREFIX}:snapshot:{celery_task_id}"
+
+
+def get_redis_client():
+    """Shared Redis client, or None while Redis is disabled or unreachable.
+
+    A failed connection is retried at most every few seconds so an outage
+    does not add a connect timeout to every progress update.
+    """
+    global _redis_client, _redis_retry_at
+    if not settings.JOB_PROGRESS_REDIS_ENABLED:
+        return None
+    if _redis_client is None and time.monotonic() >= _redis_retry_at:
+        try:
+            import redis
+
+            client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True, socket_timeout=2)
+            client.ping()
+            _redis_client = client
+        except Exception:
+            _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            logger.warning("job_progress_redis_unavailable")
+    return _redis_client
+
+
+def publish(celery_task_id: str, snapshot: Dict[str, Any], client=None) -> bool:
+    """Store *snapshot* as the task's latest progress and publish it."""
+    client = client or get_redis_client()
+    if client is None:
+        return False
+    body = json.dumps(snapshot, default=str)
+    try:
+        client.set(snapshot_key(celery_task_id), body, ex=settings.JOB_PROGRESS_SNAPSHOT_TTL_SECONDS)
+        client.publish(channel_for(celery_task_id), body)
+    except Exception as exc:
+        increment_counter("job_progress_publish_failures")
+        logger.warning("job_progress_publish_failed", celery_task_id=celery_task_id, error=str(exc))
+        return False
+    return True
+
+
+def read_snapshot(celery_task_id: str, client=None) -> Optional[Dict[str, Any]]:
+    """Latest published progress of a task, or None."""
+    client = client or get_redis_client()
+    if client is None:
+        return None
+    try:
+        body = client.get(snapshot_key(celery_task_id))
+    except Exception as exc:
+        logger.warning("job_progress_read_failed", celery_task_id=celery_task_id, error=str(exc))
+        return None
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except (TypeError, ValueError):
+        return None
+
+
+class ProgressReporter:
+    """Buffers progress updates for one job and writes them coalesced.
+
+    ``update`` mirrors the old ``_update_progress`` contract: progress is
+    capped at 99 (only the terminal transition sets 100) and ``details``
+    replaces ``progress_details`` when given.  Writes commit on *db*.
+    """
+
+    def __init__(
+        self,
+        db,
+        celery_task_id: str,
+        flush_interval_ms: Optional[int] = None,
+        redis_client=None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.db = db
+        self.celery_task_id = celery_task_id
+        interval = settings.JOB_PROGRESS_FLUSH_INTERVAL_MS if flush_interval_ms is None else flush_interval_ms
+        self._interval = interval / 1000.0
+        self._redis = redis_client
+        self._clock = clock
+        self._progress: Optional[float] = None
+        self._details: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self._flushed_at: Optional[float] = None
+        self._flushed_stage: Optional[str] = None
+        self.writes = 0
+
+    def update(self, progress: float, details: Optional[Dict[str, Any]] = None) -> None:
+        self._progress = min(progress, 99.0)
+        if details:
+            self._details = details
+        self._dirty = True
+        self._publish()
+
+        stage = (self._details or {}).get("stage")
+        now = self._clock()
+        if (
+            self._flushed_at is None
+            or stage != self._flushed_stage
+            or now - self._flushed_at >= self._interval
+        ):
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write the buffered update to the jobs row; False if nothing was pending."""
+        if not self._dirty:
+            return False
+        values: Dict[Any, Any] = {Job.progress: self._progress}
+        if self._details:
+            values[Job.progress_details] = self._details
+        self.db.query(Job).filter(Job.celery_task_id == self.celery_task_id).update(
+            values, synchronize_session=False
+        )
+        self.db.commit()
+        self._dirty = False
+        self._flushed_at = self._clock()
+        self._flushed_stage = (self._details or {}).get("stage")
+        self.writes += 1
+        return True
+
+    def close(self, status: str, progress: Optional[float] = None) -> None:
+        """Publish the job's terminal state and drop anything still buffered.
+
+        The terminal transition writes the row itself, so pending progress
+        is not flushed.
+        """
+        self._dirty = False
+        if progress is not None:
+            self._progress = progress
+        self._publish(status)
+
+    def _publish(self, status: Optional[str] = None) -> None:
+        snapshot = {
+            "progress": self._progress,
+            "progress_details": self._details,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if status is not None:
+            snapshot["status"] = status
+        publish(self.celery_task_id, snapshot, client=self._redis)
+
+
+# --------------------------------------------------------------------------- #
+# Task integration
+# --------------------------------------------------------------------------- #
+
+
+def task_reporter(task, db, celery_task_id: str) -> ProgressReporter:
+    """The reporter for *celery_task_id*, kept on the task instance.
+
+    A new reporter is started when the task opens a new session (e.g. on a
+    retry), so buffered state never outlives the session it writes with.
+    The task base drops it when the run returns (``discard_reporter``).
+    """
+    reporters = task.__dict__.setdefault("_progress_reporters", {})
+    reporter = reporters.get(celery_task_id)
+    if reporter is None or reporter.db is not db:
+        reporter = ProgressReporter(db, celery_task_id)
+        reporters[celery_task_id] = reporter
+    return reporter
+
+
+def release_reporter(task, celery_task_id: str, status: str, progress: Optional[float] = None) -> None:
+    """Forget the task's reporter once the job reached a terminal state."""
+    reporter = task.__dict__.get("_progress_reporters", {}).pop(celery_task_id, None)
+    if reporter is not None:
+        reporter.close(status, progress)
+
+
+def discard_reporter(task, celery_task_id: str) -> None:
+    """Forget the task's reporter when its run returns, whatever the outcome.
+
+    Called from the task base's ``after_return`` so a run that ends without
+    a terminal transition (a chord-backed job, a retry) does not leave the
+    reporter and its closed session on the long-lived task.  Anything still
+    buffered is dropped; the next writer of the job reports on.
+    """
+    task.__dict__.get("_progress_reporters", {}).pop(celery_task_id, None)
@@ -0,0 +1,170 @@
+"""Background Celery → ``jobs`` state synchronizer.
+
+The job endpoints used to ask the Celery result backend for the state of
+every in-progress job they returned, so dashboard polling turned into a
+Redis round-trip per job per request.  This process subscribes to the
+workers' task events instead (``task-started``, ``task-succeeded``,
+``task-failed``, ``task-revoked``), keeps the latest state per task in
+memory and writes them to ``jobs`` in batches at least every
+``JOB_STATE_SYNC_FLUSH_INTERVAL_MS``.  The endpoints read the row only.
+
+Only pending/started rows are updated: a state the task itself already
+recorded (success, quarantine, dead-letter, ...) is never overwritten.
+Chord-backed jobs (``CHORD_COMPLETED_JOB_TYPES``) only take "started"
+from events: their task succeeds on dispatch and the chord reducer writes
+the final status.
+
+Run it next to the workers::
+
+    python -m app.services.job_state_sync
+"""
+
+import socket
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import Boolean, Date, and_, bindparam, case, func, or_, update
+
+from app.core.config import settings
+from app.models.job import CHORD_COMPLETED_JOB_TYPES, Job, JobStatus, retention_month_for
+from app.services.metrics import increment_counter
+from app.utils.logging import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+EVENT_STATES: Dict[str, JobStatus] = {
+    "task-started": JobStatus.STARTED,
+    "task-succeeded": JobStatus.SUCCESS,
+    "task-failed": JobStatus.FAILURE,
+    "task-revoked": JobStatus.REVOKED,
+}
+_OPEN_STATUSES = (JobStatus.PENDING, JobStatus.STARTED)
+
+
+def _rank(status: JobStatus) -> int:
+    return 0 if status == JobStatus.STARTED else 1
+
+
+class JobStateSynchronizer:
+    """Buffers task-state events and writes them to ``jobs`` in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        flush_interval_ms: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.session_factory = session_factory
+        interval = settings.JOB_STATE_SYNC_FLUSH_INTERVAL_MS if flush_interval_ms is None else flush_interval_ms
+        self.flush_interval = interval / 1000.0
+        self.batch_size = batch_size or settings.JOB_STATE_SYNC_BATCH_SIZE
+        self._clock = clock
+        self._pending: Dict[str, Tuple[JobStatus, datetime]] = {}
+        self._flushed_at = clock()
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        status = EVENT_STATES.get(event.get("type", ""))
+        task_id = event.get("uuid")
+        if status is None or not task_id:
+            return
+        at = datetime.utcfromtimestamp(event["timestamp"]) if event.get("timestamp") else datetime.utcnow()
+        current = self._pending.get(task_id)
+        # A terminal state wins over "started" regardless of arrival order.
+        if current is None or _rank(status) > _rank(current[0]) or (
+            _rank(status) == _rank(current[0]) and at >= current[1]
+        ):
+            self._pending[task_id] = (status, at)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self) -> int:
+        if self._clock() - self._flushed_at >= self.flush_interval:
+            return self.flush()
+        return 0
+
+    def flush(self) -> int:
+        """Write the buffered states; returns the number of events written."""
+        self._flushed_at = self._clock()
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        rows = [
+            {
+                "b_celery_task_id": task_id,
+                "b_status": status,
+                "b_is_started": status == JobStatus.STARTED,
+                "b_started_at": at,
+                "b_finished_at": None if status == JobStatus.STARTED else at,
+                "b_retention_month": retention_month_for(None if status == JobStatus.STARTED else at),
+            }
+            for task_id, (status, at) in pending.items()
+        ]
+        stmt = (
+            update(Job.__table__)
+            .where(
+                Job.celery_task_id == bindparam("b_celery_task_id"),
+                # Spelled out: expanding IN parameters cannot be used with executemany.
+                or_(*(Job.status == status for status in _OPEN_STATUSES)),
+                or_(
+                    bindparam("b_is_started", type_=Boolean()),
+                    and_(*(Job.job_type != job_type for job_type in CHORD_COMPLETED_JOB_TYPES)),
+                ),
+            )
+            .values(
+                status=bindparam("b_status"),
+                started_at=func.coalesce(Job.started_at, bindparam("b_started_at")),
+                finished_at=func.coalesce(Job.finished_at, bindparam("b_finished_at")),
+                # The ORM listener does not see Core UPDATEs; without this a
+                # finished job would stay in the open partition.
+                retention_month=case(
+                    (Job.finished_at.is_(None), bindparam("b_retention_month", type_=Date())),
+                    else_=Job.retention_month,
+                ),
+            )
+        )
+        db = self.session_factory()
+        try:
+            db.execute(stmt, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Keep the batch (unless newer events replaced it) for the next flush.
+            for task_id, state in pending.items():
+                self._pending.setdefault(task_id, state)
+            logger.exception("job_state_sync_flush_failed", events=len(rows))
+            return 0
+        finally:
+            db.close()
+        increment_counter("job_state_sync_events", value=len(rows))
+        return len(rows)
+
+
+def run(app=None, session_factory=None) -> None:
+    """Consume task events from the broker until interrupted."""
+    if app is None:
+        from app.tasks.celery_app import celery_app as app
+    if session_factory is None:
+        from app.db.session import SessionLocal as session_factory
+
+    synchronizer = JobStateSynchronizer(session_factory)
+    handlers = {event_type: synchronizer.handle_event for event_type in EVENT_STATES}
+    logger.info("job_state_sync_started", flush_interval_ms=settings.JOB_STATE_SYNC_FLUSH_INTERVAL_MS)
+    with app.connection() as connection:
+        receiver = app.events.Receiver(connection, handlers=handlers)
+        while True:
+            try:
+                receiver.capture(limit=None, timeout=synchronizer.flush_interval, wakeup=False)
+            except socket.timeout:
+                pass
+            except KeyboardInterrupt:
+                synchronizer.flush()
+                raise
+            synchronizer.flush_if_due()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,113 @@
+"""Read-through outage detail cache and conditional-GET validators.
+
+Every validator is derived from the outages table version (see
+``app.repositories.change_counter``), so a poll with an unchanged
+``If-None-Match`` is answered with 304 after a single primary-key lookup
+and without touching ``outages`` or pydantic.
+
+Detail entries hold the pre-serialized JSON body and are keyed in the
+``CacheKeyNamespace.OUTAGE`` namespace.  An entry is only served while the
+table version it was built at is still current; callers additionally
+invalidate it after update, resolve, delete and restore.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+from app.core.cache_governance import CacheGovernance, CacheKeyBuilder, CacheKeyNamespace
+from app.core.config import settings
+from app.repositories.outage_repository import OutageRepository
+from app.services.metrics import increment_counter
+from app.utils.cache import TTLCache
+
+
+@dataclass
+class CachedOutage:
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime]
+    version: str
+
+
+_detail_cache = TTLCache(
+    ttl_seconds=CacheGovernance.enforce_ttl(CacheKeyNamespace.OUTAGE, settings.OUTAGE_DETAIL_CACHE_TTL_SECONDS)
+)
+
+
+def _detail_key(outage_id: str) -> str:
+    return CacheKeyBuilder.build(CacheKeyNamespace.OUTAGE, "detail", outage_id)
+
+
+def _etag(*parts: Any) -> str:
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def get_outage_detail(repo: OutageRepository, outage_id: str) -> Optional[CachedOutage]:
+    """Return the cached detail entry for *outage_id*, loading it on a miss."""
+    version, changed_at = repo.table_version()
+    key = _detail_key(outage_id)
+    entry = _detail_cache.get(key)
+    if entry is not None and entry.version == version:
+        increment_counter("outage_detail_cache", tags={"result": "hit"})
+        return entry
+
+    increment_counter("outage_detail_cache", tags={"result": "miss"})
+    loaded = repo.get_with_updated_at(outage_id)
+    if loaded is None:
+        return None
+    outage, updated_at = loaded
+    # Without the database counter, updated_at alone may miss writes that do
+    # not touch it, so only the ETag is offered.
+    last_modified = max(filter(None, (updated_at, changed_at))) if changed_at else None
+    entry = CachedOutage(
+        body=outage.model_dump_json().encode("utf-8"),
+        etag=_etag(outage_id, updated_at.isoformat() if updated_at else "", version),
+        last_modified=last_modified,
+        version=version,
+    )
+    _detail_cache.set(key, entry)
+    return entry
+
+
+def invalidate(outage_id: str) -> None:
+    _detail_cache.invalidate(_detail_key(outage_id))
+
+
+def list_validators(repo: OutageRepository, params: Mapping[str, Any]) -> Dict[str, Any]:
+    """ETag/Last-Modified for a listing: the table version plus its query."""
+    version, changed_at = repo.table_version()
+    canonical = json.dumps(params, sort_keys=True, default=str)
+    return {"etag": _etag("list", version, canonical), "last_modified": changed_at}
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def is_not_modified(request_headers: Mapping[str, str], etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate ``If-None-Match`` (preferred) or ``If-Modified-Since``."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {c.strip() for c in if_none_match.split(",")}
+        if "*" in candidates:
+            return True
+        return etag in {c[2:] if c.startswith("W/") else c for c in candidates}
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
@@ -0,0 +1,220 @@
+"""Set-based bulk outage import engine for ``POST /outages/import``.
+
+Rows are validated as they arrive (see ``ImportBatch``), then resolved
+against stored outages one chunk at a time (a single ``IN`` query per chunk
+for both id and content duplicates, see
+``OutageRepository.resolve_duplicates``) and inserted with one
+``executemany``/``COPY`` per chunk.  Duplicates *within* the upload are
+resolved in memory with the same rules, so row outcomes match what the old
+row-by-row path reported.
+
+Consistency modes:
+  atomic   nothing is written unless every row validates and resolves; all
+           new rows are inserted in a single transaction.
+  partial  each chunk commits on its own; if a chunk insert fails the chunk
+           is retried row by row inside savepoints so only the offending
+           rows are reported as errors.
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.outage_dto import ImportConsistency, ImportFieldError, ImportRowResult, OutageCreate
+from app.repositories.outage_repository import OutageRepository, PendingOutageIndex
+from app.services.metrics import increment_counter, timer
+from app.utils.logging import get_structured_logger
+
+logger = get_structured_logger("outage_import")
+
+
+def row_error(index: int, raw_row: dict, exc: Exception) -> ImportRowResult:
+    """Return a stable machine-readable ImportRowResult for a failed row."""
+    errors: list[ImportFieldError] = []
+    if hasattr(exc, "errors"):
+        for e in exc.errors():  # type: ignore[union-attr]
+            errors.append(ImportFieldError(
+                field=".".join(str(loc) for loc in e["loc"]) if e.get("loc") else None,
+                type=e.get("type"),
+                message=e.get("msg", str(e)),
+            ))
+    else:
+        errors.append(ImportFieldError(field=None, type=type(exc).__name__, message=str(exc)))
+
+    return ImportRowResult(row=index, id=raw_row.get("id") if isinstance(raw_row, dict) else None, status="error", errors=errors)
+
+
+class OutageImportEngine:
+    def __init__(self, db: Session, chunk_rows: Optional[int] = None):
+        self.db = db
+        self.repo = OutageRepository(db)
+        self.chunk_rows = max(1, chunk_rows or settings.OUTAGE_IMPORT_CHUNK_ROWS)
+
+    def begin(self, consistency: ImportConsistency, dry_run: bool = False) -> "ImportBatch":
+        """Start an incremental import; feed rows as they are parsed."""
+        return ImportBatch(self, consistency, dry_run)
+
+    def run(
+        self,
+        rows: Sequence[dict],
+        consistency: ImportConsistency,
+        dry_run: bool = False,
+    ) -> Tuple[List[ImportRowResult], int]:
+        """Import *rows* and return ``(row_outcomes, persisted_count)``."""
+        batch = self.begin(consistency, dry_run)
+        batch.feed(rows)
+        return batch.finish()
+
+
+class ImportBatch:
+    """State of one import fed row-chunk by row-chunk.
+
+    Rows are validated as they arrive and only the validated payloads are
+    kept.  Dry-run and partial imports also resolve duplicates per chunk as
+    soon as a chunk fills up; atomic imports defer resolution until every
+    row has validated.  Nothing is written before ``finish()``, so an upload
+    rejected midway (e.g. too many rows) leaves the database untouched.
+    """
+
+    def __init__(self, engine: OutageImportEngine, consistency: ImportConsistency, dry_run: bool):
+        self.engine = engine
+        self.db = engine.db
+        self.repo = engine.repo
+        self.chunk_rows = engine.chunk_rows
+        self.consistency = consistency
+        self.dry_run = dry_run
+        self.outcomes: List[ImportRowResult] = []
+        self._unresolved: List[Tuple[int, OutageCreate]] = []
+        self._to_insert: List[Tuple[int, OutageCreate]] = []
+        self._pending = PendingOutageIndex()
+        self._has_invalid = False
+        self._timer = timer(
+            "outage_import_duration",
+            {"consistency": consistency.value, "dry_run": str(dry_run).lower()},
+        )
+        self._timer.__enter__()
+
+    @property
+    def _eager_resolution(self) -> bool:
+        return self.dry_run or self.consistency == ImportConsistency.partial
+
+    def feed(self, rows: Iterable[dict]) -> None:
+        for row in rows:
+            i = len(self.outcomes)
+            try:
+                payload = OutageCreate(**row)
+            except Exception as exc:
+                self.outcomes.append(row_error(i, row, exc))
+                self._has_invalid = True
+                continue
+            self.outcomes.append(ImportRowResult(row=i, id=payload.id, status="ok"))
+            self._unresolved.append((i, payload))
+            if self._eager_resolution and len(self._unresolved) >= self.chunk_rows:
+                self._resolve_pending()
+
+    def finish(self) -> Tuple[List[ImportRowResult], int]:
+        try:
+            persisted = self._finish()
+        finally:
+            self._timer.__exit__(None, None, None)
+        increment_counter(
+            "outage_import_rows_persisted", value=persisted, tags={"consistency": self.consistency.value}
+        )
+        logger.info(
+            "Outage import complete",
+            consistency=self.consistency.value,
+            dry_run=self.dry_run,
+            total_rows=len(self.outcomes),
+            persisted=persisted,
+            errors=sum(1 for r in self.outcomes if r.status == "error"),
+        )
+        return self.outcomes, persisted
+
+    def _finish(self) -> int:
+        if not self.dry_run and self.consistency == ImportConsistency.atomic and self._has_invalid:
+            return 0
+        self._resolve_pending()
+        if self.dry_run:
+            return 0
+        if self.consistency == ImportConsistency.atomic:
+            if any(r.status == "error" for r in self.outcomes):
+                return 0
+            return self._write_atomic()
+        return self._write_partial()
+
+    # ------------------------------------------------------------------ #
+    # Phases                                                              #
+    # ------------------------------------------------------------------ #
+
+    def _resolve_pending(self) -> None:
+        """Mark duplicates/conflicts for unresolved rows and queue new ones."""
+        parsed, self._unresolved = self._unresolved, []
+        annotate = not self.dry_run
+        for start in range(0, len(parsed), self.chunk_rows):
+            chunk = parsed[start:start + self.chunk_rows]
+            resolved = self.repo.resolve_duplicates([payload for _, payload in chunk])
+            for (i, payload), (existing, conflict) in zip(chunk, resolved):
+                existing_id = existing.id if existing is not None else None
+                if existing_id is None and conflict is None:
+                    existing_id, conflict = self._pending.match(payload)
+
+                outcome = self.outcomes[i]
+                if conflict:
+                    self.outcomes[i] = row_error(i, {"id": payload.id}, ValueError(conflict))
+                elif existing_id:
+                    outcome.duplicate = True
+                    outcome.existing_id = existing_id
+                    if annotate:
+                        outcome.outage_id = existing_id
+                        outcome.persisted = False
+                else:
+                    outcome.duplicate = False
+                    self._pending.add(payload)
+                    self._to_insert.append((i, payload))
+
+    def _write_atomic(self) -> int:
+        try:
+            for start in range(0, len(self._to_insert), self.chunk_rows):
+                chunk = self._to_insert[start:start + self.chunk_rows]
+                self.repo.insert_many([payload for _, payload in chunk])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        for i, payload in self._to_insert:
+            self.outcomes[i].outage_id = payload.id
+            self.outcomes[i].persisted = True
+        return len(self._to_insert)
+
+    def _write_partial(self) -> int:
+        persisted = 0
+        for start in range(0, len(self._to_insert), self.chunk_rows):
+            chunk = self._to_insert[start:start + self.chunk_rows]
+            try:
+                self.repo.insert_many([payload for _, payload in chunk])
+                self.db.commit()
+                written = chunk
+            except Exception as exc:
+                self.db.rollback()
+                logger.warning("Outage import chunk failed; retrying row by row", error=str(exc), rows=len(chunk))
+                written = self._write_rows_individually(chunk)
+            for i, payload in written:
+                self.outcomes[i].outage_id = payload.id
+                self.outcomes[i].persisted = True
+            persisted += len(written)
+        return persisted
+
+    def _write_rows_individually(self, chunk: List[Tuple[int, OutageCreate]]) -> List[Tuple[int, OutageCreate]]:
+        written: List[Tuple[int, OutageCreate]] = []
+        for i, payload in chunk:
+            savepoint = self.db.begin_nested()
+            try:
+                self.repo.insert_many([payload])
+                savepoint.commit()
+                written.append((i, payload))
+            except Exception as exc:
+                savepoint.rollback()
+                self.outcomes[i] = row_error(i, {"id": payload.id}, exc)
+        self.db.commit()
+        return written
@@ -0,0 +1,225 @@
+"""Transactional outbox for post-commit side effects.
+
+Request paths record side effects (webhook fan-out, audit entries) as
+``outbox`` rows in the same transaction as the outage/SLA/payment change,
+instead of performing them inline.  Delivery is then:
+
+  relay     ``relay_pending`` claims due rows with ``FOR UPDATE SKIP LOCKED``
+            (so several relays never claim the same row), marks the batch
+            ``published`` in one commit and then publishes each id to Celery.
+  consumer  ``process_message`` marks the row ``processed`` and applies the
+            side effect in one unit of work.  The mark is a conditional
+            update, so a message delivered twice (republished while still
+            queued, broker redelivery) is applied once.
+
+Rows published but not processed within ``OUTBOX_REPUBLISH_AFTER_SECONDS``
+are published again, so a relay crash after its commit or a lost broker
+message is not lost work.  After ``OUTBOX_MAX_ATTEMPTS`` publishes a row is
+marked ``failed`` for an operator.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+from uuid import uuid4
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.unit_of_work import UnitOfWork, commit_or_defer
+from app.models.orm.outbox import (
+    OUTBOX_PENDING,
+    OUTBOX_PROCESSED,
+    OUTBOX_PUBLISHED,
+    OutboxMessageORM,
+)
+from app.services.metrics import increment_counter
+from app.utils.correlation import get_correlation_id
+from app.utils.logging import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+OUTBOX_FAILED = "failed"
+
+TOPIC_SLA_WEBHOOKS = "webhooks.sla"
+TOPIC_AUDIT = "audit.log"
+
+Handler = Callable[[Session, Dict[str, Any]], None]
+_handlers: Dict[str, Handler] = {}
+
+
+def handler(topic: str) -> Callable[[Handler], Handler]:
+    """Register the consumer-side handler for *topic*."""
+
+    def register(fn: Handler) -> Handler:
+        _handlers[topic] = fn
+        return fn
+
+    return register
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# --------------------------------------------------------------------------- #
+# Producer
+# --------------------------------------------------------------------------- #
+
+
+def enqueue(db: Session, topic: str, payload: Dict[str, Any]) -> OutboxMessageORM:
+    """Record a side effect on *db*; it is committed with the caller's writes.
+
+    *payload* must be JSON-serialisable.
+    """
+    if topic not in _handlers:
+        raise ValueError(f"Unknown outbox topic: '{topic}'")
+    message = OutboxMessageORM(
+        id=str(uuid4()),
+        topic=topic,
+        payload=payload,
+        status=OUTBOX_PENDING,
+        attempts=0,
+        created_at=_now(),
+    )
+    db.add(message)
+    commit_or_defer(db)
+    return message
+
+
+def enqueue_audit(
+    db: Session,
+    event_type: str,
+    details: Optional[Dict[str, Any]] = None,
+    actor_id: Optional[str] = None,
+) -> OutboxMessageORM:
+    """Outbox an audit entry, keeping the request's correlation id."""
+    return enqueue(
+        db,
+        TOPIC_AUDIT,
+        {
+            "event_type": event_type,
+            "details": details,
+            "actor_id": actor_id,
+            "correlation_id": get_correlation_id(),
+        },
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Relay
+# --------------------------------------------------------------------------- #
+
+
+def relay_pending(db: Session, publish: Callable[[str], Any], batch_size: Optional[int] = None) -> int:
+    """Publish up to *batch_size* due messages via *publish*; return how many."""
+    now = _now()
+    stale = now - timedelta(seconds=settings.OUTBOX_REPUBLISH_AFTER_SECONDS)
+    batch = (
+        db.query(OutboxMessageORM)
+        .filter(
+            or_(
+                OutboxMessageORM.status == OUTBOX_PENDING,
+                and_(OutboxMessageORM.status == OUTBOX_PUBLISHED, OutboxMessageORM.published_at < stale),
+            )
+        )
+        .order_by(OutboxMessageORM.created_at.asc())
+        .limit(batch_size or settings.OUTBOX_RELAY_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    claimed = []
+    for message in batch:
+        if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            message.status = OUTBOX_FAILED
+            logger.error("outbox_message_failed", message_id=message.id, topic=message.topic, error=message.last_error)
+            increment_counter("outbox_messages", tags={"result": "failed", "topic": message.topic})
+            continue
+        message.status = OUTBOX_PUBLISHED
+        message.published_at = now
+        message.attempts += 1
+        claimed.append(message.id)
+    # Commit (releasing the row locks) before publishing, so an eager or
+    # fast consumer never waits on this transaction.
+    db.commit()
+
+    published = 0
+    try:
+        for message_id in claimed:
+            publish(message_id)
+            published += 1
+    except Exception:
+        unsent = claimed[published:]
+        db.query(OutboxMessageORM).filter(
+            OutboxMessageORM.id.in_(unsent), OutboxMessageORM.status == OUTBOX_PUBLISHED
+        ).update({OutboxMessageORM.status: OUTBOX_PENDING}, synchronize_session=False)
+        db.commit()
+        raise
+    finally:
+        if published:
+            increment_counter("outbox_messages", value=published, tags={"result": "published"})
+    return published
+
+
+# --------------------------------------------------------------------------- #
+# Consumer
+# --------------------------------------------------------------------------- #
+
+
+def process_message(db: Session, message_id: str) -> bool:
+    """Apply the side effect of *message_id* once; False if already processed."""
+    try:
+        with UnitOfWork(db):
+            claimed = db.execute(
+                update(OutboxMessageORM)
+                .where(
+                    OutboxMessageORM.id == message_id,
+                    OutboxMessageORM.status.in_((OUTBOX_PENDING, OUTBOX_PUBLISHED)),
+                )
+                .values(status=OUTBOX_PROCESSED, processed_at=_now(), last_error=None)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not claimed:
+                increment_counter("outbox_messages", tags={"result": "duplicate"})
+                return False
+            message = db.get(OutboxMessageORM, message_id)
+            topic_handler = _handlers.get(message.topic)
+            if topic_handler is None:
+                raise ValueError(f"Unknown outbox topic: '{message.topic}'")
+            topic_handler(db, message.payload)
+    except Exception as exc:
+        db.query(OutboxMessageORM).filter(OutboxMessageORM.id == message_id).update(
+            {OutboxMessageORM.last_error: str(exc)[:2000]}, synchronize_session=False
+        )
+        db.commit()
+        raise
+    increment_counter("outbox_messages", tags={"result": "processed", "topic": message.topic})
+    return True
+
+
+# --------------------------------------------------------------------------- #
+# Handlers
+# --------------------------------------------------------------------------- #
+
+
+@handler(TOPIC_SLA_WEBHOOKS)
+def _deliver_sla_webhooks(db: Session, payload: Dict[str, Any]) -> None:
+    # Local import: webhook_service pulls in httpx and the signing stack.
+    from app.models.webhook import WebhookEvent
+    from app.services.webhook_service import trigger_sla_violation_webhooks
+
+    trigger_sla_violation_webhooks(db, sla_data=payload["sla_data"], event=WebhookEvent(payload["event"]))
+
+
+@handler(TOPIC_AUDIT)
+def _write_audit_entry(db: Session, payload: Dict[str, Any]) -> None:
+    from app.services.audit_log import audit_log
+
+    audit_log.log_event(
+        db,
+        payload["event_type"],
+        actor_id=payload.get("actor_id"),
+        details=payload.get("details"),
+        correlation_id=payload.get("correlation_id"),
+    )
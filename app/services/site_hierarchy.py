@@ -1,14 +1,164 @@
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, insert, literal, select, true
 from sqlalchemy.orm import Session
-from app.models.site_hierarchy import SiteHierarchy
+
+from app.models.site_hierarchy import SiteHierarchy, SiteHierarchyClosure, SiteOutageRollup
+from app.repositories.site_rollups import (
+    ROLLUP_FIELDS,
+    discard_deltas,
+    pending_totals,
+    rollup_totals,
+    shift_rollups,
+)
 from app.schemas.site_hierarchy import SiteHierarchyCreate
 
+
 class SiteHierarchyService:
+    """Site tree backed by a closure table and per-node outage rollups.
+
+    ``site_hierarchy_closure`` stores every (ancestor, descendant, depth)
+    pair, so subtree reads are one indexed lookup instead of a recursive
+    walk.  It is kept in step on insert and move, together with
+    ``site_outage_rollups`` (see ``app.repositories.site_rollups``).
+    """
+
     def create_site(self, db: Session, site_in: SiteHierarchyCreate) -> SiteHierarchy:
-        db_site = SiteHierarchy(**site_in.dict())
+        db_site = SiteHierarchy(**site_in.model_dump())
         db.add(db_site)
+        db.flush()
+
+        closure = SiteHierarchyClosure.__table__
+        db.execute(insert(closure).values(ancestor_id=db_site.id, descendant_id=db_site.id, depth=0))
+        if db_site.parent_id is not None:
+            db.execute(
+                insert(closure).from_select(
+                    ["ancestor_id", "descendant_id", "depth"],
+                    select(closure.c.ancestor_id, literal(db_site.id), closure.c.depth + 1).where(
+                        closure.c.descendant_id == db_site.parent_id
+                    ),
+                )
+            )
+
+        db.add(SiteOutageRollup(site_id=db_site.id, **{name: 0 for name in ROLLUP_FIELDS}))
+        db.flush()
+        if db_site.site_code:
+            # Outages may already have been reported for this site code; the
+            # recomputation covers them, so their queued deltas are dropped.
+            discard_deltas(db, db_site.site_code)
+            totals = rollup_totals(db, [db_site.id]).get(db_site.id)
+            if totals:
+                shift_rollups(db, self._ancestor_ids(db, db_site.id, include_self=True), totals)
+
         db.commit()
         db.refresh(db_site)
         return db_site
 
     def get_site_by_id(self, db: Session, site_id: int) -> SiteHierarchy:
         return db.query(SiteHierarchy).filter(SiteHierarchy.id == site_id).first()
+
+    def move_site(self, db: Session, site_id: int, new_parent_id: Optional[int]) -> SiteHierarchy:
+        """Re-parent *site_id* (and its subtree) under *new_parent_id*.
+
+        Raises ValueError for unknown sites or a move under the site's own
+        subtree.
+        """
+        site = self.get_site_by_id(db, site_id)
+        if site is None:
+            raise ValueError(f"Site {site_id} not found")
+        if new_parent_id == site.parent_id:
+            return site
+        if new_parent_id is not None:
+            if self.get_site_by_id(db, new_parent_id) is None:
+                raise ValueError(f"Parent site {new_parent_id} not found")
+            in_subtree = (
+                db.query(SiteHierarchyClosure)
+                .filter(
+                    SiteHierarchyClosure.ancestor_id == site_id,
+                    SiteHierarchyClosure.descendant_id == new_parent_id,
+                )
+                .first()
+            )
+            if in_subtree is not None:
+                raise ValueError("Cannot move a site under itself or one of its descendants")
+
+        rollup = db.get(SiteOutageRollup, site_id)
+        totals = [getattr(rollup, name) for name in ROLLUP_FIELDS] if rollup else [0] * len(ROLLUP_FIELDS)
+        shift_rollups(db, self._ancestor_ids(db, site_id), [-v for v in totals])
+
+        closure = SiteHierarchyClosure.__table__
+        subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == site_id)
+        db.execute(
+            delete(closure).where(
+                closure.c.descendant_id.in_(subtree),
+                closure.c.ancestor_id.not_in(subtree),
+            )
+        )
+        if new_parent_id is not None:
+            above = closure.alias("above")
+            below = closure.alias("below")
+            db.execute(
+                insert(closure).from_select(
+                    ["ancestor_id", "descendant_id", "depth"],
+                    select(above.c.ancestor_id, below.c.descendant_id, above.c.depth + below.c.depth + 1)
+                    .select_from(above.join(below, true()))
+                    .where(above.c.descendant_id == new_parent_id, below.c.ancestor_id == site_id),
+                )
+            )
+
+        site.parent_id = new_parent_id
+        db.flush()
+        shift_rollups(db, self._ancestor_ids(db, site_id), totals)
+        db.commit()
+        db.refresh(site)
+        return site
+
+    def get_subtree(
+        self, db: Session, site_id: int, max_depth: Optional[int] = None
+    ) -> List[Tuple[SiteHierarchy, int]]:
+        """Return ``(site, depth)`` for *site_id* and its descendants, shallowest first."""
+        query = (
+            db.query(SiteHierarchy, SiteHierarchyClosure.depth)
+            .join(SiteHierarchyClosure, SiteHierarchyClosure.descendant_id == SiteHierarchy.id)
+            .filter(SiteHierarchyClosure.ancestor_id == site_id)
+        )
+        if max_depth is not None:
+            query = query.filter(SiteHierarchyClosure.depth <= max_depth)
+        return [(site, depth) for site, depth in query.order_by(SiteHierarchyClosure.depth, SiteHierarchy.name)]
+
+    def get_rollup(self, db: Session, site_id: int) -> Optional[SiteOutageRollup]:
+        """The stored rollup plus the deltas not folded into it yet (detached)."""
+        stored = db.get(SiteOutageRollup, site_id)
+        if stored is None:
+            return None
+        pending = pending_totals(db, [site_id]).get(site_id, (0,) * len(ROLLUP_FIELDS))
+        return SiteOutageRollup(
+            site_id=site_id,
+            updated_at=stored.updated_at,
+            **{name: getattr(stored, name) + delta for name, delta in zip(ROLLUP_FIELDS, pending)},
+        )
+
+    def rebuild_rollups(self, db: Session) -> int:
+        """Recompute every node's rollup from ``outages``; returns the node count."""
+        discard_deltas(db)
+        totals = rollup_totals(db)
+        site_ids = [row[0] for row in db.query(SiteHierarchy.id)]
+        db.execute(delete(SiteOutageRollup.__table__))
+        if site_ids:
+            zero = (0,) * len(ROLLUP_FIELDS)
+            db.execute(
+                insert(SiteOutageRollup.__table__),
+                [
+                    {"site_id": sid, **dict(zip(ROLLUP_FIELDS, totals.get(sid, zero)))}
+                    for sid in site_ids
+                ],
+            )
+        db.commit()
+        return len(site_ids)
+
+    @staticmethod
+    def _ancestor_ids(db: Session, site_id: int, include_self: bool = False) -> List[int]:
+        query = db.query(SiteHierarchyClosure.ancestor_id).filter(SiteHierarchyClosure.descendant_id == site_id)
+        if not include_self:
+            query = query.filter(SiteHierarchyClosure.depth > 0)
+        return [row[0] for row in query]
@@ -1,19 +1,40 @@
 import json
 import logging
+from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.cache_governance import CacheGovernance, CacheKeyBuilder, CacheKeyNamespace
+from app.core.config import settings
+from app.models.enums import OutageStatus
 from app.models.orm.outage import OutageORM
 from app.models.orm.outage_event import OutageEventORM
 from app.models.orm.sla import SLAResultORM
 from app.models.orm.payment import PaymentTransactionORM
-from app.models.webhook import WebhookDelivery
+from app.models.payment import PaymentStatus
+from app.models.webhook import WebhookDelivery, WebhookDeliveryStatus, WebhookEvent
 from app.schemas.trace import TraceChain, TraceNode
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Webhook deliveries for these events carry the outage in their payload
+# (and, since migration 0031, in ``webhook_deliveries.outage_id``).
+_SLA_WEBHOOK_EVENTS = (
+    WebhookEvent.SLA_VIOLATION,
+    WebhookEvent.SLA_WARNING,
+    WebhookEvent.SLA_RESOLVED,
+)
+
+# Chains of settled outages (resolved, every payment confirmed, every
+# delivery succeeded) can only change through recompute-sla or an outage
+# edit, both of which call ``invalidate_trace``.
+_settled_cache = TTLCache(
+    ttl_seconds=CacheGovernance.enforce_ttl(CacheKeyNamespace.TRACE, settings.TRACE_SETTLED_CACHE_SECONDS)
+)
+
 
 def _serialize_dt(dt: Optional[datetime]) -> Optional[str]:
     if dt is None:
@@ -60,6 +81,221 @@ def _resolve_outage_id(
     return None
 
 
+def _cache_key(outage_id: str) -> str:
+    return CacheKeyBuilder.build(CacheKeyNamespace.TRACE, "outage", outage_id)
+
+
+def invalidate_trace(outage_id: str) -> None:
+    """Drop the cached chain for *outage_id* after a write that touches it."""
+    _settled_cache.invalidate(_cache_key(outage_id))
+
+
+# --------------------------------------------------------------------------- #
+# Node builders
+# --------------------------------------------------------------------------- #
+# Rows come straight from the database, so nodes are built with
+# ``model_construct`` and skip per-field validation.
+
+
+def _outage_node(outage_orm: OutageORM) -> TraceNode:
+    return TraceNode.model_construct(
+        entity_type="outage",
+        entity_id=outage_orm.id,
+        timestamp=_serialize_dt(outage_orm.detected_at),
+        summary=f"Outage {outage_orm.id}: severity={outage_orm.severity}, status={outage_orm.status}",
+        details={
+            "site_name": outage_orm.site_name,
+            "site_id": outage_orm.site_id,
+            "severity": outage_orm.severity,
+            "status": outage_orm.status,
+            "detected_at": _serialize_dt(outage_orm.detected_at),
+            "resolved_at": _serialize_dt(outage_orm.resolved_at),
+            "description": outage_orm.description,
+            "affected_services": outage_orm.affected_services or [],
+            "affected_subscribers": outage_orm.affected_subscribers,
+            "assigned_to": outage_orm.assigned_to,
+            "created_by": outage_orm.created_by,
+            "mttr_minutes": outage_orm.mttr_minutes,
+        },
+    )
+
+
+def _event_node(evt: OutageEventORM) -> TraceNode:
+    return TraceNode.model_construct(
+        entity_type="outage_event",
+        entity_id=evt.id,
+        timestamp=_serialize_dt(evt.occurred_at),
+        summary=f"Event: {evt.event_type}",
+        details={
+            "event_type": evt.event_type,
+            "schema_version": evt.schema_version,
+            "detail": json.loads(evt.detail) if evt.detail else {},
+        },
+    )
+
+
+def _sla_node(sla: SLAResultORM) -> TraceNode:
+    return TraceNode.model_construct(
+        entity_type="sla_result",
+        entity_id=str(sla.id),
+        timestamp=_serialize_dt(sla.created_at),
+        summary=f"SLA {sla.id}: status={sla.status}, rating={sla.rating}, amount={sla.amount} ({sla.payment_type})",
+        details={
+            "status": sla.status,
+            "mttr_minutes": sla.mttr_minutes,
+            "threshold_minutes": sla.threshold_minutes,
+            "amount": sla.amount,
+            "payment_type": sla.payment_type,
+            "rating": sla.rating,
+            "policy_version": sla.policy_version,
+            "threshold_source": sla.threshold_source,
+            "reason_code": sla.reason_code,
+            "decision_trace": sla.decision_trace,
+            "is_latest": sla.is_latest,
+        },
+    )
+
+
+def _payment_node(pmt: PaymentTransactionORM) -> TraceNode:
+    return TraceNode.model_construct(
+        entity_type="payment",
+        entity_id=pmt.id,
+        timestamp=_serialize_dt(pmt.created_at),
+        summary=f"Payment {pmt.id}: type={pmt.type}, amount={pmt.amount} {pmt.asset_code}, status={pmt.status}",
+        details={
+            "transaction_hash": pmt.transaction_hash,
+            "type": pmt.type,
+            "amount": pmt.amount,
+            "asset_code": pmt.asset_code,
+            "from_address": pmt.from_address,
+            "to_address": pmt.to_address,
+            "status": pmt.status,
+            "created_at": _serialize_dt(pmt.created_at),
+            "confirmed_at": _serialize_dt(pmt.confirmed_at),
+            "retry_count": pmt.retry_count,
+            "last_retried_at": _serialize_dt(pmt.last_retried_at),
+            "failure_taxonomy": pmt.failure_taxonomy,
+            "idempotency_key": pmt.idempotency_key,
+            "dead_letter_reason": pmt.dead_letter_reason,
+            "dead_lettered_at": _serialize_dt(pmt.dead_lettered_at),
+            "sla_result_id": pmt.sla_result_id,
+        },
+    )
+
+
+def _delivery_node(wd: WebhookDelivery) -> TraceNode:
+    return TraceNode.model_construct(
+        entity_type="webhook_delivery",
+        entity_id=str(wd.id),
+        timestamp=_serialize_dt(wd.created_at),
+        summary=f"Webhook delivery {wd.id}: event={wd.event.value}, status={wd.status.value}, attempt={wd.attempt_count}",
+        details={
+            "webhook_id": str(wd.webhook_id) if wd.webhook_id else None,
+            "event": wd.event.value,
+            "status": wd.status.value,
+            "attempt_count": wd.attempt_count,
+            "response_status_code": wd.response_status_code,
+            "error_message": wd.error_message,
+            "delivered_at": _serialize_dt(wd.delivered_at),
+            "dead_lettered_at": _serialize_dt(wd.dead_lettered_at),
+            "signature_version": wd.signature_version,
+            "idempotency_key": wd.idempotency_key,
+            "event_timestamp": _serialize_dt(wd.event_timestamp),
+        },
+    )
+
+
+def _is_settled(outage_orm: OutageORM, payments: List[PaymentTransactionORM], deliveries: List[WebhookDelivery]) -> bool:
+    return (
+        outage_orm.status == OutageStatus.resolved.value
+        and all(p.status == PaymentStatus.confirmed.value for p in payments)
+        and all(d.status == WebhookDeliveryStatus.SUCCESS for d in deliveries)
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Loaders
+# --------------------------------------------------------------------------- #
+
+
+def _grouped(rows: Iterable[Any], key: str) -> Dict[str, List[Any]]:
+    groups: Dict[str, List[Any]] = defaultdict(list)
+    for row in rows:
+        groups[getattr(row, key)].append(row)
+    return groups
+
+
+def load_trace_chains(db: Session, outage_ids: Iterable[str]) -> Dict[str, TraceChain]:
+    """Build trace chains for many outages in one query per entity type.
+
+    Returns a mapping of outage id to chain; ids with no outage record are
+    absent.  Chains of settled outages are served from and stored in a
+    short-lived cache.
+    """
+    chains: Dict[str, TraceChain] = {}
+    wanted: List[str] = []
+    for outage_id in dict.fromkeys(outage_ids):
+        cached = _settled_cache.get(_cache_key(outage_id))
+        if cached is not None:
+            chains[outage_id] = cached
+        else:
+            wanted.append(outage_id)
+    if not wanted:
+        return chains
+
+    outages = db.query(OutageORM).filter(OutageORM.id.in_(wanted)).all()
+    if not outages:
+        return chains
+    found = [o.id for o in outages]
+
+    events = _grouped(
+        db.query(OutageEventORM)
+        .filter(OutageEventORM.outage_id.in_(found))
+        .order_by(OutageEventORM.occurred_at.asc()),
+        "outage_id",
+    )
+    slas = _grouped(
+        db.query(SLAResultORM)
+        .filter(SLAResultORM.outage_id.in_(found))
+        .order_by(SLAResultORM.created_at.asc()),
+        "outage_id",
+    )
+    payments = _grouped(
+        db.query(PaymentTransactionORM)
+        .filter(PaymentTransactionORM.outage_id.in_(found))
+        .order_by(PaymentTransactionORM.created_at.asc()),
+        "outage_id",
+    )
+    deliveries = _grouped(
+        db.query(WebhookDelivery)
+        .filter(WebhookDelivery.outage_id.in_(found), WebhookDelivery.event.in_(_SLA_WEBHOOK_EVENTS))
+        .order_by(WebhookDelivery.created_at.asc()),
+        "outage_id",
+    )
+
+    for outage_orm in outages:
+        oid = outage_orm.id
+        nodes = [_outage_node(outage_orm)]
+        nodes.extend(_event_node(e) for e in events.get(oid, ()))
+        nodes.extend(_sla_node(s) for s in slas.get(oid, ()))
+        nodes.extend(_payment_node(p) for p in payments.get(oid, ()))
+        nodes.extend(_delivery_node(d) for d in deliveries.get(oid, ()))
+        for sequence, node in enumerate(nodes, start=1):
+            node.sequence = sequence
+
+        chain = TraceChain.model_construct(
+            outage_id=oid,
+            payment_id=None,
+            transaction_hash=None,
+            nodes=nodes,
+            total_nodes=len(nodes),
+        )
+        chains[oid] = chain
+        if _is_settled(outage_orm, payments.get(oid, []), deliveries.get(oid, [])):
+            _settled_cache.set(_cache_key(oid), chain)
+    return chains
+
+
 def build_trace_chain(
     db: Session,
     outage_id: Optional[str] = None,
@@ -85,193 +321,14 @@ def build_trace_chain(
             total_nodes=0,
         )
 
-    nodes: List[TraceNode] = []
-    sequence = 0
-
-    # --- 1. Outage record ---
-    outage_orm = db.query(OutageORM).filter(OutageORM.id == resolved_outage_id).first()
-    if not outage_orm:
+    chain = load_trace_chains(db, [resolved_outage_id]).get(resolved_outage_id)
+    if chain is None:
         return TraceChain(
             outage_id=resolved_outage_id,
             nodes=[],
             total_nodes=0,
         )
 
-    sequence += 1
-    nodes.append(
-        TraceNode(
-            sequence=sequence,
-            entity_type="outage",
-            entity_id=outage_orm.id,
-            timestamp=_serialize_dt(outage_orm.detected_at),
-            summary=f"Outage {outage_orm.id}: severity={outage_orm.severity}, status={outage_orm.status}",
-            details={
-                "site_name": outage_orm.site_name,
-                "site_id": outage_orm.site_id,
-                "severity": outage_orm.severity,
-                "status": outage_orm.status,
-                "detected_at": _serialize_dt(outage_orm.detected_at),
-                "resolved_at": _serialize_dt(outage_orm.resolved_at),
-                "description": outage_orm.description,
-                "affected_services": outage_orm.affected_services or [],
-                "affected_subscribers": outage_orm.affected_subscribers,
-                "assigned_to": outage_orm.assigned_to,
-                "created_by": outage_orm.created_by,
-                "mttr_minutes": outage_orm.mttr_minutes,
-            },
-        )
-    )
-
-    # --- 2. Outage events (timeline) ---
-    events = (
-        db.query(OutageEventORM)
-        .filter(OutageEventORM.outage_id == resolved_outage_id)
-        .order_by(OutageEventORM.occurred_at.asc())
-        .all()
-    )
-    for evt in events:
-        sequence += 1
-        detail_parsed = json.loads(evt.detail) if evt.detail else {}
-        nodes.append(
-            TraceNode(
-                sequence=sequence,
-                entity_type="outage_event",
-                entity_id=evt.id,
-                timestamp=_serialize_dt(evt.occurred_at),
-                summary=f"Event: {evt.event_type}",
-                details={
-                    "event_type": evt.event_type,
-                    "schema_version": evt.schema_version,
-                    "detail": detail_parsed,
-                },
-            )
-        )
-
-    # --- 3. SLA results ---
-    sla_results = (
-        db.query(SLAResultORM)
-        .filter(SLAResultORM.outage_id == resolved_outage_id)
-        .order_by(SLAResultORM.created_at.asc())
-        .all()
-    )
-    for sla in sla_results:
-        sequence += 1
-        nodes.append(
-            TraceNode(
-                sequence=sequence,
-                entity_type="sla_result",
-                entity_id=str(sla.id),
-                timestamp=_serialize_dt(sla.created_at),
-                summary=f"SLA {sla.id}: status={sla.status}, rating={sla.rating}, amount={sla.amount} ({sla.payment_type})",
-                details={
-                    "status": sla.status,
-                    "mttr_minutes": sla.mttr_minutes,
-                    "threshold_minutes": sla.threshold_minutes,
-                    "amount": sla.amount,
-                    "payment_type": sla.payment_type,
-                    "rating": sla.rating,
-                    "policy_version": sla.policy_version,
-                    "threshold_source": sla.threshold_source,
-                    "reason_code": sla.reason_code,
-                    "decision_trace": sla.decision_trace,
-                    "is_latest": sla.is_latest,
-                },
-            )
-        )
-
-    # --- 4. Payment transactions ---
-    payments = (
-        db.query(PaymentTransactionORM)
-        .filter(PaymentTransactionORM.outage_id == resolved_outage_id)
-        .order_by(PaymentTransactionORM.created_at.asc())
-        .all()
-    )
-    for pmt in payments:
-        sequence += 1
-        nodes.append(
-            TraceNode(
-                sequence=sequence,
-                entity_type="payment",
-                entity_id=pmt.id,
-                timestamp=_serialize_dt(pmt.created_at),
-                summary=f"Payment {pmt.id}: type={pmt.type}, amount={pmt.amount} {pmt.asset_code}, status={pmt.status}",
-                details={
-                    "transaction_hash": pmt.transaction_hash,
-                    "type": pmt.type,
-                    "amount": pmt.amount,
-                    "asset_code": pmt.asset_code,
-                    "from_address": pmt.from_address,
-                    "to_address": pmt.to_address,
-                    "status": pmt.status,
-                    "created_at": _serialize_dt(pmt.created_at),
-                    "confirmed_at": _serialize_dt(pmt.confirmed_at),
-                    "retry_count": pmt.retry_count,
-                    "last_retried_at": _serialize_dt(pmt.last_retried_at),
-                    "failure_taxonomy": pmt.failure_taxonomy,
-                    "idempotency_key": pmt.idempotency_key,
-                    "dead_letter_reason": pmt.dead_letter_reason,
-                    "dead_lettered_at": _serialize_dt(pmt.dead_lettered_at),
-                    "sla_result_id": pmt.sla_result_id,
-                },
-            )
-        )
-
-    # --- 5. Webhook deliveries ---
-    # Webhook deliveries store outage context in the JSON payload's data.outage_id field.
-    # Only scan SLA-related event types (sla.violation, sla.warning, sla.resolved) since
-    # those are the only events that carry outage_id in their payload.
-    from app.models.webhook import WebhookEvent
-
-    sla_events = [
-        WebhookEvent.SLA_VIOLATION,
-        WebhookEvent.SLA_WARNING,
-        WebhookEvent.SLA_RESOLVED,
-    ]
-    webhook_deliveries = (
-        db.query(WebhookDelivery)
-        .filter(WebhookDelivery.event.in_(sla_events))
-        .order_by(WebhookDelivery.created_at.asc())
-        .all()
-    )
-    for wd in webhook_deliveries:
-        # Parse payload to find deliveries related to this outage
-        try:
-            payload = json.loads(wd.payload) if wd.payload else {}
-            data = payload.get("data", {})
-            payload_outage_id = data.get("outage_id")
-            if payload_outage_id != resolved_outage_id:
-                continue
-        except (json.JSONDecodeError, TypeError, AttributeError):
-            continue
-
-        sequence += 1
-        nodes.append(
-            TraceNode(
-                sequence=sequence,
-                entity_type="webhook_delivery",
-                entity_id=str(wd.id),
-                timestamp=_serialize_dt(wd.created_at),
-                summary=f"Webhook delivery {wd.id}: event={wd.event.value}, status={wd.status.value}, attempt={wd.attempt_count}",
-                details={
-                    "webhook_id": str(wd.webhook_id) if wd.webhook_id else None,
-                    "event": wd.event.value,
-                    "status": wd.status.value,
-                    "attempt_count": wd.attempt_count,
-                    "response_status_code": wd.response_status_code,
-                    "error_message": wd.error_message,
-                    "delivered_at": _serialize_dt(wd.delivered_at),
-                    "dead_lettered_at": _serialize_dt(wd.dead_lettered_at),
-                    "signature_version": wd.signature_version,
-                    "idempotency_key": wd.idempotency_key,
-                    "event_timestamp": _serialize_dt(wd.event_timestamp),
-                },
-            )
-        )
-
-    return TraceChain(
-        outage_id=resolved_outage_id,
-        payment_id=payment_id or None,
-        transaction_hash=tx_hash or None,
-        nodes=nodes,
-        total_nodes=len(nodes),
+    return chain.model_copy(
+        update={"payment_id": payment_id or None, "transaction_hash": tx_hash or None}
     )
@@ -9,12 +9,13 @@ from datetime import datetime, timedelta
 from threading import Lock
 from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import httpx
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import after_commit, commit_or_defer
 from app.models.webhook import Webhook, WebhookDelivery, WebhookDeliveryStatus, WebhookEvent
 from app.models.job import Job, JobType
 from app.services.webhook_signing import (
@@ -669,7 +670,11 @@ def create_delivery(
     # Parse event_timestamp for storage
     event_dt = datetime.fromisoformat(event_timestamp)
 
+    data = payload.get("data")
+    outage_id = data.get("outage_id") if isinstance(data, dict) else None
+
     delivery = WebhookDelivery(
+        id=uuid4(),
         webhook_id=webhook.id,
         event=event,
         payload=json.dumps(payload),
@@ -677,10 +682,10 @@ def create_delivery(
         signature_version=signature_version,
         idempotency_key=idempotency_key,
         event_timestamp=event_dt,
+        outage_id=outage_id if isinstance(outage_id, str) else None,
     )
     db.add(delivery)
-    db.commit()
-    db.refresh(delivery)
+    commit_or_defer(db, delivery)
     return delivery
 
 
@@ -878,7 +883,7 @@ def trigger_sla_violation_webhooks(
             delivery.status = WebhookDeliveryStatus.DEAD_LETTER
             delivery.dead_lettered_at = datetime.utcnow()
             delivery.error_message = f"dead_lettered: {dead_letter_reason}"
-            db.commit()
+            commit_or_defer(db)
             logger.warning(
                 "Webhook delivery %s dead-lettered: schema_version=%s reason=%s",
                 delivery.id, payload.get("schema_version"), dead_letter_reason,
@@ -889,8 +894,9 @@ def trigger_sla_violation_webhooks(
             "Queued webhook delivery %s for webhook %s on event %s (sig_version=%d, idempotency_key=%s, partition=%d).",
             delivery.id, webhook.id, event.value, signature_version, delivery.idempotency_key, partition_id,
         )
-        # Dispatch immediately (in production, offload to a background task/queue)
-        dispatch_delivery(db, delivery.id)
+        # Dispatch immediately (in production, offload to a background task/queue).
+        # Under a unit of work, wait until the delivery row is committed.
+        after_commit(db, lambda delivery_id=delivery.id: dispatch_delivery(db, delivery_id))
 
     return deliveries
 
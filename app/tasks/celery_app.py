@@ -6,9 +6,13 @@ from celery import Celery
 from celery.signals import worker_ready
 
 from app.core.config import settings
+from app.services import claim_check
+from app.tasks import queue_topology
 
 logger = logging.getLogger(__name__)
 
+claim_check.register()
+
 celery_app = Celery(
     "nociq",
     broker=settings.REDIS_URL,
@@ -17,23 +21,37 @@ celery_app = Celery(
         "app.tasks.sla_tasks",
         "app.tasks.webhook_tasks",
         "app.tasks.idempotency_tasks",
+        "app.tasks.export_tasks",
+        "app.tasks.outbox_tasks",
+        "app.tasks.lease_tasks",
+        "app.tasks.claim_check_tasks",
+        "app.tasks.site_rollup_tasks",
     ],
 )
 
 celery_app.conf.update(
-    task_serializer="json",
-    result_serializer="json",
-    accept_content=["json"],
+    # JSON, with bodies over CELERY_CLAIM_CHECK_THRESHOLD_BYTES kept in the
+    # DB and passed by reference (claim_check).  Plain json stays accepted.
+    task_serializer=claim_check.SERIALIZER,
+    result_serializer=claim_check.SERIALIZER,
+    accept_content=["json", claim_check.SERIALIZER],
     timezone="UTC",
     enable_utc=True,
     task_trace_propagators=[
         "opentelemetry.instrumentation.celery.propagator",
     ],
     task_track_started=True,
+    # Task events feed the jobs-table state synchronizer (job_state_sync).
+    worker_send_task_events=True,
+    # Per-job-type queues grouped in interactive / bulk / maintenance lanes,
+    # each served by its own worker pool (see queue_topology).
+    task_queues=queue_topology.kombu_queues(),
+    task_routes=queue_topology.TASK_ROUTES,
+    task_default_queue=queue_topology.DEFAULT_QUEUE,
     task_acks_late=True,
     task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
     task_store_eager_result=True,
-    worker_prefetch_multiplier=1,
+    worker_prefetch_multiplier=1,  # lane workers override this per lane
     result_expires=86400,  # 24 hours
 
     beat_schedule={
@@ -45,6 +63,22 @@ celery_app.conf.update(
             "task": "app.tasks.webhook_tasks.retry_pending_webhook_deliveries",
             "schedule": 60.0,
         },
+        "relay-outbox-messages": {
+            "task": "app.tasks.outbox_tasks.relay_outbox_messages",
+            "schedule": settings.OUTBOX_RELAY_INTERVAL_SECONDS,
+        },
+        "flush-job-heartbeats": {
+            "task": "app.tasks.lease_tasks.flush_job_heartbeats",
+            "schedule": settings.JOB_LEASE_FLUSH_INTERVAL_SECONDS,
+        },
+        "fold-site-rollup-deltas": {
+            "task": "app.tasks.site_rollup_tasks.fold_site_rollup_deltas",
+            "schedule": settings.SITE_ROLLUP_FOLD_INTERVAL_SECONDS,
+        },
+        "purge-expired-claim-checks": {
+            "task": "app.tasks.claim_check_tasks.purge_expired_claim_checks",
+            "schedule": 3600.0,  # every hour
+        },
         "cleanup-expired-idempotency-keys": {
             "task": "app.tasks.idempotency_tasks.cleanup_expired_idempotency_keys",
             "schedule": 3600.0,  # every hour
@@ -81,17 +115,27 @@ def verify_queue_bindings(
     BE-W5-051: Worker bootstrap fails fast on missing queue/exchange dependencies.
     Operational logs clearly identify failed prerequisite checks.
 
+    The task routes are validated against the declared queue topology
+    first (``queue_topology.validate_routes``); a route to an undeclared
+    queue, an unrouted job type or a route for an unregistered task makes
+    the check fail even when no queues are required.
+
     Returns a dict with keys:
-        - ok (bool): True if all required queues are present.
+        - ok (bool): True if the routes are valid and all required queues
+          are present.
         - required (List[str]): Required queue names that were checked.
         - observed (List[str]): Names of queues reported by active workers.
         - missing (List[str]): Required queues that were not observed.
+        - unserved (List[str]): Topology queues no responding worker
+          consumes (logged as a warning, does not fail the check).
+        - routing_errors (List[str]): Problems found in the task routes.
         - workers_seen (int): Number of active workers that responded.
         - timeout_seconds (float): Probe timeout used.
 
-    When ``strict`` is True (the default in production), a missing required
-    queue causes a ``RuntimeError`` to be raised so callers can decide how
-    to fail fast (e.g. ``sys.exit(1)`` from the worker-ready signal).
+    When ``strict`` is True (the default in production), invalid routes or
+    a missing required queue cause a ``RuntimeError`` to be raised so
+    callers can decide how to fail fast (e.g. ``sys.exit(1)`` from the
+    worker-ready signal).
     """
     probe_timeout = (
         timeout if timeout is not None else settings.CELERY_QUEUE_PROBE_TIMEOUT_SECONDS
@@ -104,10 +148,22 @@ def verify_queue_bindings(
         "required": required,
         "observed": [],
         "missing": [],
+        "unserved": [],
+        "routing_errors": [],
         "workers_seen": 0,
         "timeout_seconds": probe_timeout,
     }
 
+    # Outside a worker the task modules may not be imported yet.
+    celery_app.loader.import_default_modules()
+    routing_errors = queue_topology.validate_routes(list(celery_app.tasks.keys()))
+    if routing_errors:
+        logger.error("invalid task routes: %s", routing_errors)
+        result["ok"] = False
+        result["routing_errors"] = routing_errors
+        if strict_flag:
+            raise RuntimeError(f"invalid task routes: {routing_errors}")
+
     if not required:
         # Nothing configured — treat as a no-op success.
         return result
@@ -142,6 +198,9 @@ def verify_queue_bindings(
     missing = [name for name in required if name not in observed]
     result["observed"] = sorted(set(observed))
     result["missing"] = missing
+    result["unserved"] = [name for name in queue_topology.queue_names() if name not in observed]
+    if result["unserved"]:
+        logger.warning("queues without a consuming worker: %s", result["unserved"])
 
     if missing:
         logger.error(
@@ -157,7 +216,7 @@ def verify_queue_bindings(
             raise RuntimeError(
                 f"BE-W5-051: required queues not bound to any worker: {missing}"
             )
-    else:
+    elif result["ok"]:
         logger.info(
             "BE-W5-051: queue binding probe OK — required=%s observed=%s "
             "workers_seen=%d",
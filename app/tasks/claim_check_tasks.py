@@ -0,0 +1,24 @@
+import logging
+from typing import Any, Dict
+
+from app.tasks.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services import claim_check
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.claim_check_tasks.purge_expired_claim_checks")
+def purge_expired_claim_checks() -> Dict[str, Any]:
+    """Periodic beat task: delete claim-checked task bodies/results past their TTL.
+
+    Registered in celery_app.conf.beat_schedule every hour.
+    """
+    db = SessionLocal()
+    try:
+        purged = claim_check.purge_expired(db)
+        if purged:
+            logger.info("Purged %d expired claim checks.", purged)
+        return {"purged": purged}
+    finally:
+        db.close()
@@ -0,0 +1,177 @@
+import json
+import logging
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from app.tasks.celery_app import celery_app
+from app.models.job import Job, JobType
+from app.services import export_artifacts, job_dedupe
+from app.tasks.sla_tasks import DatabaseTask
+from app.utils.correlation import set_correlation_id
+from app.utils.logging import get_structured_logger
+
+logger = logging.getLogger(__name__)
+task_logger = get_structured_logger("export_tasks")
+
+
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="app.tasks.export_tasks.run_export",
+    max_retries=2,
+    default_retry_delay=60,
+)
+def run_export(
+    self: DatabaseTask,
+    dataset: str,
+    format: str,
+    filters: Optional[Dict[str, Any]] = None,
+    dedupe_key: Optional[str] = None,
+    correlation_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Stream a dataset into a compressed artifact, reporting progress per chunk.
+    The finished artifact is served by ``GET /jobs/{job_id}/download``.
+    """
+    if correlation_id:
+        set_correlation_id(correlation_id)
+
+    db = self.get_db()
+    try:
+        self._mark_started(db, self.request.id)
+        job = self._get_job(db, self.request.id)
+        job_id = str(job.id) if job else self.request.id
+        total_rows = export_artifacts.count_rows(db, dataset, filters)
+        task_logger.info(
+            "Starting export",
+            dataset=dataset,
+            format=format,
+            total_rows=total_rows,
+            celery_task_id=self.request.id,
+            correlation_id=correlation_id,
+        )
+        self._update_progress(db, self.request.id, 1.0, {
+            "stage": "initialization",
+            "dataset": dataset,
+            "format": format,
+            "total_rows": total_rows,
+        })
+
+        def _on_chunk(rows_written: int, chunks_written: int, bytes_written: int) -> None:
+            progress = (rows_written / total_rows) * 95 if total_rows else 95.0
+            self._update_progress(db, self.request.id, progress, {
+                "stage": "writing_chunks",
+                "dataset": dataset,
+                "format": format,
+                "rows_written": rows_written,
+                "chunks_written": chunks_written,
+                "bytes_written": bytes_written,
+                "total_rows": total_rows,
+                "progress_percentage": round(progress, 2),
+            })
+            # A large export can outlive the lease; extend it per chunk.
+            self._heartbeat(db, self.request.id)
+
+        summary = export_artifacts.write_export_artifact(
+            db,
+            job_id=job_id,
+            dataset=dataset,
+            format=format,
+            filters=filters,
+            on_chunk=_on_chunk,
+        )
+
+        result = {
+            "dataset": dataset,
+            "format": format,
+            "artifact": summary.filename,
+            "row_count": summary.row_count,
+            "chunk_count": summary.chunk_count,
+            "size_bytes": summary.size_bytes,
+            "content_encoding": "gzip",
+            "sha256": summary.sha256,
+            "download_url": f"/api/v1/jobs/{job_id}/download",
+        }
+        self._mark_success(db, self.request.id, result)
+        if dedupe_key:
+            job_dedupe.release_dedupe_key(dedupe_key)
+        logger.info("Export complete dataset=%s format=%s rows=%d", dataset, format, summary.row_count)
+        return result
+
+    except Exception as exc:
+        error_msg = str(exc)
+        logger.exception("Export failed dataset=%s format=%s: %s", dataset, format, error_msg)
+
+        error_retryable = self.request.retries < self.max_retries
+        if error_retryable:
+            self._log_retry(db, self.request.id, self.request.retries + 1, error_msg)
+
+        self._mark_failure(db, self.request.id, error_msg, error_code="EXPORT_ERROR", error_retryable=error_retryable)
+        # Keep the key while a retry is pending so an identical submission
+        # joins this job instead of starting a second export.
+        if dedupe_key and not error_retryable:
+            job_dedupe.release_dedupe_key(dedupe_key)
+        raise self.retry(exc=exc)
+    finally:
+        db.close()
+
+
+def enqueue_export(
+    db,
+    dataset: str,
+    format: str,
+    filters: Optional[Dict[str, Any]] = None,
+    correlation_id: Optional[str] = None,
+) -> Job:
+    """
+    Enqueue an export and return its tracking Job.
+
+    Identical concurrent requests (same dataset, format and filters) share a
+    dedupe key; while the first job is still pending or running, the same Job
+    is returned instead of launching a second export.
+    """
+    export_artifacts.validate_export_request(dataset, format)
+    filters = filters or {}
+    payload: Dict[str, Any] = {"dataset": dataset, "format": format, "filters": filters}
+    dedupe_key = job_dedupe.compute_dedupe_key(JobType.EXPORT.value, payload)
+    payload["dedupe_key"] = dedupe_key
+    if correlation_id:
+        payload["correlation_id"] = correlation_id
+
+    # The Job row must exist before dispatch so an eagerly executed task (or
+    # a fast worker) can find it to record progress and the final artifact.
+    task_id = str(uuid4())
+    job = Job(
+        celery_task_id=task_id,
+        job_type=JobType.EXPORT,
+        payload=json.dumps(payload),
+    )
+    db.add(job)
+    db.commit()
+    winner = job_dedupe.claim_for_job(db, job, dedupe_key)
+    if winner is not job:
+        return winner
+
+    run_export.apply_async(kwargs=payload, task_id=task_id)
+    db.refresh(job)
+    return job
+
+
+def redispatch_export(db, job: Job, correlation_id: Optional[str] = None) -> Job:
+    """Re-run an existing export Job in place (manual retry / quarantine release).
+
+    The artifact is keyed by the Job id, so re-dispatching under the same Job
+    overwrites any partial artifact from the failed attempt.
+    """
+    payload = json.loads(job.payload) if job.payload else {}
+    if correlation_id:
+        payload["correlation_id"] = correlation_id
+    task_id = str(uuid4())
+    job.celery_task_id = task_id
+    db.commit()
+    if payload.get("dedupe_key"):
+        job_dedupe.register_dedupe_key(payload["dedupe_key"], job_id=task_id, job_type=JobType.EXPORT.value)
+
+    run_export.apply_async(kwargs=payload, task_id=task_id)
+    db.refresh(job)
+    return job
@@ -0,0 +1,25 @@
+import logging
+from typing import Any, Dict
+
+from app.tasks.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services import job_leases
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.lease_tasks.flush_job_heartbeats")
+def flush_job_heartbeats() -> Dict[str, Any]:
+    """Periodic beat task: copy Redis-buffered lease heartbeats to the jobs rows.
+
+    Registered in celery_app.conf.beat_schedule every
+    JOB_LEASE_FLUSH_INTERVAL_SECONDS.
+    """
+    db = SessionLocal()
+    try:
+        flushed = job_leases.flush_heartbeats(db)
+        if flushed:
+            logger.info("Flushed %d job heartbeats.", flushed)
+        return {"flushed": flushed}
+    finally:
+        db.close()
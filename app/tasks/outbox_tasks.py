@@ -0,0 +1,55 @@
+import logging
+from typing import Any, Dict
+
+from app.tasks.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services import outbox
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    name="app.tasks.outbox_tasks.process_outbox_message",
+    max_retries=5,
+    default_retry_delay=30,
+    acks_late=True,
+)
+def process_outbox_message(self, message_id: str) -> Dict[str, Any]:
+    """Apply one outbox message's side effect (exactly once per message id)."""
+    db = SessionLocal()
+    try:
+        processed = outbox.process_message(db, message_id)
+        return {"message_id": message_id, "processed": processed}
+    except Exception as exc:
+        logger.exception("Outbox message %s failed: %s", message_id, exc)
+        raise self.retry(exc=exc)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.outbox_tasks.relay_outbox_messages")
+def relay_outbox_messages() -> Dict[str, Any]:
+    """Periodic beat task: publish pending outbox messages to Celery.
+
+    Registered in celery_app.conf.beat_schedule every
+    OUTBOX_RELAY_INTERVAL_SECONDS.  Drains full batches back to back so a
+    burst does not wait for the next beat.
+    """
+    db = SessionLocal()
+    total = 0
+    try:
+        from app.core.config import settings
+
+        while True:
+            published = outbox.relay_pending(
+                db, lambda message_id: process_outbox_message.apply_async(args=[message_id])
+            )
+            total += published
+            if published < settings.OUTBOX_RELAY_BATCH_SIZE:
+                break
+        if total:
+            logger.info("Relayed %d outbox messages.", total)
+        return {"published": total}
+    finally:
+        db.close()
@@ -0,0 +1,170 @@
+"""Declarative Celery queue topology: queues per job type, grouped in lanes.
+
+Every job type has its own queue, and every queue belongs to one lane:
+
+  - ``interactive``  user-facing, latency-sensitive work (single-device SLA,
+                     live webhooks, the outbox that feeds them)
+  - ``bulk``         long-running batch work (bulk SLA, exports, DR replays)
+  - ``maintenance``  periodic housekeeping on the default ``celery`` queue
+
+A lane is served by its own worker pool (``python -m app.tasks.queue_topology
+<lane>``), so interactive tasks never wait behind a backlog of bulk tasks.
+Each lane gets a share of the environment's worker concurrency
+(``concurrency_guardrails.EnvProfile``) and its own prefetch multiplier.
+
+``TASK_ROUTES`` is installed as ``task_routes`` and ``validate_routes``
+checks the topology at worker startup (``verify_queue_bindings``).
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from kombu import Queue
+
+from app.core.config import settings
+from app.models.job import JobType
+
+DEFAULT_QUEUE = "celery"
+
+
+@dataclass(frozen=True)
+class LaneSpec:
+    name: str
+    concurrency_share: float  # fraction of EnvProfile.concurrency
+    prefetch_multiplier: int
+
+
+@dataclass(frozen=True)
+class QueueSpec:
+    name: str
+    lane: str
+    job_type: Optional[JobType] = None
+
+
+LANES: Tuple[LaneSpec, ...] = (
+    # Short tasks: a little prefetch keeps the pool busy between them.
+    LaneSpec("interactive", concurrency_share=0.5, prefetch_multiplier=4),
+    # Long tasks: never reserve a second one behind a running one.
+    LaneSpec("bulk", concurrency_share=0.25, prefetch_multiplier=1),
+    LaneSpec("maintenance", concurrency_share=0.25, prefetch_multiplier=1),
+)
+
+QUEUES: Tuple[QueueSpec, ...] = (
+    QueueSpec("sla", "interactive", JobType.SLA_COMPUTATION),
+    QueueSpec("webhooks", "interactive", JobType.WEBHOOK_DISPATCH),
+    QueueSpec("outbox", "interactive"),
+    QueueSpec("sla_bulk", "bulk", JobType.BULK_SLA_COMPUTATION),
+    QueueSpec("exports", "bulk", JobType.EXPORT),
+    QueueSpec("webhooks_replay", "bulk", JobType.WEBHOOK_DR_REPLAY),
+    QueueSpec(DEFAULT_QUEUE, "maintenance"),
+)
+
+# Task name -> queue.  Unlisted tasks run on the default (maintenance) queue.
+TASK_QUEUES: Dict[str, str] = {
+    "app.tasks.sla_tasks.compute_sla_for_device": "sla",
+    "app.tasks.sla_tasks.compute_bulk_sla": "sla_bulk",
+    "app.tasks.sla_tasks.compute_sla_chunk": "sla_bulk",
+    "app.tasks.sla_tasks.finalize_bulk_sla": "sla_bulk",
+    "app.tasks.sla_tasks.fail_bulk_sla": "sla_bulk",
+    "app.tasks.webhook_tasks.dispatch_webhook_delivery": "webhooks",
+    "app.tasks.webhook_tasks.dispatch_partitioned_delivery": "webhooks",
+    "app.tasks.webhook_tasks.trigger_sla_violation_async": "webhooks",
+    "app.tasks.webhook_tasks.recover_webhooks_in_window": "webhooks_replay",
+    "app.tasks.export_tasks.run_export": "exports",
+    "app.tasks.outbox_tasks.process_outbox_message": "outbox",
+    "app.tasks.outbox_tasks.relay_outbox_messages": "outbox",
+}
+
+TASK_ROUTES: Dict[str, Dict[str, str]] = {task: {"queue": queue} for task, queue in TASK_QUEUES.items()}
+
+
+def lane(name: str) -> LaneSpec:
+    for spec in LANES:
+        if spec.name == name:
+            return spec
+    raise ValueError(f"Unknown worker lane: '{name}'")
+
+
+def queue_names(lane_name: Optional[str] = None) -> List[str]:
+    return [q.name for q in QUEUES if lane_name is None or q.lane == lane_name]
+
+
+def queue_for_job_type(job_type: JobType) -> str:
+    for spec in QUEUES:
+        if spec.job_type == job_type:
+            return spec.name
+    return DEFAULT_QUEUE
+
+
+def kombu_queues() -> Tuple[Queue, ...]:
+    return tuple(Queue(spec.name, routing_key=spec.name) for spec in QUEUES)
+
+
+def validate_routes(task_names: Optional[List[str]] = None) -> List[str]:
+    """Problems with the topology; an empty list means it is consistent.
+
+    Checks that every route targets a declared queue, every queue sits in
+    a known lane, every job type has a queue, and (given the registered
+    *task_names*) that no route names a task that does not exist.
+    """
+    problems = []
+    declared = set(queue_names())
+    lanes = {spec.name for spec in LANES}
+    for task, queue in TASK_QUEUES.items():
+        if queue not in declared:
+            problems.append(f"task {task} routes to undeclared queue '{queue}'")
+    for spec in QUEUES:
+        if spec.lane not in lanes:
+            problems.append(f"queue '{spec.name}' is in unknown lane '{spec.lane}'")
+    routed_types = {spec.job_type for spec in QUEUES if spec.job_type is not None}
+    for job_type in JobType:
+        if job_type not in routed_types:
+            problems.append(f"job type '{job_type.value}' has no queue")
+    if task_names is not None:
+        known = set(task_names)
+        for task in TASK_QUEUES:
+            if task not in known:
+                problems.append(f"route for unregistered task {task}")
+    return problems
+
+
+def worker_options(lane_name: str, profile=None) -> Dict[str, object]:
+    """Worker settings for one lane under the active ``EnvProfile``.
+
+    The lane gets its share of the profile's concurrency (at least one
+    process); ``CELERY_WORKER_CONCURRENCY`` / ``CELERY_MAX_TASKS_PER_CHILD``
+    override the profile as they do for the guardrails.
+    """
+    spec = lane(lane_name)
+    if profile is None:
+        from app.services.concurrency_guardrails import get_profile
+
+        profile = get_profile()
+    total = settings.CELERY_WORKER_CONCURRENCY or profile.concurrency
+    return {
+        "queues": queue_names(spec.name),
+        "concurrency": max(1, round(total * spec.concurrency_share)),
+        "prefetch_multiplier": spec.prefetch_multiplier,
+        "max_tasks_per_child": settings.CELERY_MAX_TASKS_PER_CHILD or profile.max_tasks,
+    }
+
+
+def worker_argv(lane_name: str, profile=None) -> List[str]:
+    options = worker_options(lane_name, profile)
+    return [
+        "worker",
+        f"--hostname={lane_name}@%h",
+        f"--queues={','.join(options['queues'])}",
+        f"--concurrency={options['concurrency']}",
+        f"--prefetch-multiplier={options['prefetch_multiplier']}",
+        f"--max-tasks-per-child={options['max_tasks_per_child']}",
+    ]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f"usage: python -m app.tasks.queue_topology {{{'|'.join(s.name for s in LANES)}}} [celery worker args]")
+    from app.tasks.celery_app import celery_app
+
+    celery_app.worker_main(worker_argv(sys.argv[1]) + sys.argv[2:])
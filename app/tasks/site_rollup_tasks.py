@@ -0,0 +1,30 @@
+import logging
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.tasks.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.repositories import site_rollups
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.site_rollup_tasks.fold_site_rollup_deltas")
+def fold_site_rollup_deltas() -> Dict[str, Any]:
+    """Periodic beat task: fold queued outage deltas into the site rollups.
+
+    Registered in celery_app.conf.beat_schedule every
+    SITE_ROLLUP_FOLD_INTERVAL_SECONDS.
+    """
+    db = SessionLocal()
+    try:
+        folded = site_rollups.fold_deltas(db, settings.SITE_ROLLUP_FOLD_BATCH_SIZE)
+        db.commit()
+        if folded:
+            logger.info("Folded %d site rollup deltas.", folded)
+        return {"folded": folded}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
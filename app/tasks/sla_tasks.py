@@ -3,16 +3,20 @@ import json
 import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from celery import Task
+from celery import Task, chord, group
+from sqlalchemy import case
 
 from app.tasks.celery_app import celery_app
 from app.core.config import settings as cfg
 from app.db.session import SessionLocal
+from app.db.unit_of_work import UnitOfWork, commit_or_defer
 from app.models.job import Job, JobStatus, JobType
 from app.models.webhook import WebhookEvent
+from app.repositories import job_items
 from app.repositories.payment_repository import PaymentRepository
+from app.services import job_dedupe, job_leases, job_progress, outbox
 from app.services.audit_log import audit_log
 from app.utils.analytics_exporter import AnalyticsExporter
 from app.utils.correlation import set_correlation_id
@@ -63,12 +67,8 @@ class DatabaseTask(Task):
             db.commit()
 
     def _heartbeat(self, db, celery_task_id: str):
-        """BE-W5-047: Extend the lease on a running job."""
-        job = self._get_job(db, celery_task_id)
-        if job and job.status == JobStatus.STARTED:
-            job.heartbeat_at = datetime.utcnow()
-            job.lease_expires_at = datetime.utcnow() + timedelta(seconds=cfg.JOB_LEASE_TIMEOUT_SECONDS)
-            db.commit()
+        """BE-W5-047: Extend the lease on a running job (buffered in Redis)."""
+        job_leases.record_heartbeat(db, celery_task_id)
 
     def _mark_success(self, db, celery_task_id: str, result: Any):
         job = self._get_job(db, celery_task_id)
@@ -81,6 +81,7 @@ class DatabaseTask(Task):
             job.lease_expires_at = None
             job.heartbeat_at = None
             db.commit()
+        job_progress.release_reporter(self, celery_task_id, JobStatus.SUCCESS.value, 100.0)
 
     def _mark_failure(self, db, celery_task_id: str, error: str, error_code: Optional[str] = None, error_retryable: Optional[bool] = None):
         job = self._get_job(db, celery_task_id)
@@ -119,6 +120,7 @@ class DatabaseTask(Task):
                     },
                 )
                 db.commit()
+                job_progress.release_reporter(self, celery_task_id, job.status.value)
                 return
 
             payload_hash = _hash_job_payload(job)
@@ -149,6 +151,7 @@ class DatabaseTask(Task):
                 },
             )
             db.commit()
+            job_progress.release_reporter(self, celery_task_id, job.status.value)
             return
 
         job.retry_count = attempts
@@ -158,32 +161,28 @@ class DatabaseTask(Task):
         job.error_retryable = error_retryable if error_retryable is not None else False
         job.finished_at = datetime.utcnow()
         db.commit()
+        job_progress.release_reporter(self, celery_task_id, job.status.value)
 
     def _update_progress(self, db, celery_task_id: str, progress: float, details: Optional[Dict[str, Any]] = None):
-        job = self._get_job(db, celery_task_id)
-        if job:
-            job.progress = min(progress, 99.0)
-            if details:
-                job.progress_details = details
-            db.commit()
+        """Report progress; the jobs row is written coalesced (see job_progress)."""
+        job_progress.task_reporter(self, db, celery_task_id).update(progress, details)
+
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        job_progress.discard_reporter(self, task_id)
 
     def _add_partial_result(self, db, celery_task_id: str, item_id: str, result: Any):
-        """Add a partial result for bulk operations."""
+        """Record a successful item of a bulk operation (a ``job_items`` row)."""
         job = self._get_job(db, celery_task_id)
         if job:
-            if not job.partial_results:
-                job.partial_results = {}
-            job.partial_results[item_id] = result
-            db.commit()
+            job_items.insert_items(db, job.id, [job_items.success_item(item_id, result)])
+            commit_or_defer(db)
 
     def _add_item_error(self, db, celery_task_id: str, item_id: str, error: str):
-        """Add an error for a specific item in bulk operations."""
+        """Record a failed item of a bulk operation (a ``job_items`` row)."""
         job = self._get_job(db, celery_task_id)
         if job:
-            if not job.per_item_errors:
-                job.per_item_errors = {}
-            job.per_item_errors[item_id] = error
-            db.commit()
+            job_items.insert_items(db, job.id, [job_items.error_item(item_id, error)])
+            commit_or_defer(db)
 
     def _log_retry(self, db, celery_task_id: str, retry_count: int, error: str):
         """Log job retry events for audit purposes."""
@@ -299,6 +298,96 @@ def compute_sla_for_device(self: DatabaseTask, device_id: str, period: str, corr
         db.close()
 
 
+# --------------------------------------------------------------------------- #
+# Bulk SLA: chunked chord fan-out                                               #
+# --------------------------------------------------------------------------- #
+#
+# compute_bulk_sla splits device_ids into SLA_BULK_CHUNK_SIZE chunks and
+# dispatches them as a chord: compute_sla_chunk tasks run in parallel on any
+# worker, and finalize_bulk_sla merges their summaries into the bulk Job once
+# all chunks are done.  Each chunk commits once (violation webhooks via the
+# outbox plus its share of the job progress), so throughput scales with the
+# number of workers instead of being bound to one task's serial loop.
+
+_BULK_DISPATCHED_PROGRESS = 5.0
+_BULK_CHUNKS_PROGRESS = 90.0
+
+
+def _chunked(items: List[str], size: int) -> List[List[str]]:
+    size = max(size, 1)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _advance_progress(db, celery_task_id: str, delta: float) -> None:
+    """Atomically add *delta* to a job's progress (capped below 100).
+
+    A single UPDATE, so chunks finishing concurrently never lose each
+    other's increments.  Committed with the caller's unit of work.
+    """
+    new_progress = Job.progress + delta
+    db.query(Job).filter(Job.celery_task_id == celery_task_id).update(
+        {Job.progress: case((new_progress > 99.0, 99.0), else_=new_progress)},
+        synchronize_session=False,
+    )
+    commit_or_defer(db)
+
+
+def _compute_chunk(db, device_ids: List[str], period: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Compute SLA for one chunk of devices.
+
+    Returns the chunk's counts and its ``job_items`` rows; per-device
+    failures are recorded as error items, not raised.
+    """
+    from app.services.sla_service import compute_device_sla  # type: ignore
+
+    items: List[Dict[str, Any]] = []
+    violated: List[str] = []
+    error_count = 0
+    for device_id in device_ids:
+        try:
+            result = compute_device_sla(db, device_id=device_id, period=period)
+        except Exception as device_exc:
+            logger.warning("SLA failed for device=%s: %s", device_id, device_exc)
+            db.rollback()
+            items.append(job_items.error_item(device_id, str(device_exc)))
+            error_count += 1
+            continue
+        is_violated = bool(result.get("is_violated"))
+        items.append(job_items.success_item(device_id, result, flagged=is_violated))
+        if is_violated:
+            violated.append(device_id)
+
+    summary = {
+        "total": len(device_ids),
+        "processed_count": len(device_ids) - error_count,
+        "error_count": error_count,
+        "violated_devices": violated,
+    }
+    return summary, items
+
+
+def merge_chunk_summaries(chunk_summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce chunk summaries (in dispatch order) into the bulk job summary.
+
+    Used when the job has no row to aggregate ``job_items`` over.
+    """
+    violated: List[str] = []
+    processed = errors = total = 0
+    for chunk in chunk_summaries:
+        total += chunk["total"]
+        processed += chunk["processed_count"]
+        errors += chunk["error_count"]
+        violated.extend(chunk["violated_devices"])
+    return {
+        "total": total,
+        "violations": len(violated),
+        "violated_devices": violated,
+        "processed_count": processed,
+        "error_count": errors,
+        "chunks": len(chunk_summaries),
+    }
+
+
 @celery_app.task(
     bind=True,
     base=DatabaseTask,
@@ -306,90 +395,55 @@ def compute_sla_for_device(self: DatabaseTask, device_id: str, period: str, corr
     max_retries=2,
     default_retry_delay=60,
 )
-def compute_bulk_sla(self: DatabaseTask, device_ids: List[str], period: str) -> Dict[str, Any]:
+def compute_bulk_sla(
+    self: DatabaseTask, device_ids: List[str], period: str, correlation_id: Optional[str] = None
+) -> Dict[str, Any]:
     """
-    Compute SLA for multiple devices. Dispatches individual tasks per device
-    and tracks overall progress.
+    Compute SLA for multiple devices by fanning chunks out as a chord.
+
+    Returns the merged summary when the chord ran inline (eager mode);
+    otherwise a dispatch receipt, and ``finalize_bulk_sla`` completes the
+    Job when every chunk has reported.  The task's Celery state is SUCCESS
+    from the receipt on, so the Job status is never derived from it
+    (``CHORD_COMPLETED_JOB_TYPES``).
     """
+    if correlation_id:
+        set_correlation_id(correlation_id)
+
     db = self.get_db()
     try:
         self._mark_started(db, self.request.id)
         total = len(device_ids)
-        logger.info("Starting bulk SLA computation for %d devices, period=%s", total, period)
-
-        # Initialize progress tracking
-        self._update_progress(db, self.request.id, 5.0, {
-            "stage": "initialization",
-            "total_devices": total,
-            "period": period
-        })
-
-        results = []
-        violations = []
-        processed_count = 0
-        error_count = 0
-
-        for idx, device_id in enumerate(device_ids, start=1):
-            try:
-                from app.services.sla_service import compute_device_sla  # type: ignore
-                result = compute_device_sla(db, device_id=device_id, period=period)
-                results.append({"device_id": device_id, "result": result})
-                
-                # Store partial result
-                self._add_partial_result(db, self.request.id, device_id, result)
-
-                if result.get("is_violated"):
-                    violations.append(device_id)
-                    from app.services.webhook_service import trigger_sla_violation_webhooks
-                    trigger_sla_violation_webhooks(
-                        db,
-                        sla_data={"device_id": device_id, "period": period, **result},
-                        event=WebhookEvent.SLA_VIOLATION,
-                    )
-                
-                processed_count += 1
-
-            except Exception as device_exc:
-                logger.warning("SLA failed for device=%s: %s", device_id, device_exc)
-                results.append({"device_id": device_id, "error": str(device_exc)})
-                
-                # Store per-item error
-                self._add_item_error(db, self.request.id, device_id, str(device_exc))
-                error_count += 1
-
-            # Update progress with detailed information
-            progress = (idx / total) * 100
-            self._update_progress(db, self.request.id, progress, {
-                "stage": "processing_devices",
-                "current_device": device_id,
-                "processed_count": processed_count,
-                "error_count": error_count,
-                "total_devices": total,
-                "violations_found": len(violations),
-                "progress_percentage": round(progress, 2)
-            })
-
-        # Final summary with structured progress
-        self._update_progress(db, self.request.id, 95.0, {
-            "stage": "finalizing",
+        chunks = _chunked(list(device_ids), cfg.SLA_BULK_CHUNK_SIZE)
+        logger.info(
+            "Starting bulk SLA computation for %d devices in %d chunks, period=%s", total, len(chunks), period
+        )
+        self._update_progress(db, self.request.id, _BULK_DISPATCHED_PROGRESS, {
+            "stage": "processing_chunks",
             "total_devices": total,
-            "processed_count": processed_count,
-            "error_count": error_count,
-            "violations_found": len(violations)
+            "total_chunks": len(chunks),
+            "period": period,
         })
-        
-        summary = {
-            "total": total,
-            "violations": len(violations),
-            "violated_devices": violations,
-            "processed_count": processed_count,
-            "error_count": error_count,
-            "results": results,
-        }
-        
-        self._mark_success(db, self.request.id, summary)
-        logger.info("Bulk SLA computation complete. Violations: %d/%d, Errors: %d", len(violations), total, error_count)
-        return summary
+        if not chunks:
+            return finalize_bulk_sla([], parent_task_id=self.request.id)
+
+        header = group(
+            compute_sla_chunk.s(
+                chunk,
+                period,
+                parent_task_id=self.request.id,
+                progress_share=_BULK_CHUNKS_PROGRESS * len(chunk) / total,
+                correlation_id=correlation_id,
+            )
+            for chunk in chunks
+        )
+        body = finalize_bulk_sla.s(parent_task_id=self.request.id).on_error(
+            fail_bulk_sla.s(parent_task_id=self.request.id)
+        )
+        chord_result = chord(header)(body)
+        if celery_app.conf.task_always_eager:
+            return chord_result.get()
+        return {"status": "dispatched", "total": total, "chunks": len(chunks), "chord_id": chord_result.id}
 
     except Exception as exc:
         error_msg = str(exc)
@@ -407,59 +461,177 @@ def compute_bulk_sla(self: DatabaseTask, device_ids: List[str], period: str) ->
         db.close()
 
 
-def enqueue_sla_computation(
-    db,
-    device_id: str,
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="app.tasks.sla_tasks.compute_sla_chunk",
+    max_retries=3,
+    default_retry_delay=30,
+)
+def compute_sla_chunk(
+    self: DatabaseTask,
+    device_ids: List[str],
     period: str,
-    job_type: JobType = JobType.SLA_COMPUTATION,
+    parent_task_id: str,
+    progress_share: float = 0.0,
     correlation_id: Optional[str] = None,
-) -> Job:
+) -> Dict[str, Any]:
+    """Compute one chunk of a bulk SLA job and return its counts.
+
+    The chunk's ``job_items`` rows, its violation webhooks (outboxed) and
+    its share of the parent job's progress are committed together in one
+    transaction.
     """
-    Enqueue an SLA computation task and create a Job record for tracking.
-    Returns the Job before the Celery task ID is known — updated after dispatch.
+    if correlation_id:
+        set_correlation_id(correlation_id)
+
+    db = self.get_db()
+    try:
+        summary, items = _compute_chunk(db, device_ids, period)
+        job_id = db.query(Job.id).filter(Job.celery_task_id == parent_task_id).scalar()
+        with UnitOfWork(db):
+            if job_id is not None:
+                job_items.insert_items(db, job_id, items)
+            for item in items:
+                if not item["flagged"]:
+                    continue
+                outbox.enqueue(
+                    db,
+                    outbox.TOPIC_SLA_WEBHOOKS,
+                    {
+                        "sla_data": {"device_id": item["item_id"], "period": period, **item["result"]},
+                        "event": WebhookEvent.SLA_VIOLATION.value,
+                    },
+                )
+            _advance_progress(db, parent_task_id, progress_share)
+        return summary
+    except Exception as exc:
+        logger.exception("Bulk SLA chunk of %d devices failed for job %s: %s", len(device_ids), parent_task_id, exc)
+        raise self.retry(exc=exc)
+    finally:
+        db.close()
+
+
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="app.tasks.sla_tasks.finalize_bulk_sla",
+    max_retries=3,
+    default_retry_delay=30,
+)
+def finalize_bulk_sla(self: DatabaseTask, chunk_summaries: List[Dict[str, Any]], parent_task_id: str) -> Dict[str, Any]:
+    """Chord body: summarise the job's items and complete the bulk Job.
+
+    Totals come from one aggregate over ``job_items`` (per-device results
+    are listed by ``GET /jobs/{id}/items``); the chunk summaries are only
+    the fallback for a job without a row.
     """
-    from app.models.job import Job, JobType  # local import avoids circular deps
+    db = self.get_db()
+    try:
+        summary = merge_chunk_summaries(chunk_summaries)
+        job = self._get_job(db, parent_task_id)
+        if job:
+            totals = job_items.summarize(db, job.id)
+            violated = job_items.flagged_item_ids(db, job.id)
+            summary.update(
+                total=totals.total,
+                processed_count=totals.succeeded,
+                error_count=totals.failed,
+                violations=len(violated),
+                violated_devices=violated,
+            )
+            job.progress_details = {
+                "stage": "complete",
+                "total_devices": summary["total"],
+                "total_chunks": summary["chunks"],
+                "processed_count": summary["processed_count"],
+                "error_count": summary["error_count"],
+                "violations_found": summary["violations"],
+            }
+        self._mark_success(db, parent_task_id, summary)
+        logger.info(
+            "Bulk SLA computation complete. Violations: %d/%d, Errors: %d",
+            summary["violations"], summary["total"], summary["error_count"],
+        )
+        return summary
+    except Exception as exc:
+        logger.exception("Finalizing bulk SLA job %s failed: %s", parent_task_id, exc)
+        raise self.retry(exc=exc)
+    finally:
+        db.close()
 
-    payload = {"device_id": device_id, "period": period}
-    if correlation_id:
-        payload["correlation_id"] = correlation_id
 
-    task_result = compute_sla_for_device.apply_async(
-        kwargs=payload
-    )
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="app.tasks.sla_tasks.fail_bulk_sla",
+)
+def fail_bulk_sla(self: DatabaseTask, request, exc, traceback, parent_task_id: str) -> None:
+    """Chord errback: a chunk exhausted its retries, so the bulk Job fails."""
+    db = self.get_db()
+    try:
+        self._mark_failure(db, parent_task_id, str(exc), error_code="BULK_SLA_CHUNK_FAILED", error_retryable=True)
+    finally:
+        db.close()
+
 
+def _enqueue_deduped(db, task, job_type: JobType, payload: Dict[str, Any], dedupe: bool) -> Job:
+    """Create the tracking Job, claim its dedupe key and dispatch *task*.
+
+    The Job row is committed before the claim and the dispatch: competing
+    replicas look the key's holder up by row, and an eagerly executed task
+    finds its Job.  When an identical job is already pending or running,
+    that Job is returned and nothing is dispatched.
+    """
+    task_id = str(uuid4())
     job = Job(
-        celery_task_id=task_result.id,
+        celery_task_id=task_id,
         job_type=job_type,
         payload=json.dumps(payload),
     )
     db.add(job)
     db.commit()
+    if dedupe:
+        dedupe_key = job_dedupe.compute_dedupe_key(job_type.value, payload)
+        winner = job_dedupe.claim_for_job(db, job, dedupe_key)
+        if winner is not job:
+            logger.info("Deduplicated %s submission onto job %s", job_type.value, winner.id)
+            return winner
+
+    task.apply_async(kwargs=payload, task_id=task_id)
     db.refresh(job)
     return job
 
 
-def enqueue_bulk_sla_computation(db, device_ids: List[str], period: str, correlation_id: Optional[str] = None) -> Job:
-    """Enqueue a bulk SLA computation task and return the tracking Job."""
-    from app.models.job import Job, JobType
+def enqueue_sla_computation(
+    db,
+    device_id: str,
+    period: str,
+    job_type: JobType = JobType.SLA_COMPUTATION,
+    correlation_id: Optional[str] = None,
+    dedupe: bool = True,
+) -> Job:
+    """
+    Enqueue an SLA computation task and create a Job record for tracking.
 
-    payload = {"device_ids": device_ids, "period": period}
+    Identical submissions (same device and period) share a dedupe key across
+    replicas; while the first job is pending or running it is returned
+    instead.  Pass ``dedupe=False`` to force a new run (manual retries).
+    """
+    payload = {"device_id": device_id, "period": period}
     if correlation_id:
         payload["correlation_id"] = correlation_id
+    return _enqueue_deduped(db, compute_sla_for_device, job_type, payload, dedupe)
 
-    task_result = compute_bulk_sla.apply_async(
-        kwargs=payload
-    )
 
-    job = Job(
-        celery_task_id=task_result.id,
-        job_type=JobType.BULK_SLA_COMPUTATION,
-        payload=json.dumps(payload),
-    )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
-    return job
+def enqueue_bulk_sla_computation(
+    db, device_ids: List[str], period: str, correlation_id: Optional[str] = None, dedupe: bool = True
+) -> Job:
+    """Enqueue a bulk SLA computation task and return the tracking Job (deduplicated like single runs)."""
+    payload = {"device_ids": device_ids, "period": period}
+    if correlation_id:
+        payload["correlation_id"] = correlation_id
+    return _enqueue_deduped(db, compute_bulk_sla, JobType.BULK_SLA_COMPUTATION, payload, dedupe)
 
 
 def reconcile_payment_analytics(db_session, analytics_client) -> Tuple[bool, List[Dict[str, Any]]]:
@@ -49,7 +49,7 @@ class WebhookAutoscaler:
     def _get_queue_depth(self, partition_id: Optional[int] = None) -> int:
         if self._redis_client:
             try:
-                queue_key = f"celery" if partition_id is None else f"celery:partition:{partition_id}"
+                queue_key = "webhooks" if partition_id is None else f"celery:partition:{partition_id}"
                 return self._redis_client.llen(queue_key)
             except Exception:
                 return 0
@@ -11,6 +11,7 @@ from app.tasks.celery_app import celery_app
 from app.core.config import settings as cfg
 from app.db.session import SessionLocal
 from app.models.job import Job, JobStatus, JobType
+from app.services import job_leases, job_progress
 from app.services.audit_log import audit_log
 
 logger = logging.getLogger(__name__)
@@ -37,17 +38,11 @@ class WebhookDatabaseTask(Task):
         return db.query(Job).filter(Job.id == job_id).first()
 
     def _heartbeat(self, db, celery_task_id: str):
-        """BE-W5-047: Extend the lease on a running job."""
-        job = self._get_job(db, celery_task_id)
-        if job and job.status == JobStatus.STARTED:
-            job.heartbeat_at = datetime.utcnow()
-            job.lease_expires_at = datetime.utcnow() + timedelta(
-                seconds=cfg.JOB_LEASE_TIMEOUT_SECONDS
-            )
-            try:
-                db.commit()
-            except Exception:
-                db.rollback()
+        """BE-W5-047: Extend the lease on a running job (buffered in Redis)."""
+        try:
+            job_leases.record_heartbeat(db, celery_task_id)
+        except Exception:
+            db.rollback()
 
     def _mark_started(self, db, celery_task_id: str):
         """BE-W5-047: Initialise lease on task start."""
@@ -71,15 +66,13 @@ class WebhookDatabaseTask(Task):
         progress: float,
         details: Optional[Dict[str, Any]] = None,
     ) -> None:
-        job = self._get_job(db, celery_task_id)
-        if job:
-            job.progress = min(progress, 99.0)
-            if details:
-                job.progress_details = details
-            try:
-                db.commit()
-            except Exception:
-                db.rollback()
+        try:
+            job_progress.task_reporter(self, db, celery_task_id).update(progress, details)
+        except Exception:
+            db.rollback()
+
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        job_progress.discard_reporter(self, task_id)
 
 
 @celery_app.task(
@@ -269,7 +262,7 @@ def recover_webhooks_in_window(
             end_time=end_dt,
             on_progress=lambda replayed, total: self._update_progress(
                 db,
-                job_id,
+                self.request.id,
                 replayed / total * 100 if total else 0,
                 {
                     "stage": "replaying",
@@ -285,6 +278,7 @@ def recover_webhooks_in_window(
         job.progress = 100.0
         job.finished_at = datetime.utcnow()
         db.commit()
+        job_progress.release_reporter(self, self.request.id, JobStatus.SUCCESS.value, 100.0)
         logger.info(
             "BE-W5-045: DR replay job=%s window=[%s,%s] replayed=%d skipped=%d",
             job_id, start_iso, end_iso,
@@ -303,6 +297,7 @@ def recover_webhooks_in_window(
                 db.commit()
         except Exception:
             db.rollback()
+        job_progress.release_reporter(self, self.request.id, JobStatus.FAILURE.value)
         # Re-raise so Celery can record failure (max_retries=1 minimises loops).
         raise
     finally:
@@ -0,0 +1,109 @@
+"""Geohash encoding and bounding-box cover for outage map queries.
+
+A geohash interleaves longitude and latitude bits (longitude first) and
+writes them five bits per base-32 character, so every prefix names a grid
+cell and all points inside a cell share that prefix.  That makes a plain
+B-tree index on the hash a spatial index: a bounding box becomes a handful
+of prefix ranges (``cover``), and clustering at a zoom level is a
+``GROUP BY`` on a hash prefix.
+"""
+from __future__ import annotations
+
+import math
+from typing import List, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+MAX_PRECISION = 12
+
+# Sorts after every BASE32 character: ``prefix <= h < prefix + PREFIX_END``
+# matches exactly the hashes starting with ``prefix``.
+PREFIX_END = "~"
+
+
+def encode(latitude: float, longitude: float, precision: int = MAX_PRECISION) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if longitude >= mid:
+                value = (value << 1) | 1
+                lon_lo = mid
+            else:
+                value <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if latitude >= mid:
+                value = (value << 1) | 1
+                lat_lo = mid
+            else:
+                value <<= 1
+                lat_hi = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """``(lat_degrees, lon_degrees)`` covered by one cell at *precision*."""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def _cells(south: float, west: float, north: float, east: float, precision: int) -> Tuple[range, range]:
+    lat_step, lon_step = cell_size(precision)
+    lat_cells = 1 << (precision * 5 // 2)
+    lon_cells = 1 << math.ceil(precision * 5 / 2)
+    rows = range(
+        max(0, int((south + 90) // lat_step)), min(lat_cells - 1, int((north + 90) // lat_step)) + 1
+    )
+    cols = range(
+        max(0, int((west + 180) // lon_step)), min(lon_cells - 1, int((east + 180) // lon_step)) + 1
+    )
+    return rows, cols
+
+
+def cover(south: float, west: float, north: float, east: float, max_cells: int = 32) -> List[str]:
+    """Geohash prefixes whose cells together cover the box.
+
+    Uses the finest precision that needs at most *max_cells* cells, so the
+    prefixes are few enough to become individual index range scans.  The
+    box must not cross the antimeridian (``west <= east``).
+    """
+    precision = 1
+    for candidate in range(1, MAX_PRECISION + 1):
+        rows, cols = _cells(south, west, north, east, candidate)
+        if len(rows) * len(cols) > max_cells:
+            break
+        precision = candidate
+    rows, cols = _cells(south, west, north, east, precision)
+    lat_step, lon_step = cell_size(precision)
+    return sorted(
+        {
+            encode(-90 + (row + 0.5) * lat_step, -180 + (col + 0.5) * lon_step, precision)
+            for row in rows
+            for col in cols
+        }
+    )
+
+
+def precision_for_zoom(zoom: int) -> int:
+    """Cluster cell precision for a web-map zoom level (0 = whole world).
+
+    Picks cells a few times smaller than the viewport, so a screen shows on
+    the order of tens of clusters at any zoom.
+    """
+    for max_zoom, precision in ((2, 1), (5, 2), (7, 3), (10, 4), (12, 5), (15, 6), (17, 7)):
+        if zoom <= max_zoom:
+            return precision
+    return 8
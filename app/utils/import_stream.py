@@ -0,0 +1,237 @@
+"""
+Incremental parsers for outage import uploads.
+
+Both parsers accept raw upload bytes through ``feed()`` as they arrive and
+return the rows completed by that chunk, so the import endpoint never holds
+the whole file (or a decoded copy of it) in memory.  ``close()`` flushes the
+final row and raises ``ImportFormatError`` if the input ended mid-structure.
+
+JSON uploads must be a top-level array.  Elements are delimited with a small
+depth/string-aware scanner and each element is decoded on its own with
+``json.loads``, so memory is bounded by the largest single row rather than
+the file size.
+
+CSV records are split on newlines outside quoted fields and parsed one
+record at a time with the stdlib ``csv`` module; rows are returned as dicts
+with the same restkey/restval semantics as ``csv.DictReader``.
+"""
+
+import codecs
+import csv
+import json
+from typing import Any, List, Optional
+
+_JSON_WHITESPACE = " \t\r\n"
+
+
+class ImportFormatError(ValueError):
+    """Raised when an upload is not a well-formed JSON array / CSV file."""
+
+
+class JsonArrayStreamParser:
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        # start -> first -> (element -> after -> value -> element ...) -> done
+        self._state = "start"
+        self._start = 0
+        self._kind = ""
+        self._depth = 0
+        self._in_str = False
+        self._escape = False
+
+    def feed(self, data: bytes) -> List[Any]:
+        self._buf += self._decode(data, final=False)
+        return self._scan(final=False)
+
+    def close(self) -> List[Any]:
+        self._buf += self._decode(b"", final=True)
+        rows = self._scan(final=True)
+        if self._state != "done":
+            raise ImportFormatError("Invalid JSON: unexpected end of input")
+        return rows
+
+    def _decode(self, data: bytes, final: bool) -> str:
+        try:
+            return self._decoder.decode(data, final)
+        except UnicodeDecodeError as exc:
+            raise ImportFormatError(f"Invalid JSON: {exc}") from exc
+
+    def _scan(self, final: bool) -> List[Any]:
+        rows: List[Any] = []
+        buf = self._buf
+        i = self._pos
+        n = len(buf)
+
+        while i < n:
+            c = buf[i]
+            state = self._state
+
+            if state == "element":
+                end = self._advance_element(c, i)
+                if end is None:
+                    i += 1
+                    continue
+                rows.append(self._decode_element(buf[self._start:end]))
+                self._state = "after"
+                i = end
+                continue
+
+            if c in _JSON_WHITESPACE:
+                i += 1
+                continue
+
+            if state == "start":
+                if c != "[":
+                    raise ImportFormatError("JSON file must contain a list of outage objects")
+                self._state = "first"
+            elif state == "first" and c == "]":
+                self._state = "done"
+            elif state in ("first", "value"):
+                if c in ",]":
+                    raise ImportFormatError(f"Invalid JSON: unexpected '{c}' at offset {i}")
+                self._begin_element(c, i)
+                continue
+            elif state == "after":
+                if c == ",":
+                    self._state = "value"
+                elif c == "]":
+                    self._state = "done"
+                else:
+                    raise ImportFormatError(f"Invalid JSON: expected ',' or ']' at offset {i}")
+            else:  # done
+                raise ImportFormatError("Invalid JSON: extra data after the top-level array")
+            i += 1
+
+        if final and self._state == "element" and self._kind == "bare":
+            rows.append(self._decode_element(buf[self._start:n]))
+            self._state = "after"
+
+        # Drop everything already consumed; keep only the element in flight.
+        if self._state == "element":
+            self._buf = buf[self._start:]
+            self._pos = n - self._start
+            self._start = 0
+        else:
+            self._buf = ""
+            self._pos = 0
+        return rows
+
+    def _begin_element(self, c: str, i: int) -> None:
+        self._state = "element"
+        self._start = i
+        self._depth = 0
+        self._in_str = False
+        self._escape = False
+        if c in "{[":
+            self._kind = "container"
+        elif c == '"':
+            self._kind = "string"
+        else:
+            self._kind = "bare"
+
+    def _advance_element(self, c: str, i: int) -> Optional[int]:
+        """Consume ``c``; return the element's end offset once it is complete."""
+        if self._kind == "bare":
+            if c in _JSON_WHITESPACE or c in ",]":
+                return i
+            return None
+
+        if self._in_str:
+            if self._escape:
+                self._escape = False
+            elif c == "\\":
+                self._escape = True
+            elif c == '"':
+                self._in_str = False
+                if self._kind == "string":
+                    return i + 1
+            return None
+
+        if c == '"':
+            self._in_str = True
+        elif c in "{[":
+            self._depth += 1
+        elif c in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                return i + 1
+        return None
+
+    @staticmethod
+    def _decode_element(text: str) -> Any:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ImportFormatError(f"Invalid JSON: {exc}") from exc
+
+
+class CsvStreamParser:
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._scan_pos = 0
+        self._in_quotes = False
+        self._header: Optional[List[str]] = None
+
+    def feed(self, data: bytes) -> List[dict]:
+        self._buf += self._decode(data, final=False)
+        return self._drain(final=False)
+
+    def close(self) -> List[dict]:
+        self._buf += self._decode(b"", final=True)
+        return self._drain(final=True)
+
+    def _decode(self, data: bytes, final: bool) -> str:
+        try:
+            return self._decoder.decode(data, final)
+        except UnicodeDecodeError as exc:
+            raise ImportFormatError(f"Invalid CSV: {exc}") from exc
+
+    def _drain(self, final: bool) -> List[dict]:
+        rows: List[dict] = []
+        buf = self._buf
+        record_start = 0
+        for i in range(self._scan_pos, len(buf)):
+            c = buf[i]
+            if c == '"':
+                # Doubled quotes toggle twice, so escapes need no special case.
+                self._in_quotes = not self._in_quotes
+            elif c == "\n" and not self._in_quotes:
+                self._emit(buf[record_start:i + 1], rows)
+                record_start = i + 1
+
+        self._buf = buf[record_start:]
+        self._scan_pos = len(self._buf)
+        if final and self._buf:
+            self._emit(self._buf, rows)
+            self._buf = ""
+            self._scan_pos = 0
+        return rows
+
+    def _emit(self, record: str, rows: List[dict]) -> None:
+        try:
+            fields = next(csv.reader([record]), [])
+        except csv.Error as exc:
+            raise ImportFormatError(f"Invalid CSV: {exc}") from exc
+        if not fields:
+            return
+        if self._header is None:
+            self._header = fields
+            return
+        row = dict(zip(self._header, fields))
+        if len(fields) > len(self._header):
+            row[None] = fields[len(self._header):]
+        for key in self._header[len(fields):]:
+            row[key] = None
+        rows.append(row)
+
+
+def open_import_parser(filename: str):
+    """Return an incremental parser for *filename*, or ``None`` if unsupported."""
+    if filename.endswith(".json"):
+        return JsonArrayStreamParser()
+    if filename.endswith(".csv"):
+        return CsvStreamParser()
+    return None
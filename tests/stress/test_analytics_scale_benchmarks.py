@@ -0,0 +1,422 @@
+"""Seeded large-dataset analytics benchmarks.
+
+Complements ``tests/test_analytics_benchmarks.py`` (small synthetic inputs,
+pass/fail thresholds) by measuring how the real SLA analytics queries scale.
+For every configured dataset size the suite deterministically seeds N
+outages and their SLA results into SQLite — and into a Postgres stand-in
+when one is configured — then runs:
+
+  * ``aggregate_performance`` / ``aggregate_dashboard_kpis`` (unfiltered and
+    severity-filtered)
+  * ``aggregate_trends`` for every bucket in ``VALID_BUCKETS`` across
+    several timezones
+  * ``rebuild_snapshot``
+  * every export format for the outage and SLA datasets, plus the analytics
+    summary export
+
+Each measurement records latency, rows scanned and peak RSS.  Nothing is
+asserted against a latency threshold; results are written to
+``tests/analytics-scale-benchmark-results.json`` for trend comparison.
+
+The suite is opt-in because seeding millions of rows takes minutes:
+
+  ANALYTICS_SCALE_BENCH=1              enable the suite
+  ANALYTICS_SCALE_BENCH_SIZES          comma-separated sizes
+                                       (default "100000,1000000,5000000")
+  ANALYTICS_SCALE_BENCH_PG_URL         URL of a *disposable* Postgres database;
+                                       the outage/SLA tables are dropped and
+                                       recreated there
+  ANALYTICS_SCALE_BENCH_SEED           RNG seed (default 376)
+
+Rows scanned come from ``EXPLAIN (ANALYZE, FORMAT JSON)`` on Postgres.  SQLite
+has no per-query row counters, so there the figure is the row count of every
+table the query plan reads with a full ``SCAN``; index ``SEARCH`` steps are
+listed in ``plan`` but not counted.  The SQLite stand-in registers Python
+implementations of ``date_trunc``/``timezone`` so the Postgres trend query can
+run unchanged; its trend latencies therefore include UDF overhead.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import random
+import resource
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401  (registers every mapper for configure_mappers)
+from app.core.config import settings
+from app.db.base import Base
+from app.models.orm.outage import OutageORM
+from app.models.orm.sla import SLAResultORM
+from app.models.orm.sla_snapshot import SLAAnalyticsSnapshotORM
+from app.repositories.sla_repository import VALID_BUCKETS, SLARepository
+from app.services import export_artifacts
+from app.utils.analytics_exporter import export_analytics_summary
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+BENCH_ENABLED = os.environ.get("ANALYTICS_SCALE_BENCH") == "1"
+DATASET_SIZES = [
+    int(size)
+    for size in os.environ.get("ANALYTICS_SCALE_BENCH_SIZES", "100000,1000000,5000000").split(",")
+    if size.strip()
+]
+PG_URL = os.environ.get("ANALYTICS_SCALE_BENCH_PG_URL")
+SEED = int(os.environ.get("ANALYTICS_SCALE_BENCH_SEED", "376"))
+
+TIMEZONES = ("UTC", "America/New_York", "Asia/Kolkata", "Australia/Sydney")
+TREND_LIMIT = 60
+SEED_BATCH_ROWS = 50_000
+SITE_COUNT = 500
+SEVERITIES = ("critical", "high", "medium", "low")
+THRESHOLDS = {"critical": 15, "high": 30, "medium": 60, "low": 120}
+SEED_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+ARTIFACT_PATH = Path(__file__).parent.parent / "analytics-scale-benchmark-results.json"
+
+BENCH_TABLES = [
+    OutageORM.__table__,
+    SLAResultORM.__table__,
+    SLAAnalyticsSnapshotORM.__table__,
+]
+
+pytestmark = pytest.mark.skipif(
+    not BENCH_ENABLED,
+    reason="Set ANALYTICS_SCALE_BENCH=1 to run the seeded analytics scale benchmarks.",
+)
+
+_results: List[Dict[str, Any]] = []
+
+
+# ---------------------------------------------------------------------------
+# Deterministic seeding
+# ---------------------------------------------------------------------------
+
+def _seed_rows(size: int, seed: int) -> Iterator[tuple[List[dict], List[dict]]]:
+    """Yield (outage_rows, sla_rows) batches for *size* outages.
+
+    Every outage gets a latest SLA result; every tenth outage also gets an
+    earlier, superseded result so the ``row_number()`` window in
+    ``aggregate_performance`` has real work to do.
+    """
+    rng = random.Random(seed)
+    outages: List[dict] = []
+    results: List[dict] = []
+    for i in range(size):
+        severity = SEVERITIES[rng.randrange(len(SEVERITIES))]
+        detected_at = SEED_EPOCH + timedelta(seconds=rng.randrange(365 * 86400))
+        mttr = rng.randrange(5, 240)
+        resolved_at = detected_at + timedelta(minutes=mttr)
+        outage_id = f"bench-{i:08d}"
+        threshold = THRESHOLDS[severity]
+        outages.append(
+            {
+                "id": outage_id,
+                "site_name": f"Site {i % SITE_COUNT}",
+                "site_id": f"site-{i % SITE_COUNT:04d}",
+                "severity": severity,
+                "status": "resolved",
+                "detected_at": detected_at,
+                "resolved_at": resolved_at,
+                "description": "seeded benchmark outage",
+                "affected_services": ["voice", "data"][: 1 + i % 2],
+                "affected_subscribers": rng.randrange(10, 50_000),
+                "mttr_minutes": mttr,
+                "created_at": detected_at,
+                "updated_at": resolved_at,
+            }
+        )
+        if i % 10 == 0:
+            results.append(
+                _sla_row(outage_id, mttr + 10, threshold, resolved_at - timedelta(minutes=5), latest=False)
+            )
+        results.append(_sla_row(outage_id, mttr, threshold, resolved_at, latest=True))
+        if len(outages) >= SEED_BATCH_ROWS:
+            yield outages, results
+            outages, results = [], []
+    if outages:
+        yield outages, results
+
+
+def _sla_row(outage_id: str, mttr: int, threshold: int, created_at: datetime, latest: bool) -> dict:
+    violated = mttr > threshold
+    return {
+        "outage_id": outage_id,
+        "status": "violated" if violated else "met",
+        "mttr_minutes": mttr,
+        "threshold_minutes": threshold,
+        "amount": -float(mttr - threshold) * 10 if violated else float(threshold - mttr) * 5,
+        "payment_type": "penalty" if violated else "reward",
+        "rating": "poor" if violated else "good",
+        "policy_version": "1.0",
+        "threshold_source": "config",
+        "created_at": created_at,
+        "is_latest": latest,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=32)
+def _zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+def _parse_sqlite_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def _sqlite_timezone(tz: str, value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    dt = _parse_sqlite_ts(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(_zone(tz)).replace(tzinfo=None).isoformat(sep=" ")
+
+
+def _sqlite_date_trunc(unit: str, value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    dt = _parse_sqlite_ts(value).replace(hour=0, minute=0, second=0, microsecond=0)
+    if unit == "week":
+        dt -= timedelta(days=dt.weekday())
+    elif unit == "month":
+        dt = dt.replace(day=1)
+    return dt.isoformat(sep=" ")
+
+
+def _sqlite_engine(path: Path) -> Engine:
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def _register(dbapi_connection, connection_record):  # type: ignore[no-untyped-def]
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+        dbapi_connection.execute("PRAGMA synchronous=OFF")
+        dbapi_connection.create_function("timezone", 2, _sqlite_timezone, deterministic=True)
+        dbapi_connection.create_function("date_trunc", 2, _sqlite_date_trunc, deterministic=True)
+
+    return engine
+
+
+def _backends() -> List[str]:
+    return ["sqlite", "postgres"] if PG_URL else ["sqlite"]
+
+
+def _make_engine(backend: str, workdir: Path, size: int) -> Engine:
+    if backend == "sqlite":
+        path = workdir / f"analytics-bench-{size}.db"
+        if path.exists():
+            path.unlink()
+        return _sqlite_engine(path)
+    engine = create_engine(PG_URL, connect_args={"options": "-c timezone=UTC"})
+    Base.metadata.drop_all(engine, tables=list(reversed(BENCH_TABLES)))
+    return engine
+
+
+def _seed(engine: Engine, size: int) -> Dict[str, int]:
+    Base.metadata.create_all(engine, tables=BENCH_TABLES)
+    counts = {"outages": 0, "sla_results": 0}
+    for outage_rows, sla_rows in _seed_rows(size, SEED):
+        with engine.begin() as conn:
+            conn.execute(insert(OutageORM.__table__), outage_rows)
+            conn.execute(insert(SLAResultORM.__table__), sla_rows)
+        counts["outages"] += len(outage_rows)
+        counts["sla_results"] += len(sla_rows)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _sum_scanned(plan: Dict[str, Any]) -> int:
+    total = 0
+    if "Scan" in plan.get("Node Type", ""):
+        total += int(plan.get("Actual Rows", 0)) * int(plan.get("Actual Loops", 1))
+    for child in plan.get("Plans", []):
+        total += _sum_scanned(child)
+    return total
+
+
+def _rows_scanned(engine: Engine, statements: List[tuple[str, Any]], table_rows: Dict[str, int]) -> Dict[str, Any]:
+    scanned = 0
+    plan_lines: List[str] = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            if engine.dialect.name == "postgresql":
+                raw = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters).scalar()
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+                scanned += _sum_scanned(plan)
+                plan_lines.append(plan.get("Node Type", ""))
+            else:
+                for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+                    detail = row[-1]
+                    plan_lines.append(detail)
+                    words = detail.split()
+                    if words and words[0] == "SCAN" and len(words) > 1:
+                        scanned += table_rows.get(words[1], 0)
+    method = "explain_analyze" if engine.dialect.name == "postgresql" else "full_scan_estimate"
+    return {"rows_scanned": scanned, "rows_scanned_method": method, "plan": plan_lines}
+
+
+def _measure(
+    backend: str,
+    size: int,
+    engine: Engine,
+    table_rows: Dict[str, int],
+    name: str,
+    fn: Callable[[], Any],
+    params: Optional[Dict[str, Any]] = None,
+) -> Any:
+    statements: List[tuple[str, Any]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        head = statement.lstrip().upper()
+        if not executemany and (head.startswith("SELECT") or head.startswith("WITH")):
+            statements.append((statement, parameters))
+
+    rss_before = _peak_rss_kb()
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        t0 = time.perf_counter()
+        result = fn()
+        latency_ms = (time.perf_counter() - t0) * 1000.0
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+    rss_after = _peak_rss_kb()
+
+    entry = {
+        "backend": backend,
+        "dataset_size": size,
+        "benchmark": name,
+        "params": params or {},
+        "latency_ms": round(latency_ms, 3),
+        "peak_rss_kb": rss_after,
+        "peak_rss_growth_kb": max(rss_after - rss_before, 0),
+        "statements": len(statements),
+        **_rows_scanned(engine, statements, table_rows),
+    }
+    _results.append(entry)
+    return result
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _write_artifact():
+    yield
+    if not _results:
+        return
+    artifact = {
+        "suite": "analytics_scale_benchmarks",
+        "seed": SEED,
+        "dataset_sizes": DATASET_SIZES,
+        "timezones": list(TIMEZONES),
+        "buckets": list(VALID_BUCKETS),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlite": sqlite3.sqlite_version,
+            "postgres": bool(PG_URL),
+        },
+        "results": _results,
+    }
+    ARTIFACT_PATH.write_text(json.dumps(artifact, indent=2))
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("size", DATASET_SIZES)
+@pytest.mark.parametrize("backend", _backends())
+def test_analytics_scale(backend, size, tmp_path_factory, monkeypatch):
+    workdir = tmp_path_factory.mktemp(f"analytics-{backend}-{size}")
+    monkeypatch.setattr(settings, "EXPORT_ARTIFACT_DIR", str(workdir / "exports"))
+    engine = _make_engine(backend, workdir, size)
+    table_rows: Dict[str, int] = {}
+    try:
+        counts = _measure(backend, size, engine, table_rows, "seed", lambda: _seed(engine, size))
+        table_rows.update(counts)
+        assert counts["outages"] == size
+
+        db = sessionmaker(bind=engine)()
+        repo = SLARepository(db)
+        try:
+            perf = _measure(backend, size, engine, table_rows, "aggregate_performance", repo.aggregate_performance)
+            assert perf.total_outages == size
+            _measure(
+                backend, size, engine, table_rows, "aggregate_performance",
+                lambda: repo.aggregate_performance(severity="critical"),
+                {"severity": "critical"},
+            )
+
+            kpis = _measure(backend, size, engine, table_rows, "aggregate_dashboard_kpis", repo.aggregate_dashboard_kpis)
+            assert kpis.total_outages == counts["sla_results"]
+            _measure(
+                backend, size, engine, table_rows, "aggregate_dashboard_kpis",
+                lambda: repo.aggregate_dashboard_kpis(severity="critical"),
+                {"severity": "critical"},
+            )
+
+            trends = []
+            for bucket in VALID_BUCKETS:
+                for tz in TIMEZONES:
+                    trends = _measure(
+                        backend, size, engine, table_rows, "aggregate_trends",
+                        lambda: repo.aggregate_trends(limit_days=TREND_LIMIT, bucket=bucket, tz=tz),
+                        {"bucket": bucket, "tz": tz, "limit_days": TREND_LIMIT},
+                    )
+                    assert trends
+
+            snapshot = _measure(backend, size, engine, table_rows, "rebuild_snapshot", repo.rebuild_snapshot)
+            assert snapshot.total_outages == kpis.total_outages
+
+            for dataset in ("outages", "sla"):
+                for fmt in export_artifacts.EXPORT_FORMATS:
+                    summary = _measure(
+                        backend, size, engine, table_rows, "export",
+                        lambda: export_artifacts.write_export_artifact(
+                            db, job_id=f"bench-{dataset}", dataset=dataset, format=fmt
+                        ),
+                        {"dataset": dataset, "format": fmt},
+                    )
+                    assert summary.row_count == counts["outages" if dataset == "outages" else "sla_results"]
+                    _results[-1]["artifact_bytes"] = summary.size_bytes
+
+            for fmt in ("json", "csv"):
+                _measure(
+                    backend, size, engine, table_rows, "export_analytics_summary",
+                    lambda: export_analytics_summary(kpis, trends, perf, format=fmt),
+                    {"format": fmt},
+                )
+        finally:
+            db.close()
+    finally:
+        engine.dispose()
@@ -0,0 +1,159 @@
+"""Tests for the chunked chord fan-out of compute_bulk_sla."""
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models.orm  # noqa: F401
+from app.core.config import settings
+from app.db.base import Base
+from app.models.job import CHORD_COMPLETED_JOB_TYPES, Job, JobItem, JobStatus, JobType
+from app.models.orm.audit_log import AuditLogORM
+from app.models.orm.outbox import OutboxMessageORM
+from app.services import outbox
+from app.tasks import sla_tasks
+from app.tasks.celery_app import celery_app
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(
+        engine, tables=[Job.__table__, JobItem.__table__, OutboxMessageORM.__table__, AuditLogORM.__table__]
+    )
+    factory = sessionmaker(bind=engine, autoflush=False)
+    # Run the chord inline without a result backend.
+    overrides = {"task_always_eager": True, "task_eager_propagates": True, "task_store_eager_result": False}
+    originals = {key: celery_app.conf[key] for key in overrides}
+    celery_app.conf.update(overrides)
+    with patch.object(sla_tasks, "SessionLocal", factory):
+        yield factory
+    celery_app.conf.update(originals)
+
+
+def _fake_compute(db, device_id, period):
+    if device_id.startswith("bad"):
+        raise RuntimeError(f"no data for {device_id}")
+    return {"uptime": 99.0, "is_violated": device_id.startswith("v")}
+
+
+def _run(session_factory, device_ids, chunk_size):
+    task_id = "bulk-task-1"
+    db = session_factory()
+    db.add(Job(celery_task_id=task_id, job_type=JobType.BULK_SLA_COMPUTATION, status=JobStatus.PENDING))
+    db.commit()
+    db.close()
+    with patch.object(settings, "SLA_BULK_CHUNK_SIZE", chunk_size), patch(
+        "app.services.sla_service.compute_device_sla", _fake_compute, create=True
+    ):
+        result = sla_tasks.compute_bulk_sla.apply(
+            args=[device_ids, "2026-10"], task_id=task_id
+        ).get()
+    return task_id, result
+
+
+def test_chunking_splits_evenly():
+    assert sla_tasks._chunked(list("abcde"), 2) == [["a", "b"], ["c", "d"], ["e"]]
+    assert sla_tasks._chunked([], 2) == []
+
+
+def test_merge_preserves_chunk_order():
+    chunks = [
+        {"total": 2, "processed_count": 2, "error_count": 0, "violated_devices": ["a", "b"]},
+        {"total": 1, "processed_count": 0, "error_count": 1, "violated_devices": ["c"]},
+    ]
+    merged = sla_tasks.merge_chunk_summaries(chunks)
+    assert merged["total"] == 3
+    assert merged["chunks"] == 2
+    assert merged["violations"] == 3
+    assert merged["violated_devices"] == ["a", "b", "c"]
+
+
+def test_bulk_job_merges_chunk_results(session_factory):
+    devices = ["d1", "v2", "bad3", "d4", "v5"]
+    task_id, summary = _run(session_factory, devices, chunk_size=2)
+
+    assert summary["chunks"] == 3
+    assert summary["total"] == 5
+    assert summary["processed_count"] == 4
+    assert summary["error_count"] == 1
+    assert summary["violated_devices"] == ["v2", "v5"]
+    assert "results" not in summary
+
+    db = session_factory()
+    job = db.query(Job).filter(Job.celery_task_id == task_id).one()
+    assert job.status == JobStatus.SUCCESS
+    assert job.progress == 100.0
+    assert job.partial_results is None
+    assert job.progress_details["total_chunks"] == 3
+    items = db.query(JobItem).filter(JobItem.job_id == job.id).order_by(JobItem.id).all()
+    assert [i.item_id for i in items] == devices
+    assert [i.item_id for i in items if i.flagged] == ["v2", "v5"]
+    assert {i.item_id: i.error for i in items if i.status == "error"} == {"bad3": "no data for bad3"}
+    db.close()
+
+
+def test_violation_webhooks_are_outboxed(session_factory):
+    _run(session_factory, ["v1", "d2", "v3"], chunk_size=2)
+
+    db = session_factory()
+    messages = db.query(OutboxMessageORM).filter(OutboxMessageORM.topic == outbox.TOPIC_SLA_WEBHOOKS).all()
+    assert sorted(m.payload["sla_data"]["device_id"] for m in messages) == ["v1", "v3"]
+    assert all(m.payload["sla_data"]["period"] == "2026-10" for m in messages)
+    db.close()
+
+
+def test_chunk_advances_parent_progress(session_factory):
+    db = session_factory()
+    db.add(Job(celery_task_id="parent", job_type=JobType.BULK_SLA_COMPUTATION, status=JobStatus.STARTED, progress=5.0))
+    db.commit()
+    db.close()
+    with patch("app.services.sla_service.compute_device_sla", _fake_compute, create=True):
+        sla_tasks.compute_sla_chunk.apply(args=[["d1", "d2"], "2026-10"], kwargs={
+            "parent_task_id": "parent", "progress_share": 45.0,
+        }).get()
+        sla_tasks.compute_sla_chunk.apply(args=[["d3"], "2026-10"], kwargs={
+            "parent_task_id": "parent", "progress_share": 60.0,
+        }).get()
+
+    db = session_factory()
+    job = db.query(Job).filter(Job.celery_task_id == "parent").one()
+    assert job.progress == 99.0
+    db.close()
+
+
+def test_empty_bulk_completes_without_chunks(session_factory):
+    task_id, summary = _run(session_factory, [], chunk_size=2)
+    assert summary["chunks"] == 0
+    assert summary["total"] == 0
+
+
+def test_dispatched_bulk_job_stays_started_until_the_reducer_runs(session_factory):
+    class _Chord:
+        def __init__(self, header):
+            pass
+
+        def __call__(self, body):
+            return type("Result", (), {"id": "chord-1"})()
+
+    celery_app.conf.task_always_eager = False
+    try:
+        with patch.object(sla_tasks, "chord", _Chord):
+            task_id, receipt = _run(session_factory, ["d1", "d2", "d3"], chunk_size=2)
+    finally:
+        celery_app.conf.task_always_eager = True
+
+    # The task itself succeeds with a receipt; the Job is not done yet.
+    assert receipt == {"status": "dispatched", "total": 3, "chunks": 2, "chord_id": "chord-1"}
+    assert JobType.BULK_SLA_COMPUTATION in CHORD_COMPLETED_JOB_TYPES
+    db = session_factory()
+    job = db.query(Job).filter(Job.celery_task_id == task_id).one()
+    assert job.status == JobStatus.STARTED
+    assert job.result is None
+    db.close()
+    # The run ended without a terminal transition; its reporter is not kept.
+    assert task_id not in sla_tasks.compute_bulk_sla.__dict__.get("_progress_reporters", {})
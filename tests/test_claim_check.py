@@ -0,0 +1,104 @@
+"""Tests for the claim-check serializer of large Celery messages and results."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from kombu.serialization import dumps as kombu_dumps, loads as kombu_loads, prepare_accept_content
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.models.orm.claim_check import ClaimCheckORM
+from app.services import claim_check
+from app.tasks import celery_app
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[ClaimCheckORM.__table__])
+    factory = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(claim_check, "_session_factory", factory)
+    monkeypatch.setattr(settings, "CELERY_CLAIM_CHECK_ENABLED", True)
+    monkeypatch.setattr(settings, "CELERY_CLAIM_CHECK_THRESHOLD_BYTES", 1024)
+    yield factory
+    engine.dispose()
+
+
+def _roundtrip(obj):
+    content_type, encoding, data = kombu_dumps(obj, serializer=claim_check.SERIALIZER)
+    return data, kombu_loads(data, content_type, encoding, accept=prepare_accept_content(celery_app.conf.accept_content))
+
+
+def _rows(factory):
+    db = factory()
+    try:
+        return db.query(ClaimCheckORM).all()
+    finally:
+        db.close()
+
+
+def test_small_bodies_travel_inline(session_factory):
+    body = [[["dev-1", "dev-2"], "2026-10"], {"correlation_id": "c-1"}, {}]
+
+    data, decoded = _roundtrip(body)
+
+    assert not data.startswith(claim_check.REFERENCE_PREFIX)
+    assert decoded == body
+    assert _rows(session_factory) == []
+
+
+def test_large_bodies_are_stored_compressed_and_passed_by_reference(session_factory):
+    device_ids = [f"device-{i:06d}" for i in range(5000)]
+    body = [[device_ids, "2026-10"], {}, {}]
+
+    data, decoded = _roundtrip(body)
+
+    assert data.startswith(claim_check.REFERENCE_PREFIX)
+    assert len(data) < 64
+    assert decoded == body
+    (row,) = _rows(session_factory)
+    assert row.size_bytes > settings.CELERY_CLAIM_CHECK_THRESHOLD_BYTES
+    assert len(row.data) < row.size_bytes
+
+
+def test_result_backend_claim_checks_large_results(session_factory):
+    result = {"total": 3000, "results": [{"device_id": f"d-{i}", "status": "met"} for i in range(3000)]}
+
+    encoded = celery_app.backend.encode(result)
+
+    assert celery_app.backend.decode(encoded) == result
+    assert len(_rows(session_factory)) == 1
+
+
+def test_store_failure_falls_back_to_inline_body(session_factory, monkeypatch):
+    def _broken():
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(claim_check, "_session_factory", _broken)
+    body = ["x" * 4096]
+
+    data, decoded = _roundtrip(body)
+
+    assert not data.startswith(claim_check.REFERENCE_PREFIX)
+    assert decoded == body
+
+
+def test_purge_expired_removes_only_expired_rows(session_factory):
+    claim_id = claim_check.store(b'"payload"')
+    db = session_factory()
+    db.add(ClaimCheckORM(
+        id="expired",
+        data=b"",
+        size_bytes=0,
+        created_at=datetime.now(timezone.utc) - timedelta(days=3),
+        expires_at=datetime.now(timezone.utc) - timedelta(days=1),
+    ))
+    db.commit()
+
+    assert claim_check.purge_expired(db) == 1
+    db.close()
+    assert [row.id for row in _rows(session_factory)] == [claim_id]
+    with pytest.raises(ValueError):
+        claim_check.fetch("expired")
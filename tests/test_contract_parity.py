@@ -179,7 +179,7 @@ class ResolveContractParityTests(unittest.TestCase):
              patch("app.api.v1.endpoints.outages.PaymentRepository", FakePaymentRepo), \
              patch("app.api.v1.endpoints.outages.OutageEventRepository"), \
              patch("app.api.v1.endpoints.outages.audit_log"), \
-             patch("app.api.v1.endpoints.outages.trigger_sla_violation_webhooks", lambda *a, **kw: None):
+             patch("app.api.v1.endpoints.outages.outbox"):
             response = self.client.post("/api/v1/outages/out_c1/resolve", json={"mttr_minutes": 60})
 
         self.assertEqual(response.status_code, 200)
@@ -219,7 +219,7 @@ class ResolveContractParityTests(unittest.TestCase):
              patch("app.api.v1.endpoints.outages.PaymentRepository", FakePaymentRepo), \
              patch("app.api.v1.endpoints.outages.OutageEventRepository"), \
              patch("app.api.v1.endpoints.outages.audit_log"), \
-             patch("app.api.v1.endpoints.outages.trigger_sla_violation_webhooks", lambda *a, **kw: None):
+             patch("app.api.v1.endpoints.outages.outbox"):
             response = self.client.post("/api/v1/outages/out_c1/resolve", json={"mttr_minutes": 5})
 
         self.assertEqual(response.status_code, 200)
@@ -250,7 +250,7 @@ class ResolveContractParityTests(unittest.TestCase):
              patch("app.api.v1.endpoints.outages.PaymentRepository", FakePaymentRepo), \
              patch("app.api.v1.endpoints.outages.OutageEventRepository"), \
              patch("app.api.v1.endpoints.outages.audit_log"), \
-             patch("app.api.v1.endpoints.outages.trigger_sla_violation_webhooks", lambda *a, **kw: None):
+             patch("app.api.v1.endpoints.outages.outbox"):
             response = self.client.post("/api/v1/outages/out_c1/recompute-sla")
 
         self.assertEqual(response.status_code, 200)
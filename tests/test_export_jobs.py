@@ -0,0 +1,182 @@
+"""Tests for asynchronous export jobs: chunked artifacts, ranges and dedupe."""
+import gzip
+import json
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.base import Base
+from app.models.job import JobType
+from app.models.orm.payment import PaymentTransactionORM
+from app.services import export_artifacts, job_dedupe
+from app.services.job_cleanup import get_retry_policy
+
+
+@pytest.fixture
+def payment_db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[PaymentTransactionORM.__table__])
+    session = sessionmaker(bind=engine)()
+    for i in range(7):
+        session.add(
+            PaymentTransactionORM(
+                id=f"tx-{i:03d}",
+                transaction_hash=f"hash-{i}",
+                type="reward" if i % 2 else "penalty",
+                amount=10.0 + i,
+                asset_code="XLM",
+                from_address="GFROM",
+                to_address="GTO",
+                status="confirmed",
+                created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                retry_count=0,
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def artifact_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_ARTIFACT_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestExportArtifacts:
+    def test_json_artifact_is_chunked_and_decodable(self, payment_db, artifact_dir):
+        progress = []
+        summary = export_artifacts.write_export_artifact(
+            payment_db,
+            job_id="job-1",
+            dataset="payments",
+            format="json",
+            chunk_rows=3,
+            on_chunk=lambda rows, chunks, size: progress.append((rows, chunks)),
+        )
+        assert summary.row_count == 7
+        assert summary.chunk_count == 3
+        assert progress == [(3, 1), (6, 2), (7, 3)]
+
+        with gzip.open(summary.path, "rt") as handle:
+            rows = json.load(handle)
+        assert [r["id"] for r in rows] == [f"tx-{i:03d}" for i in range(7)]
+        assert not (artifact_dir / "job-1.json.gz.part").exists()
+
+    def test_csv_artifact_has_single_header(self, payment_db, artifact_dir):
+        summary = export_artifacts.write_export_artifact(
+            payment_db,
+            job_id="job-2",
+            dataset="payments",
+            format="csv",
+            filters={"type": "reward"},
+            chunk_rows=2,
+        )
+        with gzip.open(summary.path, "rt") as handle:
+            lines = handle.read().splitlines()
+        assert lines[0].startswith("id,transaction_hash")
+        assert sum(1 for line in lines if line.startswith("id,")) == 1
+        assert len(lines) == 1 + 3
+
+    def test_unsupported_dataset_rejected(self):
+        with pytest.raises(ValueError):
+            export_artifacts.validate_export_request("wallets", "json")
+        with pytest.raises(ValueError):
+            export_artifacts.validate_export_request("outages", "xlsx")
+
+    def test_artifact_path_rejects_traversal(self, artifact_dir):
+        with pytest.raises(ValueError):
+            export_artifacts.artifact_path("../secrets.gz")
+
+
+class TestByteRanges:
+    def test_no_header_returns_none(self):
+        assert export_artifacts.parse_byte_range(None, 100) is None
+
+    @pytest.mark.parametrize(
+        "header,expected",
+        [
+            ("bytes=0-9", (0, 9)),
+            ("bytes=90-", (90, 99)),
+            ("bytes=-10", (90, 99)),
+            ("bytes=50-500", (50, 99)),
+        ],
+    )
+    def test_valid_ranges(self, header, expected):
+        assert export_artifacts.parse_byte_range(header, 100) == expected
+
+    @pytest.mark.parametrize(
+        "header",
+        ["bytes=100-", "bytes=5-1", "bytes=0-1,5-6", "items=0-1", "bytes=a-b", "bytes=-0"],
+    )
+    def test_invalid_ranges(self, header):
+        with pytest.raises(ValueError):
+            export_artifacts.parse_byte_range(header, 100)
+
+    def test_iter_file_range(self, tmp_path):
+        path = tmp_path / "blob"
+        path.write_bytes(bytes(range(200)))
+        data = b"".join(export_artifacts.iter_file_range(str(path), 10, 149, block_size=16))
+        assert data == bytes(range(10, 150))
+
+
+class TestExportDedupe:
+    def test_key_ignores_filter_order(self):
+        a = job_dedupe.compute_dedupe_key(
+            "export", {"dataset": "sla", "format": "csv", "filters": {"a": 1, "b": 2}}
+        )
+        b = job_dedupe.compute_dedupe_key(
+            "export", {"dataset": "sla", "format": "csv", "filters": {"b": 2, "a": 1}}
+        )
+        c = job_dedupe.compute_dedupe_key(
+            "export", {"dataset": "sla", "format": "json", "filters": {"a": 1, "b": 2}}
+        )
+        assert a == b
+        assert a != c
+
+    def test_registry_tracks_job_id(self):
+        job_dedupe.register_dedupe_key("k-export", job_id="task-1")
+        try:
+            assert job_dedupe.is_duplicate("k-export")
+            assert job_dedupe.get_dedupe_job_id("k-export") == "task-1"
+        finally:
+            job_dedupe.release_dedupe_key("k-export")
+        assert not job_dedupe.is_duplicate("k-export")
+
+    def test_retry_policy_registered(self):
+        policy = get_retry_policy(JobType.EXPORT.value)
+        assert policy["retry_class"] == "exponential_backoff"
+        assert policy["max_retries"] == 2
+
+    def test_key_is_held_until_the_last_attempt_fails(self, payment_db, artifact_dir, monkeypatch):
+        from app.models.job import Job
+        from app.tasks import export_tasks
+
+        task = export_tasks.run_export
+        Base.metadata.create_all(payment_db.get_bind(), tables=[Job.__table__])
+
+        def _fail(*args, **kwargs):
+            raise RuntimeError("disk full")
+
+        def _retry(exc=None, **kwargs):
+            raise exc
+
+        monkeypatch.setattr(task, "get_db", lambda: payment_db)
+        monkeypatch.setattr(task, "retry", _retry)
+        monkeypatch.setattr(payment_db, "close", lambda: None)
+        monkeypatch.setattr(export_artifacts, "write_export_artifact", _fail)
+        job_dedupe.register_dedupe_key("k-retry", job_id="task-retry")
+        try:
+            for retries, still_held in ((0, True), (task.max_retries, False)):
+                task.push_request(id="task-retry", retries=retries)
+                try:
+                    with pytest.raises(RuntimeError):
+                        task.run(dataset="payments", format="json", dedupe_key="k-retry")
+                finally:
+                    task.pop_request()
+                assert job_dedupe.is_duplicate("k-retry") is still_held
+        finally:
+            job_dedupe.release_dedupe_key("k-retry")
@@ -0,0 +1,142 @@
+"""Tests for the incremental JSON/CSV upload parsers used by POST /outages/import."""
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.db.base import Base
+from app.models.orm.outage import OutageORM
+from app.models.outage_dto import ImportConsistency
+from app.services.outage_import import OutageImportEngine
+from app.utils.import_stream import (
+    CsvStreamParser,
+    ImportFormatError,
+    JsonArrayStreamParser,
+    open_import_parser,
+)
+
+
+def _parse(parser, data: bytes, chunk_size: int):
+    rows = []
+    for start in range(0, len(data), chunk_size):
+        rows.extend(parser.feed(data[start:start + chunk_size]))
+    rows.extend(parser.close())
+    return rows
+
+
+ROWS = [
+    {"id": "a", "description": "brace } and bracket ] in \"text\"", "n": 1},
+    {"id": "b", "nested": {"list": [1, [2, 3]], "s": "\\"}, "unicode": "café — 漢"},
+    {"id": "c", "affected_services": []},
+]
+
+
+class TestJsonArrayStreamParser:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 4096])
+    def test_matches_json_loads_for_any_chunking(self, chunk_size):
+        data = json.dumps(ROWS, indent=2, ensure_ascii=False).encode("utf-8")
+        assert _parse(JsonArrayStreamParser(), data, chunk_size) == ROWS
+
+    def test_scalar_elements_and_empty_array(self):
+        assert _parse(JsonArrayStreamParser(), b'[1, "x", null, true, -2.5e3]', 3) == [1, "x", None, True, -2500.0]
+        assert _parse(JsonArrayStreamParser(), b"  [ ]  ", 1) == []
+
+    def test_rows_are_emitted_before_the_array_closes(self):
+        parser = JsonArrayStreamParser()
+        assert parser.feed(b'[{"id": "a"}, {"id": ') == [{"id": "a"}]
+        assert parser.feed(b'"b"}]') == [{"id": "b"}]
+        assert parser.close() == []
+
+    def test_non_list_rejected(self):
+        with pytest.raises(ImportFormatError, match="must contain a list"):
+            _parse(JsonArrayStreamParser(), b'{"id": "a"}', 64)
+
+    @pytest.mark.parametrize(
+        "data",
+        [b'[{"id": "a"}', b'[{"id": "a"},]', b'[{"id": "a"} {"id": "b"}]', b"[1] 2", b"[tru]", b'[{"id": "a}]'],
+    )
+    def test_malformed_input_rejected(self, data):
+        with pytest.raises(ImportFormatError, match="Invalid JSON"):
+            _parse(JsonArrayStreamParser(), data, 4)
+
+
+class TestCsvStreamParser:
+    CSV = (
+        'id,description,site_name\r\n'
+        'a,"multi\nline, with comma",Site A\r\n'
+        '\r\n'
+        'b,"say ""hi""",Site B\r\n'
+        'c,short\r\n'
+        'd,x,y,extra'
+    )
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 4096])
+    def test_matches_dict_reader_for_any_chunking(self, chunk_size):
+        expected = list(csv.DictReader(io.StringIO(self.CSV)))
+        assert _parse(CsvStreamParser(), self.CSV.encode("utf-8"), chunk_size) == expected
+
+    def test_split_multibyte_character(self):
+        data = "id,site_name\na,Café\n".encode("utf-8")
+        assert _parse(CsvStreamParser(), data, 1) == [{"id": "a", "site_name": "Café"}]
+
+    def test_invalid_utf8_rejected(self):
+        with pytest.raises(ImportFormatError, match="Invalid CSV"):
+            _parse(CsvStreamParser(), b"id\n\xff\xfe\n", 64)
+
+
+def test_open_import_parser_by_extension():
+    assert isinstance(open_import_parser("x.json"), JsonArrayStreamParser)
+    assert isinstance(open_import_parser("x.csv"), CsvStreamParser)
+    assert open_import_parser("x.xlsx") is None
+
+
+class TestIncrementalImportBatch:
+    @pytest.fixture
+    def db(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine, tables=[OutageORM.__table__])
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+
+    def _rows(self, n):
+        return [
+            {
+                "id": f"s-{i}",
+                "site_name": "Site A",
+                "severity": "low",
+                "status": "open",
+                "detected_at": f"2026-01-01T00:{i:02d}:00Z",
+                "description": f"row {i}",
+                "affected_services": ["core-api"],
+            }
+            for i in range(n)
+        ]
+
+    def test_streamed_rows_are_written_only_on_finish(self, db):
+        data = json.dumps(self._rows(5)).encode("utf-8")
+        parser = JsonArrayStreamParser()
+        batch = OutageImportEngine(db, chunk_rows=2).begin(ImportConsistency.partial)
+        for start in range(0, len(data), 16):
+            batch.feed(parser.feed(data[start:start + 16]))
+        batch.feed(parser.close())
+        assert db.query(OutageORM).count() == 0
+
+        outcomes, persisted = batch.finish()
+        assert persisted == 5
+        assert [r.row for r in outcomes] == list(range(5))
+        assert db.query(OutageORM).count() == 5
+
+    def test_split_feeds_match_single_run(self, db):
+        rows = self._rows(4) + [self._rows(1)[0]]
+        batch = OutageImportEngine(db, chunk_rows=2).begin(ImportConsistency.atomic, dry_run=True)
+        for row in rows:
+            batch.feed([row])
+        outcomes, _ = batch.finish()
+        expected, _ = OutageImportEngine(db, chunk_rows=2).run(rows, ImportConsistency.atomic, dry_run=True)
+        assert [(r.status, r.duplicate) for r in outcomes] == [(r.status, r.duplicate) for r in expected]
+        assert outcomes[4].duplicate is True
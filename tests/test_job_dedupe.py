@@ -0,0 +1,179 @@
+"""Tests for Redis-backed job dedupe claims and the bounded local fallback."""
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.base import Base
+from app.models.job import Job, JobStatus, JobType
+from app.services import job_dedupe
+from app.services.job_dedupe import LocalDedupeStore, RedisDedupeStore
+from app.tasks import sla_tasks
+
+
+class FakeRedis:
+    """Shared-state stand-in for Redis ``SET NX PX`` / ``GET`` / ``DEL``."""
+
+    def __init__(self):
+        self.values = {}
+        self.calls = 0
+
+    def _live(self, key):
+        entry = self.values.get(key)
+        if entry and entry[1] <= time.monotonic():
+            del self.values[key]
+            return None
+        return entry
+
+    def set(self, key, value, nx=False, px=None):
+        self.calls += 1
+        if nx and self._live(key):
+            return None
+        self.values[key] = (value, time.monotonic() + (px or 10**9) / 1000.0)
+        return True
+
+    def get(self, key):
+        self.calls += 1
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    def delete(self, key):
+        self.calls += 1
+        self.values.pop(key, None)
+
+
+class BrokenRedis:
+    def __getattr__(self, name):
+        def _fail(*args, **kwargs):
+            raise ConnectionError("redis down")
+        return _fail
+
+
+@pytest.fixture
+def redis():
+    client = FakeRedis()
+    with patch.object(job_dedupe, "_get_redis_store", return_value=RedisDedupeStore(client)):
+        yield client
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[Job.__table__])
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+class TestLocalStore:
+    def test_lru_is_bounded(self):
+        store = LocalDedupeStore(max_keys=3)
+        for i in range(5):
+            store.set(f"k{i}", "job", 60_000)
+        assert len(store) == 3
+        assert store.get("k0") is None
+        assert store.get("k4") == "job"
+
+    def test_recently_used_keys_survive_eviction(self):
+        store = LocalDedupeStore(max_keys=2)
+        store.set("a", "1", 60_000)
+        store.set("b", "2", 60_000)
+        store.get("a")
+        store.set("c", "3", 60_000)
+        assert store.get("a") == "1"
+        assert store.get("b") is None
+
+    def test_entries_expire(self):
+        store = LocalDedupeStore(max_keys=10)
+        assert store.set_nx("a", "1", 1) is None
+        time.sleep(0.01)
+        assert store.get("a") is None
+        assert store.set_nx("a", "2", 60_000) is None
+        assert store.set_nx("a", "3", 60_000) == "2"
+
+
+class TestClaims:
+    def test_claim_is_atomic_across_callers(self, redis):
+        assert job_dedupe.claim_dedupe_key("k", "task-1", job_type="sla_computation") is None
+        assert job_dedupe.claim_dedupe_key("k", "task-2", job_type="sla_computation") == "task-1"
+        assert job_dedupe.get_dedupe_job_id("k") == "task-1"
+
+    def test_claim_uses_job_type_ttl(self, redis):
+        with patch.object(settings, "JOB_DEDUPE_TTLS", "sla_computation:900"):
+            job_dedupe.claim_dedupe_key("k", "task-1", job_type="sla_computation")
+        remaining = redis.values["jobs:dedupe:k"][1] - time.monotonic()
+        assert 890 < remaining <= 900
+
+    def test_ttl_parsing_and_default(self):
+        with patch.object(settings, "JOB_DEDUPE_TTLS", "export:120, bad, webhook_dispatch:x"), patch.object(
+            settings, "JOB_DEDUPE_DEFAULT_TTL_SECONDS", 77
+        ):
+            assert job_dedupe.dedupe_ttl_seconds("export") == 120
+            assert job_dedupe.dedupe_ttl_seconds("webhook_dispatch") == 77
+            assert job_dedupe.dedupe_ttl_seconds(None) == 77
+
+    def test_release_frees_key(self, redis):
+        job_dedupe.register_dedupe_key("k", job_id="task-1")
+        job_dedupe.release_dedupe_key("k")
+        assert not job_dedupe.is_duplicate("k")
+        assert job_dedupe.claim_dedupe_key("k", "task-2") is None
+
+    def test_hit_rate_is_tracked(self, redis):
+        with patch.object(job_dedupe, "_stats", job_dedupe.DedupeStats()):
+            job_dedupe.claim_dedupe_key("k", "task-1")
+            job_dedupe.claim_dedupe_key("k", "task-2")
+            job_dedupe.claim_dedupe_key("k", "task-3")
+            stats = job_dedupe.dedupe_stats()
+            assert (stats.hits, stats.misses) == (2, 1)
+            assert stats.hit_rate == pytest.approx(2 / 3)
+
+    def test_redis_failure_falls_back_to_local_lru(self):
+        local = LocalDedupeStore(max_keys=10)
+        with patch.object(job_dedupe, "_local_store", local), patch.object(
+            job_dedupe, "_redis_store", RedisDedupeStore(BrokenRedis())
+        ), patch.object(job_dedupe, "_redis_retry_at", 0.0), patch.object(
+            job_dedupe, "_stats", job_dedupe.DedupeStats()
+        ):
+            assert job_dedupe.claim_dedupe_key("k", "task-1") is None
+            assert local.get("k") == "task-1"
+            assert job_dedupe.dedupe_stats().fallbacks == 1
+            # The broken client is dropped; later calls go local until the retry window.
+            assert job_dedupe.claim_dedupe_key("k", "task-2") == "task-1"
+
+
+class TestClaimForJob:
+    def _job(self, db, task_id, status=JobStatus.PENDING):
+        job = Job(celery_task_id=task_id, job_type=JobType.SLA_COMPUTATION, status=status)
+        db.add(job)
+        db.commit()
+        return job
+
+    def test_second_submission_gets_active_holder(self, db, redis):
+        first = self._job(db, "task-1")
+        assert job_dedupe.claim_for_job(db, first, "k") is first
+        second = self._job(db, "task-2")
+        assert job_dedupe.claim_for_job(db, second, "k") is first
+        assert db.query(Job).count() == 1
+
+    def test_finished_holder_is_taken_over(self, db, redis):
+        first = self._job(db, "task-1", status=JobStatus.SUCCESS)
+        job_dedupe.claim_for_job(db, first, "k")
+        second = self._job(db, "task-2")
+        assert job_dedupe.claim_for_job(db, second, "k") is second
+        assert job_dedupe.get_dedupe_job_id("k") == "task-2"
+
+
+def test_identical_sla_submissions_dispatch_once(db, redis):
+    with patch.object(sla_tasks.compute_sla_for_device, "apply_async") as dispatch:
+        first = sla_tasks.enqueue_sla_computation(db, device_id="dev-1", period="2026-10")
+        second = sla_tasks.enqueue_sla_computation(db, device_id="dev-1", period="2026-10")
+        other = sla_tasks.enqueue_sla_computation(db, device_id="dev-2", period="2026-10")
+        forced = sla_tasks.enqueue_sla_computation(db, device_id="dev-1", period="2026-10", dedupe=False)
+    assert second.id == first.id
+    assert other.id != first.id
+    assert forced.id != first.id
+    assert dispatch.call_count == 3
+    assert dispatch.call_args_list[0].kwargs["task_id"] == first.celery_task_id
@@ -0,0 +1,105 @@
+"""Tests for the append-only job_items table: batch inserts, aggregates and paging."""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.job import Job, JobItem, JobStatus, JobType
+from app.repositories import job_items
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[Job.__table__, JobItem.__table__])
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def job(db):
+    job = Job(celery_task_id="bulk-1", job_type=JobType.BULK_SLA_COMPUTATION, status=JobStatus.STARTED)
+    db.add(job)
+    db.commit()
+    return job
+
+
+def _items(n, start=0):
+    rows = []
+    for i in range(start, start + n):
+        if i % 10 == 9:
+            rows.append(job_items.error_item(f"dev-{i}", "timeout"))
+        else:
+            rows.append(job_items.success_item(f"dev-{i}", {"uptime": 99.0}, flagged=i % 4 == 0))
+    return rows
+
+
+def test_chunk_is_one_insert_statement(db, job):
+    inserts = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO JOB_ITEMS"):
+            inserts.append(executemany)
+
+    event.listen(db.get_bind(), "before_cursor_execute", _capture)
+    assert job_items.insert_items(db, job.id, _items(500)) == 500
+    db.commit()
+    assert inserts == [True]
+    assert job_items.insert_items(db, job.id, []) == 0
+
+
+def test_summary_is_sql_aggregate(db, job):
+    job_items.insert_items(db, job.id, _items(40))
+    job_items.insert_items(db, job.id, _items(20, start=40))
+    db.commit()
+
+    summary = job_items.summarize(db, job.id)
+    assert summary.total == 60
+    assert summary.failed == 6
+    assert summary.succeeded == 54
+    assert summary.flagged == 15
+    assert job_items.flagged_item_ids(db, job.id)[:3] == ["dev-0", "dev-4", "dev-8"]
+
+
+def test_summary_of_job_without_items(db, job):
+    assert job_items.summarize(db, job.id) == job_items.JobItemSummary(0, 0, 0, 0)
+
+
+def test_keyset_pagination_walks_all_items(db, job):
+    job_items.insert_items(db, job.id, _items(25))
+    db.commit()
+
+    seen, after, pages = [], None, 0
+    while True:
+        rows, after = job_items.list_items(db, job.id, after=after, limit=10)
+        seen.extend(r.item_id for r in rows)
+        pages += 1
+        if after is None:
+            break
+    assert pages == 3
+    assert seen == [f"dev-{i}" for i in range(25)]
+
+
+def test_list_filters_by_status(db, job):
+    job_items.insert_items(db, job.id, _items(30))
+    db.commit()
+
+    rows, after = job_items.list_items(db, job.id, status="error", limit=10)
+    assert [r.item_id for r in rows] == ["dev-9", "dev-19", "dev-29"]
+    assert after is None
+    with pytest.raises(ValueError, match="Unknown job item status"):
+        job_items.list_items(db, job.id, status="bogus")
+
+
+def test_items_are_scoped_to_their_job(db, job):
+    other = Job(celery_task_id="bulk-2", job_type=JobType.BULK_SLA_COMPUTATION, status=JobStatus.STARTED)
+    db.add(other)
+    db.commit()
+    job_items.insert_items(db, job.id, _items(5))
+    job_items.insert_items(db, other.id, _items(3))
+    db.commit()
+
+    assert job_items.summarize(db, other.id).total == 3
+    rows, _ = job_items.list_items(db, other.id)
+    assert len(rows) == 3
@@ -0,0 +1,142 @@
+"""Tests for Redis-buffered lease heartbeats and their batched flush."""
+import json
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.job import Job, JobStatus, JobType
+from app.models.orm.audit_log import AuditLogORM
+from app.services import job_leases
+
+
+class FakeRedis:
+    """Just enough of Redis for lease keys and the dirty set."""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+    def set(self, key, value, px=None):
+        self.values[key] = (value, time.monotonic() + px / 1000.0)
+
+    def get(self, key):
+        entry = self.values.get(key)
+        return entry[0] if entry and entry[1] > time.monotonic() else None
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def spop(self, key, count):
+        members = self.sets.get(key, set())
+        popped = [members.pop() for _ in range(min(count, len(members)))]
+        return popped
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[Job.__table__, AuditLogORM.__table__])
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def redis():
+    client = FakeRedis()
+    with patch.object(job_leases, "get_redis_client", return_value=client):
+        yield client
+
+
+def _job(db, task_id, status=JobStatus.STARTED, lease_expires_at=None, worker_id=None):
+    db.add(Job(
+        celery_task_id=task_id,
+        job_type=JobType.SLA_COMPUTATION,
+        status=status,
+        worker_id=worker_id,
+        lease_expires_at=lease_expires_at,
+    ))
+    db.commit()
+
+
+def _stored(db, task_id):
+    db.expire_all()
+    return db.query(Job).filter(Job.celery_task_id == task_id).one()
+
+
+def _job_updates(db):
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE JOBS"):
+            statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", _capture)
+    return statements
+
+
+def test_heartbeats_are_buffered_until_flushed(db, redis):
+    for i in range(20):
+        _job(db, f"task-{i}")
+    updates = _job_updates(db)
+
+    for _ in range(5):
+        for i in range(20):
+            assert job_leases.record_heartbeat(db, f"task-{i}", worker_id="w1", timeout_seconds=60)
+    assert updates == []
+    assert json.loads(redis.get(job_leases.lease_key("task-3")))["worker_id"] == "w1"
+
+    assert job_leases.flush_heartbeats(db, batch_size=8) == 20
+    assert len(updates) == 3  # one executemany UPDATE per batch
+    job = _stored(db, "task-3")
+    assert job.worker_id == "w1"
+    assert job.lease_expires_at > datetime.utcnow() + timedelta(seconds=50)
+    assert job_leases.flush_heartbeats(db) == 0
+
+
+def test_flush_skips_finished_jobs_and_expired_leases(db, redis):
+    _job(db, "done", status=JobStatus.SUCCESS)
+    _job(db, "expired")
+    job_leases.record_heartbeat(db, "done", worker_id="w1")
+    job_leases.record_heartbeat(db, "expired", worker_id="w1", timeout_seconds=0)
+
+    assert job_leases.flush_heartbeats(db) == 1  # "done" matched no live row
+    assert _stored(db, "done").heartbeat_at is None
+    assert _stored(db, "expired").heartbeat_at is None
+
+
+def test_without_redis_heartbeat_writes_the_row(db):
+    _job(db, "task-1")
+    with patch.object(job_leases, "get_redis_client", return_value=None):
+        assert job_leases.record_heartbeat(db, "task-1", worker_id="w1") is not None
+        assert job_leases.record_heartbeat(db, "missing", worker_id="w1") is None
+        assert job_leases.flush_heartbeats(db) == 0
+    assert _stored(db, "task-1").worker_id == "w1"
+
+
+def test_reclaimer_honours_buffered_heartbeats(db, redis):
+    from app.services.job_cleanup import reclaim_stale_leases
+
+    expired = datetime.utcnow() - timedelta(minutes=5)
+    _job(db, "alive", lease_expires_at=expired, worker_id="w1")
+    _job(db, "dead", lease_expires_at=expired, worker_id="w2")
+    job_leases.record_heartbeat(db, "alive", worker_id="w1")
+
+    result = reclaim_stale_leases(db)
+    assert result["reclaimed"] == 1
+    assert _stored(db, "alive").status == JobStatus.STARTED
+    assert _stored(db, "dead").status == JobStatus.PENDING
@@ -0,0 +1,120 @@
+"""Tests for the jobs retention partition key and partition-drop retention."""
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.job import (
+    OPEN_RETENTION_MONTH,
+    RETAINED_RETENTION_MONTH,
+    Job,
+    JobItem,
+    JobStatus,
+    JobType,
+)
+from app.models.orm.audit_log import AuditLogORM
+from app.repositories import job_partitions
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[Job.__table__, JobItem.__table__, AuditLogORM.__table__])
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+def _job(db, task_id, status=JobStatus.SUCCESS, finished_at=None, **flags):
+    job = Job(
+        celery_task_id=task_id,
+        job_type=JobType.SLA_COMPUTATION,
+        status=status,
+        finished_at=finished_at,
+        **flags,
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_retention_month_follows_finished_at(db):
+    job = _job(db, "task-1", status=JobStatus.STARTED)
+    assert job.retention_month == OPEN_RETENTION_MONTH
+
+    job.status = JobStatus.SUCCESS
+    job.finished_at = datetime(2026, 7, 14, 9, 30)
+    db.commit()
+    assert job.retention_month == date(2026, 7, 1)
+
+
+def test_retained_rows_stay_retained(db):
+    job = _job(db, "task-1", finished_at=datetime(2026, 7, 14))
+    job.retention_month = RETAINED_RETENTION_MONTH
+    db.commit()
+    job.under_dispute = True
+    db.commit()
+    assert job.retention_month == RETAINED_RETENTION_MONTH
+
+
+def test_partition_names_and_month_arithmetic():
+    assert job_partitions.partition_name(date(2026, 3, 1)) == "jobs_p202603"
+    assert job_partitions.add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert job_partitions.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_sqlite_is_not_partitioned(db):
+    assert job_partitions.is_partitioned(db) is False
+
+
+def _drop_rows(db, month):
+    # Stand-in for DETACH + DROP on a backend without partitions.
+    db.execute(delete(Job).where(Job.retention_month == month))
+    db.commit()
+
+
+def test_expired_partition_is_dropped_after_moving_survivors(db):
+    from app.services.job_cleanup import JobCleanupService
+
+    now = datetime.utcnow()
+    old = now - timedelta(days=120)
+    month = date(old.year, old.month, 1)
+    for i in range(3):
+        _job(db, f"success-{i}", finished_at=old)
+    _job(db, "disputed", finished_at=old, under_dispute=True)
+    _job(db, "failure", status=JobStatus.FAILURE, finished_at=old)
+    _job(db, "recent", finished_at=now)
+
+    windows = {"success": 30, "failure": 180}
+    with patch.object(job_partitions, "is_partitioned", return_value=True), patch.object(
+        job_partitions, "list_month_partitions", return_value=[month]
+    ), patch.object(job_partitions, "drop_month_partition", side_effect=_drop_rows) as drop, patch.object(
+        job_partitions, "ensure_month_partitions"
+    ):
+        result = JobCleanupService(db).cleanup_old_jobs(retention_days=windows)
+
+    drop.assert_called_once_with(db, month)
+    assert result["partitions_dropped"] == [job_partitions.partition_name(month)]
+    assert result["deleted_by_status"]["success"] == 3
+    assert result["total_deleted"] == 3
+    db.expire_all()
+    remaining = {job.celery_task_id: job.retention_month for job in db.query(Job)}
+    assert remaining["disputed"] == RETAINED_RETENTION_MONTH
+    assert remaining["failure"] == RETAINED_RETENTION_MONTH
+    assert "recent" in remaining and "success-0" not in remaining
+
+
+def test_batch_delete_fallback_without_partitions(db):
+    from app.services.job_cleanup import JobCleanupService
+
+    old = datetime.utcnow() - timedelta(days=60)
+    for i in range(3):
+        _job(db, f"success-{i}", finished_at=old)
+
+    result = JobCleanupService(db).cleanup_old_jobs(retention_days={"success": 30}, batch_size=2)
+    assert result["partitions_dropped"] == []
+    assert result["total_deleted"] == 3
+    assert db.query(Job).count() == 0
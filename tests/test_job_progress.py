@@ -0,0 +1,146 @@
+"""Tests for coalesced job progress writes and the Redis progress channel."""
+import json
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.job import Job, JobStatus, JobType
+from app.services import job_progress
+from app.services.job_progress import ProgressReporter
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.published = []
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[Job.__table__])
+    session = sessionmaker(bind=engine, autoflush=False)()
+    session.add(Job(celery_task_id="task-1", job_type=JobType.EXPORT, status=JobStatus.STARTED))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _job_updates(db):
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE JOBS"):
+            statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", _capture)
+    return statements
+
+
+def _stored(db):
+    db.expire_all()
+    return db.query(Job).filter(Job.celery_task_id == "task-1").one()
+
+
+def test_updates_within_interval_are_coalesced(db):
+    redis, clock = FakeRedis(), FakeClock()
+    reporter = ProgressReporter(db, "task-1", flush_interval_ms=1000, redis_client=redis, clock=clock)
+    updates = _job_updates(db)
+
+    for i in range(1, 101):
+        clock.now = i * 0.015  # 100 updates over 1.5 s
+        reporter.update(i * 0.5, {"stage": "processing", "done": i})
+
+    assert len(updates) == 2  # first update, then once the interval elapsed
+    assert len(redis.published) == 100
+    assert reporter.flush() is True
+    assert _stored(db).progress_details["done"] == 100
+
+
+def test_stage_change_flushes_immediately(db):
+    clock = FakeClock()
+    reporter = ProgressReporter(db, "task-1", flush_interval_ms=60000, redis_client=FakeRedis(), clock=clock)
+    reporter.update(1.0, {"stage": "initialization"})
+    reporter.update(2.0, {"stage": "initialization"})
+    assert reporter.writes == 1
+    reporter.update(3.0, {"stage": "writing_chunks"})
+    assert reporter.writes == 2
+    job = _stored(db)
+    assert job.progress == 3.0
+    assert job.progress_details == {"stage": "writing_chunks"}
+
+
+def test_progress_capped_and_details_kept(db):
+    reporter = ProgressReporter(db, "task-1", flush_interval_ms=0, redis_client=FakeRedis())
+    reporter.update(10.0, {"stage": "a"})
+    reporter.update(150.0)
+    job = _stored(db)
+    assert job.progress == 99.0
+    assert job.progress_details == {"stage": "a"}
+
+
+def test_snapshot_published_for_readers(db):
+    redis = FakeRedis()
+    reporter = ProgressReporter(db, "task-1", flush_interval_ms=60000, redis_client=redis)
+    reporter.update(5.0, {"stage": "a"})
+    reporter.update(42.0, {"stage": "a", "rows": 10})
+
+    snapshot = job_progress.read_snapshot("task-1", client=redis)
+    assert snapshot["progress"] == 42.0
+    assert snapshot["progress_details"]["rows"] == 10
+    assert redis.published[-1][0] == job_progress.channel_for("task-1")
+    assert _stored(db).progress == 5.0  # the row still holds the coalesced write
+
+
+def test_close_publishes_terminal_state_without_writing(db):
+    redis = FakeRedis()
+    reporter = ProgressReporter(db, "task-1", flush_interval_ms=60000, redis_client=redis)
+    reporter.update(5.0, {"stage": "a"})
+    reporter.update(50.0, {"stage": "a"})
+    reporter.close(JobStatus.SUCCESS.value, 100.0)
+
+    assert reporter.flush() is False
+    snapshot = job_progress.read_snapshot("task-1", client=redis)
+    assert snapshot["status"] == "success"
+    assert snapshot["progress"] == 100.0
+
+
+def test_publish_without_redis_is_a_noop():
+    with patch.object(job_progress, "get_redis_client", return_value=None):
+        assert job_progress.publish("task-1", {"progress": 1.0}) is False
+        assert job_progress.read_snapshot("task-1") is None
+
+
+def test_task_reporter_is_per_session_and_released(db):
+    class _Task:
+        pass
+
+    task = _Task()
+    with patch.object(job_progress, "get_redis_client", return_value=None):
+        first = job_progress.task_reporter(task, db, "task-1")
+        assert job_progress.task_reporter(task, db, "task-1") is first
+        other = sessionmaker(bind=db.get_bind())()
+        assert job_progress.task_reporter(task, other, "task-1") is not first
+        job_progress.release_reporter(task, "task-1", JobStatus.SUCCESS.value)
+        assert job_progress.task_reporter(task, other, "task-1") is not first
+        other.close()
@@ -0,0 +1,141 @@
+"""Tests for the batched Celery task-event → jobs state synchronizer."""
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.job import OPEN_RETENTION_MONTH, Job, JobStatus, JobType, retention_month_for
+from app.services.job_state_sync import JobStateSynchronizer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[Job.__table__])
+    factory = sessionmaker(bind=engine, autoflush=False)
+    db = factory()
+    for i in range(5):
+        db.add(Job(celery_task_id=f"task-{i}", job_type=JobType.SLA_COMPUTATION, status=JobStatus.PENDING))
+    db.commit()
+    db.close()
+    return factory
+
+
+def _status(factory, task_id):
+    db = factory()
+    try:
+        return db.query(Job).filter(Job.celery_task_id == task_id).one().status
+    finally:
+        db.close()
+
+
+def _job_updates(engine):
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE JOBS"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    return statements
+
+
+def _event(event_type, task_id, timestamp=None):
+    return {"type": event_type, "uuid": task_id, "timestamp": timestamp or time.time()}
+
+
+def test_events_are_written_in_one_batch_per_interval(session_factory):
+    clock = FakeClock()
+    sync = JobStateSynchronizer(session_factory, flush_interval_ms=500, clock=clock)
+    updates = _job_updates(session_factory.kw["bind"])
+
+    for i in range(5):
+        sync.handle_event(_event("task-started", f"task-{i}"))
+    assert updates == []
+    assert _status(session_factory, "task-0") == JobStatus.PENDING
+
+    clock.now = 0.6
+    sync.handle_event(_event("task-succeeded", "task-0"))
+    assert len(updates) == 1
+    assert _status(session_factory, "task-0") == JobStatus.SUCCESS
+    assert _status(session_factory, "task-4") == JobStatus.STARTED
+
+
+def test_terminal_state_wins_over_late_started_event(session_factory):
+    sync = JobStateSynchronizer(session_factory, flush_interval_ms=60000)
+    now = time.time()
+    sync.handle_event(_event("task-failed", "task-1", now))
+    sync.handle_event(_event("task-started", "task-1", now - 1))
+    assert sync.flush() == 1
+    assert _status(session_factory, "task-1") == JobStatus.FAILURE
+
+    sync.handle_event(_event("task-started", "task-1"))
+    sync.flush()
+    assert _status(session_factory, "task-1") == JobStatus.FAILURE
+
+
+def test_states_recorded_by_the_task_are_not_overwritten(session_factory):
+    db = session_factory()
+    db.query(Job).filter(Job.celery_task_id == "task-2").update({Job.status: JobStatus.DEAD_LETTER})
+    db.commit()
+    db.close()
+
+    sync = JobStateSynchronizer(session_factory, flush_interval_ms=60000)
+    sync.handle_event(_event("task-failed", "task-2"))
+    sync.handle_event(_event("task-heartbeat", "task-3"))
+    sync.flush()
+    assert _status(session_factory, "task-2") == JobStatus.DEAD_LETTER
+    assert _status(session_factory, "task-3") == JobStatus.PENDING
+
+
+def test_finished_jobs_move_out_of_the_open_partition(session_factory):
+    sync = JobStateSynchronizer(session_factory, flush_interval_ms=60000)
+    sync.handle_event(_event("task-succeeded", "task-0"))
+    sync.handle_event(_event("task-started", "task-1"))
+    sync.flush()
+
+    db = session_factory()
+    try:
+        done = db.query(Job).filter(Job.celery_task_id == "task-0").one()
+        running = db.query(Job).filter(Job.celery_task_id == "task-1").one()
+        assert done.retention_month == retention_month_for(done.finished_at)
+        assert running.retention_month == OPEN_RETENTION_MONTH
+    finally:
+        db.close()
+
+
+def test_full_buffer_flushes_immediately(session_factory):
+    sync = JobStateSynchronizer(session_factory, flush_interval_ms=60000, batch_size=2)
+    sync.handle_event(_event("task-started", "task-0"))
+    sync.handle_event(_event("task-revoked", "task-1"))
+    assert _status(session_factory, "task-1") == JobStatus.REVOKED
+
+
+def test_chord_backed_jobs_only_take_started_from_events(session_factory):
+    db = session_factory()
+    db.add(Job(celery_task_id="bulk-1", job_type=JobType.BULK_SLA_COMPUTATION, status=JobStatus.PENDING))
+    db.commit()
+    db.close()
+    sync = JobStateSynchronizer(session_factory, flush_interval_ms=60000)
+
+    sync.handle_event(_event("task-started", "bulk-1"))
+    sync.flush()
+    assert _status(session_factory, "bulk-1") == JobStatus.STARTED
+
+    # The task succeeds once its chord is dispatched; the reducer completes the job.
+    sync.handle_event(_event("task-succeeded", "bulk-1"))
+    sync.handle_event(_event("task-succeeded", "task-0"))
+    sync.flush()
+    assert _status(session_factory, "bulk-1") == JobStatus.STARTED
+    assert _status(session_factory, "task-0") == JobStatus.SUCCESS
@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 
 import pytest
 from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
 from app.models.job import (
     Job,
@@ -27,6 +29,8 @@ from app.services.job_cleanup import (
     reclaim_stale_leases,
 )
 from app.core.config import Settings
+from app.db.base import Base
+from app.models.orm.audit_log import AuditLogORM
 
 
 # --------------------------------------------------------------------------- #
@@ -188,43 +192,81 @@ class TestBE_W5_047:
         result = heartbeat_job(db, "missing-task", "worker-abc")
         assert result is None
 
-    def test_reclaim_stale_leases_dry_run(self):
-        db = MagicMock()
-        stale_job = MagicMock(spec=Job)
-        stale_job.id = "job-1"
-        stale_job.celery_task_id = "task-1"
-        stale_job.job_type = JobType.SLA_COMPUTATION
-        stale_job.worker_id = "worker-old"
-        stale_job.lease_expires_at = datetime.utcnow() - timedelta(minutes=5)
-        stale_job.status = JobStatus.STARTED
-
-        db.query.return_value.filter.return_value.limit.return_value.all.return_value = [stale_job]
-
-        result = reclaim_stale_leases(db, timeout_seconds=120, dry_run=True)
+    @pytest.fixture
+    def lease_db(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine, tables=[Job.__table__, AuditLogORM.__table__])
+        session = sessionmaker(bind=engine, autoflush=False)()
+        yield session
+        session.close()
+
+    def _add_leased(self, db, count, expired=True):
+        lease = datetime.utcnow() + timedelta(minutes=-5 if expired else 5)
+        for i in range(count):
+            db.add(Job(
+                celery_task_id=f"task-{expired}-{i}",
+                job_type=JobType.SLA_COMPUTATION,
+                status=JobStatus.STARTED,
+                worker_id=f"worker-{i}",
+                lease_expires_at=lease,
+            ))
+        db.commit()
+
+    def test_reclaim_stale_leases_dry_run(self, lease_db):
+        self._add_leased(lease_db, 1)
+        self._add_leased(lease_db, 1, expired=False)
+
+        result = reclaim_stale_leases(lease_db, timeout_seconds=120, dry_run=True)
         assert result["stale_leases_found"] == 1
         assert result["reclaimed"] == 1
         assert result["dry_run"] is True
-        # No commit in dry run
-        db.commit.assert_not_called()
-
-    def test_reclaim_stale_leases_live(self):
-        db = MagicMock()
-        stale_job = MagicMock(spec=Job)
-        stale_job.id = "job-1"
-        stale_job.celery_task_id = "task-1"
-        stale_job.job_type = JobType.SLA_COMPUTATION
-        stale_job.worker_id = "worker-old"
-        stale_job.lease_expires_at = datetime.utcnow() - timedelta(minutes=5)
-        stale_job.status = JobStatus.STARTED
+        # Nothing is touched in a dry run
+        assert lease_db.query(Job).filter(Job.status == JobStatus.STARTED).count() == 2
+        assert lease_db.query(AuditLogORM).count() == 0
 
-        db.query.return_value.filter.return_value.limit.return_value.all.return_value = [stale_job]
+    def test_reclaim_stale_leases_live(self, lease_db):
+        self._add_leased(lease_db, 1)
+        self._add_leased(lease_db, 1, expired=False)
 
-        result = reclaim_stale_leases(db, timeout_seconds=120, dry_run=False)
+        result = reclaim_stale_leases(lease_db, timeout_seconds=120, dry_run=False)
         assert result["reclaimed"] == 1
         assert result["dry_run"] is False
-        assert stale_job.worker_id is None
-        assert stale_job.lease_expires_at is None
-        assert stale_job.status == JobStatus.PENDING
+        lease_db.expire_all()
+        job = lease_db.query(Job).filter(Job.celery_task_id == "task-True-0").one()
+        assert job.worker_id is None
+        assert job.lease_expires_at is None
+        assert job.status == JobStatus.PENDING
+        assert job.error.startswith("Lease expired (worker=worker-0, expired=")
+        live = lease_db.query(Job).filter(Job.celery_task_id == "task-False-0").one()
+        assert live.status == JobStatus.STARTED
+
+    def test_reclaim_stale_leases_loops_in_batches(self, lease_db):
+        self._add_leased(lease_db, 7)
+
+        result = reclaim_stale_leases(lease_db, batch_size=3)
+        assert result["reclaimed"] == 7
+        assert result["batches"] == 3
+        assert lease_db.query(Job).filter(Job.status == JobStatus.PENDING).count() == 7
+        events = lease_db.query(AuditLogORM).filter(AuditLogORM.event_type == "job_lease_reclaimed").all()
+        assert len(events) == 7
+        assert {e.details["previous_worker"] for e in events} == {f"worker-{i}" for i in range(7)}
+
+    def test_reclaim_survives_failed_audit_insert(self, lease_db, monkeypatch):
+        from sqlalchemy import text
+        from app.services import job_cleanup
+
+        def failing_log_events(db, event_type, rows):
+            db.execute(text("INSERT INTO missing_audit_table VALUES (1)"))
+
+        monkeypatch.setattr(job_cleanup.audit_log, "log_events", failing_log_events)
+        self._add_leased(lease_db, 5)
+
+        result = reclaim_stale_leases(lease_db, batch_size=2)
+        assert result["reclaimed"] == 5
+        assert result["batches"] == 3
+        lease_db.expire_all()
+        assert lease_db.query(Job).filter(Job.status == JobStatus.PENDING).count() == 5
+        assert lease_db.query(AuditLogORM).count() == 0
 
     def test_config_has_lease_settings(self):
         s = Settings()
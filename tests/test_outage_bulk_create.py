@@ -0,0 +1,78 @@
+"""Tests for the transactional OutageRepository.bulk_create path behind POST /outages/bulk."""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.db.base import Base
+from app.models.outage import Outage
+from app.models.orm.outage import OutageORM
+from app.models.outage_dto import OutageCreate
+from app.repositories.outage_repository import OutageRepository
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[OutageORM.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _payload(i: int, **overrides) -> OutageCreate:
+    data = {
+        "id": f"bulk-{i}",
+        "site_name": "Site B",
+        "site_id": "site-b",
+        "severity": "medium",
+        "status": "open",
+        "detected_at": f"2026-02-01T10:{i:02d}:00Z",
+        "description": f"bulk outage {i}",
+        "affected_services": ["radio"],
+    }
+    data.update(overrides)
+    return OutageCreate(**data)
+
+
+def _count_commits(db):
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(1))
+    return commits
+
+
+class TestBulkCreate:
+    def test_returns_created_and_existing_in_input_order(self, db):
+        repo = OutageRepository(db)
+        repo.create(_payload(1))
+        results = repo.bulk_create_or_get_existing(
+            [_payload(2), _payload(1), _payload(3), _payload(2), _payload(1, id="alias")]
+        )
+        assert [o.id for o, _ in results] == ["bulk-2", "bulk-1", "bulk-3", "bulk-2", "bulk-1"]
+        assert [p for _, p in results] == [True, False, True, False, False]
+        assert all(isinstance(o, Outage) for o, _ in results)
+        assert db.query(OutageORM).count() == 3
+
+    def test_single_commit_for_the_batch(self, db):
+        commits = _count_commits(db)
+        OutageRepository(db).bulk_create([_payload(i) for i in range(20)])
+        assert len(commits) == 1
+        assert db.query(OutageORM).count() == 20
+
+    def test_conflict_rejects_whole_batch(self, db):
+        repo = OutageRepository(db)
+        repo.create(_payload(1))
+        with pytest.raises(ValueError, match="different content"):
+            repo.bulk_create([_payload(2), _payload(1, description="changed")])
+        assert db.query(OutageORM).count() == 1
+
+    def test_conflict_within_batch_rejected(self, db):
+        with pytest.raises(ValueError, match="different content"):
+            OutageRepository(db).bulk_create([_payload(1), _payload(1, severity="high")])
+        assert db.query(OutageORM).count() == 0
+
+    def test_return_minimal_returns_ids(self, db):
+        repo = OutageRepository(db)
+        repo.create(_payload(1))
+        assert repo.bulk_create([_payload(1), _payload(2)], return_minimal=True) == ["bulk-1", "bulk-2"]
+        assert db.query(OutageORM).count() == 2
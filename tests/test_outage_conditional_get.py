@@ -0,0 +1,171 @@
+"""Tests for outage ETag validators, table change versions and the detail cache."""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.db.base import Base
+from app.models.orm.change_counter import TableChangeCounterORM
+from app.models.orm.outage import OutageORM
+from app.models.outage_dto import OutageCreate, OutageUpdate
+from app.repositories.outage_repository import OutageRepository
+from app.services import outage_cache
+
+
+def _session(with_triggers: bool):
+    outage_cache.invalidate("c-1")
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[OutageORM.__table__, TableChangeCounterORM.__table__])
+    if with_triggers:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO table_change_counters VALUES ('outages', 0, CURRENT_TIMESTAMP)")
+            for name, timing in (("ai", "AFTER INSERT"), ("au", "AFTER UPDATE"), ("ad", "AFTER DELETE")):
+                conn.exec_driver_sql(
+                    f"CREATE TRIGGER outages_change_counter_{name} {timing} ON outages BEGIN "
+                    "UPDATE table_change_counters SET version = version + 1, changed_at = CURRENT_TIMESTAMP "
+                    "WHERE table_name = 'outages'; END"
+                )
+    session = sessionmaker(bind=engine)()
+    OutageRepository(session).create(
+        OutageCreate(
+            id="c-1",
+            site_name="Site C",
+            severity="high",
+            status="open",
+            detected_at="2026-06-01T00:00:00Z",
+            description="link flap",
+            affected_services=["core"],
+        )
+    )
+    return session
+
+
+@pytest.fixture
+def db():
+    session = _session(with_triggers=False)
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def counted_db():
+    session = _session(with_triggers=True)
+    yield session
+    session.close()
+
+
+def _outage_selects(db):
+    statements = []
+
+    def _capture(conn, cursor, statement, *args):
+        if "FROM outages" in statement:
+            statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", _capture)
+    return statements
+
+
+class TestDetailCache:
+    def test_second_read_is_served_from_cache(self, db):
+        repo = OutageRepository(db)
+        first = outage_cache.get_outage_detail(repo, "c-1")
+        selects = _outage_selects(db)
+        second = outage_cache.get_outage_detail(repo, "c-1")
+        assert second is first
+        assert selects == []
+        assert b'"id":"c-1"' in first.body
+
+    def test_write_changes_version_and_etag(self, db):
+        repo = OutageRepository(db)
+        before = outage_cache.get_outage_detail(repo, "c-1")
+        repo.update("c-1", OutageUpdate(description="link down"))
+        after = outage_cache.get_outage_detail(repo, "c-1")
+        assert after.etag != before.etag
+        assert b"link down" in after.body
+
+    def test_invalidate_drops_entry(self, db):
+        repo = OutageRepository(db)
+        entry = outage_cache.get_outage_detail(repo, "c-1")
+        outage_cache.invalidate("c-1")
+        assert outage_cache.get_outage_detail(repo, "c-1") is not entry
+
+    def test_missing_outage(self, db):
+        assert outage_cache.get_outage_detail(OutageRepository(db), "nope") is None
+
+    def test_local_version_has_no_last_modified(self, db):
+        assert outage_cache.get_outage_detail(OutageRepository(db), "c-1").last_modified is None
+
+
+class TestDatabaseCounter:
+    def test_raw_writes_bump_the_version(self, counted_db):
+        repo = OutageRepository(counted_db)
+        version, changed_at = repo.table_version()
+        assert version.startswith("db")
+        assert changed_at is not None
+
+        entry = outage_cache.get_outage_detail(repo, "c-1")
+        counted_db.execute(text("UPDATE outages SET description = 'raw edit' WHERE id = 'c-1'"))
+        counted_db.commit()
+        assert repo.table_version()[0] != version
+
+        refreshed = outage_cache.get_outage_detail(repo, "c-1")
+        assert refreshed.etag != entry.etag
+        assert b"raw edit" in refreshed.body
+        assert refreshed.last_modified is not None
+
+    def test_postgres_reads_the_change_sequences(self):
+        from unittest.mock import MagicMock
+
+        from app.repositories.change_counter import table_version
+
+        changed = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        db.execute.return_value.first.return_value = (1,)
+        db.execute.return_value.one.return_value = (42, int(changed.timestamp() * 1_000_000))
+
+        assert table_version(db, "outages") == ("db42", changed)
+        probe, read = (str(c.args[0]) for c in db.execute.call_args_list)
+        assert "relkind = 'S'" in probe
+        assert "outages_change_seq" in read and "outages_changed_at_seq" in read
+        assert "table_change_counters" not in read
+
+    def test_missing_triggers_fall_back_to_local_version(self, db):
+        version, changed_at = OutageRepository(db).table_version()
+        assert version.startswith("local") and changed_at is None
+
+
+class TestValidators:
+    def test_if_none_match(self):
+        etag = '"abc"'
+        assert outage_cache.is_not_modified({"if-none-match": '"abc"'}, etag, None)
+        assert outage_cache.is_not_modified({"if-none-match": 'W/"abc", "zzz"'}, etag, None)
+        assert outage_cache.is_not_modified({"if-none-match": "*"}, etag, None)
+        assert not outage_cache.is_not_modified({"if-none-match": '"zzz"'}, etag, None)
+        assert not outage_cache.is_not_modified({}, etag, None)
+
+    def test_if_modified_since(self):
+        modified = datetime(2026, 6, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+        same = {"if-modified-since": format_datetime(modified.replace(microsecond=0), usegmt=True)}
+        older = {"if-modified-since": format_datetime(modified - timedelta(minutes=1), usegmt=True)}
+        assert outage_cache.is_not_modified(same, '"x"', modified)
+        assert not outage_cache.is_not_modified(older, '"x"', modified)
+        assert not outage_cache.is_not_modified({"if-modified-since": "garbage"}, '"x"', modified)
+        # If-None-Match takes precedence over If-Modified-Since.
+        assert not outage_cache.is_not_modified({**same, "if-none-match": '"y"'}, '"x"', modified)
+
+    def test_list_etag_tracks_query_and_writes(self, db):
+        repo = OutageRepository(db)
+        base = outage_cache.list_validators(repo, {"page": 1, "status": None})
+        assert outage_cache.list_validators(repo, {"status": None, "page": 1}) == base
+        assert outage_cache.list_validators(repo, {"page": 2, "status": None})["etag"] != base["etag"]
+        repo.delete("c-1")
+        assert outage_cache.list_validators(repo, {"page": 1, "status": None})["etag"] != base["etag"]
+
+    def test_headers(self):
+        headers = outage_cache.validator_headers('"x"', datetime(2026, 6, 1, tzinfo=timezone.utc))
+        assert headers["ETag"] == '"x"'
+        assert headers["Last-Modified"] == "Mon, 01 Jun 2026 00:00:00 GMT"
@@ -0,0 +1,137 @@
+"""Tests for content-hash based outage duplicate detection."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.db.base import Base
+from app.models.orm.outage import OutageORM
+from app.models.outage_dto import ImportConsistency, OutageCreate, OutageUpdate
+from app.repositories.outage_repository import OutageRepository, outage_content_hash
+from app.services.outage_import import OutageImportEngine
+
+DETECTED = datetime(2026, 5, 1, 8, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[OutageORM.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _payload(outage_id: str, **overrides) -> OutageCreate:
+    data = {
+        "id": outage_id,
+        "site_name": "Site H",
+        "site_id": "site-h",
+        "severity": "low",
+        "status": "open",
+        "detected_at": DETECTED,
+        "description": "fibre cut",
+        "affected_services": ["core"],
+    }
+    data.update(overrides)
+    return OutageCreate(**data)
+
+
+class TestContentHash:
+    def test_normalizes_whitespace_unicode_and_timezone(self):
+        base = outage_content_hash("Site H", DETECTED, "fibre cut", "site-h")
+        assert outage_content_hash(" Site H ", DETECTED, "fibre cut\n", "site-h") == base
+        assert outage_content_hash("Site H", DETECTED.replace(tzinfo=None), "fibre cut", "site-h") == base
+        assert outage_content_hash(
+            "Site H", DETECTED.astimezone(timezone(timedelta(hours=2))), "fibre cut", "site-h"
+        ) == base
+        assert outage_content_hash("Café", DETECTED, "x") == outage_content_hash("Café", DETECTED, "x")
+
+    def test_site_id_is_part_of_the_key(self):
+        assert outage_content_hash("Site H", DETECTED, "fibre cut", "a") != outage_content_hash(
+            "Site H", DETECTED, "fibre cut", "b"
+        )
+
+
+class TestDuplicateDetection:
+    def test_single_create_is_one_indexed_lookup(self, db):
+        repo = OutageRepository(db)
+        repo.create(_payload("h-1"))
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda c, cur, stmt, *a: statements.append(stmt))
+        outage, persisted = repo.create_or_get_existing(_payload("h-2"))
+        assert (outage.id, persisted) == ("h-1", False)
+        content_probes = [s for s in statements if "WHERE outages.content_hash" in s]
+        assert len(content_probes) == 1
+        assert not any("outages.description =" in s for s in statements)
+
+    def test_siteless_payload_matches_any_site(self, db):
+        repo = OutageRepository(db)
+        repo.create(_payload("h-1"))
+        outage, persisted = repo.create_or_get_existing(_payload("h-2", site_id=None))
+        assert (outage.id, persisted) == ("h-1", False)
+
+    def test_different_site_is_not_a_duplicate(self, db):
+        repo = OutageRepository(db)
+        repo.create(_payload("h-1"))
+        _, persisted = repo.create_or_get_existing(_payload("h-2", site_id="other"))
+        assert persisted is True
+
+    def test_bulk_and_import_use_the_hash(self, db):
+        repo = OutageRepository(db)
+        repo.create(_payload("h-1"))
+        results = repo.bulk_create_or_get_existing([_payload("h-2", site_name="Site H ")], return_minimal=True)
+        assert results == [("h-1", False)]
+
+        outcomes, persisted = OutageImportEngine(db).run(
+            [_payload("h-3", description=" fibre cut").model_dump(mode="json")], ImportConsistency.atomic
+        )
+        assert persisted == 0
+        assert outcomes[0].existing_id == "h-1"
+
+    def test_whitespace_variant_within_one_batch_is_a_duplicate(self, db):
+        repo = OutageRepository(db)
+        results = repo.bulk_create_or_get_existing(
+            [_payload("h-1"), _payload("h-2", site_name="Site H ", description="fibre cut\n")],
+            return_minimal=True,
+        )
+        assert results == [("h-1", True), ("h-1", False)]
+
+        for consistency in (ImportConsistency.atomic, ImportConsistency.partial):
+            rows = [
+                _payload(f"{consistency.value}-1", description=f"{consistency.value} loss").model_dump(mode="json"),
+                _payload(f"{consistency.value}-2", description=f" {consistency.value} loss").model_dump(mode="json"),
+            ]
+            outcomes, persisted = OutageImportEngine(db).run(rows, consistency)
+            assert persisted == 1
+            assert outcomes[1].existing_id == f"{consistency.value}-1"
+        assert db.query(OutageORM).count() == 3
+
+    def test_unique_index_rejects_raw_duplicate_hash(self, db):
+        repo = OutageRepository(db)
+        repo.create(_payload("h-1"))
+        db.add(OutageORM(
+            id="raw", site_name="Site H", site_id="site-h", severity="low", status="open",
+            detected_at=DETECTED, description="fibre cut", affected_services=["core"],
+            content_hash=db.get(OutageORM, "h-1").content_hash,
+        ))
+        with pytest.raises(IntegrityError):
+            db.commit()
+        db.rollback()
+
+    def test_update_rehashes_and_yields_on_collision(self, db):
+        repo = OutageRepository(db)
+        repo.create(_payload("h-1"))
+        repo.create(_payload("h-2", description="power loss"))
+
+        repo.update("h-2", OutageUpdate(description="generator fault"))
+        assert db.get(OutageORM, "h-2").content_hash == outage_content_hash(
+            "Site H", DETECTED, "generator fault", "site-h"
+        )
+
+        repo.update("h-2", OutageUpdate(description="fibre cut"))
+        assert db.get(OutageORM, "h-2").content_hash is None
+        assert db.get(OutageORM, "h-1").content_hash is not None
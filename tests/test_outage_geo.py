@@ -0,0 +1,107 @@
+"""Tests for geohash-indexed outage locations and map viewport queries."""
+import random
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.db.base import Base
+from app.models.enums import OutageStatus
+from app.models.orm.outage import OutageORM
+from app.models.outage import Location
+from app.models.outage_dto import OutageCreate, OutageUpdate
+from app.repositories.outage_repository import OutageRepository
+from app.utils import geohash
+
+# (id, latitude, longitude)
+SITES = [
+    ("lagos-1", 6.45, 3.39),
+    ("lagos-2", 6.52, 3.37),
+    ("abuja-1", 9.07, 7.49),
+    ("nairobi-1", -1.29, 36.82),
+    ("fiji-1", -17.71, 178.06),
+    ("samoa-1", -13.83, -171.76),
+]
+NIGERIA = (4.0, 2.5, 14.0, 15.0)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[OutageORM.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _payload(oid, lat, lon):
+    return OutageCreate(
+        id=oid,
+        site_name=oid,
+        site_id=oid,
+        severity="high",
+        status=OutageStatus.open,
+        detected_at=datetime(2026, 5, 1, tzinfo=timezone.utc),
+        description=f"cut {oid}",
+        affected_services=["core"],
+        location=Location(latitude=lat, longitude=lon),
+    )
+
+
+@pytest.fixture
+def repo(db):
+    repo = OutageRepository(db)
+    repo.create(_payload(*SITES[0]))
+    repo.bulk_create([_payload(*site) for site in SITES[1:]])
+    return repo
+
+
+class TestGeohash:
+    def test_known_value(self):
+        assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+    def test_cover_contains_every_point_in_box(self):
+        rng = random.Random(3)
+        for _ in range(50):
+            south, west = rng.uniform(-80, 70), rng.uniform(-170, 150)
+            north, east = south + rng.uniform(0, 10), west + rng.uniform(0, 20)
+            prefixes = geohash.cover(south, west, north, east)
+            assert len(prefixes) <= 32
+            for _ in range(20):
+                point = geohash.encode(rng.uniform(south, north), rng.uniform(west, east))
+                assert any(point.startswith(p) for p in prefixes)
+
+
+class TestViewport:
+    def test_typed_columns_populated(self, repo):
+        orm = repo.get_orm("abuja-1")
+        assert (orm.latitude, orm.longitude) == (9.07, 7.49)
+        assert orm.geohash == geohash.encode(9.07, 7.49)
+
+    def test_update_moves_location(self, repo):
+        repo.update("abuja-1", OutageUpdate(location=Location(latitude=-1.3, longitude=36.8)))
+        assert repo.get_orm("abuja-1").geohash.startswith(geohash.encode(-1.3, 36.8, 5))
+        assert {o.id for o in repo.in_viewport(NIGERIA)} == {"lagos-1", "lagos-2"}
+
+    def test_points_in_viewport(self, repo):
+        assert {o.id for o in repo.in_viewport(NIGERIA)} == {"lagos-1", "lagos-2", "abuja-1"}
+        assert repo.count_in_viewport(NIGERIA) == 3
+        assert repo.count_in_viewport(NIGERIA, status=OutageStatus.resolved) == 0
+
+    def test_antimeridian_box(self, repo):
+        pacific = (-25.0, 170.0, -10.0, -165.0)
+        assert {o.id for o in repo.in_viewport(pacific)} == {"fiji-1", "samoa-1"}
+
+    def test_geohash_ranges_used_on_sqlite(self, repo, db):
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda c, cur, stmt, *a: statements.append(stmt))
+        repo.count_in_viewport(NIGERIA)
+        assert "outages.geohash >=" in statements[-1]
+
+    def test_clusters_per_cell(self, repo):
+        clusters = repo.cluster_viewport(NIGERIA, precision=3)
+        assert [(c["geohash"], c["count"]) for c in clusters] == [("s14", 2), ("s1t", 1)]
+        assert clusters[0]["latitude"] == pytest.approx(6.485)
+        assert [c["count"] for c in repo.cluster_viewport(NIGERIA, precision=2)] == [3]
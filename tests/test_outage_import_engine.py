@@ -0,0 +1,143 @@
+"""Tests for the set-based outage import engine behind POST /outages/import."""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.db.base import Base
+from app.models.orm.outage import OutageORM
+from app.models.outage_dto import ImportConsistency, OutageCreate
+from app.repositories.outage_repository import OutageRepository, _copy_field
+from app.services.outage_import import OutageImportEngine
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[OutageORM.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _row(i: int, **overrides) -> dict:
+    row = {
+        "id": f"imp-{i}",
+        "site_name": "Site A",
+        "site_id": "site-a",
+        "severity": "high",
+        "status": "open",
+        "detected_at": f"2026-01-01T00:{i % 60:02d}:00Z",
+        "description": f"outage {i}",
+        "affected_services": ["core-api"],
+    }
+    row.update(overrides)
+    return row
+
+
+def _count_selects(db):
+    statements = []
+
+    def _capture(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", _capture)
+    return statements
+
+
+class TestResolveDuplicates:
+    def test_single_query_per_chunk(self, db):
+        OutageRepository(db).create(OutageCreate(**_row(0)))
+        selects = _count_selects(db)
+        OutageImportEngine(db, chunk_rows=50).run(
+            [_row(i) for i in range(100)], ImportConsistency.atomic, dry_run=True
+        )
+        assert len(selects) == 2
+
+    def test_id_and_content_duplicates(self, db):
+        repo = OutageRepository(db)
+        repo.create(OutageCreate(**_row(1)))
+        payloads = [
+            OutageCreate(**_row(1)),
+            OutageCreate(**_row(1, id="other-id")),
+            OutageCreate(**_row(1, description="changed")),
+            OutageCreate(**_row(2)),
+        ]
+        resolved = repo.resolve_duplicates(payloads)
+        assert resolved[0][0].id == "imp-1"
+        assert resolved[1][0].id == "imp-1"
+        assert resolved[2] == (None, "Outage with id 'imp-1' already exists with different content")
+        assert resolved[3] == (None, None)
+
+
+class TestImportEngine:
+    def test_atomic_inserts_and_reports_duplicates(self, db):
+        OutageRepository(db).create(OutageCreate(**_row(0)))
+        rows = [_row(0), _row(1), _row(1), _row(2)]
+        outcomes, persisted = OutageImportEngine(db, chunk_rows=2).run(rows, ImportConsistency.atomic)
+        assert persisted == 2
+        assert [r.persisted for r in outcomes] == [False, True, False, True]
+        assert outcomes[0].existing_id == "imp-0"
+        assert outcomes[2].duplicate is True and outcomes[2].existing_id == "imp-1"
+        assert db.query(OutageORM).count() == 3
+
+    def test_atomic_writes_nothing_when_a_row_fails(self, db):
+        rows = [_row(1), _row(2, site_name="")]
+        outcomes, persisted = OutageImportEngine(db).run(rows, ImportConsistency.atomic)
+        assert persisted == 0
+        assert outcomes[1].status == "error"
+        assert db.query(OutageORM).count() == 0
+
+    def test_atomic_conflict_is_a_row_error(self, db):
+        OutageRepository(db).create(OutageCreate(**_row(1)))
+        rows = [_row(2), _row(1, description="changed")]
+        outcomes, persisted = OutageImportEngine(db).run(rows, ImportConsistency.atomic)
+        assert persisted == 0
+        assert outcomes[1].status == "error"
+        assert db.query(OutageORM).count() == 1
+
+    def test_partial_persists_valid_rows(self, db):
+        rows = [_row(1), _row(2, severity="nope"), _row(3)]
+        outcomes, persisted = OutageImportEngine(db).run(rows, ImportConsistency.partial)
+        assert persisted == 2
+        assert [r.status for r in outcomes] == ["ok", "error", "ok"]
+        assert outcomes[1].errors[0].field == "severity"
+
+    def test_partial_isolates_failing_rows_when_chunk_insert_fails(self, db):
+        engine = OutageImportEngine(db, chunk_rows=10)
+        real_insert = engine.repo.insert_many
+
+        def flaky(payloads):
+            if len(payloads) > 1 or payloads[0].id == "imp-2":
+                raise RuntimeError("insert failed")
+            return real_insert(payloads)
+
+        engine.repo.insert_many = flaky
+        outcomes, persisted = engine.run([_row(i) for i in range(1, 4)], ImportConsistency.partial)
+        assert persisted == 2
+        assert [r.status for r in outcomes] == ["ok", "error", "ok"]
+        assert db.query(OutageORM).count() == 2
+
+    def test_dry_run_does_not_persist(self, db):
+        outcomes, persisted = OutageImportEngine(db).run([_row(1), _row(1)], ImportConsistency.atomic, dry_run=True)
+        assert persisted == 0
+        assert outcomes[1].duplicate is True
+        assert outcomes[1].persisted is None
+        assert db.query(OutageORM).count() == 0
+
+
+class TestCopyEncoding:
+    def test_null_is_unquoted_empty(self):
+        assert _copy_field(None) == ""
+        assert _copy_field("") == '""'
+
+    def test_array_and_json_literals(self):
+        assert _copy_field(["a", 'b"c']) == '"{""a"",""b\\""c""}"'
+        assert _copy_field({"latitude": 1.5}) == '"{""latitude"": 1.5}"'
+
+    def test_datetime_is_iso(self):
+        value = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        assert _copy_field(value) == '"2026-01-01T00:00:00+00:00"'
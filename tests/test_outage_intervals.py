@@ -0,0 +1,149 @@
+"""Tests for overlapping-outage queries and the concurrency profile."""
+import random
+from datetime import date, datetime, timedelta, timezone
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.db.base import Base
+from app.models.enums import OutageStatus
+from app.models.orm.outage import OutageORM
+from app.models.outage_dto import OutageCreate
+from app.repositories.outage_intervals import (
+    ACTIVE_RANGE_SQL,
+    IntervalTree,
+    OutageInterval,
+    concurrency_profile,
+    overlapping_intervals,
+)
+from app.repositories.outage_repository import OutageRepository
+
+T0 = datetime(2026, 5, 1, tzinfo=timezone.utc)
+
+
+def _at(hours):
+    return T0 + timedelta(hours=hours)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[OutageORM.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _add(repo, oid, site, start_h, end_h=None):
+    repo.create(
+        OutageCreate(
+            id=oid,
+            site_name=f"Site {site}",
+            site_id=site,
+            severity="high",
+            status=OutageStatus.open,
+            detected_at=_at(start_h),
+            description=f"cut {oid}",
+            affected_services=["core"],
+        )
+    )
+    if end_h is not None:
+        repo.resolve(oid, mttr_minutes=int((end_h - start_h) * 60))
+        orm = repo.get_orm(oid)
+        orm.resolved_at = _at(end_h)
+        repo.db.commit()
+
+
+class TestIntervalTree:
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        intervals = []
+        for i in range(300):
+            start = rng.randint(0, 1000)
+            end = None if rng.random() < 0.1 else start + rng.randint(0, 50)
+            intervals.append(OutageInterval(f"o-{i}", None, _at(start), None if end is None else _at(end)))
+        tree = IntervalTree(intervals)
+        for _ in range(100):
+            qs = rng.randint(0, 1000)
+            qe = None if rng.random() < 0.2 else qs + rng.randint(0, 30)
+            stop = _at(qe) if qe is not None else datetime.max.replace(tzinfo=timezone.utc)
+            expected = sorted(
+                (iv for iv in intervals if iv.start < stop and iv.end_key > _at(qs)),
+                key=lambda iv: (iv.start, iv.outage_id),
+            )
+            assert tree.overlapping(_at(qs), None if qe is None else _at(qe)) == expected
+
+    def test_half_open_bounds(self):
+        tree = IntervalTree([OutageInterval("a", None, _at(0), _at(2))])
+        assert tree.overlapping(_at(2), _at(3)) == []
+        assert tree.overlapping(_at(-1), _at(0)) == []
+        assert len(tree.overlapping(_at(1), _at(1.5))) == 1
+
+
+class TestOverlapping:
+    def test_outages_active_during_window(self, db):
+        repo = OutageRepository(db)
+        _add(repo, "a", "S1", 0, 4)
+        _add(repo, "b", "S1", 3, 5)
+        _add(repo, "c", "S2", 1)  # still open
+        _add(repo, "d", "S2", 6, 7)
+        assert [o.id for o in repo.overlapping(_at(0), _at(4), exclude_id="a")] == ["c", "b"]
+        assert [o.id for o in repo.overlapping(_at(0), _at(4), site_id="S1")] == ["a", "b"]
+        assert [o.id for o in repo.overlapping(_at(6))] == ["c", "d"]
+
+    def test_tree_refreshed_after_writes(self, db):
+        repo = OutageRepository(db)
+        _add(repo, "a", "S1", 0, 4)
+        assert [o.id for o in repo.overlapping(_at(1), _at(2))] == ["a"]
+        _add(repo, "b", "S1", 1, 3)
+        assert [o.id for o in repo.overlapping(_at(1), _at(2))] == ["a", "b"]
+
+    def test_postgres_query_uses_immutable_tsrange(self):
+        db = MagicMock()
+        db.get_bind.return_value.dialect = postgresql.dialect()
+        db.execute.return_value = []
+
+        overlapping_intervals(db, _at(0), _at(4))
+
+        compiled = db.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "tstzrange" not in str(compiled)
+        assert f"{ACTIVE_RANGE_SQL} && tsrange(" in str(compiled)
+        assert compiled.params["window_start"] == datetime(2026, 5, 1)
+        assert compiled.params["window_end"] == datetime(2026, 5, 1, 4)
+
+
+class TestConcurrencyProfile:
+    def test_sweep_peaks_per_site_and_day(self):
+        intervals = [
+            OutageInterval("a", "S1", _at(1), _at(5)),
+            OutageInterval("b", "S1", _at(2), _at(3)),
+            OutageInterval("c", "S1", _at(3), _at(30)),  # starts as b ends: not concurrent with b
+            OutageInterval("d", "S2", _at(20), None),
+        ]
+        profile = concurrency_profile(intervals, T0, _at(48))
+        assert [(p.site_id, p.day, p.peak_concurrent, p.peak_at) for p in profile] == [
+            ("S1", date(2026, 5, 1), 2, _at(2)),
+            ("S1", date(2026, 5, 2), 1, _at(24)),
+            ("S2", date(2026, 5, 1), 1, _at(20)),
+            ("S2", date(2026, 5, 2), 1, _at(24)),
+        ]
+
+    def test_repository_window_validation(self, db):
+        repo = OutageRepository(db)
+        with pytest.raises(ValueError, match="after start"):
+            repo.concurrency_profile(_at(5), _at(5))
+        with pytest.raises(ValueError, match="at most"):
+            repo.concurrency_profile(T0, T0 + timedelta(days=400))
+
+    def test_repository_profile(self, db):
+        repo = OutageRepository(db)
+        _add(repo, "a", "S1", 0, 4)
+        _add(repo, "b", "S1", 1, 2)
+        _add(repo, "c", "S1", 30, 31)
+        peaks = repo.concurrency_profile(T0, _at(24))
+        assert [(p.site_id, p.peak_concurrent, p.peak_at) for p in peaks] == [("S1", 2, _at(1))]
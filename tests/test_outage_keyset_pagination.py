@@ -0,0 +1,143 @@
+"""Tests for keyset (cursor) pagination and estimated totals in OutageRepository.list."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.db.base import Base
+from app.models.enums import OutageStatus
+from app.models.orm.outage import OutageORM
+from app.models.outage_dto import OutageCreate, OutageSortDirection, OutageSortField
+from app.repositories import outage_repository
+from app.repositories.outage_repository import OutageRepository
+
+SEVERITIES = ["critical", "high", "medium", "low"]
+
+
+@pytest.fixture
+def db():
+    outage_repository._count_cache.invalidate_prefix("")
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[OutageORM.__table__])
+    session = sessionmaker(bind=engine)()
+    base = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    payloads = [
+        OutageCreate(
+            id=f"o-{i:02d}",
+            site_name=f"Site {i % 4}",
+            severity=SEVERITIES[i % 4],
+            status="resolved" if i % 3 == 0 else "open",
+            # Pairs share a timestamp so the id tiebreaker is exercised.
+            detected_at=base + timedelta(minutes=i // 2),
+            description=f"outage {i}",
+            affected_services=["core"],
+        )
+        for i in range(23)
+    ]
+    OutageRepository(session).bulk_create(payloads, return_minimal=True)
+    yield session
+    session.close()
+
+
+def _walk(repo, page_size, **kwargs):
+    ids, cursor, pages = [], None, 0
+    while True:
+        result = repo.list(page_size=page_size, cursor=cursor, **kwargs)
+        ids.extend(o.id for o in result["items"])
+        pages += 1
+        cursor = result["next_cursor"]
+        assert result["has_more"] is (cursor is not None)
+        if cursor is None:
+            return ids, pages
+
+
+class TestKeysetPagination:
+    @pytest.mark.parametrize("sort_by", list(OutageSortField))
+    @pytest.mark.parametrize("direction", list(OutageSortDirection))
+    def test_cursor_walk_matches_offset_order(self, db, sort_by, direction):
+        repo = OutageRepository(db)
+        expected = [o.id for o in repo.list(page_size=100, sort_by=sort_by, sort_direction=direction)["items"]]
+        ids, pages = _walk(repo, 5, sort_by=sort_by, sort_direction=direction)
+        assert ids == expected
+        assert pages == 5
+
+    def test_cursor_composes_with_filters(self, db):
+        repo = OutageRepository(db)
+        ids, _ = _walk(repo, 3, status=OutageStatus.open)
+        assert ids == [o.id for o in repo.list(page_size=100, status=OutageStatus.open)["items"]]
+        assert len(ids) == 15
+
+    def test_cursor_does_not_use_offset(self, db):
+        repo = OutageRepository(db)
+        cursor = repo.list(page_size=5)["next_cursor"]
+        executed = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda c, cur, stmt, params, *a: executed.append(params))
+        repo.list(page_size=5, cursor=cursor)
+        # SQLite always renders "LIMIT ? OFFSET ?"; the bound offset must be 0.
+        assert tuple(executed[0][-2:]) == (6, 0)
+
+    def test_cursor_bound_to_sort(self, db):
+        repo = OutageRepository(db)
+        cursor = repo.list(page_size=5)["next_cursor"]
+        with pytest.raises(ValueError, match="different sort order"):
+            repo.list(page_size=5, cursor=cursor, sort_by=OutageSortField.site_name)
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            repo.list(page_size=5, cursor="not-a-cursor")
+
+
+class TestTotals:
+    def test_exact_total_on_request(self, db):
+        result = OutageRepository(db).list(page_size=5, exact_total=True)
+        assert result["total"] == 23
+        assert result["total_is_estimate"] is False
+
+    def test_count_is_cached_until_a_write(self, db):
+        repo = OutageRepository(db)
+        first = repo.list(page_size=5)
+        assert (first["total"], first["total_is_estimate"]) == (23, False)
+        second = repo.list(page_size=5)
+        assert (second["total"], second["total_is_estimate"]) == (23, True)
+
+        repo.delete("o-00")
+        third = repo.list(page_size=5)
+        assert (third["total"], third["total_is_estimate"]) == (22, False)
+
+
+class TestPlannerEstimate:
+    def _pg_repo(self, db, explain):
+        fake = MagicMock()
+        fake.get_bind.return_value.dialect = postgresql.dialect()
+        fake.connection.return_value.exec_driver_sql.side_effect = explain
+        repo = OutageRepository(fake)
+        query = OutageRepository(db)._filtered_query(status=OutageStatus.open)
+        return repo, fake, query
+
+    def test_explain_runs_with_driver_placeholders_in_a_savepoint(self, db):
+        calls = []
+
+        def explain(sql, params):
+            calls.append((sql, params))
+            return MagicMock(scalar=MagicMock(return_value=[{"Plan": {"Plan Rows": 4200}}]))
+
+        repo, fake, query = self._pg_repo(db, explain)
+
+        assert repo._planner_estimate(query) == 4200
+        ((sql, params),) = calls
+        assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert "%(status_1)s" in sql and "%%" not in sql
+        assert params == {"status_1": "open"}
+        fake.begin_nested.assert_called_once()
+
+    def test_failed_explain_rolls_back_only_the_savepoint(self, db):
+        def explain(sql, params):
+            raise RuntimeError("syntax error")
+
+        repo, fake, query = self._pg_repo(db, explain)
+
+        assert repo._planner_estimate(query) is None
+        exit_args = fake.begin_nested.return_value.__exit__.call_args[0]
+        assert exit_args[0] is RuntimeError
@@ -60,9 +60,12 @@ class OutageLifecycleTests(unittest.TestCase):
             def __init__(self, db):
                 self.db = db
 
-            def list(self, severity=None, status=None, search=None, start_date=None, end_date=None, page=1, page_size=20, sort_by=None, sort_direction=None):
+            def list(self, severity=None, status=None, search=None, start_date=None, end_date=None, page=1, page_size=20, sort_by=None, sort_direction=None, cursor=None, exact_total=False):
                 return {"items": [self_outage], "total": 1, "page": page, "page_size": page_size}
 
+            def table_version(self):
+                return "v1", None
+
         self_outage = self.outage
         with patch("app.api.v1.endpoints.outages.OutageRepository", FakeOutageRepo):
             response = self.client.get("/api/v1/outages")
@@ -133,7 +136,7 @@ class OutageLifecycleTests(unittest.TestCase):
         with patch("app.api.v1.endpoints.outages.OutageRepository", FakeOutageRepo), patch(
             "app.api.v1.endpoints.outages.SLARepository", FakeSLARepo
         ), patch("app.api.v1.endpoints.outages.PaymentRepository", FakePaymentRepo), patch(
-            "app.api.v1.endpoints.outages.trigger_sla_violation_webhooks", lambda *args, **kwargs: []
+            "app.api.v1.endpoints.outages.outbox"
         ):
             response = self.client.post("/api/v1/outages/out_1/resolve", json={"mttr_minutes": 20})
 
@@ -175,7 +178,7 @@ class OutageLifecycleTests(unittest.TestCase):
         with patch("app.api.v1.endpoints.outages.OutageRepository", FakeOutageRepo), patch(
             "app.api.v1.endpoints.outages.SLARepository", FakeSLARepo
         ), patch("app.api.v1.endpoints.outages.PaymentRepository", FakePaymentRepo), patch(
-            "app.api.v1.endpoints.outages.trigger_sla_violation_webhooks", lambda *args, **kwargs: []
+            "app.api.v1.endpoints.outages.outbox"
         ):
             response = self.client.post("/api/v1/outages/out_1/recompute-sla")
 
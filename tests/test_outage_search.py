@@ -0,0 +1,124 @@
+"""Tests for the indexed outage id/site search (FTS5 on SQLite)."""
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.db.base import Base
+from app.models.orm.outage import OutageORM
+from app.models.outage_dto import OutageCreate
+from app.repositories.outage_repository import OutageRepository
+from app.repositories.outage_search import BACKEND_FTS5, install_sqlite_search, search_backend
+
+
+def _payload(outage_id: str, site_name: str, site_id: str = None) -> OutageCreate:
+    return OutageCreate(
+        id=outage_id,
+        site_name=site_name,
+        site_id=site_id,
+        severity="high",
+        status="open",
+        detected_at="2026-04-01T00:00:00Z",
+        description=f"outage at {site_name}",
+        affected_services=["core"],
+    )
+
+
+def _engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[OutageORM.__table__])
+    return engine
+
+
+@pytest.fixture
+def db():
+    engine = _engine()
+    session = sessionmaker(bind=engine)()
+    OutageRepository(session).bulk_create(
+        [
+            _payload("OUT-100", "Lagos Central", "LAG-01"),
+            _payload("OUT-1001", "Abuja North", "ABJ-02"),
+            _payload("OUT-1002", "Kano East", None),
+            _payload("NET-7", "Port Harcourt", "PHC-OUT-100"),
+        ],
+        return_minimal=True,
+    )
+    install_sqlite_search(engine)
+    yield session
+    session.close()
+
+
+def _ids(hits):
+    return [(h.outage.id, h.match) for h in hits]
+
+
+class TestSearchIndex:
+    def test_backend_detected(self, db):
+        assert search_backend(db) == BACKEND_FTS5
+
+    def test_backend_absent_falls_back_to_ilike(self):
+        session = sessionmaker(bind=_engine())()
+        repo = OutageRepository(session)
+        repo.create(_payload("OUT-1", "Lagos Central"))
+        assert search_backend(session) is None
+        assert [o.id for o in repo.list(search="lagos")["items"]] == ["OUT-1"]
+
+    def test_list_search_uses_fts(self, db):
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda c, cur, stmt, *a: statements.append(stmt))
+        items = OutageRepository(db).list(search="harcourt", exact_total=True)["items"]
+        assert [o.id for o in items] == ["NET-7"]
+        assert any("MATCH" in s for s in statements)
+        assert not any("lower(outages.site_name) LIKE" in s for s in statements)
+
+    def test_list_search_matches_ilike_semantics(self, db):
+        repo = OutageRepository(db)
+        for term in ("out-100", "abj", "central", "OUT"):
+            indexed = {o.id for o in repo.list(search=term, page_size=50)["items"]}
+            expected = {
+                o.id for o in repo.list_all()
+                if any(term.lower() in (v or "").lower() for v in (o.id, o.site_id, o.site_name))
+            }
+            assert indexed == expected, term
+
+    def test_short_terms_fall_back(self, db):
+        assert {o.id for o in OutageRepository(db).list(search="ka")["items"]} == {"OUT-1002"}
+
+    def test_index_follows_updates_and_deletes(self, db):
+        orm = db.get(OutageORM, "OUT-1002")
+        orm.site_name = "Ibadan South"
+        db.commit()
+        repo = OutageRepository(db)
+        assert [o.id for o in repo.list(search="ibadan")["items"]] == ["OUT-1002"]
+        assert repo.list(search="kano")["items"] == []
+
+        repo.delete("OUT-1002")
+        assert repo.list(search="ibadan")["items"] == []
+
+    def test_search_rows_are_keyed_by_outage_rowid(self, db):
+        def rows(table):
+            return set(db.execute(text(f"SELECT rowid, id FROM {table}")).all())
+
+        assert rows("outages_search") == rows("outages")
+        orm = db.get(OutageORM, "OUT-1001")
+        orm.site_name = "Abuja West"
+        db.commit()
+        OutageRepository(db).delete("OUT-100")
+        assert rows("outages_search") == rows("outages")
+
+
+class TestRankedSearch:
+    def test_exact_id_then_prefix_then_text(self, db):
+        hits = OutageRepository(db).search("OUT-100")
+        assert _ids(hits) == [
+            ("OUT-100", "exact_id"),
+            ("OUT-1001", "id_prefix"),
+            ("OUT-1002", "id_prefix"),
+            ("NET-7", "text"),
+        ]
+
+    def test_limit_respected(self, db):
+        assert len(OutageRepository(db).search("OUT-100", limit=2)) == 2
+
+    def test_text_only(self, db):
+        assert _ids(OutageRepository(db).search("north")) == [("OUT-1001", "text")]
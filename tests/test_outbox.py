@@ -0,0 +1,130 @@
+"""Tests for the transactional outbox: enqueue, relay and exactly-once processing."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.core.config import settings
+from app.db.base import Base
+from app.db.unit_of_work import UnitOfWork
+from app.models.orm.audit_log import AuditLogORM
+from app.models.orm.outbox import OUTBOX_PENDING, OUTBOX_PROCESSED, OUTBOX_PUBLISHED, OutboxMessageORM
+from app.services import outbox
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[OutboxMessageORM.__table__, AuditLogORM.__table__])
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+def _statuses(db):
+    db.expire_all()
+    return sorted(m.status for m in db.query(OutboxMessageORM).all())
+
+
+class TestEnqueue:
+    def test_message_commits_with_unit_of_work(self, db):
+        with UnitOfWork(db):
+            outbox.enqueue_audit(db, "outage_resolved", {"id": "o-1"})
+            assert db.new
+        assert _statuses(db) == [OUTBOX_PENDING]
+
+    def test_rollback_drops_message(self, db):
+        with pytest.raises(RuntimeError):
+            with UnitOfWork(db):
+                outbox.enqueue_audit(db, "outage_resolved", {"id": "o-1"})
+                raise RuntimeError("boom")
+        assert _statuses(db) == []
+
+    def test_unknown_topic(self, db):
+        with pytest.raises(ValueError, match="Unknown outbox topic"):
+            outbox.enqueue(db, "nope", {})
+
+
+class TestRelay:
+    def test_publishes_pending_once(self, db):
+        for i in range(3):
+            outbox.enqueue_audit(db, "outage_resolved", {"id": f"o-{i}"})
+        sent = []
+        assert outbox.relay_pending(db, sent.append) == 3
+        assert len(set(sent)) == 3
+        assert _statuses(db) == [OUTBOX_PUBLISHED] * 3
+        assert outbox.relay_pending(db, sent.append) == 0
+
+    def test_batch_size(self, db):
+        for i in range(5):
+            outbox.enqueue_audit(db, "outage_resolved", {"id": f"o-{i}"})
+        assert outbox.relay_pending(db, lambda _id: None, batch_size=2) == 2
+
+    def test_stale_published_messages_are_republished(self, db, monkeypatch):
+        outbox.enqueue_audit(db, "outage_resolved", {"id": "o-1"})
+        outbox.relay_pending(db, lambda _id: None)
+        monkeypatch.setattr(settings, "OUTBOX_REPUBLISH_AFTER_SECONDS", -1)
+        sent = []
+        assert outbox.relay_pending(db, sent.append) == 1
+        assert db.query(OutboxMessageORM).one().attempts == 2
+
+    def test_exhausted_messages_are_failed(self, db, monkeypatch):
+        outbox.enqueue_audit(db, "outage_resolved", {"id": "o-1"})
+        monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 1)
+        monkeypatch.setattr(settings, "OUTBOX_REPUBLISH_AFTER_SECONDS", -1)
+        outbox.relay_pending(db, lambda _id: None)
+        assert outbox.relay_pending(db, lambda _id: None) == 0
+        assert _statuses(db) == [outbox.OUTBOX_FAILED]
+
+    def test_publish_failure_returns_unsent_to_pending(self, db):
+        for i in range(3):
+            outbox.enqueue_audit(db, "outage_resolved", {"id": f"o-{i}"})
+        sent = []
+
+        def flaky(message_id):
+            if sent:
+                raise ConnectionError("broker down")
+            sent.append(message_id)
+
+        with pytest.raises(ConnectionError):
+            outbox.relay_pending(db, flaky)
+        assert _statuses(db) == [OUTBOX_PENDING, OUTBOX_PENDING, OUTBOX_PUBLISHED]
+
+
+class TestProcess:
+    def test_side_effect_applied_once(self, db):
+        message = outbox.enqueue_audit(db, "outage_resolved", {"id": "o-1"}, actor_id="u-9")
+        message_id = message.id
+        outbox.relay_pending(db, lambda _id: None)
+
+        assert outbox.process_message(db, message_id) is True
+        assert outbox.process_message(db, message_id) is False
+        entry = db.query(AuditLogORM).one()
+        assert (entry.event_type, entry.actor_id, entry.details) == ("outage_resolved", "u-9", {"id": "o-1"})
+        assert _statuses(db) == [OUTBOX_PROCESSED]
+
+    def test_pending_message_can_be_processed_before_relay_commit(self, db):
+        message_id = outbox.enqueue_audit(db, "outage_resolved", {"id": "o-1"}).id
+        assert outbox.process_message(db, message_id) is True
+        # A later relay run does not publish it again.
+        assert outbox.relay_pending(db, lambda _id: None) == 0
+
+    def test_handler_failure_is_retryable(self, db, monkeypatch):
+        message_id = outbox.enqueue_audit(db, "outage_resolved", {"id": "o-1"}).id
+
+        def broken(db, payload):
+            db.add(AuditLogORM(event_type="partial"))
+            raise RuntimeError("handler down")
+
+        monkeypatch.setitem(outbox._handlers, outbox.TOPIC_AUDIT, broken)
+        with pytest.raises(RuntimeError):
+            outbox.process_message(db, message_id)
+        db.expire_all()
+        message = db.get(OutboxMessageORM, message_id)
+        assert message.status == OUTBOX_PENDING
+        assert message.last_error == "handler down"
+        assert db.query(AuditLogORM).count() == 0
+
+        monkeypatch.undo()
+        assert outbox.process_message(db, message_id) is True
+        assert db.get(OutboxMessageORM, message_id).last_error is None
@@ -0,0 +1,96 @@
+"""Tests for the per-job-type queue topology and lane routing."""
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.models.job import JobType
+from app.services.concurrency_guardrails import EnvProfile
+from app.tasks import queue_topology
+
+celery_app_mod = sys.modules["app.tasks.celery_app"]
+
+
+def test_topology_is_consistent_with_registered_tasks():
+    celery_app_mod.celery_app.loader.import_default_modules()
+    assert queue_topology.validate_routes(list(celery_app_mod.celery_app.tasks.keys())) == []
+
+
+def test_every_job_type_has_its_own_queue():
+    queues = [queue_topology.queue_for_job_type(job_type) for job_type in JobType]
+    assert len(set(queues)) == len(queues)
+    assert queue_topology.DEFAULT_QUEUE not in queues
+
+
+def test_interactive_tasks_never_share_a_queue_with_bulk_tasks():
+    router = celery_app_mod.celery_app.amqp.router
+    interactive = set(queue_topology.queue_names("interactive"))
+    bulk = set(queue_topology.queue_names("bulk"))
+    assert not interactive & bulk
+
+    def routed(task):
+        return router.route({}, task)["queue"].name
+
+    assert routed("app.tasks.sla_tasks.compute_sla_for_device") in interactive
+    assert routed("app.tasks.webhook_tasks.dispatch_webhook_delivery") in interactive
+    assert routed("app.tasks.sla_tasks.compute_sla_chunk") in bulk
+    assert routed("app.tasks.export_tasks.run_export") in bulk
+    assert routed("app.tasks.lease_tasks.flush_job_heartbeats") == queue_topology.DEFAULT_QUEUE
+
+
+def test_validate_routes_reports_undeclared_queue_and_unknown_task():
+    routes = dict(queue_topology.TASK_QUEUES, **{"app.tasks.sla_tasks.compute_sla_for_device": "nowhere"})
+    with patch.object(queue_topology, "TASK_QUEUES", routes):
+        problems = queue_topology.validate_routes(["app.tasks.export_tasks.run_export"])
+
+    assert any("undeclared queue 'nowhere'" in p for p in problems)
+    assert any("unregistered task app.tasks.sla_tasks.compute_bulk_sla" in p for p in problems)
+
+
+def test_worker_options_split_profile_concurrency_across_lanes(monkeypatch):
+    monkeypatch.setattr(settings, "CELERY_WORKER_CONCURRENCY", None)
+    monkeypatch.setattr(settings, "CELERY_MAX_TASKS_PER_CHILD", None)
+    profile = EnvProfile(concurrency=8, max_tasks=1000, pool_size=20)
+
+    interactive = queue_topology.worker_options("interactive", profile)
+    bulk = queue_topology.worker_options("bulk", profile)
+
+    assert interactive["queues"] == ["sla", "webhooks", "outbox"]
+    assert (interactive["concurrency"], interactive["prefetch_multiplier"]) == (4, 4)
+    assert (bulk["concurrency"], bulk["prefetch_multiplier"]) == (2, 1)
+    assert bulk["max_tasks_per_child"] == 1000
+
+    monkeypatch.setattr(settings, "CELERY_WORKER_CONCURRENCY", 1)
+    assert queue_topology.worker_options("bulk", profile)["concurrency"] == 1
+    assert "--queues=sla_bulk,exports,webhooks_replay" in queue_topology.worker_argv("bulk", profile)
+
+    with pytest.raises(ValueError):
+        queue_topology.worker_options("express", profile)
+
+
+def test_verify_queue_bindings_fails_on_invalid_routes(monkeypatch):
+    monkeypatch.setattr(settings, "CELERY_REQUIRED_QUEUES", "")
+    monkeypatch.setattr(queue_topology, "TASK_QUEUES", {"app.tasks.export_tasks.run_export": "nowhere"})
+
+    probe = celery_app_mod.verify_queue_bindings(strict=False)
+    assert probe["ok"] is False
+    assert probe["routing_errors"]
+
+    with pytest.raises(RuntimeError):
+        celery_app_mod.verify_queue_bindings(strict=True)
+
+
+def test_verify_queue_bindings_reports_unserved_lanes(monkeypatch):
+    monkeypatch.setattr(settings, "CELERY_REQUIRED_QUEUES", "sla,webhooks")
+    fake_inspect = Mock()
+    fake_inspect.active_queues.return_value = {
+        "interactive@host": [{"name": "sla"}, {"name": "webhooks"}, {"name": "outbox"}],
+    }
+
+    with patch.object(celery_app_mod.celery_app.control, "inspect", return_value=fake_inspect):
+        probe = celery_app_mod.verify_queue_bindings(strict=True)
+
+    assert probe["ok"] is True
+    assert probe["missing"] == []
+    assert set(probe["unserved"]) == set(queue_topology.queue_names("bulk")) | {"celery"}
@@ -0,0 +1,252 @@
+"""Tests for the site hierarchy closure table and incremental outage rollups."""
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models.orm  # noqa: F401
+from app.api.v1.endpoints import site_hierarchy
+from app.core.security import get_current_user
+from app.db.base import Base
+from app.db.session import get_db
+from app.db.unit_of_work import UnitOfWork
+from app.models.auth import AuthUser
+from app.models.enums import OutageStatus, Role
+from app.models.orm.outage import OutageORM
+from app.models.outage_dto import ImportConsistency, OutageCreate, OutageUpdate
+from app.models.site_hierarchy import SiteHierarchy, SiteHierarchyClosure, SiteOutageRollup, SiteRollupDelta
+from app.repositories.outage_repository import OutageRepository
+from app.repositories.site_rollups import ROLLUP_FIELDS, fold_deltas, rollups_installed
+from app.schemas.site_hierarchy import SiteHierarchyCreate
+from app.services.outage_import import OutageImportEngine
+from app.services.site_hierarchy import SiteHierarchyService
+
+service = SiteHierarchyService()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [OutageORM, SiteHierarchy, SiteHierarchyClosure, SiteOutageRollup, SiteRollupDelta]
+    Base.metadata.create_all(engine, tables=[t.__table__ for t in tables])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def tree(db):
+    """region -> {metro-a -> [dc-1, dc-2], metro-b -> [dc-3]}"""
+
+    def add(name, parent=None, code=None):
+        return service.create_site(
+            db, SiteHierarchyCreate(name=name, region="EU", parent_id=parent.id if parent else None, site_code=code)
+        )
+
+    region = add("region")
+    metro_a = add("metro-a", region)
+    metro_b = add("metro-b", region)
+    return {
+        "region": region,
+        "metro-a": metro_a,
+        "metro-b": metro_b,
+        "dc-1": add("dc-1", metro_a, "S1"),
+        "dc-2": add("dc-2", metro_a, "S2"),
+        "dc-3": add("dc-3", metro_b, "S3"),
+    }
+
+
+def _outage(oid, site_id, severity="high"):
+    return OutageCreate(
+        id=oid,
+        site_name=f"Site {site_id}",
+        site_id=site_id,
+        severity=severity,
+        status=OutageStatus.open,
+        detected_at=datetime(2026, 5, 1, tzinfo=timezone.utc),
+        description=f"fibre cut {oid}",
+        affected_services=["core"],
+    )
+
+
+def _rollup(db, site):
+    db.expire_all()
+    row = service.get_rollup(db, site.id)
+    return tuple(getattr(row, name) for name in ROLLUP_FIELDS)
+
+
+def _stored(db, site):
+    db.expire_all()
+    row = db.get(SiteOutageRollup, site.id)
+    return tuple(getattr(row, name) for name in ROLLUP_FIELDS)
+
+
+def _names(db, site, **kw):
+    return [(s.name, depth) for s, depth in service.get_subtree(db, site.id, **kw)]
+
+
+class TestClosure:
+    def test_subtree_and_depth(self, db, tree):
+        assert _names(db, tree["metro-a"]) == [("metro-a", 0), ("dc-1", 1), ("dc-2", 1)]
+        assert len(_names(db, tree["region"])) == 6
+        assert _names(db, tree["region"], max_depth=1) == [("region", 0), ("metro-a", 1), ("metro-b", 1)]
+
+    def test_move_relinks_whole_subtree(self, db, tree):
+        service.move_site(db, tree["metro-a"].id, tree["metro-b"].id)
+        assert _names(db, tree["metro-b"]) == [
+            ("metro-b", 0), ("dc-3", 1), ("metro-a", 1), ("dc-1", 2), ("dc-2", 2),
+        ]
+        depths = dict(
+            db.query(SiteHierarchyClosure.ancestor_id, SiteHierarchyClosure.depth)
+            .filter(SiteHierarchyClosure.descendant_id == tree["dc-1"].id)
+            .all()
+        )
+        assert depths == {tree["dc-1"].id: 0, tree["metro-a"].id: 1, tree["metro-b"].id: 2, tree["region"].id: 3}
+
+    def test_move_under_own_descendant_rejected(self, db, tree):
+        with pytest.raises(ValueError, match="descendants"):
+            service.move_site(db, tree["metro-a"].id, tree["dc-1"].id)
+
+
+class TestRollups:
+    def test_incremental_on_outage_writes(self, db, tree):
+        repo = OutageRepository(db)
+        repo.create(_outage("o-1", "S1"))
+        repo.create(_outage("o-2", "S3"))
+        repo.bulk_create([_outage("o-3", "S2"), _outage("o-4", None)])
+        assert _rollup(db, tree["region"]) == (3, 0, 0, 0)
+        assert _rollup(db, tree["metro-a"]) == (2, 0, 0, 0)
+
+        with UnitOfWork(db):
+            repo.resolve("o-1", mttr_minutes=45)  # high threshold is 30
+        repo.resolve("o-3", mttr_minutes=10)
+        assert _rollup(db, tree["metro-a"]) == (0, 1, 2, 55)
+        assert _rollup(db, tree["region"]) == (1, 1, 2, 55)
+        assert service.get_rollup(db, tree["metro-a"].id).mttr_avg_minutes == 27.5
+
+        repo.update("o-1", OutageUpdate(severity="low"))  # low threshold is 120
+        assert _rollup(db, tree["metro-a"]) == (0, 0, 2, 55)
+
+        repo.delete("o-1")
+        assert _rollup(db, tree["region"]) == (1, 0, 1, 10)
+        assert _rollup(db, tree["metro-b"]) == (1, 0, 0, 0)
+
+    def test_writes_queue_deltas_until_folded(self, db, tree):
+        repo = OutageRepository(db)
+        repo.create(_outage("o-1", "S1"))
+        repo.create(_outage("o-2", "S3"))
+        repo.resolve("o-1", mttr_minutes=45)
+        assert _stored(db, tree["region"]) == (0, 0, 0, 0)
+        assert _rollup(db, tree["region"]) == (1, 1, 1, 45)
+
+        assert fold_deltas(db, batch_size=2) == 2
+        assert fold_deltas(db) == 1
+        db.commit()
+        assert db.query(SiteRollupDelta).count() == 0
+        assert _stored(db, tree["region"]) == (1, 1, 1, 45)
+        assert _stored(db, tree["metro-a"]) == (0, 1, 1, 45)
+        assert _rollup(db, tree["region"]) == (1, 1, 1, 45)
+
+    def test_import_updates_rollups(self, db, tree):
+        rows = [_outage("o-1", "S1"), _outage("o-2", "S3")]
+        outcomes, persisted = OutageImportEngine(db).run(
+            [row.model_dump(mode="json") for row in rows], ImportConsistency.atomic
+        )
+        assert persisted == 2
+        assert _rollup(db, tree["dc-1"]) == (1, 0, 0, 0)
+        assert _rollup(db, tree["region"]) == (2, 0, 0, 0)
+
+        OutageImportEngine(db).run(
+            [_outage("o-3", "S2").model_dump(mode="json"), {"id": "bad"}], ImportConsistency.partial
+        )
+        assert _rollup(db, tree["metro-a"]) == (2, 0, 0, 0)
+
+    @pytest.mark.parametrize("fold_before_move", [True, False])
+    def test_move_carries_rollups(self, db, tree, fold_before_move):
+        repo = OutageRepository(db)
+        repo.create(_outage("o-1", "S1"))
+        repo.create(_outage("o-2", "S2"))
+        if fold_before_move:
+            fold_deltas(db)
+            db.commit()
+        service.move_site(db, tree["dc-1"].id, tree["metro-b"].id)
+        assert _rollup(db, tree["metro-a"]) == (1, 0, 0, 0)
+        assert _rollup(db, tree["metro-b"]) == (1, 0, 0, 0)
+        assert _rollup(db, tree["region"]) == (2, 0, 0, 0)
+
+    def test_site_created_after_its_outages(self, db, tree):
+        OutageRepository(db).create(_outage("o-1", "S9"))
+        late = service.create_site(
+            db, SiteHierarchyCreate(name="dc-9", region="EU", parent_id=tree["metro-b"].id, site_code="S9")
+        )
+        assert _rollup(db, late) == (1, 0, 0, 0)
+        assert _rollup(db, tree["region"]) == (1, 0, 0, 0)
+        fold_deltas(db)
+        assert _rollup(db, tree["region"]) == (1, 0, 0, 0)
+
+    def test_rebuild_matches_incremental(self, db, tree):
+        repo = OutageRepository(db)
+        for i, code in enumerate(["S1", "S2", "S3", "S1"]):
+            repo.create(_outage(f"o-{i}", code, severity="critical"))
+        repo.resolve("o-0", mttr_minutes=20)
+        incremental = {name: _rollup(db, site) for name, site in tree.items()}
+        assert service.rebuild_rollups(db) == 6
+        assert {name: _rollup(db, site) for name, site in tree.items()} == incremental
+        assert {name: _stored(db, site) for name, site in tree.items()} == incremental
+
+    def test_subtree_outages(self, db, tree):
+        repo = OutageRepository(db)
+        for oid, code in [("o-1", "S1"), ("o-2", "S2"), ("o-3", "S3")]:
+            repo.create(_outage(oid, code))
+        repo.resolve("o-2", mttr_minutes=5)
+        assert sorted(o.id for o in repo.list_in_site_subtree(tree["metro-a"].id)) == ["o-1", "o-2"]
+        open_only = repo.list_in_site_subtree(tree["region"].id, status=OutageStatus.open)
+        assert sorted(o.id for o in open_only) == ["o-1", "o-3"]
+
+    def test_noop_without_rollup_table(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine, tables=[OutageORM.__table__])
+        session = sessionmaker(bind=engine)()
+        assert not rollups_installed(session)
+        OutageRepository(session).create(_outage("o-1", "S1"))
+        assert session.get(OutageORM, "o-1") is not None
+
+
+class TestEndpointAuth:
+    @pytest.fixture
+    def api(self, db, tree):
+        app = FastAPI()
+        app.include_router(site_hierarchy.router, prefix="/site-hierarchy")
+        app.dependency_overrides[get_db] = lambda: db
+        return app
+
+    @staticmethod
+    def _as(app, role):
+        user = AuthUser(id="u-1", email="u@example.com", role=role, created_at=datetime.now(timezone.utc))
+        app.dependency_overrides[get_current_user] = lambda: user
+
+    def test_unauthenticated_requests_are_rejected(self, api, tree):
+        client = TestClient(api)
+        site = tree["dc-1"].id
+        requests = [
+            ("post", "/site-hierarchy/", {"name": "x", "region": "EU"}),
+            ("put", f"/site-hierarchy/{site}/parent", {"parent_id": None}),
+            ("get", f"/site-hierarchy/{site}/subtree", None),
+            ("get", f"/site-hierarchy/{site}/rollup", None),
+            ("get", f"/site-hierarchy/{site}/outages", None),
+        ]
+        for method, url, body in requests:
+            assert client.request(method, url, json=body).status_code == 401, url
+
+    def test_writes_need_admin_and_reads_need_engineer(self, api, tree):
+        client = TestClient(api)
+        site = tree["dc-1"].id
+        self._as(api, Role.engineer)
+        assert client.put(f"/site-hierarchy/{site}/parent", json={"parent_id": None}).status_code == 403
+        assert client.get(f"/site-hierarchy/{site}/subtree").status_code == 200
+        self._as(api, Role.admin)
+        assert client.put(f"/site-hierarchy/{site}/parent", json={"parent_id": None}).status_code == 200
@@ -0,0 +1,140 @@
+"""Tests for the batched trace-chain loader behind /audit/trace/batch."""
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.db.base import Base
+from app.models.orm.outage import OutageORM
+from app.models.orm.outage_event import OutageEventORM
+from app.models.orm.payment import PaymentTransactionORM
+from app.models.orm.sla import SLAResultORM
+from app.models.webhook import WebhookDelivery, WebhookDeliveryStatus, WebhookEvent
+from app.services import trace
+
+BASE = datetime(2026, 5, 1, tzinfo=timezone.utc)
+
+
+def _add_outage(db, oid, status="resolved", payment_status="confirmed", delivery_status=WebhookDeliveryStatus.SUCCESS):
+    db.add(
+        OutageORM(
+            id=oid,
+            site_name=f"Site {oid}",
+            severity="high",
+            status=status,
+            detected_at=BASE,
+            description="cut",
+            affected_services=["core"],
+        )
+    )
+    for i, etype in enumerate(("resolved", "sla_computed")):
+        db.add(
+            OutageEventORM(
+                id=f"evt-{oid}-{i}",
+                outage_id=oid,
+                event_type=etype,
+                detail=json.dumps({"n": i}),
+                schema_version=1,
+                occurred_at=BASE + timedelta(minutes=i),
+            )
+        )
+    sla = SLAResultORM(
+        outage_id=oid, status="met", mttr_minutes=10, threshold_minutes=60, amount=5.0,
+        payment_type="reward", rating="excellent", is_latest=True, created_at=BASE,
+    )
+    db.add(sla)
+    db.flush()
+    db.add(
+        PaymentTransactionORM(
+            id=f"pay-{oid}", transaction_hash=f"tx-{oid}", type="reward", amount=5.0, asset_code="USDC",
+            from_address="a", to_address="b", status=payment_status, outage_id=oid, sla_result_id=sla.id,
+            created_at=BASE,
+        )
+    )
+    db.add(
+        WebhookDelivery(
+            id=uuid.uuid4(), webhook_id=uuid.uuid4(), event=WebhookEvent.SLA_RESOLVED,
+            payload=json.dumps({"data": {"outage_id": oid}}), status=delivery_status,
+            idempotency_key=f"idem-{oid}", event_timestamp=BASE.replace(tzinfo=None), outage_id=oid,
+        )
+    )
+
+
+@pytest.fixture
+def db():
+    trace._settled_cache.invalidate_prefix("")
+    engine = create_engine("sqlite:///:memory:")
+    tables = [OutageORM, OutageEventORM, SLAResultORM, PaymentTransactionORM, WebhookDelivery]
+    Base.metadata.create_all(engine, tables=[t.__table__ for t in tables])
+    session = sessionmaker(bind=engine)()
+    for i in range(20):
+        _add_outage(session, f"o-{i:02d}")
+    _add_outage(session, "open-1", status="open")
+    _add_outage(session, "pending-pay", payment_status="pending")
+    _add_outage(session, "dead-hook", delivery_status=WebhookDeliveryStatus.DEAD_LETTER)
+    session.commit()
+    yield session
+    session.close()
+
+
+def _count_selects(db):
+    selects = []
+    event.listen(
+        db.get_bind(), "before_cursor_execute",
+        lambda conn, cur, statement, *a: selects.append(statement) if statement.startswith("SELECT") else None,
+    )
+    return selects
+
+
+class TestLoadTraceChains:
+    def test_fixed_number_of_queries(self, db):
+        selects = _count_selects(db)
+        chains = trace.load_trace_chains(db, [f"o-{i:02d}" for i in range(20)])
+        assert len(chains) == 20
+        assert len(selects) == 5
+
+    def test_matches_single_trace(self, db):
+        ids = ["o-03", "open-1", "dead-hook"]
+        batch = trace.load_trace_chains(db, ids)
+        trace._settled_cache.invalidate_prefix("")
+        for oid in ids:
+            single = trace.build_trace_chain(db, outage_id=oid)
+            assert batch[oid].model_dump() == single.model_dump()
+
+    def test_chain_order_and_sequence(self, db):
+        chain = trace.load_trace_chains(db, ["o-01"])["o-01"]
+        assert [n.entity_type for n in chain.nodes] == [
+            "outage", "outage_event", "outage_event", "sla_result", "payment", "webhook_delivery",
+        ]
+        assert [n.sequence for n in chain.nodes] == list(range(1, 7))
+        assert chain.nodes[1].details["detail"] == {"n": 0}
+        assert chain.total_nodes == 6
+
+    def test_missing_ids_absent(self, db):
+        chains = trace.load_trace_chains(db, ["o-01", "nope", "o-01"])
+        assert list(chains) == ["o-01"]
+
+    def test_only_settled_chains_are_cached(self, db):
+        ids = ["o-05", "open-1", "pending-pay", "dead-hook"]
+        trace.load_trace_chains(db, ids)
+        selects = _count_selects(db)
+        assert list(trace.load_trace_chains(db, ["o-05"])) == ["o-05"]
+        assert selects == []
+        trace.load_trace_chains(db, ["open-1", "pending-pay", "dead-hook"])
+        assert len(selects) == 5
+
+    def test_invalidate_trace(self, db):
+        trace.load_trace_chains(db, ["o-05"])
+        trace.invalidate_trace("o-05")
+        selects = _count_selects(db)
+        trace.load_trace_chains(db, ["o-05"])
+        assert len(selects) == 5
+
+    def test_payment_lookup_keeps_filter_fields(self, db):
+        chain = trace.build_trace_chain(db, payment_id="pay-o-02")
+        assert (chain.outage_id, chain.payment_id) == ("o-02", "pay-o-02")
+        assert trace.load_trace_chains(db, ["o-02"])["o-02"].payment_id is None
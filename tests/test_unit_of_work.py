@@ -0,0 +1,128 @@
+"""Tests for the request-scoped UnitOfWork used by outage resolution."""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models.orm  # noqa: F401
+from app.db.base import Base
+from app.db.unit_of_work import UnitOfWork, after_commit, commit_or_defer, current_unit_of_work
+from app.models.orm.audit_log import AuditLogORM
+from app.models.orm.outage import OutageORM
+from app.models.orm.outage_event import OutageEventORM
+from app.models.orm.payment import PaymentTransactionORM
+from app.models.orm.sla import SLAResultORM
+from app.models.outage_dto import OutageCreate
+from app.repositories.outage_event_repository import OutageEventRepository
+from app.repositories.outage_repository import OutageRepository
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.sla_repository import SLARepository
+from app.services.audit_log import audit_log
+
+TABLES = [OutageORM, OutageEventORM, SLAResultORM, PaymentTransactionORM, AuditLogORM]
+
+SLA = {
+    "outage_id": "u-1",
+    "status": "met",
+    "mttr_minutes": 30,
+    "threshold_minutes": 60,
+    "amount": 100,
+    "payment_type": "reward",
+    "rating": "excellent",
+}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[t.__table__ for t in TABLES])
+    session = sessionmaker(bind=engine, autoflush=False)()
+    OutageRepository(session).create(
+        OutageCreate(
+            id="u-1",
+            site_name="Site U",
+            severity="high",
+            status="open",
+            detected_at="2026-06-01T00:00:00Z",
+            description="fiber cut",
+            affected_services=["core"],
+        )
+    )
+    yield session
+    session.close()
+
+
+def _count_commits(db):
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(1))
+    return commits
+
+
+def _resolve(db):
+    outage = OutageRepository(db).resolve("u-1", 30)
+    audit_log.log_event(db, "outage_resolved", details={"id": "u-1", "mttr": 30})
+    events = OutageEventRepository(db)
+    events.record("u-1", "resolved", {"mttr_minutes": 30})
+    sla = SLARepository(db).create(SLA)
+    events.record("u-1", "sla_computed", {"status": sla.status})
+    payment = PaymentRepository(db).create_for_sla_result("u-1", sla)
+    return outage, sla, payment
+
+
+class TestUnitOfWork:
+    def test_resolution_writes_commit_once(self, db):
+        commits = _count_commits(db)
+        with UnitOfWork(db):
+            outage, sla, payment = _resolve(db)
+        assert len(commits) == 1
+        assert outage.status == "resolved"
+        assert sla.id is not None and payment.sla_result_id == sla.id
+        assert db.query(OutageEventORM).count() == 2
+        assert db.query(AuditLogORM).count() == 1
+
+    def test_without_unit_of_work_each_repository_commits(self, db):
+        commits = _count_commits(db)
+        _resolve(db)
+        assert len(commits) == 6
+
+    def test_exception_rolls_everything_back(self, db):
+        ran = []
+        with pytest.raises(RuntimeError):
+            with UnitOfWork(db) as uow:
+                _resolve(db)
+                uow.after_commit(lambda: ran.append(1))
+                raise RuntimeError("boom")
+        assert ran == []
+        assert db.get(OutageORM, "u-1").status == "open"
+        for table in (OutageEventORM, SLAResultORM, PaymentTransactionORM, AuditLogORM):
+            assert db.query(table).count() == 0
+        assert current_unit_of_work(db) is None
+
+    def test_after_commit_runs_after_commit(self, db):
+        seen = []
+        with UnitOfWork(db):
+            OutageEventRepository(db).record("u-1", "resolved", {"mttr_minutes": 5})
+            after_commit(db, lambda: seen.append(db.in_transaction()))
+            assert seen == []
+        assert seen == [False]
+
+    def test_failing_callback_does_not_undo_commit(self, db):
+        with UnitOfWork(db) as uow:
+            OutageEventRepository(db).record("u-1", "resolved", {"mttr_minutes": 5})
+            uow.after_commit(lambda: 1 / 0)
+        assert db.query(OutageEventORM).count() == 1
+
+    def test_nested_unit_of_work_joins_outer(self, db):
+        commits = _count_commits(db)
+        with UnitOfWork(db) as outer:
+            with UnitOfWork(db) as inner:
+                assert inner is outer
+                OutageEventRepository(db).record("u-1", "resolved", {"mttr_minutes": 5})
+            assert commits == []
+        assert len(commits) == 1
+
+    def test_commit_or_defer_flushes_on_request(self, db):
+        with UnitOfWork(db):
+            orm = SLAResultORM(**SLA, is_latest=True)
+            db.add(orm)
+            commit_or_defer(db, orm, flush=True)
+            assert orm.id is not None